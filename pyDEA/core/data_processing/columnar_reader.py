@@ -0,0 +1,360 @@
+''' This module contains classes responsible for reading input data from
+    columnar files: Parquet, Feather and NumPy npz-files.
+
+    Every column of a file is one category, except the column of DMU
+    names. If a Parquet or Feather file was written from a pandas
+    DataFrame with a named index, the first index column contains DMU
+    names, otherwise DMU names are stored in the first column. NumPy
+    npz-files must contain one one-dimensional array per column.
+    Numeric columns without missing values are copied to one array of
+    doubles column by column, without creating Python objects for
+    every cell. Missing values and NaN are read as empty cells.
+
+    Parquet and Feather files require pyarrow.
+'''
+import numpy
+
+try:
+    import pyarrow
+    import pyarrow.feather
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+class ColumnarReader(object):
+    ''' This class is an abstract base class of readers of columnar files.
+        Derived classes implement _read_columns. Data of a columnar file is
+        always a table, so read_data never parses it cell by cell, but
+        cell interface of other readers is still implemented.
+
+        Attributes:
+            header (list of str): name of the column of DMU names followed
+                by categories.
+            dmu_names (list of str): DMU names.
+            values (numpy.ndarray): numbers of the table, one row per DMU,
+                None if some category has values that are not numbers
+                or are missing.
+            columns (list of list): values of categories, missing values
+                and NaN are replaced by empty strings. It is empty if values
+                is not None.
+    '''
+    def __init__(self):
+        self.header = []
+        self.dmu_names = []
+        self.values = None
+        self.columns = []
+
+    def open_file(self, file_name, sheet_name):
+        ''' Reads all columns of a given file.
+
+            Args:
+                file_name (str): path to file with input data.
+                sheet_name (str): sheet name, it is passed to _read_columns.
+
+            Raises:
+                ValueError: if columns have different lengths.
+        '''
+        names, columns, dmu_column = self._read_columns(file_name,
+                                                        sheet_name)
+        if len(set(len(column) for column in columns)) > 1:
+            raise ValueError('Columns of file {0} have different '
+                             'lengths'.format(file_name))
+        self.header = []
+        self.dmu_names = []
+        self.values = None
+        self.columns = []
+        if not columns:
+            return
+        self.header = [names[dmu_column]] + [
+            name for count, name in enumerate(names) if count != dmu_column]
+        self.dmu_names = _to_list(columns[dmu_column])
+        columns = [_replace_nan(column) for count, column in
+                   enumerate(columns) if count != dmu_column]
+        if all(isinstance(column, numpy.ndarray) for column in columns):
+            self.values = numpy.empty((len(self.dmu_names), len(columns)))
+            for count, column in enumerate(columns):
+                self.values[:, count] = column
+        else:
+            self.columns = [_to_list(column) for column in columns]
+
+    def _read_columns(self, file_name, sheet_name):
+        ''' Reads columns of a given file.
+
+            Args:
+                file_name (str): path to file with input data.
+                sheet_name (str): sheet name, it is ignored by readers of
+                    files that do not have sheets.
+
+            Returns:
+                tuple of list of str, list, int: names of columns, columns
+                    and index of the column of DMU names. Numeric columns
+                    without missing values are returned as numpy.ndarray,
+                    other columns as lists with empty strings instead of
+                    missing values.
+        '''
+        raise NotImplementedError()
+
+    def get_table(self):
+        ''' Returns data of the table without parsing cells one by one.
+
+            Returns:
+                tuple of list of str, list of list, str: categories, list
+                    where every element contains DMU name followed by
+                    coefficients and name of all DMUs, see read_data.
+        '''
+        if not self.header:
+            return [], [], ''
+        if self.values is not None:
+            rows = self.values.tolist()
+        elif self.columns:
+            rows = [list(row) for row in zip(*self.columns)]
+        else:
+            rows = [[] for dmu_name in self.dmu_names]
+        coefficients = [[dmu_name] + row for dmu_name, row in
+                        zip(self.dmu_names, rows)]
+        return self.header[1:], coefficients, self.header[0]
+
+    def get_sheet_name(self):
+        ''' Since columnar files do not support sheets, always returns
+            empty string.
+
+            Returns:
+                str: empty string.
+        '''
+        return ''
+
+    def get_cell_value(self, row_index, column):
+        ''' Returns value of the cell with given row and column index.
+            The first row contains the header.
+
+            Args:
+                row_index (int): row index.
+                column (int): column index.
+
+            Returns:
+                cell value.
+        '''
+        if row_index == 0:
+            return self.header[column]
+        if column == 0:
+            return self.dmu_names[row_index - 1]
+        if self.values is not None:
+            return self.values.item(row_index - 1, column - 1)
+        return self.columns[column - 1][row_index - 1]
+
+    def get_rows(self):
+        ''' Returns rows of the table, the first row contains the header.
+
+            Returns:
+                generator of list: rows.
+        '''
+        if not self.header:
+            return
+        yield self.header
+        categories, coefficients, dmu_name = self.get_table()
+        for row in coefficients:
+            yield row
+
+    def cell_is_not_empty(self, cell):
+        ''' Checks if a given cell has non-empty value.
+
+            Args:
+                cell: cell value.
+
+            Returns:
+                bool: True if cell has non-empty value, False otherwise.
+        '''
+        return cell != ''
+
+    def cell_is_not_blank(self, cell):
+        ''' Checks if a given cell has blank value.
+
+            Args:
+                cell: cell value.
+
+            Returns:
+                bool: True if cell has blank value, False otherwise.
+        '''
+        return not isinstance(cell, str) or cell.strip() != ''
+
+    def is_valid_text(self, cell):
+        ''' Checks if a given cell contain valid text.
+
+            Args:
+                cell: cell value.
+
+            Returns:
+                bool: True if cell contain valid text, False otherwise.
+        '''
+        return self.cell_is_text(cell) and cell.strip() != ''
+
+    def cell_is_text(self, cell):
+        ''' Checks if a given cell contains text.
+
+            Args:
+                cell: cell value.
+
+            Returns:
+                bool: True if cell contains text, False otherwise.
+        '''
+        return isinstance(cell, str)
+
+    def get_cell_content(self, cell):
+        ''' Returns cell content.
+
+            Args:
+                cell: cell value.
+
+            Returns:
+                cell content.
+        '''
+        return cell
+
+    def close_file(self):
+        ''' All columns are read in open_file, nothing to close.
+        '''
+        pass
+
+
+class ArrowReader(ColumnarReader):
+    ''' This class is an abstract base class of readers of files that
+        are read as Arrow tables. Derived classes implement _read_table.
+    '''
+    def _read_columns(self, file_name, sheet_name):
+        ''' See base class.
+
+            Raises:
+                ValueError: if pyarrow is not installed.
+        '''
+        if pyarrow is None:
+            raise ValueError('Reading {0} requires pyarrow'.format(file_name))
+        table = self._read_table(file_name)
+        # pandas stores unnamed index as column __index_level_0__
+        names = ['' if name.startswith('__index_level_') else name
+                 for name in table.column_names]
+        columns = [_convert_arrow_column(column) for column in table.columns]
+        return names, columns, _find_dmu_column(table)
+
+    def _read_table(self, file_name):
+        ''' Reads Arrow table from a given file.
+
+            Args:
+                file_name (str): path to file with input data.
+
+            Returns:
+                pyarrow.Table: table.
+        '''
+        raise NotImplementedError()
+
+
+class ParquetReader(ArrowReader):
+    ''' This class implements reading of input data from Parquet files.
+    '''
+    def _read_table(self, file_name):
+        ''' See base class.
+        '''
+        return pyarrow.parquet.read_table(file_name)
+
+
+class FeatherReader(ArrowReader):
+    ''' This class implements reading of input data from Feather files.
+    '''
+    def _read_table(self, file_name):
+        ''' See base class.
+        '''
+        return pyarrow.feather.read_table(file_name)
+
+
+class NPZReader(ColumnarReader):
+    ''' This class implements reading of input data from NumPy npz-files.
+        Arrays are columns, names of arrays are names of columns.
+    '''
+    def _read_columns(self, file_name, sheet_name):
+        ''' See base class.
+
+            Raises:
+                ValueError: if some array is not one-dimensional.
+        '''
+        names = []
+        columns = []
+        with numpy.load(file_name, allow_pickle=False) as arrays:
+            for name in arrays.files:
+                column = arrays[name]
+                if column.ndim != 1:
+                    raise ValueError('Array {0} of file {1} is not '
+                                     'one-dimensional'.format(name,
+                                                              file_name))
+                if column.dtype.kind not in 'iuf':
+                    column = column.tolist()
+                names.append(name)
+                columns.append(column)
+        return names, columns, 0
+
+
+def _convert_arrow_column(column):
+    ''' Converts a given column of Arrow table.
+
+        Args:
+            column (pyarrow.ChunkedArray): column.
+
+        Returns:
+            numpy.ndarray or list: numbers if column is numeric and has no
+                missing values, otherwise list of values with empty strings
+                instead of missing values.
+    '''
+    if column.null_count == 0 and (pyarrow.types.is_integer(column.type) or
+                                   pyarrow.types.is_floating(column.type)):
+        return column.to_numpy()
+    return ['' if value is None else value for value in column.to_pylist()]
+
+
+def _find_dmu_column(table):
+    ''' Finds the column of DMU names of a given table.
+
+        Args:
+            table (pyarrow.Table): table.
+
+        Returns:
+            int: index of the first column of pandas index if the table was
+                written from pandas DataFrame with a named index, 0 otherwise.
+    '''
+    metadata = table.schema.pandas_metadata
+    if metadata:
+        for index_column in metadata.get('index_columns', []):
+            if (isinstance(index_column, str) and
+                    index_column in table.column_names):
+                return table.column_names.index(index_column)
+    return 0
+
+
+def _replace_nan(column):
+    ''' Replaces NaN values of a given column by empty strings, so that
+        they are treated as missing values.
+
+        Args:
+            column (numpy.ndarray or list): column.
+
+        Returns:
+            numpy.ndarray or list: the same column if it has no NaN values,
+                otherwise list of values.
+    '''
+    if (isinstance(column, numpy.ndarray) and column.dtype.kind == 'f' and
+            numpy.isnan(column).any()):
+        return ['' if numpy.isnan(value) else value
+                for value in column.tolist()]
+    return column
+
+
+def _to_list(column):
+    ''' Returns values of a given column as a list.
+
+        Args:
+            column (numpy.ndarray or list): column.
+
+        Returns:
+            list: values.
+    '''
+    if isinstance(column, numpy.ndarray):
+        return column.tolist()
+    return column
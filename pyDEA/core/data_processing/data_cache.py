@@ -0,0 +1,243 @@
+''' This module contains functions that store parsed and validated input
+    data on disk, so that the same data file is not read again by the
+    next run.
+
+    Every entry of the cache is one npz-file with the matrix of
+    coefficients and a JSON index with names of categories and DMUs.
+    Entries are identified by the path to the data file, the sheet
+    name and the query, and are valid only for the size, modification
+    time and content of the data file that were used to create them.
+
+    Attributes:
+        DEFAULT_CACHE_DIRECTORY (str): directory used if parameter
+            DATA_CACHE is set to yes.
+        HASH_BLOCK_SIZE (int): number of bytes of the data file hashed
+            at once.
+'''
+import hashlib
+import json
+import os
+import re
+import tempfile
+import zipfile
+from collections import OrderedDict
+
+import numpy
+
+from pyDEA.core.data_processing.input_data import InputData
+from pyDEA.core.utils.dea_utils import get_logger
+
+DEFAULT_CACHE_DIRECTORY = os.path.join(os.path.expanduser('~'), '.pyDEA',
+                                       'data_cache')
+HASH_BLOCK_SIZE = 1 << 20
+_ENTRY_NAME = re.compile(r'^([0-9a-f]{16})_([0-9a-f]{32})\.npz$')
+
+
+def get_cache_directory(params):
+    ''' Returns directory where parsed input data must be cached.
+
+        Args:
+            params (Parameters): parameters.
+
+        Returns:
+            str: path to cache directory or None if input data must
+                not be cached.
+
+        Raises:
+            ValueError: if parameter DATA_CACHE has invalid value.
+                Allowed values are no (or empty string), yes and a path
+                to a directory.
+    '''
+    data_cache = params.get_parameter_value('DATA_CACHE').strip()
+    if data_cache == '' or data_cache == 'no':
+        return None
+    if data_cache == 'yes':
+        return DEFAULT_CACHE_DIRECTORY
+    if os.path.isfile(data_cache):
+        raise ValueError('Unexpected value of parameter <DATA_CACHE>')
+    return data_cache
+
+
+class CacheKey(object):
+    ''' Identifies cache entry of a given data file and sheet.
+
+        Attributes:
+            prefix (str): hash of the absolute path to the data file,
+                the sheet name and the query, it is the same for all
+                versions of the file.
+            digest (str): hash of the size, modification time and content
+                of the data file. SQLite databases in WAL mode keep
+                recent changes in a separate file, which is hashed too.
+
+        Args:
+            file_name (str): path to the data file.
+            sheet_name (str): name of the sheet from which data is read.
+            query (str, optional): table name or query used to read data
+                from SQLite database. Defaults to empty string.
+    '''
+    def __init__(self, file_name, sheet_name, query=''):
+        file_name = os.path.abspath(file_name)
+        self.prefix = hashlib.sha256('{0}\0{1}\0{2}'.format(
+            file_name, sheet_name, query).encode('utf-8')).hexdigest()[:16]
+        file_names = [file_name]
+        if os.path.exists(file_name + '-wal'):
+            file_names.append(file_name + '-wal')
+        digest = hashlib.sha256()
+        for name in file_names:
+            stat = os.stat(name)
+            content_hash = hashlib.sha256()
+            with open(name, 'rb') as data_file:
+                for block in iter(lambda: data_file.read(HASH_BLOCK_SIZE),
+                                  b''):
+                    content_hash.update(block)
+            digest.update('{0}\0{1}\0{2}\0'.format(
+                stat.st_size, stat.st_mtime_ns,
+                content_hash.hexdigest()).encode('utf-8'))
+        self.digest = digest.hexdigest()[:32]
+
+    def get_entry_name(self, directory):
+        ''' Returns path to the cache entry.
+
+            Args:
+                directory (str): cache directory.
+
+            Returns:
+                str: path to npz-file of the entry.
+        '''
+        return os.path.join(directory, '{0}_{1}.npz'.format(
+            self.prefix, self.digest))
+
+
+class CachedData(object):
+    ''' Input data loaded from the cache.
+
+        Attributes:
+            categories (list of str): list of categories.
+            dmu_names (list of str): DMU names, one per row of values.
+            values (numpy.ndarray): coefficients with one row per DMU and
+                one column per category.
+
+        Args:
+            categories (list of str): list of categories.
+            dmu_names (list of str): DMU names, one per row of values.
+            values (numpy.ndarray): coefficients with one row per DMU and
+                one column per category.
+    '''
+    def __init__(self, categories, dmu_names, values):
+        self.categories = categories
+        self.dmu_names = dmu_names
+        self.values = values
+
+    def get_coefficients(self):
+        ''' Returns coefficients in the same format as
+            convert_to_dictionary.
+
+            Returns:
+                dict of str to list of double: dictionary that
+                    maps DMU name to a list with coefficients.
+        '''
+        return OrderedDict(zip(self.dmu_names, self.values.tolist()))
+
+    def create_input_data(self):
+        ''' Constructs instance of InputData directly from the matrix
+            of coefficients.
+
+            Returns:
+                InputData: constructed instance.
+        '''
+        input_data = InputData()
+        input_data.add_coefficients(self.dmu_names, self.categories,
+                                    self.values)
+        return input_data
+
+
+def load_data(directory, key):
+    ''' Loads input data from the cache.
+
+        Args:
+            directory (str): cache directory.
+            key (CacheKey): key of the data file.
+
+        Returns:
+            CachedData: loaded data or None if the data file is not
+                in the cache or the entry cannot be read.
+    '''
+    entry_name = key.get_entry_name(directory)
+    if not os.path.exists(entry_name):
+        return None
+    try:
+        with numpy.load(entry_name, allow_pickle=False) as entry:
+            index = json.loads(entry['index'].tobytes().decode('utf-8'))
+            values = entry['values']
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        get_logger().warning('Removed corrupted cache entry %s', entry_name)
+        _remove_entry(entry_name)
+        return None
+    return CachedData(index['categories'], index['dmu_names'], values)
+
+
+def store_data(directory, key, categories, coefficients):
+    ''' Stores validated input data in the cache. Entries with previous
+        versions of the same data file are removed.
+        The entry is written to a temporary file first, so that runs
+        that read the cache at the same time never see a partial entry.
+
+        Args:
+            directory (str): cache directory.
+            key (CacheKey): key of the data file.
+            categories (list of str): list of categories.
+            coefficients (dict of str to list of double): dictionary that
+                maps DMU name to a list with coefficients.
+    '''
+    os.makedirs(directory, exist_ok=True)
+    index = json.dumps({'categories': list(categories),
+                        'dmu_names': list(coefficients.keys())})
+    index = numpy.frombuffer(index.encode('utf-8'), dtype=numpy.uint8)
+    values = numpy.array(list(coefficients.values()), dtype=numpy.float64)
+    with tempfile.NamedTemporaryFile(dir=directory, suffix='.tmp',
+                                     delete=False) as entry:
+        try:
+            numpy.savez(entry, index=index, values=values)
+        except BaseException:
+            entry.close()
+            _remove_entry(entry.name)
+            raise
+    entry_name = key.get_entry_name(directory)
+    os.replace(entry.name, entry_name)
+    for file_name in os.listdir(directory):
+        match = _ENTRY_NAME.match(file_name)
+        if (match and match.group(1) == key.prefix and
+                match.group(2) != key.digest):
+            _remove_entry(os.path.join(directory, file_name))
+
+
+def clear_cache(directory):
+    ''' Removes all entries from the cache. Other files in the cache
+        directory are not touched.
+
+        Args:
+            directory (str): cache directory.
+
+        Returns:
+            int: number of removed entries.
+    '''
+    if not os.path.isdir(directory):
+        return 0
+    nb_removed = 0
+    for file_name in os.listdir(directory):
+        if _ENTRY_NAME.match(file_name):
+            _remove_entry(os.path.join(directory, file_name))
+            nb_removed += 1
+    return nb_removed
+
+
+def _remove_entry(entry_name):
+    ''' Removes a given cache entry if it still exists.
+
+        Args:
+            entry_name (str): path to npz-file of the entry.
+    '''
+    try:
+        os.remove(entry_name)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,441 @@
+''' This module contains containers that store results of all DMUs of
+    a solution in NumPy arrays indexed by DMU index. They behave like
+    dictionaries that map DMU codes to values, so they can replace
+    dictionaries of :class:`Solution`, and also provide vectorised access
+    to values of many DMUs at once.
+
+    Attributes:
+        MISSING_STATUS (int): value of the status array for DMUs without
+            LP status.
+'''
+import collections.abc
+import numbers
+
+import numpy
+
+MISSING_STATUS = -128
+
+
+def _get_index(dmu_index, dmu_code):
+    ''' Returns index of a given DMU, new index is assigned
+        if DMU does not have one yet.
+
+        Args:
+            dmu_index (dict of str to int): maps DMU code to its index.
+            dmu_code (str): DMU code.
+
+        Returns:
+            int: index of DMU.
+    '''
+    index = dmu_index.get(dmu_code, None)
+    if index is None:
+        index = len(dmu_index)
+        dmu_index[dmu_code] = index
+    return index
+
+
+def _get_indices(dmu_index, dmu_codes):
+    ''' Returns indices of given DMUs.
+
+        Args:
+            dmu_index (dict of str to int): maps DMU code to its index.
+            dmu_codes (list of str): DMU codes.
+
+        Returns:
+            numpy.ndarray: indices of DMUs.
+
+        Raises:
+            KeyError: if some DMU does not have an index.
+    '''
+    try:
+        return numpy.fromiter((dmu_index[dmu_code] for dmu_code in dmu_codes),
+                              dtype=numpy.intp, count=len(dmu_codes))
+    except KeyError as error:
+        raise KeyError(error.args[0])
+
+
+def _get_capacity(nb_rows, capacity):
+    ''' Returns new number of rows of an array that must store a given
+        number of rows, the array is at least doubled if it grows.
+
+        Args:
+            nb_rows (int): required number of rows.
+            capacity (int): current number of rows.
+
+        Returns:
+            int: new number of rows.
+    '''
+    if nb_rows <= capacity:
+        return capacity
+    return max(nb_rows, 2 * capacity)
+
+
+class ResultVector(collections.abc.MutableMapping):
+    ''' Dictionary that maps DMU code to one value, e.g. efficiency score.
+        Values are stored in a one-dimensional array at DMU indices,
+        missing values are marked with a special value. Values that
+        cannot be stored in the array (e.g. a string in an integer array)
+        are kept in a separate dictionary.
+
+        Attributes:
+            dmu_index (dict of str to int): maps DMU code to its index,
+                it is shared by all containers of one solution.
+            array (numpy.ndarray): values at DMU indices, it might be
+                longer than the number of DMUs.
+            missing (int or double): value of the array for DMUs without
+                a value.
+            _other_values (dict of str to object): values that are not
+                stored in the array.
+
+        Args:
+            dmu_index (dict of str to int): maps DMU code to its index.
+            dtype (numpy.dtype, optional): type of values. Defaults to
+                numpy.float64.
+            missing (int or double, optional): value of the array for DMUs
+                without a value. Defaults to NaN.
+    '''
+    __slots__ = ('dmu_index', 'array', 'missing', '_other_values')
+
+    def __init__(self, dmu_index, dtype=numpy.float64, missing=numpy.nan):
+        self.dmu_index = dmu_index
+        self.array = numpy.full(len(dmu_index), missing, dtype=dtype)
+        self.missing = missing
+        self._other_values = dict()
+
+    def _is_missing(self, value):
+        # NaN is the only value that is not equal to itself
+        return value != value or value == self.missing
+
+    def _get_missing_mask(self):
+        ''' Returns True for array elements without a value.
+
+            Returns:
+                numpy.ndarray: boolean mask of the array.
+        '''
+        if self.array.dtype.kind == 'f':
+            return numpy.isnan(self.array)
+        return self.array == self.missing
+
+    def _can_store(self, value):
+        ''' Checks if a given value can be stored in the array.
+
+            Args:
+                value (object): value.
+
+            Returns:
+                bool: True if value can be stored in the array,
+                    False otherwise.
+        '''
+        if self.array.dtype.kind == 'f':
+            return isinstance(value, numbers.Real) and value == value
+        if not isinstance(value, numbers.Integral):
+            return False
+        limits = numpy.iinfo(self.array.dtype)
+        return limits.min <= value <= limits.max and value != self.missing
+
+    def __getitem__(self, dmu_code):
+        index = self.dmu_index.get(dmu_code, None)
+        if index is not None and index < len(self.array):
+            value = self.array.item(index)
+            if not self._is_missing(value):
+                return value
+        return self._other_values[dmu_code]
+
+    def __setitem__(self, dmu_code, value):
+        index = _get_index(self.dmu_index, dmu_code)
+        if index >= len(self.array):
+            array = numpy.full(_get_capacity(index + 1, len(self.array)),
+                               self.missing, dtype=self.array.dtype)
+            array[:len(self.array)] = self.array
+            self.array = array
+        if self._can_store(value):
+            self.array[index] = value
+            self._other_values.pop(dmu_code, None)
+        else:
+            self.array[index] = self.missing
+            self._other_values[dmu_code] = value
+
+    def __delitem__(self, dmu_code):
+        if dmu_code not in self:
+            raise KeyError(dmu_code)
+        if self._other_values.pop(dmu_code, None) is None:
+            self.array[self.dmu_index[dmu_code]] = self.missing
+
+    def __iter__(self):
+        # keys of the index are stored in the order of their indices
+        dmu_codes = list(self.dmu_index)
+        for index in numpy.flatnonzero(~self._get_missing_mask()).tolist():
+            yield dmu_codes[index]
+        yield from list(self._other_values)
+
+    def __len__(self):
+        return (int(numpy.count_nonzero(~self._get_missing_mask())) +
+                len(self._other_values))
+
+    def get_values(self, dmu_codes):
+        ''' Returns values of given DMUs. Values kept outside of the
+            array are returned as missing.
+
+            Args:
+                dmu_codes (list of str): DMU codes.
+
+            Returns:
+                numpy.ndarray: new array with one value per DMU.
+
+            Raises:
+                KeyError: if some DMU does not have an index.
+        '''
+        indices = _get_indices(self.dmu_index, dmu_codes)
+        values = numpy.full(len(indices), self.missing, dtype=self.array.dtype)
+        stored = indices < len(self.array)
+        values[stored] = self.array[indices[stored]]
+        return values
+
+    def find(self, value):
+        ''' Returns DMUs that have a given value.
+
+            Args:
+                value (object): value.
+
+            Returns:
+                list of str: DMU codes in the order of their indices.
+        '''
+        if not self._can_store(value):
+            return [dmu_code for dmu_code, other_value in
+                    self._other_values.items() if other_value == value]
+        dmu_codes = list(self.dmu_index)
+        return [dmu_codes[index] for index in
+                numpy.flatnonzero(self.array == value).tolist()]
+
+
+class ResultRow(collections.abc.MutableMapping):
+    ''' Dictionary that maps category to value of one DMU, it is a view
+        of one row of :class:`ResultMatrix`.
+
+        Attributes:
+            matrix (ResultMatrix): matrix.
+            dmu_code (str): DMU code.
+
+        Args:
+            matrix (ResultMatrix): matrix.
+            dmu_code (str): DMU code.
+    '''
+    __slots__ = ('matrix', 'dmu_code')
+
+    def __init__(self, matrix, dmu_code):
+        self.matrix = matrix
+        self.dmu_code = dmu_code
+
+    def _get_row(self):
+        ''' Returns values of the row.
+
+            Returns:
+                numpy.ndarray: values of the row, it is empty if the row
+                    is not stored yet.
+        '''
+        index = self.matrix.dmu_index[self.dmu_code]
+        return self.matrix.array[index:index + 1].ravel()
+
+    def __getitem__(self, category):
+        return self.matrix.get_value(self.dmu_code, category)
+
+    def __setitem__(self, category, value):
+        self.matrix.set_value(self.dmu_code, category, value)
+
+    def __delitem__(self, category):
+        if category not in self:
+            raise KeyError(category)
+        self.matrix.set_value(self.dmu_code, category, numpy.nan)
+
+    def __iter__(self):
+        categories = list(self.matrix.category_index)
+        for column in numpy.flatnonzero(
+                ~numpy.isnan(self._get_row())).tolist():
+            yield categories[column]
+
+    def __len__(self):
+        return int(numpy.count_nonzero(~numpy.isnan(self._get_row())))
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class ResultMatrix(collections.abc.Mapping):
+    ''' Dictionary that maps DMU code to another dictionary that maps
+        category to value, e.g. dual variables of input categories.
+        Values are stored in a two-dimensional array with one row per DMU
+        index and one column per category, missing values are NaN.
+        Dictionary of every DMU is a :class:`ResultRow` view of the array.
+        Assigning a dictionary to a DMU replaces all its values.
+
+        Attributes:
+            dmu_index (dict of str to int): maps DMU code to its index,
+                it is shared by all containers of one solution.
+            category_index (dict of str to int): maps category to
+                column index.
+            array (numpy.ndarray): values with one row per DMU index and
+                one column per category, it might have more rows than
+                the number of DMUs.
+
+        Args:
+            dmu_index (dict of str to int): maps DMU code to its index.
+            categories (list of str, optional): initial categories.
+                Defaults to an empty tuple, other categories are added
+                when their first value is stored.
+    '''
+    __slots__ = ('dmu_index', 'category_index', 'array')
+
+    def __init__(self, dmu_index, categories=()):
+        self.dmu_index = dmu_index
+        self.category_index = dict((category, column) for column, category
+                                   in enumerate(categories))
+        self.array = numpy.full((len(dmu_index), len(self.category_index)),
+                                numpy.nan)
+
+    def __getitem__(self, dmu_code):
+        if dmu_code not in self.dmu_index:
+            raise KeyError(dmu_code)
+        return ResultRow(self, dmu_code)
+
+    def __setitem__(self, dmu_code, values):
+        row = _get_index(self.dmu_index, dmu_code)
+        if row < len(self.array):
+            self.array[row] = numpy.nan
+        for category, value in values.items():
+            self.set_value(dmu_code, category, value)
+
+    def __iter__(self):
+        return iter(list(self.dmu_index))
+
+    def __len__(self):
+        return len(self.dmu_index)
+
+    def get_value(self, dmu_code, category):
+        ''' Returns value of a given DMU and category.
+
+            Args:
+                dmu_code (str): DMU code.
+                category (str): category.
+
+            Returns:
+                double: value.
+
+            Raises:
+                KeyError: if value is not stored.
+        '''
+        row = self.dmu_index[dmu_code]
+        column = self.category_index[category]
+        if row >= len(self.array):
+            raise KeyError(category)
+        value = self.array.item(row, column)
+        if value != value:
+            raise KeyError(category)
+        return value
+
+    def set_value(self, dmu_code, category, value):
+        ''' Stores value of a given DMU and category.
+
+            Args:
+                dmu_code (str): DMU code.
+                category (str): category.
+                value (double): value.
+        '''
+        row = _get_index(self.dmu_index, dmu_code)
+        column = _get_index(self.category_index, category)
+        self._reserve(row + 1, len(self.category_index))
+        self.array[row, column] = value
+
+    def _reserve(self, nb_rows, nb_columns):
+        ''' Makes sure that the array has at least given numbers of rows
+            and columns, new values are NaN.
+
+            Args:
+                nb_rows (int): number of rows.
+                nb_columns (int): number of columns.
+        '''
+        old_rows, old_columns = self.array.shape
+        if nb_rows <= old_rows and nb_columns <= old_columns:
+            return
+        array = numpy.full((_get_capacity(nb_rows, old_rows),
+                            max(nb_columns, old_columns)), numpy.nan)
+        array[:old_rows, :old_columns] = self.array
+        self.array = array
+
+    def get_values(self, dmu_codes, categories):
+        ''' Returns values of given DMUs and categories.
+
+            Args:
+                dmu_codes (list of str): DMU codes.
+                categories (list of str): categories.
+
+            Returns:
+                numpy.ndarray: new array with one row per DMU and one
+                    column per category, missing values are NaN.
+
+            Raises:
+                KeyError: if some DMU does not have an index.
+        '''
+        rows = _get_indices(self.dmu_index, dmu_codes)
+        values = numpy.full((len(rows), len(categories)), numpy.nan)
+        stored = rows < len(self.array)
+        for position, category in enumerate(categories):
+            column = self.category_index.get(category, None)
+            if column is not None:
+                values[stored, position] = self.array[rows[stored], column]
+        return values
+
+    def set_values(self, dmu_codes, categories, values):
+        ''' Stores values of given DMUs and categories.
+
+            Args:
+                dmu_codes (list of str): DMU codes.
+                categories (list of str): categories.
+                values (numpy.ndarray): array with one row per DMU and
+                    one column per category.
+        '''
+        for dmu_code in dmu_codes:
+            _get_index(self.dmu_index, dmu_code)
+        for category in categories:
+            _get_index(self.category_index, category)
+        self._reserve(len(self.dmu_index), len(self.category_index))
+        self.array[numpy.ix_(_get_indices(self.dmu_index, dmu_codes),
+                             _get_indices(self.category_index,
+                                          categories))] = values
+
+
+class DmuResults(object):
+    ''' Results of all DMUs of a solution. All containers share one
+        index of DMUs, so values of one DMU are stored at the same row
+        of all arrays.
+
+        Attributes:
+            dmu_index (dict of str to int): maps DMU code to its index.
+            efficiency_scores (ResultVector): efficiency scores.
+            lp_status (ResultVector): LP statuses stored as int8.
+            input_duals (ResultMatrix): dual variables of input categories.
+            output_duals (ResultMatrix): dual variables of output
+                categories.
+            vrs_duals (ResultVector): values of VRS variables.
+
+        Args:
+            dmu_codes (list of str, optional): DMU codes in the order of
+                their indices. Defaults to an empty tuple, other DMUs
+                get indices when their first value is stored.
+            input_categories (list of str, optional): input categories.
+                Defaults to an empty tuple.
+            output_categories (list of str, optional): output categories.
+                Defaults to an empty tuple.
+    '''
+    __slots__ = ('dmu_index', 'efficiency_scores', 'lp_status',
+                 'input_duals', 'output_duals', 'vrs_duals')
+
+    def __init__(self, dmu_codes=(), input_categories=(),
+                 output_categories=()):
+        self.dmu_index = dict((dmu_code, index) for index, dmu_code
+                              in enumerate(dmu_codes))
+        self.efficiency_scores = ResultVector(self.dmu_index)
+        self.lp_status = ResultVector(self.dmu_index, numpy.int8,
+                                      MISSING_STATUS)
+        self.input_duals = ResultMatrix(self.dmu_index, input_categories)
+        self.output_duals = ResultMatrix(self.dmu_index, output_categories)
+        self.vrs_duals = ResultVector(self.dmu_index)
@@ -1,5 +1,167 @@
 ''' This module contains a class for storing input data.
 '''
+import collections.abc
+import copy
+import math
+
+import numpy
+
+# capacity of the coefficient array when the first coefficient is added
+INITIAL_CAPACITY = 16
+
+
+class Coefficients(collections.abc.Mapping):
+    ''' Dictionary that maps DMU code and category to the corresponding
+        coefficient, e.g. {(DMU, category) : value}. Values are stored in
+        one contiguous two-dimensional array with one row per DMU and one
+        column per category, missing coefficients are stored as NaN.
+        Rows and columns are appended in the order in which DMUs and
+        categories are added, the array grows geometrically.
+
+        Attributes:
+            values (numpy.ndarray): array with one row per DMU and one column
+                per category, it is a view of _buffer.
+            dmu_index (dict of str to int): maps DMU code to row index.
+            category_index (dict of str to int): maps category to
+                column index.
+            _buffer (numpy.ndarray): array with spare rows and columns
+                that are used when new DMUs and categories are added.
+    '''
+    def __init__(self):
+        self._buffer = numpy.empty((0, 0))
+        self.values = self._buffer
+        self.dmu_index = dict()
+        self.category_index = dict()
+
+    def __getitem__(self, key):
+        dmu_code, category = key
+        try:
+            value = self.values.item(self.dmu_index[dmu_code],
+                                     self.category_index[category])
+        except KeyError:
+            raise KeyError(key)
+        if math.isnan(value):
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        dmu_code, category = key
+        row = self._get_index(self.dmu_index, dmu_code)
+        column = self._get_index(self.category_index, category)
+        if row >= self.values.shape[0] or column >= self.values.shape[1]:
+            self._resize(len(self.dmu_index), len(self.category_index))
+        self.values[row, column] = value
+
+    @staticmethod
+    def _get_index(index, key):
+        ''' Returns index of a given DMU or category, new index is assigned
+            if it does not have one yet.
+
+            Args:
+                index (dict of str to int): dmu_index or category_index.
+                key (str): DMU code or category.
+
+            Returns:
+                int: index of key.
+        '''
+        position = index.get(key, None)
+        if position is None:
+            position = len(index)
+            index[key] = position
+        return position
+
+    def __contains__(self, key):
+        try:
+            dmu_code, category = key
+            row = self.dmu_index[dmu_code]
+            column = self.category_index[category]
+        except (KeyError, TypeError, ValueError):
+            return False
+        return not math.isnan(self.values.item(row, column))
+
+    def __iter__(self):
+        # keys of both indexes are stored in the order of their indices
+        dmu_codes = list(self.dmu_index)
+        categories = list(self.category_index)
+        rows, columns = numpy.nonzero(~numpy.isnan(self.values))
+        for row, column in zip(rows.tolist(), columns.tolist()):
+            yield (dmu_codes[row], categories[column])
+
+    def __len__(self):
+        return int(numpy.count_nonzero(~numpy.isnan(self.values)))
+
+    def __getstate__(self):
+        # spare rows and columns are not pickled
+        state = self.__dict__.copy()
+        state['_buffer'] = self.values
+        return state
+
+    def _resize(self, nb_rows, nb_columns):
+        ''' Changes the shape of values to a given shape. The buffer is
+            reallocated with at least twice as many rows or columns if
+            it is too small, new coefficients are set to NaN.
+
+            Args:
+                nb_rows (int): number of rows.
+                nb_columns (int): number of columns.
+        '''
+        max_rows, max_columns = self._buffer.shape
+        if nb_rows > max_rows or nb_columns > max_columns:
+            if nb_rows > max_rows:
+                max_rows = max(nb_rows, 2 * max_rows, INITIAL_CAPACITY)
+            if nb_columns > max_columns:
+                max_columns = max(nb_columns, 2 * max_columns)
+            buffer = numpy.full((max_rows, max_columns), numpy.nan)
+            buffer[:self.values.shape[0],
+                   :self.values.shape[1]] = self.values
+            self._buffer = buffer
+        self.values = self._buffer[:nb_rows, :nb_columns]
+
+    def get_values(self, dmu_codes, categories):
+        ''' Returns coefficients of given DMUs and categories.
+
+            Args:
+                dmu_codes (list of str): DMU codes.
+                categories (list of str): categories.
+
+            Returns:
+                numpy.ndarray: new array with one row per DMU and one
+                    column per category.
+
+            Raises:
+                KeyError: if some coefficient is missing.
+        '''
+        try:
+            rows = numpy.fromiter(
+                (self.dmu_index[dmu_code] for dmu_code in dmu_codes),
+                dtype=numpy.intp, count=len(dmu_codes))
+            columns = numpy.fromiter(
+                (self.category_index[category] for category in categories),
+                dtype=numpy.intp, count=len(categories))
+        except KeyError as error:
+            raise KeyError(error.args[0])
+        values = self.values[numpy.ix_(rows, columns)]
+        missing = numpy.argwhere(numpy.isnan(values))
+        if len(missing) > 0:
+            row, column = missing[0]
+            raise KeyError((dmu_codes[row], categories[column]))
+        return values
+
+    def set_values(self, dmu_codes, categories, values):
+        ''' Stores coefficients of given DMUs and categories.
+
+            Args:
+                dmu_codes (list of str): DMU codes.
+                categories (list of str): categories.
+                values (numpy.ndarray): array with one row per DMU and one
+                    column per category.
+        '''
+        rows = [self._get_index(self.dmu_index, dmu_code)
+                for dmu_code in dmu_codes]
+        columns = [self._get_index(self.category_index, category)
+                   for category in categories]
+        self._resize(len(self.dmu_index), len(self.category_index))
+        self.values[numpy.ix_(rows, columns)] = values
 
 
 class InputData:
@@ -19,9 +181,11 @@ class InputData:
                 in the order they were added.
             categories (set of str): set of all categories (input and
                 output).
-            coefficients (dict of tuple of str, str to double}): dictionary
-                that maps internal DMU code and category to the
-                corresponding coefficient, e.g. {(DMU, category) : value}.
+            coefficients (Coefficients): dictionary that maps internal
+                DMU code and category to the corresponding coefficient,
+                e.g. {(DMU, category) : value}. Coefficients are stored
+                in a two-dimensional array, see get_values for
+                vectorised access.
             output_categories (set of str): set of output categories.
             input_categories (set of str): set of input categories.
             _count (int): internal variable used to generate DMU codes.
@@ -33,7 +197,7 @@ class InputData:
         # only in this class for adding new DMUs
         self.DMU_codes_in_added_order = []
         self.categories = set()  # all categories
-        self.coefficients = dict()
+        self.coefficients = Coefficients()
         self.output_categories = set()
         self.input_categories = set()
         self._count = 0
@@ -66,8 +230,7 @@ class InputData:
 
         key = (dmu_code, category_name)
         if key in self.coefficients:
-            raise KeyError('Pair ({dmu}, {category}) is already recorded'.
-                           format(dmu=dmu_code, category=category_name))
+            self._raise_recorded_pair(dmu_code, category_name)
 
         self.coefficients[key] = value
 
@@ -78,6 +241,84 @@ class InputData:
         self.DMU_code_to_user_name.setdefault(dmu_code, dmu_user_name)
         self.categories.add(category_name)
 
+    def add_coefficients(self, dmu_user_names, categories, values):
+        ''' Adds coefficients of several DMUs at once. DMU codes and
+            other containers are the same as if add_coefficient was called
+            for every DMU and category in the order of rows and columns,
+            but all values are copied to the coefficient array at once.
+
+            Args:
+                dmu_user_names (list of str): DMU names, one per row
+                    of values.
+                categories (list of str): categories, one per column
+                    of values.
+                values (numpy.ndarray or list of list of double):
+                    coefficients with one row per DMU and one column per
+                    category.
+
+            Raises:
+                KeyError: if a pair of DMU and category is given twice
+                    or has already been added before.
+        '''
+        values = numpy.asarray(values, dtype=numpy.float64).reshape(
+            len(dmu_user_names), len(categories))
+        if not categories or not dmu_user_names:
+            return
+        dmu_codes = []
+        for dmu_user_name in dmu_user_names:
+            # add_coefficient generates a new code for every coefficient
+            dmu_code = self._DMU_user_name_to_code.setdefault(
+                dmu_user_name, 'dmu_{index}'.format(index=self._count + 1))
+            self._count += len(categories)
+            dmu_codes.append(dmu_code)
+        self._check_new_coefficients(dmu_codes, categories)
+        self.coefficients.set_values(dmu_codes, categories, values)
+        for dmu_code, dmu_user_name in zip(dmu_codes, dmu_user_names):
+            if dmu_code not in self.DMU_codes:
+                self.DMU_codes_in_added_order.append(dmu_code)
+                self.DMU_codes.add(dmu_code)
+            self.DMU_code_to_user_name.setdefault(dmu_code, dmu_user_name)
+        self.categories.update(categories)
+
+    def _check_new_coefficients(self, dmu_codes, categories):
+        ''' Checks that coefficients of given DMUs and categories
+            can be added.
+
+            Args:
+                dmu_codes (list of str): DMU codes.
+                categories (list of str): categories.
+
+            Raises:
+                KeyError: if a pair of DMU and category is given twice
+                    or has already been added before.
+        '''
+        added_dmus = set()
+        for count, category in enumerate(categories):
+            if category in categories[:count]:
+                self._raise_recorded_pair(dmu_codes[0], category)
+        for dmu_code in dmu_codes:
+            if dmu_code in added_dmus:
+                self._raise_recorded_pair(dmu_code, categories[0])
+            added_dmus.add(dmu_code)
+            if dmu_code in self.coefficients.dmu_index:
+                for category in categories:
+                    if (dmu_code, category) in self.coefficients:
+                        self._raise_recorded_pair(dmu_code, category)
+
+    @staticmethod
+    def _raise_recorded_pair(dmu_code, category):
+        ''' Raises KeyError about a coefficient that is already recorded.
+
+            Args:
+                dmu_code (str): DMU code.
+                category (str): category.
+
+            Raises:
+                KeyError: always.
+        '''
+        raise KeyError('Pair ({dmu}, {category}) is already recorded'.
+                       format(dmu=dmu_code, category=category))
+
     def _generate_next_DMU_code(self):
         ''' Generates a code for new DMU in the following format: {dmu_number}.
 
@@ -150,6 +391,84 @@ class InputData:
             raise KeyError('{category} is not present in categories list'.
                            format(category=category_name))
 
+    def create_view(self):
+        ''' Returns a copy of input data that shares coefficients,
+            DMU names and categories with this object, but has its own
+            set of DMU codes. Some models change DMU codes of input data
+            while they are solved, e.g. peel the onion and models with
+            categorical DMUs, so models that are solved concurrently
+            must use different views of the same data.
+
+            Returns:
+                InputData: view of input data.
+        '''
+        view = copy.copy(self)
+        view.DMU_codes = set(self.DMU_codes)
+        return view
+
+    def get_values(self, categories, dmu_codes=None):
+        ''' Returns coefficients of given categories as a matrix.
+
+            Args:
+                categories (list of str): categories in the order of
+                    columns.
+                dmu_codes (list of str, optional): DMU codes in the order
+                    of rows. Defaults to None, in this case
+                    DMU_codes_in_added_order is used.
+
+            Returns:
+                numpy.ndarray: new array with one row per DMU and one
+                    column per category.
+
+            Raises:
+                KeyError: if some coefficient is missing.
+        '''
+        if dmu_codes is None:
+            dmu_codes = self.DMU_codes_in_added_order
+        return self.coefficients.get_values(list(dmu_codes),
+                                            list(categories))
+
+    def get_input_matrix(self, dmu_codes=None):
+        ''' Returns inputs of given DMUs with one column per input
+            category, categories are sorted by name.
+
+            Args:
+                dmu_codes (list of str, optional): DMU codes in the order
+                    of rows. Defaults to None, in this case
+                    DMU_codes_in_added_order is used.
+
+            Returns:
+                numpy.ndarray: new array with one row per DMU.
+        '''
+        return self.get_values(sorted(self.input_categories), dmu_codes)
+
+    def get_output_matrix(self, dmu_codes=None):
+        ''' Returns outputs of given DMUs with one column per output
+            category, categories are sorted by name.
+
+            Args:
+                dmu_codes (list of str, optional): DMU codes in the order
+                    of rows. Defaults to None, in this case
+                    DMU_codes_in_added_order is used.
+
+            Returns:
+                numpy.ndarray: new array with one row per DMU.
+        '''
+        return self.get_values(sorted(self.output_categories), dmu_codes)
+
+    def get_dmu_row(self, dmu_code, categories):
+        ''' Returns coefficients of a given DMU.
+
+            Args:
+                dmu_code (str): DMU code.
+                categories (list of str): categories.
+
+            Returns:
+                numpy.ndarray: one-dimensional array with one value per
+                    category.
+        '''
+        return self.get_values(categories, [dmu_code])[0]
+
     def print_coefficients(self):
         ''' Prints all coefficients on the screen.
         '''
@@ -0,0 +1,243 @@
+''' This module contains a class that stores lambda variables of all DMUs
+    of a solution as one sparse matrix.
+
+    Attributes:
+        ENTRY_TYPE (numpy.dtype): type of matrix entries, every entry stores
+            column (index of DMU of the reference set) and value of the
+            lambda variable.
+        INITIAL_CAPACITY (int): number of entries allocated when the first
+            row is added.
+'''
+import os
+import tempfile
+import weakref
+
+import numpy
+
+ENTRY_TYPE = numpy.dtype([('column', numpy.int64), ('value', numpy.float64)])
+INITIAL_CAPACITY = 256
+
+
+def _remove_file(file_name):
+    ''' Removes a given file if it exists.
+
+        Args:
+            file_name (str): file name.
+    '''
+    if os.path.exists(file_name):
+        os.remove(file_name)
+
+
+class LambdaMatrix(object):
+    ''' Sparse matrix of lambda variables in compressed sparse row format.
+        Row of a DMU stores lambda variables computed for this DMU,
+        columns correspond to DMUs of the reference set. Rows and columns
+        are indexed by DMU indices assigned in the order in which DMUs
+        appear. Entries of all rows are stored in one array, rows are
+        appended to it in the order in which they are added. If a row is
+        added again, it replaces the previous one, whose entries are not
+        used anymore.
+
+        If a file is used, entries are stored in a memory-mapped temporary
+        file instead of memory. The file grows together with the matrix
+        and is removed when the matrix is closed or garbage collected.
+        A pickled matrix is always restored in memory.
+
+        Attributes:
+            dmu_codes (list of str): DMU codes in the order of their
+                indices.
+            dmu_index (dict of str to int): maps DMU code to its index.
+            row_starts (numpy.ndarray): index of the first entry of every
+                row, -1 if the row was not added.
+            row_ends (numpy.ndarray): index after the last entry of every
+                row.
+            nb_entries (int): number of used entries.
+            file_name (str): name of the memory-mapped file or None if
+                entries are stored in memory.
+            _entries (numpy.ndarray or numpy.memmap): entries of all rows.
+            _finalizer (weakref.finalize): removes the file when the matrix
+                is garbage collected, None if file is not used.
+
+        Args:
+            use_file (bool, optional): if True, entries are stored in a
+                memory-mapped file. Defaults to False.
+            directory (str, optional): directory of the memory-mapped file.
+                Defaults to None, i.e. the default temporary directory
+                is used.
+    '''
+    def __init__(self, use_file=False, directory=None):
+        self.dmu_codes = []
+        self.dmu_index = dict()
+        self.row_starts = numpy.full(INITIAL_CAPACITY, -1, dtype=numpy.int64)
+        self.row_ends = numpy.zeros(INITIAL_CAPACITY, dtype=numpy.int64)
+        self.nb_entries = 0
+        self.file_name = None
+        self._finalizer = None
+        if use_file:
+            file_descriptor, self.file_name = tempfile.mkstemp(
+                prefix='lambda', suffix='.dat', dir=directory)
+            os.close(file_descriptor)
+            self._finalizer = weakref.finalize(self, _remove_file,
+                                               self.file_name)
+            self._entries = self._map_file(INITIAL_CAPACITY)
+        else:
+            self._entries = numpy.empty(INITIAL_CAPACITY, dtype=ENTRY_TYPE)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_entries'] = numpy.array(self._entries[:self.nb_entries])
+        state['file_name'] = None
+        state['_finalizer'] = None
+        return state
+
+    def __contains__(self, dmu_code):
+        index = self.dmu_index.get(dmu_code, None)
+        return index is not None and self.row_starts[index] >= 0
+
+    def _map_file(self, capacity):
+        ''' Resizes the file to a given number of entries and maps it
+            to memory.
+
+            Args:
+                capacity (int): number of entries.
+
+            Returns:
+                numpy.memmap: entries stored in the file.
+        '''
+        with open(self.file_name, 'r+b') as f:
+            f.truncate(capacity * ENTRY_TYPE.itemsize)
+        return numpy.memmap(self.file_name, dtype=ENTRY_TYPE, mode='r+',
+                            shape=(capacity,))
+
+    def _get_index(self, dmu_code):
+        ''' Returns index of a given DMU, new index is assigned
+            if DMU does not have one yet.
+
+            Args:
+                dmu_code (str): DMU code.
+
+            Returns:
+                int: index of DMU.
+        '''
+        index = self.dmu_index.get(dmu_code, None)
+        if index is None:
+            index = len(self.dmu_codes)
+            self.dmu_index[dmu_code] = index
+            self.dmu_codes.append(dmu_code)
+            if index >= len(self.row_starts):
+                extra = len(self.row_starts)
+                self.row_starts = numpy.concatenate((
+                    self.row_starts,
+                    numpy.full(extra, -1, dtype=numpy.int64)))
+                self.row_ends = numpy.concatenate((
+                    self.row_ends, numpy.zeros(extra, dtype=numpy.int64)))
+        return index
+
+    def _reserve(self, nb_entries):
+        ''' Makes sure that a given number of entries can be appended,
+            capacity of the entries is at least doubled if it is too small.
+
+            Args:
+                nb_entries (int): number of entries that will be appended.
+        '''
+        required = self.nb_entries + nb_entries
+        capacity = len(self._entries)
+        if required <= capacity:
+            return
+        capacity = max(required, 2 * capacity)
+        if self.file_name is not None:
+            self._entries.flush()
+            self._entries = None
+            self._entries = self._map_file(capacity)
+        else:
+            entries = numpy.empty(capacity, dtype=ENTRY_TYPE)
+            entries[:self.nb_entries] = self._entries[:self.nb_entries]
+            self._entries = entries
+
+    def set_row(self, dmu_code, variables):
+        ''' Stores lambda variables of a given DMU.
+
+            Args:
+                dmu_code (str): DMU code.
+                variables (dict of str to double): dictionary that maps
+                    DMU codes to the corresponding value of lambda variables.
+        '''
+        row = self._get_index(dmu_code)
+        nb_entries = len(variables)
+        self._reserve(nb_entries)
+        start = self.nb_entries
+        end = start + nb_entries
+        if nb_entries > 0:
+            entries = self._entries[start:end]
+            entries['column'] = [self._get_index(column)
+                                 for column in variables.keys()]
+            entries['value'] = list(variables.values())
+        self.row_starts[row] = start
+        self.row_ends[row] = end
+        self.nb_entries = end
+
+    def _get_entries(self, dmu_code):
+        ''' Returns entries of a given row.
+
+            Args:
+                dmu_code (str): DMU code.
+
+            Returns:
+                numpy.ndarray: entries of the row.
+
+            Raises:
+                KeyError: if lambda variables of DMU were not added.
+        '''
+        row = self.dmu_index.get(dmu_code, None)
+        if row is None or self.row_starts[row] < 0:
+            raise KeyError(dmu_code)
+        return self._entries[self.row_starts[row]:self.row_ends[row]]
+
+    def get_row(self, dmu_code):
+        ''' Returns lambda variables of a given DMU.
+
+            Args:
+                dmu_code (str): DMU code.
+
+            Returns:
+                dict of str to double: dictionary that maps DMU codes to
+                    the corresponding value of lambda variables, it
+                    contains DMUs in the order in which they were added.
+
+            Raises:
+                KeyError: if lambda variables of DMU were not added.
+        '''
+        entries = self._get_entries(dmu_code)
+        dmu_codes = self.dmu_codes
+        return dict((dmu_codes[column], value) for column, value in zip(
+            entries['column'].tolist(), entries['value'].tolist()))
+
+    def get_value(self, dmu_code, column_dmu_code):
+        ''' Returns one lambda variable of a given DMU.
+
+            Args:
+                dmu_code (str): DMU code.
+                column_dmu_code (str): DMU code of the lambda variable.
+
+            Returns:
+                double: value of the lambda variable, 0 if it is not stored.
+
+            Raises:
+                KeyError: if lambda variables of DMU were not added.
+        '''
+        entries = self._get_entries(dmu_code)
+        column = self.dmu_index.get(column_dmu_code, None)
+        if column is None:
+            return 0
+        positions = numpy.flatnonzero(entries['column'] == column)
+        if len(positions) == 0:
+            return 0
+        return float(entries['value'][positions[0]])
+
+    def close(self):
+        ''' Removes the memory-mapped file. The matrix must not be used
+            afterwards. Does nothing if entries are stored in memory.
+        '''
+        if self.file_name is not None:
+            self._entries = None
+            self._finalizer()
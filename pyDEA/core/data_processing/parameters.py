@@ -34,7 +34,14 @@ VALID_PARAM_NAMES = ['DATA_FILE', 'INPUT_CATEGORIES', 'OUTPUT_CATEGORIES',
                      'ABS_WEIGHT_RESTRICTIONS', 'VIRTUAL_WEIGHT_RESTRICTIONS',
                      'PRICE_RATIO_RESTRICTIONS', 'MAXIMIZE_SLACKS',
                      'MULTIPLIER_MODEL_TOLERANCE', 'OUTPUT_FILE',
-                     'CATEGORICAL_CATEGORY', 'PEEL_THE_ONION']
+                     'CATEGORICAL_CATEGORY', 'PEEL_THE_ONION', 'LP_ENGINE',
+                     'DMU_ORDER', 'NUM_WORKERS', 'FRONTIER_FIRST',
+                     'DOMINANCE_FILTER', 'RESTRICTED_BASIS',
+                     'CONCURRENT_MODELS', 'DERIVE_OUTPUT_ORIENTATION',
+                     'SOLVER', 'SOLVER_THREADS', 'SOLVER_TOLERANCE',
+                     'SOLVER_TIME_LIMIT', 'DMU_TIME_LIMIT', 'RUN_TIME_LIMIT',
+                     'LAMBDA_STORAGE', 'DATA_CACHE',
+                     'DATA_QUERY']
 
 CATEGORICAL_AND_DATA_FIELDS = ['DATA_FILE', 'INPUT_CATEGORIES',
                                'OUTPUT_CATEGORIES',
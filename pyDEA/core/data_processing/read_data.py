@@ -1,17 +1,27 @@
 ''' This module contains functions and classes responsible for reading
-    input data from xlsx and csv files.
+    input data from xlsx and csv files. Readers of columnar files
+    (Parquet, Feather and npz) are in module columnar_reader, reader of
+    SQLite databases is in module sqlite_reader.
 '''
 
 import openpyxl
+from openpyxl.cell.read_only import EMPTY_CELL
 import csv
 import os
 from collections import OrderedDict
 
+import numpy
+
+from pyDEA.core.data_processing.columnar_reader import FeatherReader
+from pyDEA.core.data_processing.columnar_reader import NPZReader
+from pyDEA.core.data_processing.columnar_reader import ParquetReader
 from pyDEA.core.data_processing.input_data import InputData
+from pyDEA.core.data_processing.sqlite_reader import SQLITE_EXTENSIONS
+from pyDEA.core.data_processing.sqlite_reader import SQLiteReader
 from pyDEA.core.utils.dea_utils import is_valid_coeff, NOT_VALID_COEFF
 
 
-def read_data(file_name, sheet_name=''):
+def read_data(file_name, sheet_name='', query=''):
     ''' Reads data from a given file.
 
         Args:
@@ -19,6 +29,12 @@ def read_data(file_name, sheet_name=''):
             sheet_name (str, optional): name of the excel sheet
                 where data is stored. Defaults to empty string.
                 If it is not given, data is read from the first sheet.
+                For SQLite databases it is the name of the table,
+                if it is not given, data is read from the first table.
+                It is ignored for all other file formats.
+            query (str, optional): table name or SELECT query used to
+                read data from SQLite database instead of sheet_name.
+                Defaults to empty string.
 
         Returns:
             tuple of list of str, list of str, str, str:
@@ -40,9 +56,22 @@ def read_data(file_name, sheet_name=''):
         reader = XLSXReader()
     elif extension == '.csv':
         reader = CSVReader()
+    elif extension == '.parquet':
+        reader = ParquetReader()
+    elif extension == '.feather':
+        reader = FeatherReader()
+    elif extension == '.npz':
+        reader = NPZReader()
+    elif extension in SQLITE_EXTENSIONS:
+        reader = SQLiteReader(query)
     else:
         raise ValueError('{0} format is not supported'.format(extension))
     reader.open_file(file_name, sheet_name)
+    table = reader.get_table()
+    if table is not None:
+        categories, coefficients, dmu_name = table
+        reader.close_file()
+        return categories, coefficients, dmu_name, reader.get_sheet_name()
     categories = []
     coefficients = []
     first_non_empty_row = True
@@ -145,9 +174,8 @@ def construct_input_data_instance(categories, coefficients):
             InputData: constructed instance.
     '''
     input_data = InputData()
-    for (dmu, list_of_coefficients) in coefficients.items():
-        for count, coeff in enumerate(list_of_coefficients):
-            input_data.add_coefficient(dmu, categories[count], coeff)
+    input_data.add_coefficients(list(coefficients.keys()), categories,
+                                list(coefficients.values()))
 
     return input_data
 
@@ -267,12 +295,18 @@ def find_first_non_empty_col(reader, row):
 
 class XLSXReader(object):
     ''' This class implements parsing of input data from xlsx files.
+        The workbook is opened in read-only mode, rows are parsed one
+        at a time while they are iterated, so cells of the whole sheet
+        are never kept in memory.
 
         Attributes:
-            open_sheet (openpyxl.worksheet.worksheet.Worksheet): open sheet where data is stored.
+            book (openpyxl.workbook.workbook.Workbook): open workbook.
+            open_sheet (openpyxl.worksheet._read_only.ReadOnlyWorksheet):
+                open sheet where data is stored.
 
     '''
     def __init__(self):
+        self.book = None
         self.open_sheet = None
 
     def open_file(self, file_name, sheet_name):
@@ -282,13 +316,25 @@ class XLSXReader(object):
                 file_name (str): path to file with input data.
                 sheet_name (str): sheet name.
         '''
-        book = openpyxl.load_workbook(file_name, data_only = True)
+        self.book = openpyxl.load_workbook(file_name, read_only=True,
+                                           data_only=True)
         if sheet_name:
-            sheet = book[sheet_name]
+            sheet = self.book[sheet_name]
         else:
-            sheet = book[book.sheetnames[0]] #first sheet
+            sheet = self.book[self.book.sheetnames[0]] #first sheet
+        # dimensions stored in the file might be wrong, without them
+        # rows end at their last non-empty cell
+        sheet.reset_dimensions()
         self.open_sheet = sheet
 
+    def get_table(self):
+        ''' Rows of xlsx files are always parsed one by one.
+
+            Returns:
+                None: always returns None.
+        '''
+        return None
+
     def get_sheet_name(self):
         ''' Returns opened sheet name.
 
@@ -310,18 +356,26 @@ class XLSXReader(object):
         return self.open_sheet.cell(row+1, column+1).value
 
     def get_rows(self):
-        ''' Returns a list of rows.
+        ''' Returns a generator of rows, every row is read from the file
+            when the generator reaches it. Streamed rows end at their
+            last non-empty cell, so they are padded with empty cells
+            to the length of the longest previous row, as rows of a sheet
+            with known dimensions.
 
             Returns:
-                list of list of openpyxl.cell.cell.Cell: list of rows.
+                generator of tuple of openpyxl.cell.read_only.ReadOnlyCell:
+                    rows of the sheet.
         '''
-        return [list(i) for i in self.open_sheet.rows]
+        nb_columns = 0
+        for row in self.open_sheet.iter_rows():
+            nb_columns = max(nb_columns, len(row))
+            yield row + (EMPTY_CELL,) * (nb_columns - len(row))
 
     def cell_is_not_empty(self, cell):
         ''' Checks if a given cell has non-empty value.
 
             Args:
-                cell (openpyxl.cell.cell.Cell): cell.
+                cell (openpyxl.cell.read_only.ReadOnlyCell): cell.
 
             Returns:
                 bool: True if cell has non-empty value, False otherwise.
@@ -332,7 +386,7 @@ class XLSXReader(object):
         ''' Checks if a given cell has blank value.
 
             Args:
-                cell (openpyxl.cell.cell.Cell): cell.
+                cell (openpyxl.cell.read_only.ReadOnlyCell): cell.
 
             Returns:
                 bool: True if cell is not error type.
@@ -343,7 +397,7 @@ class XLSXReader(object):
         ''' Checks if a given cell contain valid text.
 
             Args:
-                cell (openpyxl.cell.cell.Cell): cell.
+                cell (openpyxl.cell.read_only.ReadOnlyCell): cell.
 
             Returns:
                 bool: True if cell contain valid text, False otherwise.
@@ -354,7 +408,7 @@ class XLSXReader(object):
         ''' Checks if a given cell contain text.
 
             Args:
-                cell (openpyxl.cell.cell.Cell): cell.
+                cell (openpyxl.cell.read_only.ReadOnlyCell): cell.
 
             Returns:
                 bool: True if cell contain text, False otherwise.
@@ -365,7 +419,7 @@ class XLSXReader(object):
         ''' Returns cell content.
 
             Args:
-                cell (openpyxl.cell.cell.Cell): cell.
+                cell (openpyxl.cell.read_only.ReadOnlyCell): cell.
 
             Returns:
                 cell content (type depends on what is stored in the cell).
@@ -375,18 +429,44 @@ class XLSXReader(object):
     def close_file(self):
         ''' Closes file if necessary.
         '''
-        pass
+        if self.book is not None:
+            self.book.close()
+            self.book = None
 
 
 class CSVReader(object):
     ''' This class implements parsing of input data from csv files.
 
+        Files are parsed in chunks of CHUNK_SIZE rows. If a file is a table
+        whose first non-empty row contains categories and all other rows
+        contain a DMU name followed by numbers, DMU names are kept in a list
+        and numbers in a two-dimensional array of doubles. Columns before
+        the column of DMU names must be empty, empty rows at the end of
+        the table are ignored. All other files are kept as rows of strings.
+        In both cases every cell can be accessed in constant time.
+
         Attributes:
-            rows (list of list of str): list of rows with input data.
+            CHUNK_SIZE (int): number of rows converted to numbers at once.
+            rows (list of list of str): list of rows with input data,
+                empty if the file is stored as a table.
+            nb_empty_rows (int): number of empty rows before the header
+                of the table.
+            header (list of str): header of the table.
+            first_column (int): index of the column of DMU names.
+            dmu_names (list of str): DMU names of the table.
+            values (numpy.ndarray): numbers of the table, one row per DMU,
+                None if the file is not stored as a table.
             file_ref (file): file reference.
     '''
+    CHUNK_SIZE = 10000
+
     def __init__(self):
         self.rows = []
+        self.nb_empty_rows = 0
+        self.header = None
+        self.first_column = 0
+        self.dmu_names = []
+        self.values = None
         self.file_ref = None
 
     def open_file(self, file_name, sheet_name):
@@ -397,10 +477,111 @@ class CSVReader(object):
                 sheet_name (str): sheet name.
         '''
         self.file_ref = open(file_name, 'r')
-        rows = csv.reader(self.file_ref)
         self.rows.clear()
-        for row in rows:
-            self.rows.append(row)
+        self.values = self._read_table()
+        if self.values is None:
+            self.header = None
+            self.dmu_names = []
+            self.file_ref.seek(0)
+            self.rows.extend(csv.reader(self.file_ref))
+
+    def _read_table(self):
+        ''' Reads the file as a table of DMU names and numbers.
+
+            Returns:
+                numpy.ndarray: numbers of the table or None if the file is
+                    not a table, then the file must be read again.
+        '''
+        self.nb_empty_rows = 0
+        self.header = None
+        self.dmu_names = []
+        chunks = []
+        numbers = []
+        nb_columns = 0
+        reached_end = False
+        for row in csv.reader(self.file_ref):
+            if not any(row):
+                if self.header is None:
+                    self.nb_empty_rows += 1
+                else:
+                    reached_end = True
+                continue
+            if self.header is None:
+                self.header = row
+                continue
+            if not self.dmu_names:
+                self.first_column = next(count for count, cell in
+                                         enumerate(row) if cell)
+                nb_columns = len(self.header) - self.first_column - 1
+                if not self._is_valid_header():
+                    return None
+            first_column = self.first_column
+            if (reached_end or len(row) != len(self.header) or
+                    not row[first_column].strip() or
+                    any(row[:first_column])):
+                return None
+            self.dmu_names.append(row[first_column])
+            numbers.append(row[first_column + 1:])
+            # the first row is converted alone, so files that are not
+            # tables are recognised before the first chunk is read
+            if len(numbers) == self.CHUNK_SIZE or not chunks:
+                chunks.append(self._convert(numbers, nb_columns))
+                numbers = []
+                if chunks[-1] is None:
+                    return None
+        if numbers:
+            chunks.append(self._convert(numbers, nb_columns))
+            if chunks[-1] is None:
+                return None
+        if not chunks:
+            return None
+        return numpy.concatenate(chunks)
+
+    def _is_valid_header(self):
+        ''' Checks if the header of the table has only empty cells
+            before the column of DMU names and only categories after it.
+
+            Returns:
+                bool: True if the header is valid, False otherwise.
+        '''
+        return (not any(self.header[:self.first_column]) and
+                all(cell.strip() for cell in
+                    self.header[self.first_column + 1:]))
+
+    @staticmethod
+    def _convert(numbers, nb_columns):
+        ''' Converts cells of several rows to numbers.
+
+            Args:
+                numbers (list of list of str): cells.
+                nb_columns (int): number of cells in every row.
+
+            Returns:
+                numpy.ndarray: numbers or None if some cell is not a number.
+        '''
+        if nb_columns == 0:
+            return None
+        try:
+            return numpy.array(numbers, dtype=numpy.float64)
+        except ValueError:
+            return None
+
+    def get_table(self):
+        ''' Returns data of the table without parsing cells one by one.
+
+            Returns:
+                tuple of list of str, list of list, str: categories, list
+                    where every element contains DMU name followed by
+                    coefficients and name of all DMUs, see read_data.
+                    None is returned if the file is not stored as a table.
+        '''
+        if self.values is None:
+            return None
+        categories = [category.strip() for category in
+                      self.header[self.first_column + 1:]]
+        coefficients = [[dmu_name.strip()] + values for dmu_name, values in
+                        zip(self.dmu_names, self.values.tolist())]
+        return categories, coefficients, self.header[self.first_column]
 
     def get_sheet_name(self):
         ''' Since csv files do not support sheets, always returns empty string.
@@ -420,21 +601,47 @@ class CSVReader(object):
             Returns:
                 str: cell value.
         '''
-        count = 0
-        for row in self.rows:
-            if count == row_index:
-                assert column < len(row)
-                return row[column]
-            count += 1
-        return ''
+        if self.values is None:
+            if row_index >= len(self.rows):
+                return ''
+            row = self.rows[row_index]
+            assert column < len(row)
+            return row[column]
+        row_index -= self.nb_empty_rows
+        if row_index < 0 or row_index > len(self.dmu_names):
+            return ''
+        if row_index == 0:
+            return self.header[column]
+        column -= self.first_column
+        if column < 0:
+            return ''
+        if column == 0:
+            return self.dmu_names[row_index - 1]
+        return repr(self.values.item(row_index - 1, column - 1))
 
     def get_rows(self):
-        ''' Returns a list of rows.
+        ''' Returns rows of the file. Numbers of a table are converted
+            back to strings while rows are iterated.
 
             Returns:
-                list of list of str: list of rows.
+                list or generator of list of str: rows.
+        '''
+        if self.values is None:
+            return self.rows
+        return self._generate_table_rows()
+
+    def _generate_table_rows(self):
+        ''' Generates rows of the table.
+
+            Yields:
+                list of str: row.
         '''
-        return self.rows
+        for count in range(self.nb_empty_rows):
+            yield []
+        yield self.header
+        empty_cells = [''] * self.first_column
+        for dmu_name, values in zip(self.dmu_names, self.values.tolist()):
+            yield empty_cells + [dmu_name] + [repr(value) for value in values]
 
     def cell_is_not_empty(self, cell):
         ''' Checks if a given cell has non-empty value.
@@ -0,0 +1,125 @@
+''' This module contains classes that publish coefficients of input data
+    in shared memory, so that worker processes can access them without
+    receiving a copy.
+
+    Coefficients are stored as one contiguous block of doubles with one row
+    per DMU and one column per category. If module
+    multiprocessing.shared_memory is not available (Python older than 3.8),
+    the block is stored in a temporary memory-mapped file instead.
+'''
+import os
+import tempfile
+
+import numpy
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+from pyDEA.core.data_processing.input_data import Coefficients, InputData
+
+
+class SharedCoefficients(Coefficients):
+    ''' Read-only dictionary of coefficients whose values are stored
+        in a block shared between processes (see Coefficients).
+
+        Args:
+            values (numpy.ndarray): array with one row per DMU and one column
+                per category.
+            dmu_codes (list of str): DMU codes in the order of rows.
+            categories (list of str): categories in the order of columns.
+    '''
+    def __init__(self, values, dmu_codes, categories):
+        self._buffer = values
+        self.values = values
+        self.dmu_index = dict((dmu_code, index) for index, dmu_code
+                              in enumerate(dmu_codes))
+        self.category_index = dict((category, index) for index, category
+                                   in enumerate(categories))
+
+    def __setitem__(self, key, value):
+        raise TypeError('Shared coefficients cannot be changed')
+
+
+class SharedInputData(object):
+    ''' Publishes coefficients of given input data in shared memory.
+        The block must be released with close when it is not needed
+        anymore.
+
+        Attributes:
+            handle (dict): picklable description of the block, it is
+                passed to attach_input_data in worker processes.
+            nbytes (int): size of the block in bytes.
+            _memory (SharedMemory): shared memory block or None if
+                memory-mapped file is used.
+            _values (numpy.ndarray): array stored in the block.
+
+        Args:
+            input_data (InputData): object that stores input data.
+    '''
+    def __init__(self, input_data):
+        coefficients = input_data.coefficients
+        dmu_codes = list(coefficients.dmu_index)
+        categories = list(coefficients.category_index)
+        shape = (len(dmu_codes), len(categories))
+        self.nbytes = shape[0] * shape[1] * numpy.dtype(numpy.float64).itemsize
+        metadata = dict((name, value) for name, value
+                        in input_data.__dict__.items()
+                        if name != 'coefficients')
+        self.handle = {'shape': shape, 'dmu_codes': dmu_codes,
+                       'categories': categories, 'metadata': metadata}
+        if shared_memory is not None:
+            self._memory = shared_memory.SharedMemory(
+                create=True, size=max(self.nbytes, 1))
+            self._values = numpy.ndarray(shape, dtype=numpy.float64,
+                                         buffer=self._memory.buf)
+            self.handle['name'] = self._memory.name
+        else:
+            self._memory = None
+            file_descriptor, file_name = tempfile.mkstemp(suffix='.npy')
+            os.close(file_descriptor)
+            self._values = numpy.lib.format.open_memmap(
+                file_name, mode='w+', dtype=numpy.float64, shape=shape)
+            self.handle['file_name'] = file_name
+        self._values[:] = coefficients.values
+        if self._memory is None:
+            self._values.flush()
+
+    def close(self):
+        ''' Releases the block. Worker processes must not use it
+            afterwards.
+        '''
+        self._values = None
+        if self._memory is not None:
+            self._memory.close()
+            self._memory.unlink()
+        else:
+            os.remove(self.handle['file_name'])
+
+
+def attach_input_data(handle):
+    ''' Creates input data whose coefficients are read directly
+        from the block published by SharedInputData.
+
+        Args:
+            handle (dict): handle of the block (SharedInputData.handle).
+
+        Returns:
+            tuple of InputData, object: input data and an object that
+                keeps the block open. It must be kept alive as long as
+                input data is used.
+    '''
+    if 'name' in handle:
+        block = shared_memory.SharedMemory(name=handle['name'])
+        values = numpy.ndarray(handle['shape'], dtype=numpy.float64,
+                               buffer=block.buf)
+    else:
+        values = numpy.load(handle['file_name'], mmap_mode='r')
+        block = values
+    values.flags.writeable = False
+    input_data = InputData()
+    input_data.__dict__.update(handle['metadata'])
+    input_data.coefficients = SharedCoefficients(
+        values, handle['dmu_codes'], handle['categories'])
+    return input_data, block
@@ -2,62 +2,107 @@
     objects for storing solutions.
 
     Attributes:
-        _solution_id (int): global variable used for generating
-            solution IDs.
+        LP_STATUS_TIME_LIMIT (int): LP status of DMUs whose linear programs
+            were stopped by a time limit or were not solved, since the time
+            limit of the run was reached. It is not one of pulp statuses.
 '''
 
 from pulp import LpStatus, LpStatusOptimal
-import pickle
-import os
 
-from pyDEA.core.utils.dea_utils import is_efficient, TMP_FOLDER
+from pyDEA.core.data_processing.dmu_results import DmuResults
+from pyDEA.core.data_processing.lambda_matrix import LambdaMatrix
+from pyDEA.core.utils.dea_utils import is_efficient
 
-_solution_id = 0
+LP_STATUS_TIME_LIMIT = -10
+
+
+def get_lp_status_name(lp_status):
+    ''' Returns name of a given LP status that is written to output.
+
+        Args:
+            lp_status (int): pulp status or LP_STATUS_TIME_LIMIT.
+
+        Returns:
+            str: name of the status.
+    '''
+    if lp_status == LP_STATUS_TIME_LIMIT:
+        return 'Time limit'
+    return LpStatus[lp_status]
 
 
 class Solution(object):
     ''' This class implements basic solution.
 
         Attributes:
-            _solution_id (int): solution ID.
             orientation (str): problem orientation, can take values
                 input or output.
             _input_data (InputData): object that stores input data.
-            efficiency_scores (dict of str to double): dictionary that maps
+            results (DmuResults): arrays with results of all DMUs,
+                efficiency_scores, lp_status, input_duals and output_duals
+                are its containers.
+            efficiency_scores (ResultVector): dictionary that maps
                 DMU code to efficiency spyDEA.core.
-            lp_status (dict of str to pulp.LpStatus): dictionary that maps
-                DMU code to LP status (optimal, unbounded, etc).
-            input_duals (dict of str to dict of str to double): dictionary
+            lp_status (ResultVector): dictionary that maps
+                DMU code to LP status (optimal, unbounded, etc) or
+                LP_STATUS_TIME_LIMIT.
+            input_duals (ResultMatrix): dictionary
                 that maps DMU code to another dictionary that maps input
                 category name to value of dual variable.
-            output_duals (dict of str to dict of str to double): dictionary
+            output_duals (ResultMatrix): dictionary
                 that maps DMU code to another dictionary that maps output
                 category name to value of dual variable.
             return_to_scale (dict of str to str): dictionary that maps DMU code
                 to the return-to-scale of the DMU
+            lp_iterations (dict of str to int): dictionary that maps DMU code
+                to the number of simplex iterations needed to solve
+                linear programs of this DMU. It is empty if solver does not
+                report number of iterations.
+            lp_times (dict of str to double): dictionary that maps DMU code
+                to wall time in seconds spent by the solver on linear
+                programs of this DMU.
+            worker_statistics (list of dict): statistics of worker
+                processes if the solution was computed in parallel
+                (see ParallelModel), empty otherwise.
+            skipped_lps (set of str): DMUs whose linear programs were
+                not solved, since their results follow from other linear
+                programs, e.g. the second phase of the two-phase model
+                is skipped if the first phase proves that all slacks
+                are zero.
+            lambda_matrix (LambdaMatrix): lambda variables of all DMUs.
+            _efficient_dmus (frozenset of str): cached result of
+                get_efficient_dmus or None if it must be computed again.
+            _peers (dict of str to list of str): cached results of
+                get_peers.
 
         Args:
             input_data (InputData): object that stores input data.
+            lambda_matrix (LambdaMatrix, optional): storage of lambda
+                variables. Defaults to None, in this case lambda variables
+                are stored in memory.
     '''
-    def __init__(self, input_data):
+    def __init__(self, input_data, lambda_matrix=None):
 
-        global _solution_id
-        _solution_id += 1
-        self._solution_id = _solution_id
         self.orientation = ''
         self._input_data = input_data
 
-        self.efficiency_scores = dict()
-        self.lp_status = dict()
-        self.input_duals = dict()
-        self.output_duals = dict()
+        # rows of result arrays follow rows of coefficients
+        self.results = DmuResults(input_data.coefficients.dmu_index,
+                                  sorted(input_data.input_categories),
+                                  sorted(input_data.output_categories))
+        self.efficiency_scores = self.results.efficiency_scores
+        self.lp_status = self.results.lp_status
+        self.input_duals = self.results.input_duals
+        self.output_duals = self.results.output_duals
         self.return_to_scale = dict()
-        for dmu_code in input_data.DMU_codes:
-            self.input_duals[dmu_code] = dict()
-            self.output_duals[dmu_code] = dict()
-
-        if not os.path.exists(TMP_FOLDER):
-            os.makedirs(TMP_FOLDER)
+        self.lp_iterations = dict()
+        self.lp_times = dict()
+        self.worker_statistics = []
+        self.skipped_lps = set()
+        if lambda_matrix is None:
+            lambda_matrix = LambdaMatrix()
+        self.lambda_matrix = lambda_matrix
+        self._efficient_dmus = None
+        self._peers = dict()
 
     def add_efficiency_score(self, dmu_code, efficiency_score):
         ''' Adds efficiency score of a given DMU to internal
@@ -74,6 +119,7 @@ class Solution(object):
         self._check_efficiency_score(efficiency_score)
         self._check_if_dmu_code_exists(dmu_code)
         self.efficiency_scores[dmu_code] = efficiency_score
+        self._efficient_dmus = None
 
     def _check_efficiency_score(self, efficiency_score):
         ''' Checks if efficiency score has a valid value.
@@ -105,23 +151,24 @@ class Solution(object):
                 dmu_code (str): DMU code.
                 lambda_variables (dict of str to double, optional): dictionary
                     that maps DMU codes to the corresponding value
-                    of lambda variables. If it is not given, it will be loaded
-                    from a pickled file.
+                    of lambda variables. If it is not given, stored lambda
+                    variables are used.
 
             Returns:
                 bool: True if a given DMU is efficient, False otherwise.
         '''
         if self.lp_status[dmu_code] != LpStatusOptimal:
             return False
-        file_name = self._get_pickle_name(dmu_code)
         if not lambda_variables:
-            lambda_variables = pickle.load(open(file_name, 'rb'))
+            lambda_variable = self.lambda_matrix.get_value(dmu_code, dmu_code)
+        else:
+            lambda_variable = lambda_variables.get(dmu_code, 0)
         return is_efficient(self.get_efficiency_score(dmu_code),
-                            lambda_variables.get(dmu_code, 0))
+                            lambda_variable)
 
     def add_lambda_variables(self, dmu_code, variables):
         ''' Adds lambda variables corresponding to a given DMU
-            to pickled file.
+            to the lambda matrix.
 
             Args:
                 dmu_code (str): DMU code.
@@ -137,8 +184,8 @@ class Solution(object):
         '''
         self._check_if_dmu_code_exists(dmu_code)
         self._validate_lambda_variables(variables)
-        with open(self._get_pickle_name(dmu_code), 'wb') as f:
-            pickle.dump(variables, f)
+        self.lambda_matrix.set_row(dmu_code, variables)
+        self._clear_cache(dmu_code)
 
     def get_lambda_variables(self, dmu_code):
         ''' Returns lambda variables corresponding to a given DMU.
@@ -148,22 +195,56 @@ class Solution(object):
 
             Returns:
                 dict of str to double: lambda variables.
+
+            Raises:
+                KeyError: if lambda variables of DMU were not added.
+        '''
+        return self.lambda_matrix.get_row(dmu_code)
+
+    def get_efficient_dmus(self):
+        ''' Returns DMUs whose linear programs are optimal and that are
+            efficient (see is_efficient). The set is computed once and
+            cached until results of some DMU change, so it is cheap to
+            call this method in loops over DMUs.
+
+            Returns:
+                frozenset of str: codes of efficient DMUs.
         '''
-        file_name = self._get_pickle_name(dmu_code)
-        return pickle.load(open(file_name, 'rb'))
+        if self._efficient_dmus is None:
+            self._efficient_dmus = frozenset(
+                dmu_code for dmu_code in self.lp_status.find(LpStatusOptimal)
+                if self.is_efficient(dmu_code))
+        return self._efficient_dmus
 
-    def _get_pickle_name(self, dmu_code):
-        ''' Generates a unique name for pickled file with lambda
-            variables.
+    def get_peers(self, dmu_code):
+        ''' Returns DMUs with non-zero lambda variables of a given DMU.
+            The list is cached until lambda variables of DMU change.
 
             Args:
                 dmu_code (str): DMU code.
 
             Returns:
-                str: generated file name.
+                list of str: codes of peers in the order in which lambda
+                    variables were added.
+
+            Raises:
+                KeyError: if lambda variables of DMU were not added.
+        '''
+        peers = self._peers.get(dmu_code, None)
+        if peers is None:
+            peers = [dmu for dmu, value in
+                     self.lambda_matrix.get_row(dmu_code).items() if value]
+            self._peers[dmu_code] = peers
+        return peers
+
+    def _clear_cache(self, dmu_code):
+        ''' Removes cached efficient DMUs and cached peers of a given DMU.
+
+            Args:
+                dmu_code (str): DMU code whose results have changed.
         '''
-        file_name = 'lambda{0}_{1}.p'.format(self._solution_id, dmu_code)
-        return os.path.join(TMP_FOLDER, file_name)
+        self._efficient_dmus = None
+        self._peers.pop(dmu_code, None)
 
     def _check_if_dmu_code_exists(self, dmu_code):
         ''' Checks if a given DMU code exists.
@@ -208,7 +289,7 @@ class Solution(object):
         if input_category not in self._input_data.input_categories:
             raise ValueError('{category} is not a valid input category'.format(
                 category=input_category))
-        self.input_duals[dmu_code][input_category] = dual_value
+        self.input_duals.set_value(dmu_code, input_category, dual_value)
 
     def add_output_dual(self, dmu_code, output_category, dual_value):
         ''' Adds value of a dual variable associated with a given output
@@ -226,7 +307,7 @@ class Solution(object):
         if output_category not in self._input_data.output_categories:
             raise ValueError('{category} is not a valid output category'.format(
                              category=output_category))
-        self.output_duals[dmu_code][output_category] = dual_value
+        self.output_duals.set_value(dmu_code, output_category, dual_value)
 
     def get_input_dual(self, dmu_code, input_category):
         ''' Returns dual variable value corresponding to a given DMU and
@@ -239,7 +320,7 @@ class Solution(object):
             Returns:
                 double: dual variable value.
         '''
-        return self.input_duals[dmu_code][input_category]
+        return self.input_duals.get_value(dmu_code, input_category)
 
     def get_output_dual(self, dmu_code, output_category):
         ''' Returns dual variable value corresponding to a given DMU and
@@ -252,7 +333,7 @@ class Solution(object):
             Returns:
                 double: dual variable value.
         '''
-        return self.output_duals[dmu_code][output_category]
+        return self.output_duals.get_value(dmu_code, output_category)
 
     def add_lp_status(self, dmu_code, lp_status):
         ''' Adds LP status corresponding to a given DMU to internal
@@ -264,6 +345,117 @@ class Solution(object):
         '''
         self._check_if_dmu_code_exists(dmu_code)
         self.lp_status[dmu_code] = lp_status
+        self._efficient_dmus = None
+
+    def add_lp_iterations(self, dmu_code, iterations):
+        ''' Adds number of simplex iterations spent on a given DMU.
+            If several linear programs are solved for one DMU,
+            iterations are summed up.
+
+            Args:
+                dmu_code (str): DMU code.
+                iterations (int): number of simplex iterations.
+        '''
+        self._check_if_dmu_code_exists(dmu_code)
+        self.lp_iterations[dmu_code] = self.lp_iterations.get(
+            dmu_code, 0) + iterations
+
+    def add_lp_time(self, dmu_code, seconds):
+        ''' Adds wall time spent by the solver on a given DMU.
+            If several linear programs are solved for one DMU,
+            times are summed up.
+
+            Args:
+                dmu_code (str): DMU code.
+                seconds (double): wall time in seconds.
+        '''
+        self._check_if_dmu_code_exists(dmu_code)
+        self.lp_times[dmu_code] = self.lp_times.get(dmu_code, 0) + seconds
+
+    def add_skipped_lp(self, dmu_code):
+        ''' Records that linear program of a given DMU was not solved.
+
+            Args:
+                dmu_code (str): DMU code.
+        '''
+        self._check_if_dmu_code_exists(dmu_code)
+        self.skipped_lps.add(dmu_code)
+
+    def get_total_lp_iterations(self):
+        ''' Returns total number of simplex iterations of all DMUs.
+
+            Returns:
+                int: total number of simplex iterations or None if
+                    solver does not report number of iterations.
+        '''
+        if not self.lp_iterations:
+            return None
+        return sum(self.lp_iterations.values())
+
+    def get_total_lp_time(self):
+        ''' Returns total wall time spent by the solver on all DMUs.
+
+            Returns:
+                double: total time in seconds or None if no linear
+                    program was solved.
+        '''
+        if not self.lp_times:
+            return None
+        return sum(self.lp_times.values())
+
+    def export_results(self, dmu_code):
+        ''' Returns all values stored for a given DMU. Used for passing
+            results computed in another process.
+
+            Args:
+                dmu_code (str): DMU code.
+
+            Returns:
+                dict of str to object: values stored for a given DMU.
+        '''
+        results = {'orientation': self.orientation,
+                   'input_duals': None, 'output_duals': None,
+                   'skipped_lp': dmu_code in self.skipped_lps}
+        if dmu_code in self.input_duals:
+            # rows are views of the whole matrix, only values are passed
+            results['input_duals'] = dict(self.input_duals[dmu_code])
+            results['output_duals'] = dict(self.output_duals[dmu_code])
+        for name, values in [('efficiency_score', self.efficiency_scores),
+                             ('lp_status', self.lp_status),
+                             ('lp_iterations', self.lp_iterations),
+                             ('lp_time', self.lp_times)]:
+            if dmu_code in values:
+                results[name] = values[dmu_code]
+        if dmu_code in self.lambda_matrix:
+            results['lambda_variables'] = self.lambda_matrix.get_row(
+                dmu_code)
+        return results
+
+    def import_results(self, dmu_code, results):
+        ''' Stores values of a given DMU returned by export_results.
+
+            Args:
+                dmu_code (str): DMU code.
+                results (dict of str to object): values returned by
+                    export_results.
+        '''
+        if results['orientation']:
+            self.orientation = results['orientation']
+        if results['input_duals'] is not None:
+            self.input_duals[dmu_code] = results['input_duals']
+        if results['output_duals'] is not None:
+            self.output_duals[dmu_code] = results['output_duals']
+        if results.get('skipped_lp'):
+            self.skipped_lps.add(dmu_code)
+        for name, values in [('efficiency_score', self.efficiency_scores),
+                             ('lp_status', self.lp_status),
+                             ('lp_iterations', self.lp_iterations),
+                             ('lp_time', self.lp_times)]:
+            if name in results:
+                values[dmu_code] = results[name]
+        if 'lambda_variables' in results:
+            self.lambda_matrix.set_row(dmu_code, results['lambda_variables'])
+        self._clear_cache(dmu_code)
 
     def _print_for_one_dmu(self, dmu_code):
         ''' Prints on screen all information available for a given DMU.
@@ -276,7 +468,7 @@ class Solution(object):
         print('code: ', dmu_code)
         if self.lp_status.get(dmu_code):
             print('LP status: {status}'.format(
-                status=LpStatus[self.lp_status.get(dmu_code)]))
+                status=get_lp_status_name(self.lp_status.get(dmu_code))))
             if self.lp_status.get(dmu_code) == LpStatusOptimal:
                 print('Efficiency score: {score}'.format(
                     score=self.efficiency_scores.get(dmu_code)))
@@ -301,8 +493,9 @@ class SolutionWithVRS(object):
         Attributes:
             _model_solution (Solution): solution that should be decorated
                 with VRS variables.
-            vrs_duals (dict of str to double): dictionary that maps DMU code
-                to VRS variable value.
+            vrs_duals (ResultVector): dictionary that maps DMU code
+                to VRS variable value, it is stored in results of
+                the decorated solution.
 
         Args:
             model_solution (Solution): solution that should be decorated
@@ -310,11 +503,21 @@ class SolutionWithVRS(object):
     '''
     def __init__(self, model_solution):
         self._model_solution = model_solution
-        self.vrs_duals = dict()
+        self.vrs_duals = model_solution.results.vrs_duals
 
     def __getattr__(self, name):
         return getattr(self._model_solution, name)
 
+    def __setstate__(self, state):
+        ''' Restores pickled solution. Default unpickling looks up
+            attributes of an empty object, which are redirected to
+            _model_solution that does not exist yet.
+
+            Args:
+                state (dict): attributes of the solution.
+        '''
+        self.__dict__.update(state)
+
     def add_VRS_dual(self, dmu_code, value):
         ''' Adds VRS variable value corresponding to a given DMU to
             internal data structure.
@@ -338,6 +541,25 @@ class SolutionWithVRS(object):
         '''
         return self.vrs_duals[dmu_code]
 
+    def export_results(self, dmu_code):
+        ''' See :meth:`Solution.export_results`.
+        '''
+        results = self._model_solution.export_results(dmu_code)
+        # models set orientation of the decorated solution
+        results['orientation'] = self.orientation
+        if dmu_code in self.vrs_duals:
+            results['vrs_dual'] = self.vrs_duals[dmu_code]
+        return results
+
+    def import_results(self, dmu_code, results):
+        ''' See :meth:`Solution.import_results`.
+        '''
+        self._model_solution.import_results(dmu_code, results)
+        if results['orientation']:
+            self.orientation = results['orientation']
+        if 'vrs_dual' in results:
+            self.vrs_duals[dmu_code] = results['vrs_dual']
+
     def _print_for_one_dmu(self, dmu_code):
         ''' Prints on screen all information available for a given DMU.
 
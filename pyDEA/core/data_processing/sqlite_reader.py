@@ -0,0 +1,197 @@
+''' This module contains a class responsible for reading input data from
+    SQLite databases.
+
+    Data is read from a table or from the result of a SELECT query.
+    Every column of the result is one category, except the first column
+    that contains DMU names. Rows are fetched in batches, and numbers of
+    every batch are converted to one array of doubles at once.
+
+    Attributes:
+        SQLITE_EXTENSIONS (tuple of str): file extensions of SQLite
+            databases.
+'''
+import math
+import pathlib
+import re
+import sqlite3
+
+import numpy
+
+from pyDEA.core.data_processing.columnar_reader import ColumnarReader
+
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+_QUERY = re.compile(r'^\s*(select|with)\s', re.IGNORECASE)
+
+
+def connect(file_name):
+    ''' Opens a given database in read-only mode, so that a database is
+        never created or modified.
+
+        Args:
+            file_name (str): path to SQLite database.
+
+        Returns:
+            sqlite3.Connection: connection.
+    '''
+    uri = pathlib.Path(file_name).absolute().as_uri() + '?mode=ro'
+    return sqlite3.connect(uri, uri=True)
+
+
+def get_table_names(file_name):
+    ''' Returns names of tables and views of a given database in the order
+        in which they were created.
+
+        Args:
+            file_name (str): path to SQLite database.
+
+        Returns:
+            list of str: names of tables and views.
+
+        Raises:
+            ValueError: if database cannot be read.
+    '''
+    try:
+        connection = connect(file_name)
+        try:
+            return _get_table_names(connection)
+        finally:
+            connection.close()
+    except sqlite3.Error as excinfo:
+        raise ValueError('Cannot read {0}: {1}'.format(file_name, excinfo))
+
+
+def _get_table_names(connection):
+    ''' Returns names of tables and views of a database in the order
+        in which they were created.
+
+        Args:
+            connection (sqlite3.Connection): connection.
+
+        Returns:
+            list of str: names of tables and views.
+    '''
+    return [row[0] for row in connection.execute(
+        "SELECT name FROM sqlite_master WHERE type IN ('table', 'view') "
+        "AND name NOT LIKE 'sqlite_%' ORDER BY rowid")]
+
+
+class SQLiteReader(ColumnarReader):
+    ''' This class implements reading of input data from SQLite databases.
+
+        Attributes:
+            CHUNK_SIZE (int): number of rows fetched at once.
+            query (str): table name or SELECT query given by parameter
+                DATA_QUERY.
+            table_name (str): name of the table from which data was read,
+                empty string if data was read with a query.
+
+        Args:
+            query (str, optional): table name or SELECT query. If it is
+                not given, data is read from the table given as sheet name
+                or from the first table of the database.
+    '''
+    CHUNK_SIZE = 10000
+
+    def __init__(self, query=''):
+        super().__init__()
+        self.query = query
+        self.table_name = ''
+
+    def _read_columns(self, file_name, sheet_name):
+        ''' See base class.
+
+            Raises:
+                ValueError: if database, table or query cannot be read.
+        '''
+        try:
+            connection = connect(file_name)
+            try:
+                cursor = connection.execute(self._get_query(
+                    connection, sheet_name))
+                if cursor.description is None:
+                    raise ValueError('Query {0} does not return '
+                                     'data'.format(self.query))
+                names = [column[0] for column in cursor.description]
+                return names, self._fetch_columns(cursor, len(names)), 0
+            finally:
+                connection.close()
+        except sqlite3.Error as excinfo:
+            raise ValueError('Cannot read {0}: {1}'.format(file_name,
+                                                           excinfo))
+
+    def _get_query(self, connection, sheet_name):
+        ''' Returns query that selects input data.
+
+            Args:
+                connection (sqlite3.Connection): connection.
+                sheet_name (str): table name, it is used if query is empty.
+
+            Returns:
+                str: query.
+
+            Raises:
+                ValueError: if database has no tables.
+        '''
+        self.table_name = self.query.strip() or sheet_name
+        if _QUERY.match(self.table_name):
+            self.table_name = ''
+            return self.query
+        if not self.table_name:
+            table_names = _get_table_names(connection)
+            if not table_names:
+                raise ValueError('Database has no tables')
+            self.table_name = table_names[0]
+        return 'SELECT * FROM "{0}"'.format(
+            self.table_name.replace('"', '""'))
+
+    def _fetch_columns(self, cursor, nb_columns):
+        ''' Fetches all rows in batches of CHUNK_SIZE rows.
+
+            Args:
+                cursor (sqlite3.Cursor): cursor of executed query.
+                nb_columns (int): number of columns.
+
+            Returns:
+                list: columns, see _read_columns. Columns with numbers are
+                    returned as numpy.ndarray only if all categories
+                    contain numbers or missing values.
+        '''
+        dmu_names = []
+        chunks = []
+        rows = None
+        while True:
+            batch = cursor.fetchmany(self.CHUNK_SIZE)
+            if not batch:
+                break
+            dmu_names.extend('' if row[0] is None else row[0]
+                             for row in batch)
+            if rows is None:
+                try:
+                    # missing values are converted to NaN
+                    chunks.append(numpy.array(
+                        [row[1:] for row in batch],
+                        dtype=numpy.float64).reshape(len(batch),
+                                                     nb_columns - 1))
+                    continue
+                except (ValueError, TypeError):
+                    rows = [['' if math.isnan(value) else value
+                             for value in row]
+                            for chunk in chunks for row in chunk.tolist()]
+            rows.extend(['' if value is None else value
+                         for value in row[1:]] for row in batch)
+        if rows is not None:
+            return [dmu_names] + [list(column) for column in zip(*rows)]
+        if chunks:
+            values = numpy.concatenate(chunks)
+        else:
+            values = numpy.empty((0, nb_columns - 1))
+        return [dmu_names] + [values[:, count]
+                              for count in range(nb_columns - 1)]
+
+    def get_sheet_name(self):
+        ''' Returns name of the table from which data was read.
+
+            Returns:
+                str: table name, empty string if data was read with a query.
+        '''
+        return self.table_name
@@ -7,11 +7,14 @@
         sequentially, row after row, column after column.
 '''
 
+import numpy
 import pulp
 from itertools import chain
 from collections import defaultdict
 
 from pyDEA.core.utils.dea_utils import ZERO_TOLERANCE
+from pyDEA.core.data_processing.solution import LP_STATUS_TIME_LIMIT
+from pyDEA.core.data_processing.solution import get_lp_status_name
 from pyDEA.core.data_processing.targets_and_slacks import calculate_target
 from pyDEA.core.data_processing.targets_and_slacks import calculate_radial_reduction
 from pyDEA.core.data_processing.targets_and_slacks import calculate_non_radial_reduction
@@ -69,6 +72,37 @@ class SheetWithParameters(object):
             work_sheet.write(row_index, 0, param_name)
             work_sheet.write(row_index, 1, param_value)
             row_index += 1
+        total_iterations = solution.get_total_lp_iterations()
+        if total_iterations is not None:
+            work_sheet.write(row_index, 0, 'Total simplex iterations:')
+            work_sheet.write(row_index, 1, total_iterations)
+            row_index += 1
+        total_lp_time = solution.get_total_lp_time()
+        if total_lp_time is not None:
+            work_sheet.write(row_index, 0, 'Total solver time:')
+            work_sheet.write(row_index, 1, '{0:.3f} seconds'.format(
+                total_lp_time))
+            row_index += 1
+        if solution.skipped_lps:
+            work_sheet.write(row_index, 0, 'Skipped linear programs:')
+            work_sheet.write(row_index, 1, len(solution.skipped_lps))
+            row_index += 1
+        nb_stopped_lps = len(solution.lp_status.find(LP_STATUS_TIME_LIMIT))
+        if nb_stopped_lps:
+            work_sheet.write(row_index, 0,
+                             'Linear programs stopped by time limit:')
+            work_sheet.write(row_index, 1, nb_stopped_lps)
+            row_index += 1
+        for count, statistics in enumerate(solution.worker_statistics):
+            work_sheet.write(row_index, 0, 'Worker {0}:'.format(count + 1))
+            work_sheet.write(row_index, 1, '{0} DMUs'.format(
+                statistics['nb_dmus']))
+            work_sheet.write(row_index, 2, 'startup {0:.3f} seconds'.format(
+                statistics['startup_time']))
+            if statistics['peak_memory'] is not None:
+                work_sheet.write(row_index, 3, 'peak memory {0:.1f} MB'.format(
+                    statistics['peak_memory']))
+            row_index += 1
         return row_index
 
 
@@ -132,7 +166,7 @@ class SheetOnionRank(object):
                 else:
                     work_sheet.write(
                         row_index, 1,
-                        pulp.LpStatus[solution.lp_status[dmu_code]])
+                        get_lp_status_name(solution.lp_status[dmu_code]))
                 row_index += 1
             self.count += 1
             return row_index
@@ -179,17 +213,21 @@ class SheetWithCategoricalVar(object):
                              'Categorical: {0}'.format(self.categorical))
 
         ordered_dmu_codes = solution._input_data.DMU_codes_in_added_order
+        is_optimal = (solution.lp_status.get_values(ordered_dmu_codes) ==
+                      pulp.LpStatusOptimal).tolist()
+        scores = solution.efficiency_scores.get_values(
+            ordered_dmu_codes).tolist()
         row_index = 0
         for count, dmu_code in enumerate(ordered_dmu_codes):
             row_index = start_row_index + count + 2
             work_sheet.write(
                 row_index, 0, solution._input_data.get_dmu_user_name(dmu_code))
-            if solution.lp_status[dmu_code] == pulp.LpStatusOptimal:
-                work_sheet.write(
-                    row_index, 1, solution.get_efficiency_score(dmu_code))
+            if is_optimal[count]:
+                work_sheet.write(row_index, 1, scores[count])
             else:
                 work_sheet.write(
-                    row_index, 1, pulp.LpStatus[solution.lp_status[dmu_code]])
+                    row_index, 1,
+                    get_lp_status_name(solution.lp_status[dmu_code]))
             if self.categorical is not None:
                 work_sheet.write(
                     row_index, 2,
@@ -209,7 +247,8 @@ class SheetWithCategoricalVar(object):
                     write method, it actually writes data to some output
                     (like file, screen, etc.).
                 solution (Solution): solution.
-                get_multiplier (func): function that scales weights.
+                get_multiplier (func): function that returns values that
+                    scale weights of given DMUs and categories.
                 sheet_name (str): name that will be written into the name
                     attribute of work_sheet.
                 start_row_index (int): initial row index (usually used to append
@@ -232,32 +271,44 @@ class SheetWithCategoricalVar(object):
                              'Categorical: {0}'.format(self.categorical))
             init_column_index = 3
 
-        categories = []
-        categories.extend(solution._input_data.input_categories)
-        categories.extend(solution._input_data.output_categories)
+        input_categories = list(solution._input_data.input_categories)
+        output_categories = list(solution._input_data.output_categories)
+        categories = input_categories + output_categories
 
         column_index = init_column_index
         for category in categories:
             work_sheet.write(start_row_index + 1, column_index, category)
             column_index += 1
 
+        ordered_dmu_codes = solution._input_data.DMU_codes_in_added_order
         try:
-            solution.vrs_duals
+            vrs_duals = solution.vrs_duals.get_values(
+                ordered_dmu_codes).tolist()
         except AttributeError:
-            pass
+            vrs_duals = None
         else:
             work_sheet.write(start_row_index + 1,
                              init_column_index + len(categories), 'VRS')
 
+        is_optimal = (solution.lp_status.get_values(ordered_dmu_codes) ==
+                      pulp.LpStatusOptimal).tolist()
+        scores = solution.efficiency_scores.get_values(
+            ordered_dmu_codes).tolist()
+        weights = numpy.hstack((
+            solution.input_duals.get_values(ordered_dmu_codes,
+                                            input_categories),
+            solution.output_duals.get_values(ordered_dmu_codes,
+                                             output_categories)))
+        weights = (get_multiplier(solution, ordered_dmu_codes, categories) *
+                   weights).tolist()
+
         row_index = start_row_index + 2
-        ordered_dmu_codes = solution._input_data.DMU_codes_in_added_order
-        for dmu_code in ordered_dmu_codes:
+        for count, dmu_code in enumerate(ordered_dmu_codes):
             dmu_name = solution._input_data.get_dmu_user_name(dmu_code)
             work_sheet.write(row_index, 0, dmu_name)
 
-            if solution.lp_status[dmu_code] == pulp.LpStatusOptimal:
-                work_sheet.write(
-                    row_index, 1, solution.get_efficiency_score(dmu_code))
+            if is_optimal[count]:
+                work_sheet.write(row_index, 1, scores[count])
 
             if self.categorical is not None:
                 work_sheet.write(
@@ -265,44 +316,33 @@ class SheetWithCategoricalVar(object):
                     int(solution._input_data.coefficients[
                         dmu_code, self.categorical]))
 
-            if solution.lp_status[dmu_code] == pulp.LpStatusOptimal:
+            if is_optimal[count]:
 
                 column_index = init_column_index
-                for input_category in solution._input_data.input_categories:
-                    work_sheet.write(
-                        row_index, column_index,
-                        get_multiplier(solution, dmu_code, input_category) *
-                        solution.get_input_dual(dmu_code, input_category))
+                for weight in weights[count]:
+                    work_sheet.write(row_index, column_index, weight)
                     column_index += 1
 
-                for output_category in solution._input_data.output_categories:
-                    work_sheet.write(
-                        row_index, column_index,
-                        get_multiplier(solution, dmu_code, output_category) *
-                        solution.get_output_dual(dmu_code, output_category))
-                    column_index += 1
-
-                try:
-                    vrs_dual = solution.get_VRS_dual(dmu_code)
-                    work_sheet.write(row_index, column_index, vrs_dual)
-                except AttributeError:
-                    pass
+                if vrs_duals is not None:
+                    work_sheet.write(row_index, column_index,
+                                     vrs_duals[count])
             else:
                 work_sheet.write(
-                    row_index, 1, pulp.LpStatus[solution.lp_status[dmu_code]])
+                    row_index, 1,
+                    get_lp_status_name(solution.lp_status[dmu_code]))
 
             row_index += 1
         return row_index
 
     @staticmethod
-    def _get_const_multiplier(solution, dmu_code, category):
+    def _get_const_multiplier(solution, dmu_codes, categories):
         ''' Helper method that is used for writing input and output data
             to a given output.
 
             Args:
                 solution (Solution): solution.
-                dmu_code (str): DMU code.
-                category (str): category name.
+                dmu_codes (list of str): DMU codes.
+                categories (list of str): category names.
 
             Returns:
                 int: always returns 1 since we don't need to scale weights.
@@ -332,19 +372,20 @@ class SheetWithCategoricalVar(object):
             start_row_index, params_str)
 
     @staticmethod
-    def _get_data_multiplier(solution, dmu_code, category):
+    def _get_data_multiplier(solution, dmu_codes, categories):
         ''' Helper method that is used for writing weighted data
             to a given output.
 
             Args:
                 solution (Solution): solution.
-                dmu_code (str): DMU code.
-                category (str): category name.
+                dmu_codes (list of str): DMU codes.
+                categories (list of str): category names.
 
             Returns:
-                int: a scale value to scale weights.
+                numpy.ndarray: values that scale weights, one row per DMU
+                    and one column per category.
         '''
-        return solution._input_data.coefficients[dmu_code, category]
+        return solution._input_data.get_values(categories, dmu_codes)
 
     def create_sheet_weighted_data(self, work_sheet, solution,
                                    start_row_index, params_str):
@@ -444,7 +485,8 @@ class SheetWithCategoricalVar(object):
                     row_index += 1
             else:
                 work_sheet.write(
-                    row_index, 1, pulp.LpStatus[solution.lp_status[dmu_code]])
+                    row_index, 1,
+                    get_lp_status_name(solution.lp_status[dmu_code]))
 
             row_index += 2
         return row_index
@@ -640,7 +682,8 @@ def create_sheet_peers(work_sheet, solution, start_row_index, params_str):
                     dmu_name = solution._input_data.get_dmu_user_name(dmu)
                     work_sheet.write(row_index, 2, dmu_name)
                     work_sheet.write(row_index, 3, lambda_value)
-                    if write_classification and once:
+                    if (write_classification and once and
+                            dmu_code in solution.return_to_scale):
                         work_sheet.write(
                             row_index, 4, solution.return_to_scale[dmu_code]
                             #_calculate_frontier_classification(sum_of_lambda_values)
@@ -651,7 +694,7 @@ def create_sheet_peers(work_sheet, solution, start_row_index, params_str):
 
         else:
             work_sheet.write(
-                row_index, 2, pulp.LpStatus[solution.lp_status[dmu_code]])
+                row_index, 2, get_lp_status_name(solution.lp_status[dmu_code]))
         row_index += 1
     return row_index
 
@@ -679,13 +722,12 @@ def create_sheet_peer_count(work_sheet, solution, start_row_index, params_str):
     work_sheet.write(start_row_index + 1, 0, 'Efficient Peers')
 
     # write names of efficient DMUs first
-    column_index = 1
-    for dmu_code in ordered_dmu_codes:
-        if solution.lp_status[dmu_code] == pulp.LpStatusOptimal:
-            if solution.is_efficient(dmu_code):
-                dmu_name = solution._input_data.get_dmu_user_name(dmu_code)
-                work_sheet.write(start_row_index + 1, column_index, dmu_name)
-                column_index += 1
+    efficient_dmus = solution.get_efficient_dmus()
+    efficient_peers = [dmu_code for dmu_code in ordered_dmu_codes
+                       if dmu_code in efficient_dmus]
+    for column_index, dmu_code in enumerate(efficient_peers, 1):
+        dmu_name = solution._input_data.get_dmu_user_name(dmu_code)
+        work_sheet.write(start_row_index + 1, column_index, dmu_name)
 
     work_sheet.write(start_row_index + 2, 0, 'DMU')
     # continue line by line
@@ -697,23 +739,20 @@ def create_sheet_peer_count(work_sheet, solution, start_row_index, params_str):
         work_sheet.write(row_index, 0, dmu_name)
 
         if solution.lp_status[dmu_code] == pulp.LpStatusOptimal:
-            column_index = 1
             all_lambda_vars = solution.get_lambda_variables(dmu_code)
-            for dmu in ordered_dmu_codes:
-                if (solution.lp_status[dmu] == pulp.LpStatusOptimal and
-                        solution.is_efficient(dmu, all_lambda_vars)):
-                    # get is used since some lambda
-                    # # variables might not be present in categorical model!
-                    lambda_value = all_lambda_vars.get(dmu, 0)
-                    if lambda_value:
-                        work_sheet.write(row_index, column_index, lambda_value)
-                        nb_peers[dmu] += 1
-                    else:
-                        work_sheet.write(row_index, column_index, '-')
-                    column_index += 1
+            for column_index, dmu in enumerate(efficient_peers, 1):
+                # get is used since some lambda
+                # # variables might not be present in categorical model!
+                lambda_value = all_lambda_vars.get(dmu, 0)
+                if lambda_value:
+                    work_sheet.write(row_index, column_index, lambda_value)
+                    nb_peers[dmu] += 1
+                else:
+                    work_sheet.write(row_index, column_index, '-')
         else:
             work_sheet.write(
-                row_index, 1, pulp.LpStatus[solution.lp_status[dmu_code]])
+                row_index, 1,
+                get_lp_status_name(solution.lp_status[dmu_code]))
         row_index += 1
     work_sheet.write(row_index, 0, 'Peer count')
     column_index = 1
@@ -13,8 +13,11 @@ from pyDEA.core.gui_modules.table_gui import TableFrameWithInputOutputBox
 from pyDEA.core.gui_modules.navigation_frame_gui import NavigationForTableFrame
 from pyDEA.core.gui_modules.table_modifier_gui import TableModifierFrame
 from pyDEA.core.utils.dea_utils import TEXT_FOR_PANEL, FILE_TYPES, center_window
+from pyDEA.core.utils.dea_utils import SAVE_DATA_FILE_TYPES
 from pyDEA.core.utils.dea_utils import calculate_nb_pages
 from pyDEA.core.data_processing.read_data import read_data
+from pyDEA.core.data_processing.sqlite_reader import SQLITE_EXTENSIONS
+from pyDEA.core.data_processing.sqlite_reader import get_table_names
 from pyDEA.core.gui_modules.load_xlsx_gui import AskSheetName
 from pyDEA.core.data_processing.save_data_to_file import save_data_to_xlsx
 
@@ -185,11 +188,14 @@ class DataTabFrame(Frame):
             This method is called when user presses "Save" button.
             If user modified open data file, then modifications will
             be saved in this file.
-            If user typed data, this method redirects user to
-            save_data_as() method.
+            If user typed data or data was loaded from a file that
+            cannot be written (for example, SQLite database), this method
+            redirects user to save_data_as() method.
         '''
         data_file = self.get_data_file_name()
-        if data_file == '*':  # when file was created and modified
+        if data_file == '*' or (  # when file was created and modified
+                data_file and
+                not remove_star(data_file).endswith(('.xlsx', '.csv'))):
             self.save_data_as()
         elif data_file:
             self.save_data_to_given_file(remove_star(data_file),
@@ -212,7 +218,8 @@ class DataTabFrame(Frame):
 
             This method is redefined in unit tests.
         '''
-        return asksaveasfilename(filetypes=FILE_TYPES, defaultextension='.xlsx')
+        return asksaveasfilename(filetypes=SAVE_DATA_FILE_TYPES,
+                                 defaultextension='.xlsx')
 
     def save_data_to_given_file(self, data_file, sheet_name='Data'):
         ''' Saves data to a given file.
@@ -240,7 +247,8 @@ class DataTabFrame(Frame):
     def load_file(self):
         ''' Asks user which data file should be loaded and loads specified file.
 
-            Only xlsx and csv files are allowed.
+            Only xlsx, csv, Parquet, Feather, npz files and SQLite
+            databases are allowed.
         '''
         file_name = self._call_open_file_dialogue()
         if file_name:
@@ -300,7 +308,8 @@ class DataTabFrame(Frame):
 
             This method asks user from what sheet data must be loaded if
             there are more then 1 sheet
-            in data file. Changes name of data file in label frame and
+            in data file (or table in SQLite database).
+            Changes name of data file in label frame and
             calls method that displays
             data in the table.
 
@@ -309,9 +318,12 @@ class DataTabFrame(Frame):
         '''
         just_name, extension = os.path.splitext(file_name)
         should_proceed = False
-        if extension == '.xlsx':
-            book = load_workbook(file_name, data_only = True)
-            names = book.sheetnames
+        if extension == '.xlsx' or extension in SQLITE_EXTENSIONS:
+            if extension == '.xlsx':
+                book = load_workbook(file_name, data_only = True)
+                names = book.sheetnames
+            else:
+                names = get_table_names(file_name)
             nb_names = len(names)
             if nb_names == 0:
                 return
@@ -322,7 +334,7 @@ class DataTabFrame(Frame):
             if self.sheet_name:
                 should_proceed = True
         else:
-            self.sheet_name = ''  # csv does not support sheets
+            self.sheet_name = ''  # other formats do not support sheets
             should_proceed = True
         if should_proceed:
             sheet_name_copy = self.sheet_name
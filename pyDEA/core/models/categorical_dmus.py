@@ -1,8 +1,7 @@
 ''' This module contains class for performing DEA analysis with categorical DMUs
     and some helper functions.
 '''
-from pyDEA.core.models.model_base import ModelBase
-from pyDEA.core.utils.dea_utils import check_input_and_output_categories
+from pyDEA.core.models.model_base import ModelBase, creates_one_lp
 
 
 def get_dmus_with_fixed_hierarchical_category(coefficients,
@@ -30,6 +29,21 @@ def get_dmus_with_fixed_hierarchical_category(coefficients,
                category == category_name and dmu in dmu_codes)
 
 
+def can_grow_lp(model):
+    ''' Checks if a given model creates one linear program for all DMUs
+        and DMUs can be added to the reference set of this linear
+        program in place. It is true for envelopment models.
+
+        Args:
+            model (ModelBase): DEA model.
+
+        Returns:
+            bool: True if DMUs can be added to linear program,
+                False otherwise.
+    '''
+    return hasattr(model, '_add_reference_dmus') and creates_one_lp(model)
+
+
 class ModelWithCategoricalDMUs(ModelBase):
 
     ''' This class implements DEA categorical analysis.
@@ -62,7 +76,7 @@ class ModelWithCategoricalDMUs(ModelBase):
         '''
         return getattr(self.model, name)
 
-    def run(self):
+    def run(self, dmu_codes=None):
         ''' Performs categorical analysis.
 
             Warning:
@@ -73,6 +87,11 @@ class ModelWithCategoricalDMUs(ModelBase):
             and so on. Hence, category 1 is least favourable, category 2 is more
             favourable and so on.
 
+            Args:
+                dmu_codes (iterable of str, optional): DMUs whose linear
+                    programs must be solved. Defaults to all DMUs of
+                    input data.
+
             Returns:
                 Solution: solution of the problem.
 
@@ -80,32 +99,65 @@ class ModelWithCategoricalDMUs(ModelBase):
                 All floating point values of categorical category will be
                 truncated to integer values.
         '''
-        check_input_and_output_categories(self.input_data)
+        return super(ModelWithCategoricalDMUs, self).run(dmu_codes)
+
+    def _run_for_dmus(self, dmu_codes, model_solution):
+        ''' Solves linear programs of given DMUs. For every value of
+            the categorical category, all given DMUs with this value are
+            solved against DMUs with the same or smaller value.
+
+            If the decorated model creates one linear program for all DMUs
+            and can add DMUs to its reference set (see can_grow_lp),
+            linear program is created once and lambda variables of DMUs
+            of every next value are appended to it. Otherwise, the
+            decorated model creates linear program once per value.
+
+            Args:
+                dmu_codes (list of str): DMU codes in the order in which
+                    they must be solved.
+                model_solution (Solution): solution.
+        '''
         copy_of_dmu_codes = set([dmu for dmu in self.input_data.DMU_codes])
-        model_solution = self._create_solution()
 
         tmp_set = set(int(coeff) for (dmu, category), coeff in
                       self.input_data.coefficients.items()
                       if category == self.category_name)
         sorted_hierarchical_categories = sorted(tmp_set)
 
+        grow_lp = can_grow_lp(self.model)
+        # DMUs in the reference set of linear program,
+        # None if linear program is not created yet
+        reference_dmus = None
         self.input_data.DMU_codes = set()
-        for hierarchical_category in sorted_hierarchical_categories:
-            dmu_fixed_category = get_dmus_with_fixed_hierarchical_category(
-                self.input_data.coefficients,
-                hierarchical_category, self.category_name,
-                copy_of_dmu_codes)
-
-            self.input_data.DMU_codes = dmu_fixed_category.union(
-                self.input_data.DMU_codes)
-            if len(self.input_data.DMU_codes) > 0:
-                self._create_lp()
-                for dmu_code in dmu_fixed_category:
-                    self.run_for_one_DMU(dmu_code, model_solution)
+        try:
+            for hierarchical_category in sorted_hierarchical_categories:
+                dmu_fixed_category = get_dmus_with_fixed_hierarchical_category(
+                    self.input_data.coefficients,
+                    hierarchical_category, self.category_name,
+                    copy_of_dmu_codes)
+
+                self.input_data.DMU_codes = dmu_fixed_category.union(
+                    self.input_data.DMU_codes)
+                dmus_to_solve = [dmu_code for dmu_code in dmu_codes
+                                 if dmu_code in dmu_fixed_category]
+                if len(dmus_to_solve) == 0:
+                    continue
+                if not grow_lp:
+                    self.model._run_for_dmus(dmus_to_solve, model_solution)
+                    continue
+                if reference_dmus is None:
+                    self.model._create_lp()
+                    reference_dmus = set(self.input_data.DMU_codes)
+                else:
+                    new_dmus = self._get_ordered_dmu_codes(
+                        self.input_data.DMU_codes.difference(reference_dmus))
+                    self.model._add_reference_dmus(new_dmus)
+                    reference_dmus.update(new_dmus)
+                for dmu_code in dmus_to_solve:
+                    self.model.run_for_one_DMU(dmu_code, model_solution)
                     self.update_dmu_str_var()
-
-        self.input_data.DMU_codes = copy_of_dmu_codes
-        return model_solution
+        finally:
+            self.input_data.DMU_codes = copy_of_dmu_codes
 
     def run_for_one_DMU(self, dmu_code, model_solution):
         ''' Solves LP for a given DMU.
@@ -0,0 +1,76 @@
+''' This module contains DominanceFilterModel class that removes
+    lambda variables of dominated DMUs from envelopment models.
+'''
+from pyDEA.core.models.envelopment_model_base import create_lp_with_lambdas
+from pyDEA.core.models.model_base import ModelBase
+from pyDEA.core.utils.dominance import get_dominated_dmus
+
+
+class DominanceFilterModel(ModelBase):
+    ''' Decorator that creates linear programs of envelopment models
+        with lambda variables of DMUs that are not dominated by other DMUs.
+        Every dominated DMU can be replaced by the DMU that dominates it,
+        so efficiency scores and duals are the same as in the model with
+        all DMUs, lambda variables of dominated DMUs are always zero.
+
+        Note:
+            The filter is valid only for envelopment models with strongly
+            disposable categories and without weight restrictions and
+            super efficiency.
+
+        Attributes:
+            model (ModelBase): envelopment model.
+            peers (set of str): DMUs that were not dominated in the
+                last run.
+
+        Args:
+            model (ModelBase): envelopment model.
+    '''
+    def __init__(self, model):
+        self.model = model
+        self.peers = set()
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    def _run_for_dmus(self, dmu_codes, model_solution):
+        ''' Solves linear programs of given DMUs against DMUs of input
+            data that are not dominated.
+
+            Args:
+                dmu_codes (list of str): DMU codes in the order in which
+                    they must be solved.
+                model_solution (Solution): solution.
+        '''
+        all_dmu_codes = self.input_data.DMU_codes
+        self.peers = all_dmu_codes.difference(get_dominated_dmus(
+            self.input_data, all_dmu_codes))
+        create_lp_with_lambdas(self, self.peers)
+        for dmu_code in dmu_codes:
+            self.run_for_one_DMU(dmu_code, model_solution)
+            self.update_dmu_str_var()
+
+    def _create_solution(self):
+        ''' See base class.
+        '''
+        return self.model._create_solution()
+
+    def run_for_one_DMU(self, dmu_code, model_solution):
+        ''' See base class.
+        '''
+        self.model.run_for_one_DMU(dmu_code, model_solution)
+
+    def _create_lp(self):
+        ''' See base class.
+        '''
+        self.model._create_lp()
+
+    def _update_lp(self, dmu_code):
+        ''' See base class.
+        '''
+        self.model._update_lp(dmu_code)
+
+    def _fill_solution(self, dmu_code, model_solution):
+        ''' See base class.
+        '''
+        self.model._fill_solution(dmu_code, model_solution)
@@ -6,6 +6,25 @@ from pyDEA.core.models.model_base import ModelBase
 from pyDEA.core.utils.dea_utils import ZERO_TOLERANCE
 
 
+def create_lp_with_lambdas(model, dmu_codes):
+    ''' Creates linear program of a given envelopment model that contains
+        lambda variables of given DMUs only. Linear program can still be
+        solved for any DMU of input data. It also works for multiplier
+        models, where only constraints of given DMUs are created.
+
+        Args:
+            model (ModelBase): envelopment or multiplier model, it might
+                be decorated.
+            dmu_codes (iterable of str): DMU codes.
+    '''
+    all_dmu_codes = model.input_data.DMU_codes
+    model.input_data.DMU_codes = set(dmu_codes)
+    try:
+        model._create_lp()
+    finally:
+        model.input_data.DMU_codes = all_dmu_codes
+
+
 class EnvelopmentModelBase(ModelBase):
     ''' This class is a base class for different envelopment models.
         It implements general structure of all envelopment models.
@@ -22,9 +41,6 @@ class EnvelopmentModelBase(ModelBase):
                 variables than maps variable names to pulp variables.
             _constraints (dict of str to str): dictionary that maps name of
                 the category to the name of the corresponding constraint.
-            _should_add_efficiency (bool): if set to False, previously
-                stored efficiency score is used. This variable is changed
-                in two phase model.
 
         Args:
             input_data (InputData): object that stores all data of
@@ -40,7 +56,6 @@ class EnvelopmentModelBase(ModelBase):
         self._constraint_creator = constraint_creator
         self._variables = dict()
         self._constraints = dict()
-        self._should_add_efficiency = True
 
     def _create_lp(self):
         ''' Creates initial linear program.
@@ -56,9 +71,8 @@ class EnvelopmentModelBase(ModelBase):
 
         orientation = self._concrete_model.get_orientation()
         obj_type = self._concrete_model.get_objective_type()
-        self.lp_model = pulp.LpProblem('Envelopment model: {0}-'
-                                       'oriented'.format(orientation),
-                                       obj_type)
+        self.lp_model = self._create_lp_problem(
+            'Envelopment model: {0}-oriented'.format(orientation), obj_type)
         ub_obj = self._concrete_model.get_upper_bound_for_objective_variable()
         obj_variable = pulp.LpVariable('Variable in objective function',
                                        self._concrete_model.
@@ -70,15 +84,102 @@ class EnvelopmentModelBase(ModelBase):
         self.lp_model += (obj_variable,
                           'Efficiency score or inverse of efficiency score')
 
-        lambda_variables = pulp.LpVariable.dicts('lambda',
-                                                 self.input_data.DMU_codes,
-                                                 0, None, pulp.LpContinuous)
+        lambda_variables = self._create_lambda_variables(
+            self.input_data.DMU_codes)
         self._variables.update(lambda_variables)
         self._add_constraints_for_outputs(lambda_variables, dmu_code,
                                           obj_variable)
         self._add_constraints_for_inputs(lambda_variables, dmu_code,
                                          obj_variable)
 
+    def _create_lp_problem(self, name, obj_type):
+        ''' Allocates an empty linear program.
+
+            Args:
+                name (str): name of the linear program.
+                obj_type (int): pulp.LpMinimize or pulp.LpMaximize.
+
+            Returns:
+                pulp.LpProblem: allocated linear program.
+        '''
+        return pulp.LpProblem(name, obj_type)
+
+    def _create_lambda_variables(self, dmu_codes):
+        ''' Creates lambda variables.
+
+            Args:
+                dmu_codes (list of str): DMU codes.
+
+            Returns:
+                dict of str to pulp.LpVariable: a dictionary that maps
+                    DMU codes to lambda variables.
+        '''
+        return pulp.LpVariable.dicts('lambda', dmu_codes, 0, None,
+                                     pulp.LpContinuous)
+
+    def _add_lambda_variables(self, dmu_codes):
+        ''' Adds lambda variables of given DMUs to existing linear program.
+            DMUs must not have lambda variables in the linear program yet.
+
+            Args:
+                dmu_codes (list of str): DMU codes.
+
+            Returns:
+                dict of str to pulp.LpVariable: a dictionary that maps
+                    DMU codes to added lambda variables.
+        '''
+        variables = self._create_lambda_variables(dmu_codes)
+        self._variables.update(variables)
+        lambda_variables = [variables[dmu] for dmu in dmu_codes]
+        columns = self.lp_template.get_columns(self.input_data, dmu_codes)
+        for output_category in self.input_data.output_categories:
+            constraint = self.lp_model.constraints[
+                self._constraints[output_category]]
+            row = self.lp_template.get_row(self.input_data, output_category,
+                                           columns)
+            for variable, value in zip(lambda_variables, row.tolist()):
+                constraint[variable] = value
+        for input_category in self.input_data.input_categories:
+            constraint = self.lp_model.constraints[
+                self._constraints[input_category]]
+            row = self.lp_template.get_row(self.input_data, input_category,
+                                           columns)
+            for variable, value in zip(lambda_variables, (-row).tolist()):
+                constraint[variable] = value
+        return variables
+
+    def _add_reference_dmus(self, dmu_codes):
+        ''' Adds given DMUs to the reference set of existing linear
+            program. DMUs must be already added to DMU codes of input data
+            and must not be in the reference set yet.
+
+            Args:
+                dmu_codes (list of str): DMU codes.
+        '''
+        self._add_lambda_variables(dmu_codes)
+
+    def _exclude_dmu(self, dmu_code):
+        ''' Excludes a given DMU from the reference set of linear program
+            by fixing upper bound of its lambda variable to zero.
+
+            Args:
+                dmu_code (str): DMU code.
+        '''
+        variable = self._variables.get(dmu_code, None)
+        if variable is not None:
+            variable.upBound = 0
+
+    def _restore_dmu(self, dmu_code):
+        ''' Returns a given DMU excluded by _exclude_dmu to the reference
+            set of linear program.
+
+            Args:
+                dmu_code (str): DMU code.
+        '''
+        variable = self._variables.get(dmu_code, None)
+        if variable is not None:
+            variable.upBound = None
+
     def _update_lp(self, dmu_code):
         ''' Updates existing linear program with coefficients corresponding
             to a given DMU.
@@ -115,16 +216,16 @@ class EnvelopmentModelBase(ModelBase):
                 obj_variable (pulp.LpVariable): LP variable that is optimised
                     (either efficiency score or inverse of efficiency score).
         '''
+        lambda_variables, columns = self._get_lambda_columns(variables)
         for (count, output_category) in enumerate(
                 self.input_data.output_categories):
             current_output = self.input_data.coefficients[(dmu_code,
                                                           output_category)]
             output_coeff = self._concrete_model.get_output_variable_coefficient(
                 obj_variable, output_category)
-            sum_all_outputs = pulp.lpSum([variables[dmu] *
-                                         self.input_data.coefficients
-                                         [(dmu, output_category)]
-                                         for dmu in self.input_data.DMU_codes])
+            sum_all_outputs = pulp.LpAffineExpression(zip(
+                lambda_variables, self.lp_template.get_row(
+                    self.input_data, output_category, columns).tolist()))
             name = 'constraint_output_{count}'.format(count=count)
             self.lp_model += (self._constraint_creator.create(
                               -output_coeff * current_output +
@@ -143,23 +244,40 @@ class EnvelopmentModelBase(ModelBase):
                 obj_variable (pulp.LpVariable): LP variable that is optimised
                     (either efficiency score or inverse of efficiency score).
         '''
+        lambda_variables, columns = self._get_lambda_columns(variables)
         for (count, input_category) in enumerate(
                 self.input_data.input_categories):
             current_input = self.input_data.coefficients[(dmu_code,
                                                          input_category)]
             input_coeff = self._concrete_model.get_input_variable_coefficient(
                 obj_variable, input_category)
-            sum_all_inputs = pulp.lpSum([variables[dmu] *
-                                        self.input_data.coefficients
-                                        [(dmu, input_category)]
-                                        for dmu in
-                                        self.input_data.DMU_codes])
+            sum_all_inputs = pulp.LpAffineExpression(zip(
+                lambda_variables, self.lp_template.get_row(
+                    self.input_data, input_category, columns).tolist()))
             name = 'constraint_input_{count}'.format(count=count)
             self.lp_model += (self._constraint_creator.create(
                               input_coeff * current_input
                               - sum_all_inputs, 0, input_category), name)
             self._constraints[input_category] = name
 
+    def _get_lambda_columns(self, variables):
+        ''' Returns lambda variables of DMUs of input data and
+            corresponding columns of the LP template in the order in which
+            DMUs were added to input data.
+
+            Args:
+                variables (dict of str to pulp.LpVariable): a dictionary
+                    that maps DMU codes to lambda variables.
+
+            Returns:
+                tuple of list of pulp.LpVariable, numpy.ndarray: lambda
+                    variables and indices of their columns in the
+                    LP template.
+        '''
+        dmu_codes, columns = self.lp_template.get_ordered_columns(
+            self.input_data, self.input_data.DMU_codes)
+        return [variables[dmu] for dmu in dmu_codes], columns
+
     def _fill_solution(self, dmu_code, model_solution):
         ''' Fills given solution with data calculated for one DMU.
 
@@ -172,24 +290,34 @@ class EnvelopmentModelBase(ModelBase):
         model_solution.add_lp_status(dmu_code, self.lp_model.status)
 
         if self.lp_model.status == pulp.LpStatusOptimal:
-            lambda_variables = dict()
-            for dmu in self.input_data.DMU_codes:
-                var = self._variables.get(dmu, None)
-                if (var is not None and var.varValue is not None and
-                        abs(var.varValue) > ZERO_TOLERANCE):
-                    lambda_variables[dmu] = var.varValue
-
-            if self._should_add_efficiency:
-                model_solution.add_efficiency_score(
-                    dmu_code, self._concrete_model.process_obj_var
-                    (pulp.value(self.lp_model.objective)))
-                
+            lambda_variables = self._get_lambda_values()
+
+            model_solution.add_efficiency_score(
+                dmu_code, self._concrete_model.process_obj_var
+                (pulp.value(self.lp_model.objective)))
+
             model_solution.add_lambda_variables(dmu_code, lambda_variables)
             self._process_duals(dmu_code, self.input_data.input_categories,
                                 model_solution.add_input_dual)
             self._process_duals(dmu_code, self.input_data.output_categories,
                                 model_solution.add_output_dual)
 
+    def _get_lambda_values(self):
+        ''' Returns non-zero values of lambda variables obtained in the
+            last solve.
+
+            Returns:
+                dict of str to double: dictionary that maps DMU codes
+                    to values of lambda variables.
+        '''
+        lambda_variables = dict()
+        for dmu in self.input_data.DMU_codes:
+            var = self._variables.get(dmu, None)
+            if (var is not None and var.varValue is not None and
+                    abs(var.varValue) > ZERO_TOLERANCE):
+                lambda_variables[dmu] = var.varValue
+        return lambda_variables
+
     def _process_duals(self, dmu_code, categories, func):
         ''' Helper function that adds duals to solution using given method func.
             Helps to avoid code duplication.
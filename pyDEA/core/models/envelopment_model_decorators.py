@@ -36,6 +36,23 @@ class EnvelopmentModelVRSDecorator(EnvelopmentModelBase):
                                              'VRS_constraint')
         self.lp_model = self._model_to_decorate.lp_model
 
+    def _add_lambda_variables(self, dmu_codes):
+        ''' Adds lambda variables of given DMUs to existing linear program
+            and to VRS constraint.
+
+            Args:
+                dmu_codes (list of str): DMU codes.
+
+            Returns:
+                dict of str to pulp.LpVariable: a dictionary that maps
+                    DMU codes to added lambda variables.
+        '''
+        variables = self._model_to_decorate._add_lambda_variables(dmu_codes)
+        constraint = self.lp_model.constraints['VRS_constraint']
+        for variable in variables.values():
+            constraint[variable] = 1
+        return variables
+
     def _create_solution(self):
         ''' Creates SolutionWithVRS instead of usual Solution in order to
             add extra information about VRS dual variable.
@@ -131,6 +148,18 @@ class DefaultConstraintCreator(object):
         '''
         return lhs >= rhs
 
+    def get_sense(self, category):
+        ''' Returns sense of the constraint created for a given category.
+
+            Args:
+                category(str): input or output category (it is not used by
+                    this class).
+
+            Returns:
+                int: pulp.LpConstraintGE.
+        '''
+        return pulp.LpConstraintGE
+
 
 class DisposableVarsConstraintCreator(object):
     ''' This is a helper class that creates constraints for envelopment model
@@ -162,6 +191,20 @@ class DisposableVarsConstraintCreator(object):
             return lhs == rhs
         return lhs >= rhs
 
+    def get_sense(self, category):
+        ''' Returns sense of the constraint created for a given category.
+
+            Args:
+                category (str): input or output category.
+
+            Returns:
+                int: pulp.LpConstraintEQ if category is weakly disposable,
+                    pulp.LpConstraintGE otherwise.
+        '''
+        if category in self.weakly_disposable_categories:
+            return pulp.LpConstraintEQ
+        return pulp.LpConstraintGE
+
 
 class EnvelopmentModelWithAbsoluteWeightRestrictions(EnvelopmentModelBase):
     ''' This class implements envelopment model with absolute weight
@@ -245,6 +288,11 @@ class EnvelopmentModelWithAbsoluteWeightRestrictions(EnvelopmentModelBase):
          #   self.lp_model += self.lp_model.objective >= 1
 
 
+    def _add_lambda_variables(self, dmu_codes):
+        ''' See base class.
+        '''
+        return self.model._add_lambda_variables(dmu_codes)
+
     def _update_lp(self, dmu_code):
         ''' See base class.
         '''
@@ -384,6 +432,11 @@ class EnvelopmentModelWithPriceRatioConstraints(EnvelopmentModelBase):
                 name = self.model._constraints[category_in_denom]
                 self.lp_model.constraints[name].addterm(variable, -upper_bound)
 
+    def _add_lambda_variables(self, dmu_codes):
+        ''' See base class.
+        '''
+        return self.model._add_lambda_variables(dmu_codes)
+
     def _create_solution(self):
         ''' See base class.
         '''
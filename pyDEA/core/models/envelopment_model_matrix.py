@@ -0,0 +1,153 @@
+''' This module contains envelopment model that assembles the data part
+    of the linear program with NumPy instead of pulp expressions.
+'''
+import numpy
+import pulp
+
+from pyDEA.core.models.envelopment_model_base import EnvelopmentModelBase
+from pyDEA.core.models.matrix_lp import MatrixLpProblem, MatrixLpVariable
+from pyDEA.core.utils.dea_utils import ZERO_TOLERANCE
+
+
+class EnvelopmentModelMatrixBase(EnvelopmentModelBase):
+    ''' Envelopment model that stores coefficients of lambda variables
+        in a dense NumPy matrix (see :mod:`pyDEA.core.models.matrix_lp`).
+        It produces the same solution as EnvelopmentModelBase, but
+        building the linear program does not create a pulp term
+        for every pair of DMU and category.
+        All decorators of EnvelopmentModelBase can be applied to this model.
+
+        Attributes:
+            _lambda_dmu_codes (list of str): DMU codes that correspond
+                to columns of the data block.
+            _lambda_columns (numpy.ndarray): columns of the LP template
+                that correspond to columns of the data block.
+
+        Args:
+            input_data (InputData): object that stores all data of
+                a DEA instance.
+            concrete_model: concrete implementation of the envelopment
+                model.
+            constraint_creator: object that creates a proper
+                constraint depending on presence of disposable variables.
+    '''
+    def __init__(self, input_data, concrete_model, constraint_creator):
+        super(EnvelopmentModelMatrixBase, self).__init__(
+            input_data, concrete_model, constraint_creator)
+        self._lambda_dmu_codes = []
+        self._lambda_columns = numpy.zeros(0, dtype=numpy.intp)
+
+    def _create_lp_problem(self, name, obj_type):
+        ''' See base class.
+        '''
+        return MatrixLpProblem(name, obj_type)
+
+    def _create_lambda_variables(self, dmu_codes):
+        ''' See base class.
+        '''
+        return MatrixLpVariable.dicts('lambda', dmu_codes, 0, None,
+                                      pulp.LpContinuous)
+
+    def _add_lambda_variables(self, dmu_codes):
+        ''' See base class. Lambda variables are added as new columns
+            of the data block.
+        '''
+        variables = self._create_lambda_variables(dmu_codes)
+        self._variables.update(variables)
+        template_columns = self.lp_template.get_columns(self.input_data,
+                                                        dmu_codes)
+        columns = numpy.zeros((len(self._constraints), len(dmu_codes)))
+        for category, name in self._constraints.items():
+            row = self.lp_template.get_row(self.input_data, category,
+                                           template_columns)
+            if category in self.input_data.input_categories:
+                row = -row
+            columns[self.lp_model.constraints[name].block_row] = row
+        self.lp_model.add_block_variables(
+            [variables[dmu] for dmu in dmu_codes], columns)
+        self._lambda_dmu_codes.extend(dmu_codes)
+        self._lambda_columns = numpy.concatenate(
+            (self._lambda_columns, template_columns))
+        return variables
+
+    def _get_data_row(self, category):
+        ''' Returns coefficients of a given category for all DMUs
+            that correspond to lambda variables.
+
+            Args:
+                category (str): input or output category.
+
+            Returns:
+                numpy.ndarray: array of coefficients.
+        '''
+        return self.lp_template.get_row(self.input_data, category,
+                                        self._lambda_columns)
+
+    def _add_constraints_for_outputs(self, variables, dmu_code,
+                                     obj_variable):
+        ''' See base class.
+        '''
+        # outputs are added first, so this is a good place to define
+        # columns of the data block
+        self._lambda_dmu_codes, self._lambda_columns = (
+            self.lp_template.get_ordered_columns(
+                self.input_data, [dmu for dmu in self.input_data.DMU_codes
+                                  if dmu in variables]))
+        self.lp_model.set_block_variables(
+            [variables[dmu] for dmu in self._lambda_dmu_codes])
+        for (count, output_category) in enumerate(
+                self.input_data.output_categories):
+            current_output = self.input_data.coefficients[(dmu_code,
+                                                          output_category)]
+            output_coeff = self._concrete_model.get_output_variable_coefficient(
+                obj_variable, output_category)
+            name = 'constraint_output_{count}'.format(count=count)
+            constraint = self.lp_model.add_block_constraint(
+                name, self._get_data_row(output_category),
+                self._constraint_creator.get_sense(output_category))
+            _add_term(constraint, output_coeff, -current_output)
+            self._constraints[output_category] = name
+
+    def _add_constraints_for_inputs(self, variables,
+                                    dmu_code, obj_variable):
+        ''' See base class.
+        '''
+        for (count, input_category) in enumerate(
+                self.input_data.input_categories):
+            current_input = self.input_data.coefficients[(dmu_code,
+                                                         input_category)]
+            input_coeff = self._concrete_model.get_input_variable_coefficient(
+                obj_variable, input_category)
+            name = 'constraint_input_{count}'.format(count=count)
+            constraint = self.lp_model.add_block_constraint(
+                name, -self._get_data_row(input_category),
+                self._constraint_creator.get_sense(input_category))
+            _add_term(constraint, input_coeff, current_input)
+            self._constraints[input_category] = name
+
+    def _get_lambda_values(self):
+        ''' See base class.
+        '''
+        values = self.lp_model.block_values
+        if values is None:
+            return dict()
+        return dict((self._lambda_dmu_codes[index], float(values[index]))
+                    for index in numpy.flatnonzero(
+                        numpy.abs(values) > ZERO_TOLERANCE))
+
+
+def _add_term(constraint, coefficient, value):
+    ''' Adds term coefficient * value to a given constraint.
+        If coefficient is a pulp variable, the term is added to
+        the left hand side, otherwise it is moved to the right hand side.
+
+        Args:
+            constraint (MatrixConstraint): constraint.
+            coefficient (double or pulp.LpVariable): coefficient returned by
+                the concrete model.
+            value (double): value of the current DMU.
+    '''
+    if isinstance(coefficient, pulp.LpVariable):
+        constraint.addterm(coefficient, value)
+    else:
+        constraint.changeRHS(constraint.rhs - coefficient * value)
@@ -0,0 +1,182 @@
+''' This module contains FrontierFirstModel class that implements
+    two-stage frontier-first algorithm for envelopment models.
+'''
+from pulp import LpStatusOptimal
+
+from pyDEA.core.models.envelopment_model_base import create_lp_with_lambdas
+from pyDEA.core.models.model_base import ModelBase
+from pyDEA.core.utils.dominance import get_dominated_dmus
+
+# DMUs with efficiency score above 1 - EFFICIENCY_TOLERANCE are
+# considered efficient, it is safe to consider more DMUs efficient
+EFFICIENCY_TOLERANCE = 1e-6
+DEFAULT_BLOCK_SIZE = 200
+
+
+class FrontierFirstModel(ModelBase):
+    ''' Decorator that solves envelopment models in two stages.
+
+        In the first stage efficient DMUs are identified.
+        DMUs are split into blocks and every DMU is compared only to DMUs
+        of its block. DMUs that are inefficient in their block are also
+        inefficient compared to all DMUs and they are discarded.
+        Blocks of remaining DMUs are merged and this is repeated until
+        all remaining DMUs fit into one block. Inefficient DMUs are
+        dominated by combinations of efficient DMUs, so remaining
+        DMUs span the same frontier as all DMUs.
+
+        If dominance filter is used, DMUs dominated by other DMUs are
+        discarded before the first stage.
+
+        In the second stage linear programs of all other DMUs contain
+        lambda variables of efficient DMUs only. Efficiency scores and
+        duals are the same as in the model with all DMUs, lambda variables
+        of inefficient DMUs are always zero.
+
+        Note:
+            The algorithm is valid only for envelopment models with strongly
+            disposable categories and without weight restrictions and
+            super efficiency.
+
+        Attributes:
+            model (ModelBase): envelopment model.
+            block_size (int): maximum number of DMUs in a block of the
+                first stage.
+            frontier (list of str): DMUs that were efficient in the
+                last run, only these DMUs are used in the second stage.
+            dominance_filter (bool): if True, dominated DMUs are discarded
+                before the first stage.
+
+        Args:
+            model (ModelBase): envelopment model.
+            block_size (int, optional): maximum number of DMUs in a block of
+                the first stage. Defaults to DEFAULT_BLOCK_SIZE.
+            dominance_filter (bool, optional): if True, dominated DMUs are
+                discarded before the first stage. Defaults to False.
+    '''
+    def __init__(self, model, block_size=DEFAULT_BLOCK_SIZE,
+                 dominance_filter=False):
+        if block_size < 2:
+            raise ValueError('Block size must be at least 2')
+        self.model = model
+        self.block_size = block_size
+        self.frontier = []
+        self.dominance_filter = dominance_filter
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    def _run_for_dmus(self, dmu_codes, model_solution):
+        ''' Identifies efficient DMUs among all DMUs of input data and
+            solves linear programs of given DMUs against them.
+
+            Args:
+                dmu_codes (list of str): DMU codes in the order in which
+                    they must be solved.
+                model_solution (Solution): solution.
+        '''
+        # solution of the first stage is not a part of the result, but
+        # it might replace the second solution of the two-phase model
+        second_solution = getattr(self.model, 'second_solution', None)
+        first_stage_solution = self.model._create_solution()
+        if second_solution is not None:
+            self.model.second_solution = second_solution
+        dmus_to_solve = set(dmu_codes)
+
+        candidates = self.input_data.DMU_codes
+        if self.dominance_filter:
+            candidates = candidates.difference(get_dominated_dmus(
+                self.input_data, candidates))
+        candidates = self._get_ordered_dmu_codes(candidates)
+        block_size = self.block_size
+        while len(candidates) > block_size:
+            survivors = []
+            for start in range(0, len(candidates), block_size):
+                block = candidates[start:start + block_size]
+                survivors.extend(self._solve_block(
+                    block, block, first_stage_solution))
+            if len(survivors) == len(candidates):
+                # all DMUs are efficient in their blocks,
+                # larger blocks are needed to discard anything
+                block_size *= 2
+            candidates = survivors
+        # remaining DMUs span the frontier, so these results are final
+        solved_dmus = [dmu_code for dmu_code in candidates
+                       if dmu_code in dmus_to_solve]
+        self.frontier = self._solve_block(candidates, solved_dmus,
+                                          model_solution, first_stage_solution)
+        for dmu_code in solved_dmus:
+            self.update_dmu_str_var()
+        for dmu_code, iterations in first_stage_solution.lp_iterations.items():
+            if dmu_code in dmus_to_solve:
+                model_solution.add_lp_iterations(dmu_code, iterations)
+        for dmu_code, seconds in first_stage_solution.lp_times.items():
+            if dmu_code in dmus_to_solve:
+                model_solution.add_lp_time(dmu_code, seconds)
+
+        solved_dmus = set(solved_dmus)
+        create_lp_with_lambdas(self, self.frontier)
+        for dmu_code in dmu_codes:
+            if dmu_code not in solved_dmus:
+                self.run_for_one_DMU(dmu_code, model_solution)
+                self.update_dmu_str_var()
+
+    def _solve_block(self, block, dmus_to_solve, model_solution,
+                     other_solution=None):
+        ''' Solves linear programs of all DMUs of a given block against
+            DMUs of this block.
+
+            Args:
+                block (list of str): DMU codes of the block.
+                dmus_to_solve (list of str): DMU codes whose results
+                    must be stored in model_solution.
+                model_solution (Solution): solution.
+                other_solution (Solution, optional): solution where
+                    results of other DMUs of the block are stored.
+                    Defaults to model_solution.
+
+            Returns:
+                list of str: DMUs of the block that are efficient or whose
+                    linear programs are not optimal.
+        '''
+        if other_solution is None:
+            other_solution = model_solution
+        dmus_to_solve = set(dmus_to_solve)
+        create_lp_with_lambdas(self, block)
+        efficient_dmus = []
+        for dmu_code in block:
+            if dmu_code in dmus_to_solve:
+                solution = model_solution
+            else:
+                solution = other_solution
+            self.run_for_one_DMU(dmu_code, solution)
+            if (solution.lp_status[dmu_code] != LpStatusOptimal or
+                    solution.get_efficiency_score(dmu_code) >
+                    1 - EFFICIENCY_TOLERANCE):
+                efficient_dmus.append(dmu_code)
+        return efficient_dmus
+
+    def _create_solution(self):
+        ''' See base class.
+        '''
+        return self.model._create_solution()
+
+    def run_for_one_DMU(self, dmu_code, model_solution):
+        ''' See base class.
+        '''
+        self.model.run_for_one_DMU(dmu_code, model_solution)
+
+    def _create_lp(self):
+        ''' See base class.
+        '''
+        self.model._create_lp()
+
+    def _update_lp(self, dmu_code):
+        ''' See base class.
+        '''
+        self.model._update_lp(dmu_code)
+
+    def _fill_solution(self, dmu_code, model_solution):
+        ''' See base class.
+        '''
+        self.model._fill_solution(dmu_code, model_solution)
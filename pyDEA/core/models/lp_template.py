@@ -0,0 +1,148 @@
+''' This module contains LpTemplate class that stores the data part of
+    constraint matrices of linear programs.
+'''
+import numpy
+
+
+class LpTemplate(object):
+    ''' Data part of constraint matrices of linear programs: coefficients
+        of every input and output category for all DMUs of input data.
+        Every row of the template is built once, when a model needs it
+        for the first time, and kept as NumPy array. Models created from
+        the same input data can share one template, e.g. CRS and VRS,
+        input- and output-oriented models created when RETURN_TO_SCALE
+        or ORIENTATION is set to both
+        (see :mod:`pyDEA.core.utils.model_builder`). These models differ
+        only in rows and columns they add to the data part, so the second
+        and next models take rows of the template instead of reading
+        coefficients of input data one by one.
+
+        Template does not store input data, it is passed to every method.
+        This way models with different DMU codes that share coefficients of
+        input data (see InputData.create_view) can share the template.
+        Rows of the template are not pickled, they are rebuilt
+        in the process where the model is unpickled.
+
+        Attributes:
+            _dmu_index (dict of str to int): maps DMU code to its column
+                in the template. Columns correspond to DMUs in the order
+                in which they were added to input data.
+            _rows (dict of str to numpy.ndarray): maps category to
+                coefficients of all DMUs.
+    '''
+    def __init__(self):
+        self._dmu_index = dict()
+        self._rows = dict()
+
+    def __getstate__(self):
+        ''' Returns empty template for pickling, rows are rebuilt on
+            demand.
+
+            Returns:
+                dict: attributes of the template.
+        '''
+        return dict(_dmu_index=dict(), _rows=dict())
+
+    def get_columns(self, input_data, dmu_codes):
+        ''' Returns columns of given DMUs in the template.
+
+            Args:
+                input_data (InputData): input data.
+                dmu_codes (iterable of str): DMU codes.
+
+            Returns:
+                numpy.ndarray: indices of columns in the same order as
+                    DMU codes.
+        '''
+        dmu_index = self._get_dmu_index(input_data)
+        return numpy.array([dmu_index[dmu_code] for dmu_code in dmu_codes],
+                           dtype=numpy.intp)
+
+    def get_ordered_columns(self, input_data, dmu_codes):
+        ''' Returns given DMUs and their columns in the template in the
+            order in which DMUs were added to input data. Iteration order
+            of a set of DMU codes depends on how the set was built, e.g.
+            copies of input data might iterate over the same DMUs in
+            different order. Linear programs with columns in this order
+            are the same for all copies.
+
+            Args:
+                input_data (InputData): input data.
+                dmu_codes (iterable of str): DMU codes.
+
+            Returns:
+                tuple of list of str, numpy.ndarray: ordered DMU codes and
+                    indices of their columns.
+        '''
+        columns = numpy.sort(self.get_columns(input_data, dmu_codes))
+        all_dmu_codes = input_data.DMU_codes_in_added_order
+        return [all_dmu_codes[column] for column in columns], columns
+
+    def get_row(self, input_data, category, columns):
+        ''' Returns coefficients of a given category for given columns.
+
+            Args:
+                input_data (InputData): input data.
+                category (str): input or output category.
+                columns (numpy.ndarray): indices of columns returned by
+                    get_columns.
+
+            Returns:
+                numpy.ndarray: array of coefficients, it can be modified
+                    by the caller.
+        '''
+        return self._get_row(input_data, category)[columns]
+
+    def get_rows(self, input_data, categories, columns):
+        ''' Returns coefficients of given categories for given columns.
+
+            Args:
+                input_data (InputData): input data.
+                categories (list of str): input or output categories.
+                columns (numpy.ndarray): indices of columns returned by
+                    get_columns.
+
+            Returns:
+                numpy.ndarray: matrix with one row per category and
+                    one column per DMU.
+        '''
+        rows = numpy.empty((len(categories), len(columns)))
+        for count, category in enumerate(categories):
+            rows[count] = self.get_row(input_data, category, columns)
+        return rows
+
+    def _get_dmu_index(self, input_data):
+        ''' Returns dictionary that maps DMU codes to columns of the
+            template. Template is cleared if DMUs were added to input data
+            after it was built.
+
+            Args:
+                input_data (InputData): input data.
+
+            Returns:
+                dict of str to int: maps DMU code to its column.
+        '''
+        dmu_codes = input_data.DMU_codes_in_added_order
+        if len(self._dmu_index) != len(dmu_codes):
+            self._rows = dict()
+            self._dmu_index = dict((dmu_code, count) for count, dmu_code
+                                   in enumerate(dmu_codes))
+        return self._dmu_index
+
+    def _get_row(self, input_data, category):
+        ''' Returns coefficients of a given category for all DMUs,
+            the row is built if it is not in the template yet.
+
+            Args:
+                input_data (InputData): input data.
+                category (str): input or output category.
+
+            Returns:
+                numpy.ndarray: array of coefficients.
+        '''
+        self._get_dmu_index(input_data)
+        row = self._rows.get(category, None)
+        if row is None:
+            row = input_data.get_values([category])[:, 0]
+            self._rows[category] = row
+        return row
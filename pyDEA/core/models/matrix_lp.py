@@ -0,0 +1,583 @@
+''' This module contains a linear program that stores the data part of
+    the constraint matrix as a NumPy array instead of pulp expressions.
+
+    MatrixLpProblem mimics the small subset of pulp.LpProblem interface that
+    is used by DEA models and their decorators (constraints dictionary,
+    objective, sense, status, deepcopy and solve). Rows of the data block
+    are added as dense arrays, while extra terms (e.g. efficiency score
+    variable, variables of weight restrictions or VRS constraint) are
+    stored as ordinary pulp terms. The whole problem is assembled into
+    arrays only when it is passed to the solver.
+
+    The problem records which rows, coefficients and bounds were changed
+    since the last solve, so that solver backends that keep the linear
+    program loaded (see :mod:`pyDEA.core.models.solver_backends`) can
+    apply only these changes instead of rebuilding the whole model.
+'''
+import numpy
+import pulp
+
+from pyDEA.core.models.solver_backends import get_default_backend
+
+
+class MatrixLpVariable(pulp.LpVariable):
+    ''' pulp variable that notifies MatrixLpProblem about changes of
+        its bounds. Used for block variables, since checking bounds of
+        all of them before every solve is too expensive.
+
+        Args:
+            name (str): name of the variable.
+            lowBound (double, optional): lower bound. Defaults to None.
+            upBound (double, optional): upper bound. Defaults to None.
+            cat (str, optional): category of the variable.
+                Defaults to pulp.LpContinuous.
+    '''
+    def __init__(self, name, lowBound=None, upBound=None,
+                 cat=pulp.LpContinuous):
+        self._problems = []
+        super(MatrixLpVariable, self).__init__(name, lowBound, upBound, cat)
+
+    def __setattr__(self, name, value):
+        super(MatrixLpVariable, self).__setattr__(name, value)
+        if name == 'lowBound' or name == 'upBound':
+            for problem in self._problems:
+                problem.bounds_changed(self)
+
+    def __getstate__(self):
+        ''' Returns attributes for pickling. Problems are not pickled with
+            the variable, they register themselves again after unpickling.
+
+            Returns:
+                dict: attributes of the variable.
+        '''
+        state = self.__dict__.copy()
+        state['_problems'] = []
+        return state
+
+    def add_problem(self, problem):
+        ''' Registers problem that must be notified about changes
+            of bounds.
+
+            Args:
+                problem (MatrixLpProblem): problem that uses this variable.
+        '''
+        self._problems.append(problem)
+
+    @classmethod
+    def dicts(cls, name, indices, lowBound=None, upBound=None,
+              cat=pulp.LpContinuous):
+        ''' Creates a dictionary of variables in the same way as
+            pulp.LpVariable.dicts with one index.
+
+            Args:
+                name (str): prefix of variable names.
+                indices (list of str): keys of the dictionary.
+                lowBound (double, optional): lower bound. Defaults to None.
+                upBound (double, optional): upper bound. Defaults to None.
+                cat (str, optional): category of variables.
+                    Defaults to pulp.LpContinuous.
+
+            Returns:
+                dict of str to MatrixLpVariable: created variables.
+        '''
+        return dict((index, cls('{0}_{1}'.format(name, index), lowBound,
+                                upBound, cat)) for index in indices)
+
+
+class MatrixConstraint(object):
+    ''' Constraint of MatrixLpProblem. Implements methods of
+        pulp.LpConstraint that are used by DEA models.
+
+        Constraint has the form:
+            block_row * block_variables + sum(terms) sense rhs.
+
+        Attributes:
+            problem (MatrixLpProblem): problem that owns this constraint.
+            block_row (int or None): index of the row of the data block or
+                None if constraint does not have coefficients
+                in the data block.
+            terms (dict of pulp.LpVariable to double): coefficients of
+                variables that are not part of the data block.
+            sense (int): pulp.LpConstraintGE, pulp.LpConstraintLE or
+                pulp.LpConstraintEQ.
+            rhs (double): right hand side of the constraint.
+            pi (double): value of the dual variable, it is set after
+                the problem is solved.
+
+        Args:
+            problem (MatrixLpProblem): problem that owns this constraint.
+            sense (int): pulp.LpConstraintGE, pulp.LpConstraintLE or
+                pulp.LpConstraintEQ.
+            block_row (int, optional): index of the row of the data block.
+                Defaults to None.
+    '''
+    def __init__(self, problem, sense, block_row=None):
+        self.problem = problem
+        self.block_row = block_row
+        self.terms = dict()
+        self._sense = sense
+        self.rhs = 0
+        self.pi = None
+
+    @property
+    def sense(self):
+        return self._sense
+
+    @sense.setter
+    def sense(self, sense):
+        self._sense = sense
+        self.problem.row_changed(self)
+
+    def changeRHS(self, rhs):
+        ''' Changes right hand side of the constraint.
+
+            Args:
+                rhs (double): new value of the right hand side.
+        '''
+        self.rhs = rhs
+        self.problem.row_changed(self)
+
+    def addterm(self, variable, coefficient):
+        ''' Adds a given coefficient to the coefficient of a given variable.
+
+            Args:
+                variable (pulp.LpVariable): variable.
+                coefficient (double): coefficient.
+        '''
+        self[variable] = self[variable] + coefficient
+
+    def __getitem__(self, variable):
+        index = self.problem.get_block_index(variable)
+        if index is not None and self.block_row is not None:
+            return self.problem.get_block_coefficient(self.block_row, index)
+        return self.terms.get(variable, 0)
+
+    def __setitem__(self, variable, coefficient):
+        index = self.problem.get_block_index(variable)
+        if index is not None and self.block_row is not None:
+            self.problem.set_block_coefficient(self.block_row, index,
+                                               coefficient)
+        else:
+            self.terms[variable] = coefficient
+        self.problem.coefficient_changed(self, variable)
+
+    def copy(self, problem):
+        ''' Creates a copy of this constraint that belongs to a given problem.
+
+            Args:
+                problem (MatrixLpProblem): problem that owns the copy.
+
+            Returns:
+                MatrixConstraint: copy of the constraint.
+        '''
+        constraint = MatrixConstraint(problem, self.sense, self.block_row)
+        constraint.terms = self.terms.copy()
+        constraint.rhs = self.rhs
+        return constraint
+
+
+class MatrixLpProblem(object):
+    ''' Linear program with a dense data block.
+
+        Columns of the data block correspond to block variables
+        (usually lambda variables of the envelopment model), rows of the
+        data block are added with add_block_constraint. All other
+        coefficients are stored in constraints as pulp terms.
+
+        Attributes:
+            name (str): name of the problem.
+            sense (int): pulp.LpMinimize or pulp.LpMaximize.
+            objective (pulp.LpAffineExpression): objective function.
+            constraints (dict of str to MatrixConstraint): constraints
+                of the problem, keys are constraint names.
+            status (int): pulp status of the last solve.
+            block_values (numpy.ndarray): values of block variables
+                obtained in the last solve.
+            iterations (int): number of simplex iterations of the last
+                solve.
+            _block_variables (list of pulp.LpVariable): variables that
+                correspond to columns of the data block.
+            _block_index (dict of pulp.LpVariable to int): maps
+                block variables to column indices.
+            _block_rows (list of numpy.ndarray): rows of the data block.
+            solver_model: state that solver backend keeps between solves,
+                e.g. loaded HiGHS model.
+            structure_changed (bool): True if rows were added since the
+                last solve or block variables were replaced.
+            added_block_variables (list of pulp.LpVariable): block variables
+                added with add_block_variables since the last solve.
+            changed_rows (dict of MatrixConstraint to None): constraints
+                whose right hand side or sense were changed since the last
+                solve.
+            changed_coefficients (dict of MatrixConstraint to dict): maps
+                constraints to variables whose coefficients were changed
+                since the last solve.
+            changed_bounds (dict of MatrixLpVariable to None): block
+                variables whose bounds were changed since the last solve.
+
+        Args:
+            name (str): name of the problem.
+            sense (int): pulp.LpMinimize or pulp.LpMaximize.
+    '''
+    def __init__(self, name, sense):
+        self.name = name
+        self.sense = sense
+        self.objective = pulp.LpAffineExpression()
+        self.constraints = dict()
+        self.status = pulp.LpStatusNotSolved
+        self.block_values = None
+        self.iterations = 0
+        self._block_variables = []
+        self._block_index = dict()
+        self._block_rows = []
+        self._block = None
+        self.solver_model = None
+        self.structure_changed = True
+        self.added_block_variables = []
+        self.changed_rows = dict()
+        self.changed_coefficients = dict()
+        self.changed_bounds = dict()
+
+    def __getstate__(self):
+        ''' Returns attributes for pickling. Model loaded into solver
+            cannot be pickled, it is loaded again after unpickling.
+
+            Returns:
+                dict: attributes of the problem.
+        '''
+        state = self.__dict__.copy()
+        state['solver_model'] = None
+        state['structure_changed'] = True
+        return state
+
+    def __setstate__(self, state):
+        ''' Restores pickled problem.
+
+            Args:
+                state (dict): attributes of the problem.
+        '''
+        self.__dict__.update(state)
+        for variable in self._block_variables:
+            if isinstance(variable, MatrixLpVariable):
+                variable.add_problem(self)
+
+    def set_block_variables(self, variables):
+        ''' Sets variables that correspond to columns of the data block.
+            Must be called before any rows are added.
+
+            Args:
+                variables (list of pulp.LpVariable): block variables.
+        '''
+        assert len(self._block_rows) == 0
+        self._block_variables = list(variables)
+        self._block_index = dict((variable, index) for index, variable in
+                                 enumerate(self._block_variables))
+        for variable in self._block_variables:
+            if isinstance(variable, MatrixLpVariable):
+                variable.add_problem(self)
+        self.structure_changed = True
+
+    def add_block_variables(self, variables, columns):
+        ''' Adds new columns to the data block. Coefficients of new
+            variables in constraints outside the data block can be set
+            afterwards.
+
+            Args:
+                variables (list of pulp.LpVariable): variables that
+                    correspond to new columns.
+                columns (numpy.ndarray): coefficients of new variables
+                    with one row per row of the data block.
+        '''
+        columns = numpy.asarray(columns, dtype=float)
+        assert columns.shape == (len(self._block_rows), len(variables))
+        self._block_rows = [numpy.concatenate((row, column)) for row, column
+                            in zip(self._block_rows, columns)]
+        self._block = None
+        for variable in variables:
+            self._block_index[variable] = len(self._block_variables)
+            self._block_variables.append(variable)
+            if isinstance(variable, MatrixLpVariable):
+                variable.add_problem(self)
+        self.added_block_variables.extend(variables)
+
+    def add_block_constraint(self, name, row, sense):
+        ''' Adds constraint whose coefficients of block variables
+            are given by row.
+
+            Args:
+                name (str): name of the constraint.
+                row (numpy.ndarray): coefficients of block variables.
+                sense (int): pulp.LpConstraintGE, pulp.LpConstraintLE or
+                    pulp.LpConstraintEQ.
+
+            Returns:
+                MatrixConstraint: created constraint.
+        '''
+        row = numpy.asarray(row, dtype=float)
+        assert row.shape == (len(self._block_variables), )
+        self._block_rows.append(row)
+        self._block = None
+        constraint = MatrixConstraint(self, sense, len(self._block_rows) - 1)
+        self.constraints[name] = constraint
+        self.structure_changed = True
+        return constraint
+
+    def get_block_variables(self):
+        ''' Returns variables that correspond to columns of the data block.
+
+            Returns:
+                list of pulp.LpVariable: block variables.
+        '''
+        return list(self._block_variables)
+
+    def get_block_index(self, variable):
+        ''' Returns column index of a given variable in the data block.
+
+            Args:
+                variable (pulp.LpVariable): variable.
+
+            Returns:
+                int: column index or None if variable is not a block variable.
+        '''
+        return self._block_index.get(variable, None)
+
+    def get_block(self):
+        ''' Returns the data block as a 2-dimensional array.
+
+            Returns:
+                numpy.ndarray: data block.
+        '''
+        if self._block is None:
+            if self._block_rows:
+                self._block = numpy.vstack(self._block_rows)
+            else:
+                self._block = numpy.zeros((0, len(self._block_variables)))
+            self._block_rows = list(self._block)
+        return self._block
+
+    def get_block_coefficient(self, row, column):
+        ''' Returns coefficient of the data block.
+
+            Args:
+                row (int): row index.
+                column (int): column index.
+
+            Returns:
+                double: coefficient.
+        '''
+        return self._block_rows[row][column]
+
+    def set_block_coefficient(self, row, column, value):
+        ''' Changes coefficient of the data block.
+
+            Args:
+                row (int): row index.
+                column (int): column index.
+                value (double): new coefficient.
+        '''
+        self._block_rows[row][column] = value
+
+    def __iadd__(self, other):
+        ''' Adds constraint or objective function in the same way
+            as pulp.LpProblem does.
+
+            Args:
+                other (tuple or pulp.LpConstraint or pulp.LpAffineExpression
+                    or pulp.LpVariable): either constraint or objective
+                    function with an optional name.
+        '''
+        name = None
+        if isinstance(other, tuple):
+            other, name = other
+        if isinstance(other, pulp.LpConstraint):
+            self._add_constraint(other, name)
+        elif isinstance(other, pulp.LpVariable):
+            self.objective = pulp.LpAffineExpression(other)
+        else:
+            self.objective = pulp.LpAffineExpression(other)
+        return self
+
+    def _add_constraint(self, lp_constraint, name):
+        ''' Converts pulp constraint to MatrixConstraint and adds it to
+            the problem.
+
+            Args:
+                lp_constraint (pulp.LpConstraint): constraint.
+                name (str): name of the constraint.
+        '''
+        if name is None:
+            name = '_C{0}'.format(len(self.constraints) + 1)
+        constraint = MatrixConstraint(self, lp_constraint.sense)
+        for variable, coefficient in lp_constraint.items():
+            constraint.addterm(variable, coefficient)
+        constraint.changeRHS(-lp_constraint.constant)
+        self.constraints[name] = constraint
+        self.structure_changed = True
+
+    def row_changed(self, constraint):
+        ''' Records that right hand side or sense of a given constraint
+            was changed.
+
+            Args:
+                constraint (MatrixConstraint): changed constraint.
+        '''
+        self.changed_rows[constraint] = None
+
+    def coefficient_changed(self, constraint, variable):
+        ''' Records that coefficient of a given variable in a given
+            constraint was changed.
+
+            Args:
+                constraint (MatrixConstraint): changed constraint.
+                variable (pulp.LpVariable): variable.
+        '''
+        self.changed_coefficients.setdefault(constraint, dict())[
+            variable] = None
+
+    def bounds_changed(self, variable):
+        ''' Records that bounds of a given block variable were changed.
+
+            Args:
+                variable (MatrixLpVariable): changed variable.
+        '''
+        self.changed_bounds[variable] = None
+
+    def clear_changes(self):
+        ''' Forgets all recorded changes. Called by solver backends
+            after the changes were applied.
+        '''
+        self.structure_changed = False
+        self.added_block_variables = []
+        self.changed_rows.clear()
+        self.changed_coefficients.clear()
+        self.changed_bounds.clear()
+
+    def deepcopy(self):
+        ''' Creates a copy of the problem. Variables are shared between
+            the problem and its copy as in pulp.LpProblem.deepcopy.
+
+            Returns:
+                MatrixLpProblem: copy of the problem.
+        '''
+        problem = MatrixLpProblem(self.name, self.sense)
+        problem.objective = self.objective.copy()
+        problem.set_block_variables(self._block_variables)
+        problem._block_rows = [row.copy() for row in self._block_rows]
+        for name, constraint in self.constraints.items():
+            problem.constraints[name] = constraint.copy(problem)
+        return problem
+
+    def _get_extra_variables(self):
+        ''' Returns variables that are not part of the data block.
+
+            Returns:
+                list of pulp.LpVariable: variables in the order of
+                    appearance.
+        '''
+        extra_variables = dict()
+        for constraint in self.constraints.values():
+            for variable in constraint.terms:
+                if variable not in self._block_index:
+                    extra_variables[variable] = None
+        for variable in self.objective:
+            if variable not in self._block_index:
+                extra_variables[variable] = None
+        return list(extra_variables)
+
+    def get_arrays(self):
+        ''' Assembles the problem in the matrix form.
+
+            Returns:
+                tuple: objective vector, constraint matrix,
+                    array with senses of constraints, right hand side vector,
+                    lower bounds, upper bounds and list of extra variables.
+                    Block variables come first in the matrix.
+        '''
+        extra_variables = self._get_extra_variables()
+        nb_block = len(self._block_variables)
+        column_index = dict((variable, nb_block + index) for index, variable
+                            in enumerate(extra_variables))
+        column_index.update(self._block_index)
+        nb_columns = nb_block + len(extra_variables)
+        block = self.get_block()
+        matrix = numpy.zeros((len(self.constraints), nb_columns))
+        senses = numpy.zeros(len(self.constraints), dtype=int)
+        rhs = numpy.zeros(len(self.constraints))
+        for row, constraint in enumerate(self.constraints.values()):
+            if constraint.block_row is not None:
+                matrix[row, :nb_block] = block[constraint.block_row]
+            for variable, coefficient in constraint.terms.items():
+                matrix[row, column_index[variable]] += coefficient
+            senses[row] = constraint.sense
+            rhs[row] = constraint.rhs
+        costs = numpy.zeros(nb_columns)
+        for variable, coefficient in self.objective.items():
+            costs[column_index[variable]] += coefficient
+        variables = self._block_variables + extra_variables
+        lower_bounds = numpy.array(
+            [-numpy.inf if var.lowBound is None else var.lowBound
+             for var in variables], dtype=float)
+        upper_bounds = numpy.array(
+            [numpy.inf if var.upBound is None else var.upBound
+             for var in variables], dtype=float)
+        return (costs, matrix, senses, rhs, lower_bounds, upper_bounds,
+                extra_variables)
+
+    def solve(self, solver=None):
+        ''' Solves the problem.
+
+            Args:
+                solver (optional): solver backend from
+                    :mod:`pyDEA.core.models.solver_backends`. If not given,
+                    backend returned by get_default_backend is used.
+
+            Returns:
+                int: pulp status of the solution.
+        '''
+        if solver is None:
+            solver = get_default_backend()
+        return solver.solve(self)
+
+    def set_solution(self, status, values, duals, extra_variables):
+        ''' Stores solution obtained from the solver.
+
+            Args:
+                status (int): pulp status of the solution.
+                values (numpy.ndarray): values of all variables,
+                    block variables come first. Ignored if status
+                    is not optimal.
+                duals (numpy.ndarray): values of dual variables in the order
+                    of constraints. Ignored if status is not optimal.
+                extra_variables (list of pulp.LpVariable): variables that
+                    are not part of the data block.
+        '''
+        self.status = status
+        if status != pulp.LpStatusOptimal:
+            self.block_values = None
+            for constraint in self.constraints.values():
+                constraint.pi = 0.0
+            return
+        for constraint, dual in zip(self.constraints.values(), duals):
+            constraint.pi = float(dual)
+        self.set_values(values, extra_variables)
+
+    def set_values(self, values, extra_variables):
+        ''' Stores values of variables obtained from the solver.
+            Values of block variables are stored in block_values array,
+            values of other variables are written to varValue attributes.
+
+            Args:
+                values (numpy.ndarray): values of all variables,
+                    block variables come first.
+                extra_variables (list of pulp.LpVariable): variables that
+                    are not part of the data block.
+        '''
+        nb_block = len(self._block_variables)
+        self.block_values = numpy.array(values[:nb_block], dtype=float)
+        for variable, value in zip(extra_variables, values[nb_block:]):
+            variable.varValue = float(value)
+        for variable in self.objective:
+            index = self._block_index.get(variable, None)
+            if index is not None:
+                variable.varValue = float(self.block_values[index])
+
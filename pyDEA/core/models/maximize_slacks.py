@@ -4,11 +4,39 @@
 import pulp
 
 from pyDEA.core.models.envelopment_model_base import EnvelopmentModelBase
+from pyDEA.core.models.model_base import solve_lp
+from pyDEA.core.models.super_efficiency_model import SupperEfficiencyModel
+
+# constraints whose dual values are larger than this value in absolute
+# terms have zero slack in every optimal solution of the first phase
+DUAL_TOLERANCE = 1e-9
+# variables of the objective function of the first phase are fixed to
+# their optimal values with this relative tolerance in the second phase,
+# since solvers might report these values rounded
+OBJECTIVE_TOLERANCE = 1e-7
 
 
 class MaximizeSlacksModel(EnvelopmentModelBase):
     ''' Implements a two-phase model.
 
+        Both phases are solved with the same linear program. Slack
+        variables are added to constraints of strongly disposable
+        categories when linear program is created, their upper bounds
+        are zero in the first phase. In the second phase variables of
+        the objective function of the first phase are fixed to their
+        optimal values, slack variables are released and their sum is
+        maximised. Then the objective function, bounds and slack
+        variables of the first phase are restored. The second phase
+        starts from the optimal solution of the first phase, so solvers
+        that keep linear program loaded (e.g. HiGHS backend of the matrix
+        engine) continue from the optimal basis of the first phase.
+
+        The second phase is skipped if dual values of all constraints
+        with slack variables are not zero, since by complementary
+        slackness all slacks are zero in every optimal solution of the
+        first phase. Then the solution of the first phase is stored in the
+        solution of the second phase.
+
         Attributes:
             strongly_disposal_input_categories (set of str): set
                 of strongly disposal input categories.
@@ -18,7 +46,8 @@ class MaximizeSlacksModel(EnvelopmentModelBase):
                 two-phase model.
             second_solution (Solution): solution obtained after second
                 phase.
-            lp_model_max_slack (pulp.LpProblem): pulp LP.
+            _slack_variables (dict of str to pulp.LpVariable): maps
+                strongly disposable categories to slack variables.
 
         Args:
             model (EnvelopmentModelBase): envelopment model.
@@ -36,7 +65,7 @@ class MaximizeSlacksModel(EnvelopmentModelBase):
             weakly_disposable_categories)
         self.model = model
         self.second_solution = None
-        self.lp_model_max_slack = None
+        self._slack_variables = dict()
 
     def __getattr__(self, name):
         return getattr(self.model, name)
@@ -45,24 +74,81 @@ class MaximizeSlacksModel(EnvelopmentModelBase):
         ''' See base class.
         '''
         self.model.run_for_one_DMU(dmu_code, model_solution)
-        lp_model_copy = self.model.lp_model
-        self.model.lp_model = self.lp_model_max_slack
-        self.model._update_lp(dmu_code)
-        self.model.lp_model = lp_model_copy
-        self.lp_model_max_slack.solve()
-        self.model._should_add_efficiency = False  # keep efficiency
-         # calculated previously
         assert(self.second_solution is not None)
-        lp_model_copy = self.model.lp_model
-        self.model.lp_model = self.lp_model_max_slack
-        self.model._fill_solution(dmu_code, self.second_solution)
-        # sometimes
-        # we can have optimal solution in second phase for a DMU
-        # for which we had unbounded solution in the first phase
-        self.second_solution.efficiency_scores[dmu_code] = float('inf')
-        self.model._should_add_efficiency = True
-        self.fill_efficiency(model_solution)
-        self.model.lp_model = lp_model_copy
+        if (self.lp_model.status != pulp.LpStatusOptimal or
+                self._slacks_are_zero()):
+            self.model._fill_solution(dmu_code, self.second_solution)
+            if self.lp_model.status == pulp.LpStatusOptimal:
+                self.second_solution.add_skipped_lp(dmu_code)
+            return
+        # the DMU is excluded from the reference set in the first
+        # phase of super efficiency model, it must be excluded
+        # in the second phase too
+        exclude_dmu = (isinstance(self.model, SupperEfficiencyModel) and
+                       len(self.input_data.DMU_codes) > 1)
+        if exclude_dmu:
+            self.model._exclude_dmu(dmu_code)
+        try:
+            self._solve_second_phase(dmu_code, model_solution)
+        finally:
+            if exclude_dmu:
+                self.model._restore_dmu(dmu_code)
+
+    def _slacks_are_zero(self):
+        ''' Checks if dual values of the first phase prove that all
+            slack variables are zero in every optimal solution.
+
+            Returns:
+                bool: True if all slacks are zero, False otherwise.
+        '''
+        for category in self._slack_variables:
+            dual = self.lp_model.constraints[self._constraints[category]].pi
+            if dual is None or abs(dual) <= DUAL_TOLERANCE:
+                return False
+        return True
+
+    def _solve_second_phase(self, dmu_code, model_solution):
+        ''' Solves the second phase for a given DMU from the optimal
+            solution of the first phase and stores results in
+            second_solution. Time limit of the DMU covers both phases.
+
+            Args:
+                dmu_code (str): DMU code.
+                model_solution (Solution): solution of the first phase.
+        '''
+        objective = self.lp_model.objective
+        sense = self.lp_model.sense
+        fixed_variables = [(variable, variable.varValue, variable.lowBound,
+                            variable.upBound) for variable in objective]
+        for variable, value, _, _ in fixed_variables:
+            tolerance = OBJECTIVE_TOLERANCE * max(1, abs(value))
+            variable.lowBound = value - tolerance
+            variable.upBound = value + tolerance
+        for variable in self._slack_variables.values():
+            variable.upBound = None
+        self.lp_model.objective = pulp.lpSum(
+            list(self._slack_variables.values()))
+        self.lp_model.sense = pulp.LpMaximize
+        try:
+            solve_lp(self.lp_model, self.solver, dmu_code,
+                     self.second_solution, self.time_budget,
+                     model_solution.lp_times.get(dmu_code, 0))
+        finally:
+            self.lp_model.objective = objective
+            self.lp_model.sense = sense
+        try:
+            # objective function of the first phase is restored and
+            # its variables get their values of the first phase, so
+            # efficiency score of the first phase is stored
+            for variable, value, _, _ in fixed_variables:
+                variable.varValue = value
+            self.model._fill_solution(dmu_code, self.second_solution)
+        finally:
+            for variable, _, lower_bound, upper_bound in fixed_variables:
+                variable.lowBound = lower_bound
+                variable.upBound = upper_bound
+            for variable in self._slack_variables.values():
+                variable.upBound = 0
 
     # we need to explicitly redirect all calls to model since this class
     # inherits from EnvelopmentModelBase and all methods are defined there.
@@ -70,42 +156,43 @@ class MaximizeSlacksModel(EnvelopmentModelBase):
     # redefined methods are called, we have to explicitly redirect calls to
     # stored model.
     def _create_lp(self):
-        ''' See base class.
+        ''' See base class. Slack variables with zero upper bounds are
+            added to constraints of strongly disposable categories.
         '''
         self.model._create_lp()
-        self.lp_model_max_slack = self.model.lp_model.deepcopy()
-
-        input_slack_vars = pulp.LpVariable.dicts(
-            'input_slack', self.strongly_disposal_input_categories,
-            0, None, pulp.LpContinuous)
-        output_slack_vars = pulp.LpVariable.dicts(
-            'output_slack', self.strongly_disposal_output_categories,
-            0, None, pulp.LpContinuous)
-
-        # change objective function
-        self.lp_model_max_slack.sense = pulp.LpMaximize
-        self.lp_model_max_slack.objective = (
-            pulp.lpSum(list(input_slack_vars.values())) +
-            pulp.lpSum(list(output_slack_vars.values())))
-
-        # change constraints
-        for input_category in self.strongly_disposal_input_categories:
-            name = self.model._constraints[input_category]
-            self.lp_model_max_slack.constraints[name].addterm(
-                input_slack_vars[input_category], 1)
-            self.lp_model_max_slack.constraints[name].sense = pulp.LpConstraintEQ
-
-        for output_category in self.strongly_disposal_output_categories:
-            name = self.model._constraints[output_category]
-            self.lp_model_max_slack.constraints[name].addterm(
-                output_slack_vars[output_category], -1)
-            self.lp_model_max_slack.constraints[name].sense = pulp.LpConstraintEQ
+        self._slack_variables.clear()
+        for categories, name in [
+                (self.strongly_disposal_input_categories, 'input_slack'),
+                (self.strongly_disposal_output_categories, 'output_slack')]:
+            for category, variable in pulp.LpVariable.dicts(
+                    name, sorted(categories), 0, 0,
+                    pulp.LpContinuous).items():
+                # constraints have the form lhs >= 0, where lhs is
+                # the slack of the category
+                self.lp_model.constraints[
+                    self.model._constraints[category]].addterm(variable, -1)
+                self._slack_variables[category] = variable
 
     def _update_lp(self, dmu_code):
         ''' See base class.
         '''
         self.model._update_lp(dmu_code)
 
+    def _add_reference_dmus(self, dmu_codes):
+        ''' See base class.
+        '''
+        self.model._add_reference_dmus(dmu_codes)
+
+    def _exclude_dmu(self, dmu_code):
+        ''' See base class.
+        '''
+        self.model._exclude_dmu(dmu_code)
+
+    def _restore_dmu(self, dmu_code):
+        ''' See base class.
+        '''
+        self.model._restore_dmu(dmu_code)
+
     def _add_constraints_for_outputs(self, variables, dmu_code,
                                      obj_variable):
         ''' See base class.
@@ -135,14 +222,3 @@ class MaximizeSlacksModel(EnvelopmentModelBase):
         '''
         self.second_solution = self.model._create_solution()
         return self.model._create_solution()
-
-    def fill_efficiency(self, model_solution):
-        ''' Copies efficiency scores from the solution obtained from
-            the first phase to the solution of the second phase.
-
-            Args:
-                model_solution (Solution): solution obtained from the
-                    first phase.
-        '''
-        for dmu_code, score in model_solution.efficiency_scores.items():
-            self.second_solution.add_efficiency_score(dmu_code, score)
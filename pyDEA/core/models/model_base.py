@@ -1,8 +1,14 @@
 ''' This module contains an abstract base class for all
     models.
 '''
+import time
 
+import pulp
+
+from pyDEA.core.data_processing.lambda_matrix import LambdaMatrix
 from pyDEA.core.data_processing.solution import Solution
+from pyDEA.core.data_processing.solution import LP_STATUS_TIME_LIMIT
+from pyDEA.core.models.lp_template import LpTemplate
 from pyDEA.core.utils.dea_utils import check_input_and_output_categories
 
 
@@ -12,6 +18,94 @@ def do_nothing():
     pass
 
 
+def add_lp_iterations(lp_model, dmu_code, model_solution):
+    ''' Adds number of simplex iterations of the last solve to
+        a given solution if linear program reports it.
+
+        Args:
+            lp_model (pulp.LpProblem or MatrixLpProblem): solved linear
+                program.
+            dmu_code (str): DMU code.
+            model_solution (Solution): solution.
+    '''
+    iterations = getattr(lp_model, 'iterations', None)
+    if iterations is not None:
+        model_solution.add_lp_iterations(dmu_code, iterations)
+
+
+def solve_lp(lp_model, solver, dmu_code, model_solution, time_budget=None,
+             spent_time=0):
+    ''' Solves a given linear program and adds wall time of the solve
+        and number of simplex iterations to a given solution.
+
+        If time budget is given, time limit of the solver is reduced to
+        the time left for the DMU. The linear program is not solved if no
+        time is left. In both cases status of the linear program is set to
+        LP_STATUS_TIME_LIMIT.
+
+        Args:
+            lp_model (pulp.LpProblem or MatrixLpProblem): linear program.
+            solver (pulp.LpSolver or solver backend): solver created by
+                :func:`pyDEA.core.models.solver_registry.create_solver`
+                or None if the default solver must be used.
+            dmu_code (str): DMU code.
+            model_solution (Solution): solution.
+            time_budget (TimeBudget, optional): time limits of DMUs and
+                the run. Defaults to None, i.e. only the time limit of
+                the solver applies.
+            spent_time (double, optional): time in seconds spent on
+                linear programs of the DMU that are stored in another
+                solution, e.g. in the first phase of two phase model.
+                Defaults to 0.
+    '''
+    solver_time_limit = getattr(solver, 'time_limit', None)
+    time_limit = solver_time_limit
+    if time_budget is not None:
+        time_limit = time_budget.get_time_limit(
+            spent_time + model_solution.lp_times.get(dmu_code, 0))
+        if time_limit is not None and time_limit <= 0:
+            lp_model.status = LP_STATUS_TIME_LIMIT
+            return
+        if solver_time_limit is not None and (
+                time_limit is None or solver_time_limit < time_limit):
+            time_limit = solver_time_limit
+        solver.time_limit = time_limit
+    start_time = time.perf_counter()
+    try:
+        lp_model.solve(solver)
+    finally:
+        if time_budget is not None:
+            solver.time_limit = solver_time_limit
+    seconds = time.perf_counter() - start_time
+    model_solution.add_lp_time(dmu_code, seconds)
+    add_lp_iterations(lp_model, dmu_code, model_solution)
+    # solvers report different statuses when they are stopped
+    if (time_limit is not None and seconds >= time_limit and
+            lp_model.status != pulp.LpStatusOptimal):
+        lp_model.status = LP_STATUS_TIME_LIMIT
+
+
+def creates_one_lp(model):
+    ''' Checks if a given model and all models decorated by it
+        create one linear program for all DMUs, i.e. none of them
+        overrides ModelBase._run_for_dmus. It is not true for decorators
+        that solve DMUs against different sets of DMUs, for example,
+        for categorical and parallel models.
+
+        Args:
+            model (ModelBase): DEA model.
+
+        Returns:
+            bool: True if one linear program is created for all DMUs,
+                False otherwise.
+    '''
+    while model is not None:
+        if type(model)._run_for_dmus is not ModelBase._run_for_dmus:
+            return False
+        model = vars(model).get('model', None)
+    return True
+
+
 class ModelBase(object):
     ''' Abstract base class for some of the DEA models.
 
@@ -20,6 +114,28 @@ class ModelBase(object):
             update_dmu_str_var (func): function that updates
                 solution progress.
             lp_model (pulp.LpProblem): pulp LP.
+            dmu_ordering (func): function that takes input data and
+                DMU codes and returns DMU codes in the order in which
+                linear programs must be solved. If None, DMUs are solved
+                in the order in which they were added to input data.
+            inefficiency_screen (func): function that takes input data,
+                DMU codes and codes of reference DMUs and returns DMUs
+                that are certainly not efficient compared to reference
+                DMUs without solving linear programs. It is used by peel
+                the onion. If None, all linear programs are solved.
+            lp_template (LpTemplate): data part of the constraint matrix,
+                it might be shared with other models created from the same
+                input data.
+            solver (pulp.LpSolver or solver backend): solver selected with
+                parameter SOLVER (see
+                :mod:`pyDEA.core.models.solver_registry`) or None if the
+                default solver of the linear program must be used.
+            time_budget (TimeBudget): time limits of DMUs and of the run
+                or None if there are no limits, see
+                :mod:`pyDEA.core.utils.time_budget`.
+            use_lambda_file (bool): if True, lambda variables of solutions
+                are stored in a memory-mapped file instead of memory,
+                see :mod:`pyDEA.core.data_processing.lambda_matrix`.
 
         Args:
             input_data (InputData): object that stores all input data.
@@ -30,18 +146,77 @@ class ModelBase(object):
         self.input_data = input_data
         self.update_dmu_str_var = update_str
         self.lp_model = None
+        self.dmu_ordering = None
+        self.inefficiency_screen = None
+        self.lp_template = LpTemplate()
+        self.solver = None
+        self.time_budget = None
+        self.use_lambda_file = False
 
-    def run(self):
+    def run(self, dmu_codes=None):
         ''' Solves a given problem.
+
+            Args:
+                dmu_codes (iterable of str, optional): DMUs whose linear
+                    programs must be solved. Linear programs are still
+                    constructed with all DMUs of input data. Defaults to
+                    all DMUs of input data.
+
+            Returns:
+                Solution: solution of the problem.
         '''
         check_input_and_output_categories(self.input_data)
         model_solution = self._create_solution()
+        if dmu_codes is None:
+            dmu_codes = self.input_data.DMU_codes
+        self._run_for_dmus(self._get_ordered_dmu_codes(dmu_codes),
+                           model_solution)
+        return model_solution
+
+    def _run_for_dmus(self, dmu_codes, model_solution):
+        ''' Creates linear program and solves it for given DMUs.
+            DMUs that are not in dmu_codes are still used for
+            construction of the linear program.
+
+            Args:
+                dmu_codes (list of str): DMU codes in the order in which
+                    they must be solved.
+                model_solution (Solution): solution.
+        '''
         self._create_lp()
-        for count, dmu_code in enumerate(self.input_data.DMU_codes):
+        for count, dmu_code in enumerate(dmu_codes):
             self.run_for_one_DMU(dmu_code, model_solution)
             # self.lp_model.writeLP("dmu_{0}.txt".format(dmu_code))
             self.update_dmu_str_var()
-        return model_solution
+
+    def __setstate__(self, state):
+        ''' Restores pickled model. Decorators redirect unknown attributes
+            to the decorated model, so default unpickling that looks up
+            attributes of an empty object would never finish.
+
+            Args:
+                state (dict): attributes of the model.
+        '''
+        self.__dict__.update(state)
+
+    def _get_ordered_dmu_codes(self, dmu_codes):
+        ''' Returns DMU codes in the order in which linear programs
+            must be solved.
+
+            Args:
+                dmu_codes (set of str): DMU codes.
+
+            Returns:
+                list of str: ordered DMU codes.
+        '''
+        if self.dmu_ordering is None:
+            # linear programs are warm-started from the previous solve,
+            # so the order must not depend on hashing of DMU codes
+            dmu_codes = set(dmu_codes)
+            return [dmu_code for dmu_code in
+                    self.input_data.DMU_codes_in_added_order
+                    if dmu_code in dmu_codes]
+        return self.dmu_ordering(self.input_data, dmu_codes)
 
     def _create_solution(self):
         ''' Allocates solution object.
@@ -49,7 +224,8 @@ class ModelBase(object):
             Returns:
                 (Solution): created solution object.
         '''
-        return Solution(self.input_data)
+        return Solution(self.input_data,
+                        LambdaMatrix(use_file=self.use_lambda_file))
 
     def run_for_one_DMU(self, dmu_code, model_solution):
         ''' Solves LP for a given DMU and stores solution.
@@ -59,7 +235,8 @@ class ModelBase(object):
                 model_solution (Solution): solution.
         '''
         self._update_lp(dmu_code)
-        self.lp_model.solve()
+        solve_lp(self.lp_model, self.solver, dmu_code, model_solution,
+                 self.time_budget)
         self._fill_solution(dmu_code, model_solution)
 
     def _fill_solution(self, dmu_code, model_solution):
@@ -35,10 +35,10 @@ class ProgressBarDecorator(ModelBase):
     def __getattr__(self, name):
         return getattr(self.model, name)
 
-    def run(self):
+    def run(self, dmu_codes=None):
         ''' See base class.
         '''
-        return self.model.run()
+        return self.model.run(dmu_codes)
 
     def _create_solution(self):
         ''' See base class.
@@ -1,6 +1,7 @@
 ''' This module contains MultiplierModelBase class that
     implements basic functionality of the multiplier model.
 '''
+import numpy
 import pulp
 
 from pyDEA.core.models.model_base import ModelBase
@@ -26,6 +27,8 @@ class MultiplierModelBase(ModelBase):
                 corresponding to output categories.
             _dmu_constraint_names (dict of str to str): dictionary that maps
                 constraint names to DMU code.
+            _excluded_constraints (dict of str to pulp.LpConstraint):
+                constraints of DMUs excluded by _exclude_dmu.
 
         Args:
             input_data (InputData): object that stores all data of
@@ -42,6 +45,7 @@ class MultiplierModelBase(ModelBase):
         self._input_variables = dict()
         self._output_variables = dict()
         self._dmu_constraint_names = dict()
+        self._excluded_constraints = dict()
 
     def _create_lp(self):
         ''' Creates initial LP model.
@@ -71,21 +75,68 @@ class MultiplierModelBase(ModelBase):
             'Efficiency score or inverse of efficiency score')
 
         self._dmu_constraint_names.clear()
-        for dmu in self.input_data.DMU_codes:
-            output_sum = pulp.lpSum([self.input_data.coefficients[
-                dmu, category] * self._output_variables[category]
-                for category in self.input_data.output_categories])
-            input_sum = pulp.lpSum([self.input_data.coefficients[
-                dmu, category] * self._input_variables[category]
-                for category in self.input_data.input_categories])
-            name = 'DMU_constraint_{count}'.format(count=dmu)
-            self.lp_model += (output_sum - input_sum <= 0, name)
+        self._excluded_constraints.clear()
+        output_categories = list(self.input_data.output_categories)
+        input_categories = list(self.input_data.input_categories)
+        variables = ([self._output_variables[category]
+                      for category in output_categories] +
+                     [self._input_variables[category]
+                      for category in input_categories])
+        dmu_codes, columns = self.lp_template.get_ordered_columns(
+            self.input_data, self.input_data.DMU_codes)
+        # one row per DMU, outputs with positive and inputs with negative
+        # coefficients
+        rows = numpy.vstack((
+            self.lp_template.get_rows(self.input_data, output_categories,
+                                      columns),
+            -self.lp_template.get_rows(self.input_data, input_categories,
+                                       columns))).T.tolist()
+        for dmu, row in zip(dmu_codes, rows):
+            name = self._get_dmu_constraint_name(dmu)
+            self.lp_model += (pulp.LpAffineExpression(
+                zip(variables, row)) <= 0, name)
             self._dmu_constraint_names[name] = dmu
 
         self.lp_model += (self._concrete_model.get_equality_constraint(
             self.input_data, dmu_code, self._input_variables,
             self._output_variables), 'equality_constraint')
 
+    def _get_dmu_constraint_name(self, dmu_code):
+        ''' Returns name of the constraint of a given DMU.
+
+            Args:
+                dmu_code (str): DMU code.
+
+            Returns:
+                str: constraint name.
+        '''
+        return 'DMU_constraint_{count}'.format(count=dmu_code)
+
+    def _exclude_dmu(self, dmu_code):
+        ''' Excludes a given DMU from the reference set of linear program
+            by removing its constraint. It corresponds to fixing lambda
+            variable of the DMU to zero in the envelopment model.
+
+            Args:
+                dmu_code (str): DMU code.
+        '''
+        name = self._get_dmu_constraint_name(dmu_code)
+        if name in self.lp_model.constraints:
+            self._excluded_constraints[name] = self.lp_model.constraints.pop(
+                name)
+
+    def _restore_dmu(self, dmu_code):
+        ''' Returns a given DMU excluded by _exclude_dmu to the reference
+            set of linear program.
+
+            Args:
+                dmu_code (str): DMU code.
+        '''
+        name = self._get_dmu_constraint_name(dmu_code)
+        if name in self._excluded_constraints:
+            self.lp_model.constraints[name] = self._excluded_constraints.pop(
+                name)
+
     def _update_lp(self, dmu_code):
         ''' Updates existing linear program with coefficients corresponding
             to a given DMU.
@@ -125,6 +176,9 @@ class MultiplierModelBase(ModelBase):
                     self._output_variables[output_category].varValue)
             lambda_variables = dict()
             for dmu_constraint, dmu in self._dmu_constraint_names.items():
+                if dmu_constraint not in self.lp_model.constraints:
+                    # DMU is excluded from the reference set
+                    continue
                 if self.lp_model.constraints[dmu_constraint].pi is None:
                     self.lp_model.constraints[dmu_constraint].pi = 0
                 # else:
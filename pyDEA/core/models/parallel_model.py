@@ -0,0 +1,274 @@
+''' This module contains ParallelModel class that solves linear programs
+    of DMUs in several processes.
+
+    Coefficients of input data are published once in shared memory
+    (see :mod:`pyDEA.core.data_processing.shared_input_data`), the rest
+    of the model is pickled without input data and sent to every worker.
+'''
+import io
+import multiprocessing
+import pickle
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from pyDEA.core.data_processing.shared_input_data import SharedInputData
+from pyDEA.core.data_processing.shared_input_data import attach_input_data
+from pyDEA.core.models.model_base import ModelBase
+from pyDEA.core.utils.dea_utils import check_input_and_output_categories
+
+# model used by the current worker process
+_worker_model = None
+# object that keeps shared input data open in the current worker process
+_worker_block = None
+# time in seconds from creation of the pool until the current worker
+# was ready to solve linear programs
+_worker_startup_time = None
+
+_INPUT_DATA_ID = 'input_data'
+
+
+class _ModelPickler(pickle.Pickler):
+    ''' Pickler that stores a reference instead of input data.
+    '''
+    def __init__(self, file, input_data):
+        super(_ModelPickler, self).__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.input_data = input_data
+
+    def persistent_id(self, obj):
+        if obj is self.input_data:
+            return _INPUT_DATA_ID
+        return None
+
+
+class _ModelUnpickler(pickle.Unpickler):
+    ''' Unpickler that replaces the reference stored by _ModelPickler
+        with given input data.
+    '''
+    def __init__(self, file, input_data):
+        super(_ModelUnpickler, self).__init__(file)
+        self.input_data = input_data
+
+    def persistent_load(self, pid):
+        if pid == _INPUT_DATA_ID:
+            return self.input_data
+        raise pickle.UnpicklingError('Unknown persistent id {0}'.format(pid))
+
+
+def dump_model(model):
+    ''' Pickles a given model without its input data.
+
+        Args:
+            model (ModelBase): model.
+
+        Returns:
+            bytes: pickled model.
+    '''
+    output = io.BytesIO()
+    _ModelPickler(output, model.input_data).dump(model)
+    return output.getvalue()
+
+
+def load_model(data, input_data):
+    ''' Unpickles a model pickled with dump_model.
+
+        Args:
+            data (bytes): pickled model.
+            input_data (InputData): input data used by the model.
+
+        Returns:
+            ModelBase: model.
+    '''
+    return _ModelUnpickler(io.BytesIO(data), input_data).load()
+
+
+def get_peak_memory():
+    ''' Returns peak resident memory of the current process.
+
+        Returns:
+            double: peak memory in megabytes or None if it is not
+                available on this platform.
+    '''
+    if resource is None:
+        return None
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    if sys.platform == 'darwin':
+        return peak_memory / 1024.0 / 1024.0
+    return peak_memory / 1024.0
+
+
+def _init_worker(model_data, handle, pool_start_time):
+    ''' Attaches shared input data and restores the model in the worker
+        process.
+
+        Args:
+            model_data (bytes): model pickled with dump_model.
+            handle (dict): handle of shared input data.
+            pool_start_time (double): time when the pool was created.
+    '''
+    global _worker_model, _worker_block, _worker_startup_time
+    input_data, _worker_block = attach_input_data(handle)
+    _worker_model = load_model(model_data, input_data)
+    _worker_startup_time = time.time() - pool_start_time
+
+
+def _solve_chunk(dmu_codes):
+    ''' Solves linear programs of given DMUs in the worker process.
+
+        Args:
+            dmu_codes (list of str): DMU codes.
+
+        Returns:
+            tuple of dict, dict, dict: results of all DMUs in the solution,
+                in the solution of the second phase of the two-phase model
+                (None if the model is not a two-phase model) and
+                statistics of the worker (see ParallelModel).
+                Results are obtained with Solution.export_results.
+    '''
+    model_solution = _worker_model._create_solution()
+    _worker_model._run_for_dmus(dmu_codes, model_solution)
+    second_solution = getattr(_worker_model, 'second_solution', None)
+    results = dict((dmu_code, model_solution.export_results(dmu_code))
+                   for dmu_code in dmu_codes)
+    second_results = None
+    if second_solution is not None:
+        second_results = dict(
+            (dmu_code, second_solution.export_results(dmu_code))
+            for dmu_code in dmu_codes)
+    statistics = {'startup_time': _worker_startup_time,
+                  'peak_memory': get_peak_memory(),
+                  'nb_dmus': len(dmu_codes)}
+    return results, second_results, statistics
+
+
+def split_into_chunks(dmu_codes, nb_chunks):
+    ''' Splits DMU codes into contiguous chunks of almost equal size.
+
+        Args:
+            dmu_codes (list of str): DMU codes.
+            nb_chunks (int): number of chunks.
+
+        Returns:
+            list of list of str: non-empty chunks.
+    '''
+    chunks = []
+    start = 0
+    for count in range(nb_chunks):
+        end = start + (len(dmu_codes) - start) // (nb_chunks - count)
+        if end > start:
+            chunks.append(dmu_codes[start:end])
+        start = end
+    return chunks
+
+
+class ParallelModel(ModelBase):
+    ''' Decorator that solves a given model in several processes.
+        DMUs are split into one chunk per worker. Every worker creates
+        the linear program once and solves it for all DMUs of its chunk,
+        results are merged into one solution.
+        Coefficients are not pickled, workers read them from shared memory.
+        Any decorated model (including categorical and two-phase models)
+        can be solved in parallel.
+
+        Attributes:
+            model (ModelBase): model that must be solved.
+            num_workers (int): number of worker processes.
+            worker_statistics (list of dict): statistics of workers of the
+                last run, they are also stored in the solution.
+                Every dictionary contains startup_time (seconds from creation
+                of the pool until the worker was ready), peak_memory
+                (peak resident memory of the worker in megabytes, None if
+                not available) and nb_dmus (number of solved DMUs).
+            shared_data_size (int): size of shared input data of the last
+                run in bytes.
+
+        Args:
+            model (ModelBase): model that must be solved.
+            num_workers (int): number of worker processes.
+
+        Raises:
+            ValueError: if num_workers is less than 1.
+    '''
+    def __init__(self, model, num_workers):
+        if num_workers < 1:
+            raise ValueError('Number of workers must be positive')
+        self.model = model
+        self.num_workers = num_workers
+        self.worker_statistics = []
+        self.shared_data_size = 0
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    def run(self, dmu_codes=None):
+        ''' See base class.
+        '''
+        check_input_and_output_categories(self.input_data)
+        model_solution = self.model._create_solution()
+        second_solution = getattr(self.model, 'second_solution', None)
+        if dmu_codes is None:
+            dmu_codes = self.input_data.DMU_codes
+        dmu_codes = self._get_ordered_dmu_codes(dmu_codes)
+        chunks = split_into_chunks(dmu_codes, self.num_workers)
+        if not chunks:
+            return model_solution
+        self.worker_statistics = []
+        shared_data = SharedInputData(self.input_data)
+        self.shared_data_size = shared_data.nbytes
+        pool = None
+        try:
+            pool = multiprocessing.Pool(
+                len(chunks), initializer=_init_worker,
+                initargs=(dump_model(self.model), shared_data.handle,
+                          time.time()))
+            for results, second_results, statistics in pool.imap_unordered(
+                    _solve_chunk, chunks):
+                self.worker_statistics.append(statistics)
+                for dmu_code, dmu_results in results.items():
+                    model_solution.import_results(dmu_code, dmu_results)
+                    if second_results is not None:
+                        second_solution.import_results(
+                            dmu_code, second_results[dmu_code])
+                    self.update_dmu_str_var()
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+            shared_data.close()
+        model_solution.worker_statistics = self.worker_statistics
+        return model_solution
+
+    def _create_solution(self):
+        ''' See base class.
+        '''
+        return self.model._create_solution()
+
+    def _run_for_dmus(self, dmu_codes, model_solution):
+        ''' See base class.
+        '''
+        self.model._run_for_dmus(dmu_codes, model_solution)
+
+    def run_for_one_DMU(self, dmu_code, model_solution):
+        ''' See base class.
+        '''
+        self.model.run_for_one_DMU(dmu_code, model_solution)
+
+    def _create_lp(self):
+        ''' See base class.
+        '''
+        self.model._create_lp()
+
+    def _update_lp(self, dmu_code):
+        ''' See base class.
+        '''
+        self.model._update_lp(dmu_code)
+
+    def _fill_solution(self, dmu_code, model_solution):
+        ''' See base class.
+        '''
+        self.model._fill_solution(dmu_code, model_solution)
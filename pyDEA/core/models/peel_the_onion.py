@@ -4,6 +4,11 @@
 import copy
 from pulp import LpStatusOptimal
 
+from pyDEA.core.models.envelopment_model_base import create_lp_with_lambdas
+from pyDEA.core.models.model_base import creates_one_lp
+from pyDEA.core.utils.dea_utils import check_input_and_output_categories
+from pyDEA.core.utils.dominance import get_dominated_dmus
+
 
 def restore_base(model, first_solution, copy_of_dmu_codes, max_slack_solution):
     ''' Helper function used for restoring DMU codes and first solution.
@@ -22,13 +27,61 @@ def restore_base(model, first_solution, copy_of_dmu_codes, max_slack_solution):
     assert(first_solution)
 
 
-def peel_the_onion_method(model):
+def can_peel_incrementally(model):
+    ''' Checks if linear program of a given model is created once for
+        all DMUs (see creates_one_lp) and DMUs can be excluded from it
+        in place.
+
+        Args:
+            model (ModelBase): DEA model.
+
+        Returns:
+            bool: True if peel the onion can be done incrementally,
+                False otherwise.
+    '''
+    return hasattr(model, '_exclude_dmu') and creates_one_lp(model)
+
+
+def peel_the_onion_method(model, skip_dominated=False):
     ''' Runs the peel the onion model and returns solution that corresponds to
         the first run and ranking of all DMUs.
 
+        If possible (see can_peel_incrementally), ranks are computed
+        incrementally, otherwise the model is run for every rank.
+
+        Args:
+            model (ModelBase): DEA model that must be called in the peel
+                the onion.
+            skip_dominated (bool, optional): if True, linear programs of
+                DMUs strictly dominated by other remaining DMUs are not
+                solved after the first run, such DMUs are never efficient.
+                It must not be used with weakly disposal or categorical
+                categories. Defaults to False.
+
+        Returns:
+            tuple of Solution, dict of str to int, bool: tuple with the first
+                solution of the problem, dictionary that maps DMU code to peel
+                the onion rank, boolean value which is true if all peel the
+                onion runs were successful, false otherwise.
+    '''
+    if can_peel_incrementally(model):
+        return peel_the_onion_incrementally(model, skip_dominated)
+    return peel_the_onion_by_rerunning(model, skip_dominated)
+
+
+def peel_the_onion_by_rerunning(model, skip_dominated=False):
+    ''' Runs the peel the onion model by running a given model for every
+        rank. Efficient DMUs of every rank are removed from input data and
+        restored at the end.
+
         Args:
             model (ModelBase): DEA model that must be called in the peel
                 the onion.
+            skip_dominated (bool, optional): if True, linear programs of
+                DMUs strictly dominated by other remaining DMUs are not
+                solved after the first run, such DMUs are never efficient.
+                It must not be used with weakly disposal or categorical
+                categories. Defaults to False.
 
         Returns:
             tuple of Solution, dict of str to int, bool: tuple with the first
@@ -45,7 +98,14 @@ def peel_the_onion_method(model):
     first_solution = None
     max_slack_solution = None
     while model.input_data.DMU_codes:
-        solution = model.run()
+        dominated_dmus = set()
+        if skip_dominated and current_rank > 1:
+            dominated_dmus = get_dominated_dmus(
+                model.input_data, model.input_data.DMU_codes, strict=True)
+            solution = model.run(
+                model.input_data.DMU_codes.difference(dominated_dmus))
+        else:
+            solution = model.run()
         if current_rank == 1:
             first_solution = solution
             try:
@@ -56,10 +116,13 @@ def peel_the_onion_method(model):
         not_efficient_dmus = []
 
         one_is_infeasible = False
+        efficient_dmus = solution.get_efficient_dmus()
         for dmu_code in model.input_data.DMU_codes:
-            if solution.lp_status[dmu_code] != LpStatusOptimal:
+            if dmu_code in dominated_dmus:
+                not_efficient_dmus.append(dmu_code)
+            elif solution.lp_status[dmu_code] != LpStatusOptimal:
                 one_is_infeasible = True
-            elif solution.is_efficient(dmu_code):
+            elif dmu_code in efficient_dmus:
                 ranks[dmu_code] = current_rank
                 dmus_to_remove.append(dmu_code)
             else:
@@ -79,3 +142,131 @@ def peel_the_onion_method(model):
 
     restore_base(model, first_solution, copy_of_dmu_codes, max_slack_solution)
     return first_solution, ranks, True
+
+
+def peel_the_onion_incrementally(model, skip_dominated=False):
+    ''' Runs the peel the onion model with one linear program.
+
+        Linear program is created once with all DMUs. Efficient DMUs
+        of every rank are excluded from it in place and only DMUs
+        with positive lambda variables of removed DMUs are solved again.
+        Solutions of other DMUs do not use removed DMUs, and linear
+        programs with fewer DMUs cannot have better solutions, so they
+        stay optimal. Once more than half of DMUs of the linear program
+        are excluded, a smaller linear program is created with remaining
+        DMUs only. Remaining DMUs are kept in a local set, input data
+        is modified only while linear program is created and while
+        the last remaining DMU is solved.
+
+        Removed DMUs are usually peers of all remaining DMUs, so most of
+        them must be solved again. After the first run, DMUs that
+        are certainly not efficient (see inefficiency_screen attribute
+        of ModelBase) are not solved, only ranks are needed for them.
+
+        Args:
+            model (ModelBase): DEA model whose linear program can be
+                modified in place, see can_peel_incrementally.
+            skip_dominated (bool, optional): if True, linear programs of
+                DMUs strictly dominated by other remaining DMUs are not
+                solved after the first run, such DMUs are never efficient.
+                It must not be used with weakly disposal or categorical
+                categories. Defaults to False.
+
+        Returns:
+            tuple of Solution, dict of str to int, bool: tuple with the first
+                solution of the problem, dictionary that maps DMU code to peel
+                the onion rank, boolean value which is true if all peel the
+                onion runs were successful, false otherwise.
+    '''
+    check_input_and_output_categories(model.input_data)
+    remaining_dmus = set(model.input_data.DMU_codes)
+    ranks = dict()
+    for dmu_code in remaining_dmus:
+        ranks[dmu_code] = 'Infeasible/unbounded'
+
+    first_solution = model._create_solution()
+    max_slack_solution = getattr(model, 'second_solution', None)
+    inefficiency_screen = getattr(model, 'inefficiency_screen', None)
+    # results of the last solve of every DMU: True if it was efficient
+    # and DMUs with positive lambda variables
+    is_efficient = dict()
+    peers = dict()
+    dmus_to_solve = set(remaining_dmus)
+    excluded_dmus = []
+    current_rank = 1
+    solution = first_solution
+    dmu_codes = model.input_data.DMU_codes
+    model._create_lp()
+    try:
+        while remaining_dmus:
+            # DMUs that are certainly not efficient, they are solved once
+            # it is not known anymore
+            skipped_dmus = set()
+            if current_rank > 1:
+                if skip_dominated:
+                    skipped_dmus = get_dominated_dmus(
+                        model.input_data, remaining_dmus, strict=True)
+                if inefficiency_screen is not None:
+                    skipped_dmus.update(inefficiency_screen(
+                        model.input_data,
+                        dmus_to_solve.difference(skipped_dmus),
+                        remaining_dmus))
+            if len(remaining_dmus) == 1:
+                # models can treat input data with one DMU as a special
+                # case (see SuperEfficiencyModel), so the last DMU is
+                # solved with the same input data as by rerunning
+                model.input_data.DMU_codes = set(remaining_dmus)
+            # all DMUs of the rank are solved before statuses are checked,
+            # so that the first solution has results of all DMUs
+            not_optimal_dmus = set()
+            for dmu_code in model._get_ordered_dmu_codes(
+                    dmus_to_solve.difference(skipped_dmus)):
+                model.run_for_one_DMU(dmu_code, solution)
+                model.update_dmu_str_var()
+                if solution.lp_status[dmu_code] != LpStatusOptimal:
+                    not_optimal_dmus.add(dmu_code)
+                else:
+                    is_efficient[dmu_code] = solution.is_efficient(dmu_code)
+                    peers[dmu_code] = solution.get_peers(dmu_code)
+            dmus_to_solve = skipped_dmus
+
+            dmus_to_remove = set(dmu_code for dmu_code in remaining_dmus
+                                 if dmu_code not in skipped_dmus and
+                                 dmu_code not in not_optimal_dmus and
+                                 is_efficient[dmu_code])
+            if not_optimal_dmus:
+                # efficient DMUs of the current rank are still ranked,
+                # as in peel_the_onion_by_rerunning
+                for dmu_code in dmus_to_remove:
+                    ranks[dmu_code] = current_rank
+                return first_solution, ranks, False
+            if len(dmus_to_remove) == 0:
+                for dmu_code in remaining_dmus:
+                    ranks[dmu_code] = current_rank
+                break
+            remaining_dmus.difference_update(dmus_to_remove)
+            for dmu_code in dmus_to_remove:
+                ranks[dmu_code] = current_rank
+            if not remaining_dmus:
+                break
+            if len(excluded_dmus) + len(dmus_to_remove) > len(remaining_dmus):
+                # most of the linear program is excluded, it is faster
+                # to create a smaller one than to keep solving it
+                create_lp_with_lambdas(model, remaining_dmus)
+                excluded_dmus = []
+            else:
+                for dmu_code in dmus_to_remove:
+                    model._exclude_dmu(dmu_code)
+                    excluded_dmus.append(dmu_code)
+            for dmu_code in remaining_dmus:
+                if not dmus_to_remove.isdisjoint(peers[dmu_code]):
+                    dmus_to_solve.add(dmu_code)
+            solution = model._create_solution()
+            current_rank += 1
+    finally:
+        model.input_data.DMU_codes = dmu_codes
+        for dmu_code in excluded_dmus:
+            model._restore_dmu(dmu_code)
+        if max_slack_solution is not None:
+            model.second_solution = max_slack_solution
+    return first_solution, ranks, True
@@ -0,0 +1,252 @@
+''' This module contains RestrictedBasisModel class that solves
+    envelopment models with column generation.
+'''
+import numpy
+import pulp
+
+from pyDEA.core.data_processing.solution import LP_STATUS_TIME_LIMIT
+from pyDEA.core.models.envelopment_model_base import create_lp_with_lambdas
+from pyDEA.core.models.model_base import ModelBase, solve_lp
+from pyDEA.core.utils.dominance import get_category_values
+
+# lambda variable enters the linear program if its reduced cost
+# is attractive by more than this value
+PRICING_TOLERANCE = 1e-9
+DEFAULT_COLUMNS_PER_ITERATION = 50
+
+
+class RestrictedBasisModel(ModelBase):
+    ''' Decorator that solves envelopment models with restricted basis
+        entry (column generation).
+
+        Linear program is created with lambda variables of a few DMUs
+        only: DMUs with the largest ratio of every output to every input
+        and DMUs with the smallest input or the largest output in every
+        category. If linear program is not feasible, lambda variable of the
+        DMU under consideration is added, since it is always feasible with it.
+        After every solve remaining lambda variables are priced out
+        with dual values of constraints, and variables with attractive
+        reduced costs enter the linear program. This is repeated until
+        no variable has attractive reduced cost, so efficiency scores are
+        the same as in the model with all DMUs. Lambda variables that
+        entered the linear program stay there for the next DMUs.
+
+        Note:
+            Lambda variables must appear only in input, output and VRS
+            constraints, so it cannot be used with weight restrictions,
+            super efficiency and two phase model.
+
+        Attributes:
+            model (ModelBase): envelopment model.
+            columns_per_iteration (int): maximum number of lambda variables
+                that enter the linear program after one solve.
+            _dmu_codes (list of str): DMUs whose lambda variables might
+                enter the linear program.
+            _inputs (numpy.ndarray): inputs of these DMUs with one
+                column per input category.
+            _outputs (numpy.ndarray): outputs of these DMUs with one
+                column per output category.
+            _in_lp (numpy.ndarray): boolean array that is True for
+                DMUs whose lambda variables are in the linear program.
+            _is_excluded (numpy.ndarray): boolean array that is True for
+                DMUs excluded from the reference set, their lambda
+                variables never enter the linear program.
+            _dmu_index (dict of str to int): maps DMU code to its index
+                in _dmu_codes.
+
+        Args:
+            model (ModelBase): envelopment model.
+            columns_per_iteration (int, optional): maximum number of lambda
+                variables that enter the linear program after one solve.
+                Defaults to DEFAULT_COLUMNS_PER_ITERATION.
+    '''
+    def __init__(self, model,
+                 columns_per_iteration=DEFAULT_COLUMNS_PER_ITERATION):
+        if columns_per_iteration < 1:
+            raise ValueError('At least one column must enter '
+                             'the linear program')
+        self.model = model
+        self.columns_per_iteration = columns_per_iteration
+        self._dmu_codes = []
+        self._inputs = None
+        self._outputs = None
+        self._in_lp = None
+        self._is_excluded = None
+        self._dmu_index = dict()
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    def _create_lp(self):
+        ''' Creates linear program with lambda variables of DMUs
+            returned by _get_initial_columns.
+        '''
+        self._dmu_codes = list(self.input_data.DMU_codes)
+        self._dmu_index = dict((dmu_code, index) for index, dmu_code
+                               in enumerate(self._dmu_codes))
+        self._inputs, self._outputs = get_category_values(
+            self.input_data, self._dmu_codes)
+        self._in_lp = numpy.zeros(len(self._dmu_codes), dtype=bool)
+        self._in_lp[self._get_initial_columns()] = True
+        self._is_excluded = numpy.zeros(len(self._dmu_codes), dtype=bool)
+        create_lp_with_lambdas(self.model, [
+            self._dmu_codes[index] for index in numpy.flatnonzero(
+                self._in_lp)])
+
+    def _get_initial_columns(self):
+        ''' Returns indices of DMUs whose lambda variables are added to
+            the linear program when it is created. These DMUs are
+            usually efficient.
+
+            Returns:
+                list of int: indices of DMUs in _dmu_codes.
+        '''
+        indices = set(self._inputs.argmin(axis=0))
+        indices.update(self._outputs.argmax(axis=0))
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            for column in range(self._inputs.shape[1]):
+                ratios = self._outputs / self._inputs[:, column, None]
+                ratios[numpy.isnan(ratios)] = -numpy.inf
+                indices.update(ratios.argmax(axis=0))
+        return sorted(indices)
+
+    def run_for_one_DMU(self, dmu_code, model_solution):
+        ''' Solves linear program of a given DMU, adding lambda variables
+            with attractive reduced costs until there are none left.
+
+            Args:
+                dmu_code (str): DMU code.
+                model_solution (Solution): solution.
+        '''
+        self.model._update_lp(dmu_code)
+        index = self._dmu_index.get(dmu_code, None)
+        while True:
+            solve_lp(self.lp_model, self.solver, dmu_code, model_solution,
+                     self.time_budget)
+            if self.lp_model.status != pulp.LpStatusOptimal:
+                if (index is None or self._in_lp[index] or
+                        self.lp_model.status == LP_STATUS_TIME_LIMIT):
+                    break
+                # linear program is always feasible with lambda
+                # variable of the DMU under consideration
+                columns = [index]
+            else:
+                columns = self._price_columns()
+            if len(columns) == 0:
+                break
+            self._add_columns(columns)
+        self.model._fill_solution(dmu_code, model_solution)
+
+    def _price_columns(self):
+        ''' Computes reduced costs of lambda variables that are not in
+            the linear program from dual values of the last solve.
+
+            Returns:
+                numpy.ndarray: indices of DMUs whose lambda variables
+                    must enter the linear program, the most attractive first.
+        '''
+        constraints = self.lp_model.constraints
+        input_duals = self._get_duals(sorted(self.input_data.input_categories))
+        output_duals = self._get_duals(
+            sorted(self.input_data.output_categories))
+        vrs_constraint = constraints.get('VRS_constraint', None)
+        if (input_duals is None or output_duals is None or
+                (vrs_constraint is not None and vrs_constraint.pi is None)):
+            # solver did not report duals, all variables enter
+            return numpy.flatnonzero(~(self._in_lp | self._is_excluded))
+        # lambda variables have zero cost, so reduced cost is minus the
+        # dual value of the column: outputs enter with positive
+        # coefficients, inputs with negative and VRS constraint with one
+        column_duals = (numpy.dot(self._outputs, output_duals) -
+                        numpy.dot(self._inputs, input_duals))
+        if vrs_constraint is not None:
+            column_duals += vrs_constraint.pi
+        if self.lp_model.sense == pulp.LpMaximize:
+            column_duals = -column_duals
+        column_duals[self._in_lp | self._is_excluded] = 0
+        columns = numpy.flatnonzero(column_duals > PRICING_TOLERANCE)
+        if len(columns) > self.columns_per_iteration:
+            columns = columns[numpy.argsort(
+                -column_duals[columns],
+                kind='stable')[:self.columns_per_iteration]]
+        return columns
+
+    def _get_duals(self, categories):
+        ''' Returns dual values of constraints of given categories.
+
+            Args:
+                categories (list of str): input or output categories.
+
+            Returns:
+                numpy.ndarray: dual values or None if solver did not
+                    report them.
+        '''
+        duals = [self.lp_model.constraints[self._constraints[category]].pi
+                 for category in categories]
+        if any(dual is None for dual in duals):
+            return None
+        return numpy.array(duals, dtype=float)
+
+    def _add_columns(self, indices):
+        ''' Adds lambda variables of given DMUs to the linear program.
+
+            Args:
+                indices (list of int): indices of DMUs in _dmu_codes.
+        '''
+        self._in_lp[indices] = True
+        self.model._add_lambda_variables(
+            [self._dmu_codes[index] for index in indices])
+
+    def _add_reference_dmus(self, dmu_codes):
+        ''' Adds given DMUs to DMUs whose lambda variables might
+            enter the linear program.
+
+            Args:
+                dmu_codes (list of str): DMU codes.
+        '''
+        inputs, outputs = get_category_values(self.input_data, dmu_codes)
+        self._dmu_index.update((dmu_code, index) for index, dmu_code in
+                               enumerate(dmu_codes, len(self._dmu_codes)))
+        self._dmu_codes.extend(dmu_codes)
+        self._inputs = numpy.vstack((self._inputs, inputs))
+        self._outputs = numpy.vstack((self._outputs, outputs))
+        self._in_lp = numpy.concatenate(
+            (self._in_lp, numpy.zeros(len(dmu_codes), dtype=bool)))
+        self._is_excluded = numpy.concatenate(
+            (self._is_excluded, numpy.zeros(len(dmu_codes), dtype=bool)))
+
+    def _exclude_dmu(self, dmu_code):
+        ''' Excludes a given DMU from the reference set, its lambda
+            variable does not enter the linear program until the DMU
+            is restored.
+
+            Args:
+                dmu_code (str): DMU code.
+        '''
+        self._is_excluded[self._dmu_index[dmu_code]] = True
+        self.model._exclude_dmu(dmu_code)
+
+    def _restore_dmu(self, dmu_code):
+        ''' Returns a given DMU excluded by _exclude_dmu to the reference
+            set.
+
+            Args:
+                dmu_code (str): DMU code.
+        '''
+        self._is_excluded[self._dmu_index[dmu_code]] = False
+        self.model._restore_dmu(dmu_code)
+
+    def _create_solution(self):
+        ''' See base class.
+        '''
+        return self.model._create_solution()
+
+    def _update_lp(self, dmu_code):
+        ''' See base class.
+        '''
+        self.model._update_lp(dmu_code)
+
+    def _fill_solution(self, dmu_code, model_solution):
+        ''' See base class.
+        '''
+        self.model._fill_solution(dmu_code, model_solution)
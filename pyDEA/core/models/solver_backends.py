@@ -0,0 +1,595 @@
+''' This module contains solver backends that solve
+    :class:`pyDEA.core.models.matrix_lp.MatrixLpProblem` in the same
+    process, without writing model files and starting a solver executable
+    for every DMU.
+
+    ScipyBackend assembles the whole problem and passes it to
+    scipy.optimize.linprog(method='highs') in every solve.
+    HighsBackend loads the problem into HiGHS once and keeps it alive
+    between solves. Before the next solve only changes recorded by
+    MatrixLpProblem (right hand sides, senses, coefficients,
+    bounds and objective function) are passed to HiGHS, the model is
+    rebuilt only if rows were added (new columns of the data block are
+    appended to the loaded model). Since the model is not
+    rebuilt, every solve is warm-started from the optimal basis of
+    the previous one. Number of simplex iterations of the last solve is
+    stored in problem.iterations by both backends.
+
+    Both backends take options of parameters SOLVER_THREADS,
+    SOLVER_TOLERANCE and SOLVER_TIME_LIMIT, see
+    :mod:`pyDEA.core.models.solver_registry`. Functions solve_with_scipy
+    and create_highs are also used to solve pulp problems with the same
+    solvers.
+'''
+import numpy
+import pulp
+
+from pyDEA.core.data_processing.solution import LP_STATUS_TIME_LIMIT
+
+try:
+    import highspy
+except ImportError:
+    highspy = None
+
+
+def get_default_backend():
+    ''' Returns the fastest available solver backend: HighsBackend
+        if highspy is installed, ScipyBackend otherwise.
+
+        Returns:
+            HighsBackend or ScipyBackend: solver backend.
+    '''
+    if highspy is not None:
+        return HighsBackend()
+    return ScipyBackend()
+
+
+def get_row_bounds(sense, rhs):
+    ''' Converts sense and right hand side of a constraint to
+        lower and upper bounds of the row activity.
+
+        Args:
+            sense (int): pulp.LpConstraintGE, pulp.LpConstraintLE or
+                pulp.LpConstraintEQ.
+            rhs (double): right hand side.
+
+        Returns:
+            tuple of double: lower and upper bounds.
+    '''
+    if sense == pulp.LpConstraintGE:
+        return rhs, numpy.inf
+    if sense == pulp.LpConstraintLE:
+        return -numpy.inf, rhs
+    return rhs, rhs
+
+
+def _get_bound(bound, default):
+    ''' Returns default value if bound is None, bound otherwise.
+    '''
+    if bound is None:
+        return default
+    return bound
+
+
+def solve_with_scipy(costs, matrix, senses, rhs, lower_bounds,
+                     upper_bounds, sense, tolerance=None, time_limit=None):
+    ''' Solves a linear program given by arrays with HiGHS solver
+        available through scipy.optimize.linprog.
+
+        Args:
+            costs (numpy.ndarray): objective function coefficients.
+            matrix (numpy.ndarray): constraint matrix.
+            senses (numpy.ndarray): pulp senses of constraints.
+            rhs (numpy.ndarray): right hand sides of constraints.
+            lower_bounds (numpy.ndarray): lower bounds of variables.
+            upper_bounds (numpy.ndarray): upper bounds of variables.
+            sense (int): pulp.LpMinimize or pulp.LpMaximize.
+            tolerance (double, optional): primal and dual feasibility
+                tolerance. Defaults to None, i.e. solver default.
+            time_limit (double, optional): time limit in seconds.
+                Defaults to None, i.e. no time limit.
+
+        Returns:
+            tuple of int, numpy.ndarray, numpy.ndarray, int: pulp status,
+                values of variables, dual values of constraints (values
+                and duals are None if status is not optimal) and number
+                of simplex iterations.
+
+        Raises:
+            ValueError: if scipy is not installed.
+    '''
+    try:
+        from scipy.optimize import linprog
+    except ImportError:
+        raise ValueError('Solver scipy requires scipy')
+    sign = 1 if sense == pulp.LpMinimize else -1
+    is_eq = senses == pulp.LpConstraintEQ
+    # all inequalities are converted to <= form
+    row_signs = numpy.where(senses == pulp.LpConstraintGE, -1.0, 1.0)
+    is_ub = ~is_eq
+    a_ub = b_ub = a_eq = b_eq = None
+    if is_ub.any():
+        a_ub = matrix[is_ub] * row_signs[is_ub, None]
+        b_ub = rhs[is_ub] * row_signs[is_ub]
+    if is_eq.any():
+        a_eq = matrix[is_eq]
+        b_eq = rhs[is_eq]
+    options = dict()
+    if tolerance is not None:
+        options['primal_feasibility_tolerance'] = tolerance
+        options['dual_feasibility_tolerance'] = tolerance
+    if time_limit is not None:
+        options['time_limit'] = time_limit
+    bounds = numpy.column_stack((lower_bounds, upper_bounds))
+    result = linprog(sign * costs, A_ub=a_ub, b_ub=b_ub, A_eq=a_eq,
+                     b_eq=b_eq, bounds=bounds, method='highs',
+                     options=options)
+    status = ScipyBackend._STATUS.get(result.status, pulp.LpStatusUndefined)
+    if status != pulp.LpStatusOptimal:
+        return status, None, None, int(result.nit)
+    duals = numpy.zeros(len(senses))
+    if a_ub is not None:
+        duals[is_ub] = result.ineqlin.marginals * row_signs[is_ub]
+    if a_eq is not None:
+        duals[is_eq] = result.eqlin.marginals
+    duals *= sign
+    # solver tolerances might move values slightly outside of bounds
+    return (status, numpy.clip(result.x, lower_bounds, upper_bounds), duals,
+            int(result.nit))
+
+
+class ScipyBackend(object):
+    ''' Solver backend that solves the problem from scratch with HiGHS
+        solver available through scipy.optimize.linprog.
+
+        Attributes:
+            tolerance (double): primal and dual feasibility tolerance or
+                None for the solver default.
+            time_limit (double): time limit of one solve in seconds or
+                None if there is no limit.
+
+        Args:
+            threads (int, optional): ignored, linprog solves every problem
+                in one thread. Defaults to None.
+            tolerance (double, optional): primal and dual feasibility
+                tolerance. Defaults to None.
+            time_limit (double, optional): time limit of one solve in
+                seconds. Defaults to None.
+    '''
+    _STATUS = {0: pulp.LpStatusOptimal, 1: pulp.LpStatusNotSolved,
+               2: pulp.LpStatusInfeasible, 3: pulp.LpStatusUnbounded}
+
+    def __init__(self, threads=None, tolerance=None, time_limit=None):
+        self.tolerance = tolerance
+        self.time_limit = time_limit
+
+    def solve(self, problem):
+        ''' Solves a given problem and stores solution in it.
+
+            Args:
+                problem (MatrixLpProblem): problem to solve.
+
+            Returns:
+                int: pulp status of the solution.
+        '''
+        (costs, matrix, senses, rhs, lower_bounds, upper_bounds,
+         extra_variables) = problem.get_arrays()
+        problem.clear_changes()
+        status, values, duals, problem.iterations = solve_with_scipy(
+            costs, matrix, senses, rhs, lower_bounds, upper_bounds,
+            problem.sense, self.tolerance, self.time_limit)
+        problem.set_solution(status, values, duals, extra_variables)
+        return status
+
+
+class HighsBackend(object):
+    ''' Solver backend that keeps the problem loaded in HiGHS between
+        solves. The loaded model is stored in problem.solver_model.
+
+        Attributes:
+            warm_start (bool): if True, every solve starts from the basis
+                of the previous solve, otherwise HiGHS solves the
+                problem from scratch.
+            threads (int): maximum number of threads or None for the
+                solver default.
+            tolerance (double): primal and dual feasibility tolerance or
+                None for the solver default.
+            time_limit (double): time limit of one solve in seconds or
+                None if there is no limit.
+
+        Args:
+            warm_start (bool, optional): if True, every solve starts from
+                the basis of the previous solve. Defaults to True.
+            threads (int, optional): maximum number of threads.
+                Defaults to None.
+            tolerance (double, optional): primal and dual feasibility
+                tolerance. Defaults to None.
+            time_limit (double, optional): time limit of one solve in
+                seconds. Defaults to None.
+
+        Raises:
+            ValueError: if highspy is not installed.
+    '''
+    def __init__(self, warm_start=True, threads=None, tolerance=None,
+                 time_limit=None):
+        if highspy is None:
+            raise ValueError('Solver highs requires highspy')
+        self.warm_start = warm_start
+        self.threads = threads
+        self.tolerance = tolerance
+        self.time_limit = time_limit
+
+    def solve(self, problem):
+        ''' Applies changes of a given problem to the loaded model
+            (or loads the problem if necessary), solves it and stores
+            solution in the problem.
+
+            Args:
+                problem (MatrixLpProblem): problem to solve.
+
+            Returns:
+                int: pulp status of the solution.
+        '''
+        model = problem.solver_model
+        if not isinstance(model, HighsModel):
+            model = self._load(problem)
+        elif not model.update(problem):
+            previous_model = model
+            model = self._load(problem)
+            if self.warm_start:
+                model.set_basis(previous_model)
+        problem.solver_model = model
+        problem.clear_changes()
+        if not self.warm_start:
+            model.highs.clearSolver()
+        set_highs_time_limit(model.highs, self.time_limit)
+        return model.solve(problem)
+
+    def _load(self, problem):
+        ''' Loads a given problem into HiGHS and sets options.
+
+            Args:
+                problem (MatrixLpProblem): problem to load.
+
+            Returns:
+                HighsModel: loaded model.
+        '''
+        model = HighsModel(problem)
+        set_highs_options(model.highs, self.threads, self.tolerance)
+        return model
+
+
+def create_highs(costs, matrix, senses, rhs, lower_bounds, upper_bounds,
+                 sense):
+    ''' Loads a linear program given by arrays into HiGHS.
+
+        Args:
+            costs (numpy.ndarray): objective function coefficients.
+            matrix (numpy.ndarray): constraint matrix.
+            senses (numpy.ndarray): pulp senses of constraints.
+            rhs (numpy.ndarray): right hand sides of constraints.
+            lower_bounds (numpy.ndarray): lower bounds of variables.
+            upper_bounds (numpy.ndarray): upper bounds of variables.
+            sense (int): pulp.LpMinimize or pulp.LpMaximize.
+
+        Returns:
+            highspy.Highs: HiGHS instance with the loaded linear program.
+
+        Raises:
+            ValueError: if highspy is not installed.
+    '''
+    if highspy is None:
+        raise ValueError('Solver highs requires highspy')
+    lp = highspy.HighsLp()
+    lp.num_col_ = matrix.shape[1]
+    lp.num_row_ = matrix.shape[0]
+    lp.col_cost_ = costs
+    lp.col_lower_ = lower_bounds
+    lp.col_upper_ = upper_bounds
+    row_bounds = [get_row_bounds(row_sense, value) for row_sense, value
+                  in zip(senses, rhs)]
+    lp.row_lower_ = numpy.array([bounds[0] for bounds in row_bounds],
+                                dtype=float)
+    lp.row_upper_ = numpy.array([bounds[1] for bounds in row_bounds],
+                                dtype=float)
+    if sense == pulp.LpMaximize:
+        lp.sense_ = highspy.ObjSense.kMaximize
+    columns, rows = numpy.nonzero(matrix.T)
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+    lp.a_matrix_.start_ = numpy.searchsorted(
+        columns, numpy.arange(matrix.shape[1] + 1))
+    lp.a_matrix_.index_ = rows
+    lp.a_matrix_.value_ = matrix[rows, columns]
+
+    highs = highspy.Highs()
+    highs.setOptionValue('output_flag', False)
+    highs.passModel(lp)
+    return highs
+
+
+def set_highs_options(highs, threads=None, tolerance=None):
+    ''' Sets options of a given HiGHS instance. Options that are None
+        keep their default values.
+
+        Args:
+            highs (highspy.Highs): HiGHS instance.
+            threads (int, optional): maximum number of threads.
+                Defaults to None.
+            tolerance (double, optional): primal and dual feasibility
+                tolerance. Defaults to None.
+    '''
+    if threads is not None:
+        highs.setOptionValue('threads', threads)
+    if tolerance is not None:
+        highs.setOptionValue('primal_feasibility_tolerance', tolerance)
+        highs.setOptionValue('dual_feasibility_tolerance', tolerance)
+
+
+def set_highs_time_limit(highs, time_limit):
+    ''' Sets time limit of the next solve of a given HiGHS instance.
+        HiGHS compares its time limit with the total time of all solves
+        of the instance, so the limit is shifted by the time of previous
+        solves.
+
+        Args:
+            highs (highspy.Highs): HiGHS instance.
+            time_limit (double): time limit in seconds or None if there
+                is no limit.
+    '''
+    if time_limit is None:
+        highs.setOptionValue('time_limit', numpy.inf)
+    else:
+        highs.setOptionValue('time_limit',
+                             highs.getRunTime() + float(time_limit))
+
+
+def get_highs_status(highs):
+    ''' Returns pulp status of the last solve of a given HiGHS instance.
+
+        Args:
+            highs (highspy.Highs): HiGHS instance.
+
+        Returns:
+            int: pulp status.
+    '''
+    return HighsModel._STATUS.get(highs.getModelStatus(),
+                                  pulp.LpStatusUndefined)
+
+
+class HighsModel(object):
+    ''' Linear program loaded into HiGHS.
+
+        Attributes:
+            highs (highspy.Highs): HiGHS instance.
+            extra_variables (list of pulp.LpVariable): variables that are
+                not part of the data block in the order of columns.
+            column_index (dict of pulp.LpVariable to int): maps variables
+                to column indices.
+            row_index (dict of MatrixConstraint to int): maps constraints
+                to row indices.
+            lower_bounds (numpy.ndarray): lower bounds of columns.
+            upper_bounds (numpy.ndarray): upper bounds of columns.
+            costs (dict of pulp.LpVariable to double): objective function
+                coefficients passed to HiGHS.
+            sense (int): pulp.LpMinimize or pulp.LpMaximize.
+            column_order (numpy.ndarray): column indices in the order of
+                variables of the problem (block variables first),
+                it differs from the order of columns if block variables
+                were added after loading.
+            nb_block (int): number of block variables.
+
+        Args:
+            problem (MatrixLpProblem): problem to load.
+    '''
+    _STATUS = {}
+    if highspy is not None:
+        _STATUS = {
+            highspy.HighsModelStatus.kOptimal: pulp.LpStatusOptimal,
+            highspy.HighsModelStatus.kInfeasible: pulp.LpStatusInfeasible,
+            highspy.HighsModelStatus.kUnboundedOrInfeasible:
+                pulp.LpStatusInfeasible,
+            highspy.HighsModelStatus.kUnbounded: pulp.LpStatusUnbounded,
+            highspy.HighsModelStatus.kTimeLimit: LP_STATUS_TIME_LIMIT}
+
+    def __init__(self, problem):
+        (costs, matrix, senses, rhs, self.lower_bounds, self.upper_bounds,
+         self.extra_variables) = problem.get_arrays()
+        variables = problem.get_block_variables() + self.extra_variables
+        self.column_index = dict((variable, index) for index, variable
+                                 in enumerate(variables))
+        self.row_index = dict((constraint, index) for index, constraint
+                              in enumerate(problem.constraints.values()))
+        self.costs = dict(problem.objective.items())
+        self.sense = problem.sense
+        self.column_order = numpy.arange(matrix.shape[1])
+        self.nb_block = len(variables) - len(self.extra_variables)
+        self.highs = create_highs(costs, matrix, senses, rhs,
+                                  self.lower_bounds, self.upper_bounds,
+                                  self.sense)
+        # the model is re-solved from the previous basis,
+        # presolve would discard it
+        self.highs.setOptionValue('presolve', 'off')
+
+    def set_basis(self, previous_model):
+        ''' Sets initial basis from the optimal basis of a model that was
+            loaded before rows or columns were added to the problem.
+            New rows are basic, new columns are nonbasic at one of
+            their bounds.
+
+            Args:
+                previous_model (HighsModel): previously loaded model
+                    of the same problem.
+        '''
+        previous_basis = previous_model.highs.getBasis()
+        if not previous_basis.valid:
+            return
+        col_status = []
+        for variable, column in sorted(self.column_index.items(),
+                                       key=lambda item: item[1]):
+            previous_column = previous_model.column_index.get(variable, None)
+            if previous_column is not None:
+                col_status.append(previous_basis.col_status[previous_column])
+            elif numpy.isfinite(self.lower_bounds[column]):
+                col_status.append(highspy.HighsBasisStatus.kLower)
+            elif numpy.isfinite(self.upper_bounds[column]):
+                col_status.append(highspy.HighsBasisStatus.kUpper)
+            else:
+                col_status.append(highspy.HighsBasisStatus.kZero)
+        row_status = []
+        for constraint in sorted(self.row_index,
+                                 key=self.row_index.__getitem__):
+            previous_row = previous_model.row_index.get(constraint, None)
+            if previous_row is not None:
+                row_status.append(previous_basis.row_status[previous_row])
+            else:
+                row_status.append(highspy.HighsBasisStatus.kBasic)
+        basis = highspy.HighsBasis()
+        basis.col_status = col_status
+        basis.row_status = row_status
+        basis.valid = True
+        # HiGHS rejects basis with a wrong number of basic variables,
+        # then the problem is solved from scratch
+        self.highs.setBasis(basis)
+
+    def update(self, problem):
+        ''' Passes changes recorded by a given problem to HiGHS.
+
+            Args:
+                problem (MatrixLpProblem): loaded problem.
+
+            Returns:
+                bool: False if the problem cannot be updated and must be
+                    loaded again, True otherwise.
+        '''
+        if problem.structure_changed:
+            return False
+        if problem.added_block_variables:
+            self._add_block_columns(problem)
+        for constraint in problem.changed_rows:
+            lower, upper = get_row_bounds(constraint.sense, constraint.rhs)
+            self.highs.changeRowBounds(self.row_index[constraint],
+                                       lower, upper)
+        for constraint, variables in problem.changed_coefficients.items():
+            row = self.row_index[constraint]
+            for variable in variables:
+                column = self.column_index.get(variable, None)
+                if column is None:
+                    return False
+                self.highs.changeCoeff(row, column, constraint[variable])
+        changed_bounds = list(problem.changed_bounds)
+        # there are few extra variables, their bounds are checked directly
+        changed_bounds.extend(self.extra_variables)
+        for variable in changed_bounds:
+            self._update_bounds(variable)
+        return self._update_objective(problem)
+
+    def _add_block_columns(self, problem):
+        ''' Appends block variables added since the last solve to the
+            loaded model. Their coefficients in rows outside the data block
+            are passed as changed coefficients.
+
+            Args:
+                problem (MatrixLpProblem): loaded problem.
+        '''
+        variables = problem.added_block_variables
+        block_rows = [(self.row_index[constraint], constraint.block_row)
+                      for constraint in problem.constraints.values()
+                      if constraint.block_row is not None]
+        rows = numpy.array([row for row, _ in block_rows], dtype=numpy.int32)
+        values = problem.get_block()[
+            [block_row for _, block_row in block_rows]][
+                :, [problem.get_block_index(variable)
+                    for variable in variables]]
+        columns, row_indices = numpy.nonzero(values.T)
+        lower_bounds = numpy.array([_get_bound(variable.lowBound, -numpy.inf)
+                                    for variable in variables], dtype=float)
+        upper_bounds = numpy.array([_get_bound(variable.upBound, numpy.inf)
+                                    for variable in variables], dtype=float)
+        first_column = self.highs.getNumCol()
+        self.highs.addCols(
+            len(variables), numpy.zeros(len(variables)), lower_bounds,
+            upper_bounds, len(columns),
+            numpy.searchsorted(columns, numpy.arange(len(variables))).astype(
+                numpy.int32),
+            rows[row_indices], values[row_indices, columns])
+        new_columns = numpy.arange(first_column,
+                                   first_column + len(variables))
+        for variable, column in zip(variables, new_columns):
+            self.column_index[variable] = column
+        self.lower_bounds = numpy.concatenate((self.lower_bounds,
+                                               lower_bounds))
+        self.upper_bounds = numpy.concatenate((self.upper_bounds,
+                                               upper_bounds))
+        self.column_order = numpy.concatenate((
+            self.column_order[:self.nb_block], new_columns,
+            self.column_order[self.nb_block:]))
+        self.nb_block += len(variables)
+
+    def _update_bounds(self, variable):
+        ''' Passes bounds of a given variable to HiGHS if they were changed.
+
+            Args:
+                variable (pulp.LpVariable): variable.
+        '''
+        column = self.column_index[variable]
+        lower = _get_bound(variable.lowBound, -numpy.inf)
+        upper = _get_bound(variable.upBound, numpy.inf)
+        if (lower != self.lower_bounds[column] or
+                upper != self.upper_bounds[column]):
+            self.lower_bounds[column] = lower
+            self.upper_bounds[column] = upper
+            self.highs.changeColBounds(column, lower, upper)
+
+    def _update_objective(self, problem):
+        ''' Passes objective function and its sense to HiGHS
+            if they were changed.
+
+            Args:
+                problem (MatrixLpProblem): loaded problem.
+
+            Returns:
+                bool: False if objective function contains variables that
+                    are not loaded, True otherwise.
+        '''
+        costs = dict(problem.objective.items())
+        for variable in costs:
+            if variable not in self.column_index:
+                return False
+        for variable in set(costs).union(self.costs):
+            cost = costs.get(variable, 0)
+            if cost != self.costs.get(variable, 0):
+                self.highs.changeColCost(self.column_index[variable], cost)
+        self.costs = costs
+        if problem.sense != self.sense:
+            self.sense = problem.sense
+            if self.sense == pulp.LpMaximize:
+                self.highs.changeObjectiveSense(highspy.ObjSense.kMaximize)
+            else:
+                self.highs.changeObjectiveSense(highspy.ObjSense.kMinimize)
+        return True
+
+    def solve(self, problem):
+        ''' Solves the loaded model and stores solution in a given problem.
+
+            Args:
+                problem (MatrixLpProblem): loaded problem.
+
+            Returns:
+                int: pulp status of the solution.
+        '''
+        self.highs.run()
+        status = get_highs_status(self.highs)
+        problem.iterations = self.highs.getInfo().simplex_iteration_count
+        if status != pulp.LpStatusOptimal:
+            problem.set_solution(status, None, None, self.extra_variables)
+            return status
+        solution = self.highs.getSolution()
+        # solver tolerances might move values slightly outside of bounds
+        values = numpy.clip(numpy.array(solution.col_value),
+                            self.lower_bounds,
+                            self.upper_bounds)[self.column_order]
+        # HiGHS duals are derivatives of the objective function with respect
+        # to right hand sides, the same as in pulp
+        problem.set_solution(status, values, numpy.array(solution.row_dual),
+                             self.extra_variables)
+        return status
@@ -0,0 +1,440 @@
+''' This module contains the registry of solvers that can be selected
+    with parameter SOLVER.
+
+    Every solver has two implementations: a pulp solver that solves
+    pulp.LpProblem (used by the pulp LP engine and multiplier models) and a
+    solver backend from :mod:`pyDEA.core.models.solver_backends` that
+    solves :class:`pyDEA.core.models.matrix_lp.MatrixLpProblem`
+    (used by the matrix LP engine). CBC and GLPK run as separate processes
+    and have only pulp solvers. HiGHS and SciPy solve linear programs in
+    the same process.
+
+    All solvers take the same options: maximum number of threads,
+    primal and dual feasibility tolerance and time limit of one solve in
+    seconds. Options that are None keep solver defaults. Options that a
+    solver does not support are ignored: GLPK and SciPy solve in one
+    thread, GLPK does not allow to change tolerances from the command line.
+
+    Every solver stores the number of simplex iterations of the last solve
+    in the iterations attribute of the solved problem, see
+    :func:`pyDEA.core.models.model_base.solve_lp`.
+
+    Attributes:
+        SOLVERS (dict of str to tuple of class, class): maps solver name to
+            its pulp solver and solver backend (None if the solver
+            cannot be used with the matrix LP engine).
+        CBC_ITERATIONS (str): regular expression that matches the number
+            of iterations in CBC log.
+        GLPK_ITERATIONS (str): regular expression that matches the number
+            of iterations in GLPK log.
+'''
+import math
+import os
+import re
+import subprocess
+
+import numpy
+import pulp
+
+from pyDEA.core.data_processing.solution import LP_STATUS_TIME_LIMIT
+from pyDEA.core.models.solver_backends import HighsBackend, ScipyBackend
+from pyDEA.core.models.solver_backends import create_highs, get_highs_status
+from pyDEA.core.models.solver_backends import set_highs_options
+from pyDEA.core.models.solver_backends import set_highs_time_limit
+from pyDEA.core.models.solver_backends import solve_with_scipy
+from pyDEA.core.models.solver_backends import highspy
+
+CBC_ITERATIONS = r'- (\d+) iterations'
+GLPK_ITERATIONS = r'^\*?\s*(\d+): obj ='
+
+
+def get_default_solver_name(matrix_engine):
+    ''' Returns name of the solver that is used if parameter SOLVER
+        is empty, but some of the solver options are given.
+
+        Args:
+            matrix_engine (bool): True if linear programs are built by
+                the matrix LP engine.
+
+        Returns:
+            str: solver name.
+    '''
+    if not matrix_engine:
+        return 'cbc'
+    if highspy is not None:
+        return 'highs'
+    return 'scipy'
+
+
+def create_solver(name, matrix_engine=False, threads=None, tolerance=None,
+                  time_limit=None):
+    ''' Creates solver with a given name.
+
+        Args:
+            name (str): solver name, one of the keys of SOLVERS.
+            matrix_engine (bool, optional): True if linear programs are
+                built by the matrix LP engine. Defaults to False.
+            threads (int, optional): maximum number of threads.
+                Defaults to None.
+            tolerance (double, optional): primal and dual feasibility
+                tolerance. Defaults to None.
+            time_limit (double, optional): time limit of one solve in
+                seconds. Defaults to None.
+
+        Returns:
+            pulp.LpSolver or solver backend: solver that can be passed to
+                the solve method of linear programs.
+
+        Raises:
+            ValueError: if solver name is unknown, if solver is not
+                available or cannot be used with the matrix LP engine.
+    '''
+    if name not in SOLVERS:
+        raise ValueError('Unexpected value of parameter <SOLVER>')
+    pulp_solver, backend = SOLVERS[name]
+    if matrix_engine:
+        if backend is None:
+            raise ValueError('Solver {0} cannot be used with matrix '
+                             'LP engine'.format(name))
+        return backend(threads=threads, tolerance=tolerance,
+                       time_limit=time_limit)
+    solver = pulp_solver(threads=threads, tolerance=tolerance,
+                         time_limit=time_limit)
+    if not solver.available():
+        raise ValueError('Solver {0} is not available'.format(name))
+    return solver
+
+
+def read_iterations(file_name, pattern):
+    ''' Reads the number of simplex iterations from solver log.
+
+        Args:
+            file_name (str): path to the log file.
+            pattern (str): regular expression with one group that matches
+                the number of iterations.
+
+        Returns:
+            int: the last number of iterations found in the log or None
+                if the log does not contain it.
+    '''
+    if not os.path.exists(file_name):
+        return None
+    with open(file_name) as log_file:
+        matches = re.findall(pattern, log_file.read(), re.MULTILINE)
+    if not matches:
+        return None
+    return int(matches[-1])
+
+
+def read_glpk_duals(file_name):
+    ''' Reads dual values of constraints (marginals of rows) from
+        solution printed by glpsol with option -o. Rows are printed in
+        fixed width columns, row names longer than 12 characters are
+        printed on a separate line.
+
+        Args:
+            file_name (str): path to the solution file.
+
+        Returns:
+            dict of str to double: maps constraint name to its dual value.
+    '''
+    duals = dict()
+    with open(file_name) as solution_file:
+        lines = iter(solution_file.read().splitlines())
+    for line in lines:
+        if line.split()[:3] == ['No.', 'Row', 'name']:
+            break
+    next(lines, None)
+    for line in lines:
+        if not line.strip():
+            break
+        name = line.split()[1]
+        if len(line.split()) == 2:
+            line = next(lines)
+        marginal = line[65:].strip()
+        if marginal in ['', '< eps']:
+            duals[name] = 0.0
+        else:
+            duals[name] = float(marginal)
+    return duals
+
+
+class CbcSolver(pulp.PULP_CBC_CMD):
+    ''' CBC solver distributed with pulp. It runs CBC executable for
+        every solve and reads the number of iterations from its log.
+
+        Args:
+            threads (int, optional): maximum number of threads.
+                Defaults to None.
+            tolerance (double, optional): primal and dual feasibility
+                tolerance. Defaults to None.
+            time_limit (double, optional): time limit of one solve in
+                seconds. Defaults to None.
+    '''
+    def __init__(self, threads=None, tolerance=None, time_limit=None):
+        options = []
+        if tolerance is not None:
+            options = ['primalTolerance {0}'.format(tolerance),
+                       'dualTolerance {0}'.format(tolerance)]
+        super(CbcSolver, self).__init__(msg=False, threads=threads,
+                                        timeLimit=time_limit,
+                                        options=options)
+
+    @property
+    def time_limit(self):
+        ''' Time limit of one solve in seconds or None if there is no
+            limit, the same as timeLimit.
+        '''
+        return self.timeLimit
+
+    @time_limit.setter
+    def time_limit(self, value):
+        self.timeLimit = value
+
+    def actualSolve(self, lp, **kwargs):
+        ''' Solves a given problem with CBC and stores the number of
+            iterations in lp.iterations.
+
+            Args:
+                lp (pulp.LpProblem): problem to solve.
+
+            Returns:
+                int: pulp status of the solution.
+        '''
+        log_path, = self.create_tmp_files(lp.name, 'log')
+        self.optionsDict['logPath'] = log_path
+        try:
+            status = super(CbcSolver, self).actualSolve(lp, **kwargs)
+            lp.iterations = read_iterations(log_path, CBC_ITERATIONS)
+        finally:
+            self.delete_tmp_files(log_path)
+        return status
+
+
+class GlpkSolver(pulp.GLPK_CMD):
+    ''' GLPK solver, glpsol executable must be installed. It runs glpsol
+        for every solve. Unlike pulp.GLPK_CMD, dual values of constraints
+        and the number of iterations are read as well. GLPK prints
+        values rounded to six significant digits.
+
+        Args:
+            threads (int, optional): ignored, GLPK solves in one thread.
+                Defaults to None.
+            tolerance (double, optional): ignored, GLPK does not allow to
+                change it from the command line. Defaults to None.
+            time_limit (double, optional): time limit of one solve in
+                seconds, GLPK rounds it up to whole seconds.
+                Defaults to None.
+    '''
+    def __init__(self, threads=None, tolerance=None, time_limit=None):
+        super(GlpkSolver, self).__init__(mip=False, msg=False,
+                                         timeLimit=time_limit)
+
+    @property
+    def time_limit(self):
+        ''' Time limit of one solve in seconds or None if there is no
+            limit, the same as timeLimit.
+        '''
+        return self.timeLimit
+
+    @time_limit.setter
+    def time_limit(self, value):
+        self.timeLimit = value
+
+    def actualSolve(self, lp, **kwargs):
+        ''' Solves a given problem with glpsol and stores solution in it.
+
+            Args:
+                lp (pulp.LpProblem): problem to solve.
+
+            Returns:
+                int: pulp status of the solution.
+
+            Raises:
+                pulp.PulpSolverError: if glpsol cannot be executed.
+        '''
+        if not self.executable(self.path):
+            raise pulp.PulpSolverError('Cannot execute ' + self.path)
+        tmp_lp, tmp_sol, tmp_log = self.create_tmp_files(lp.name, 'lp',
+                                                         'sol', 'log')
+        lp.writeLP(tmp_lp, writeSOS=0)
+        args = [self.path, '--cpxlp', tmp_lp, '-o', tmp_sol,
+                '--log', tmp_log, '--nomip']
+        if self.timeLimit is not None:
+            args.extend(['--tmlim', str(int(math.ceil(self.timeLimit)))])
+        try:
+            with open(os.devnull, 'w') as pipe:
+                return_code = subprocess.call(args, stdout=pipe,
+                                              stderr=pipe)
+            if return_code or not os.path.exists(tmp_sol):
+                raise pulp.PulpSolverError(
+                    'Error while executing ' + self.path)
+            status, values = self.readsol(tmp_sol)
+            lp.assignVarsVals(values)
+            lp.assignConsPi(read_glpk_duals(tmp_sol))
+            lp.assignStatus(status)
+            lp.iterations = read_iterations(tmp_log, GLPK_ITERATIONS)
+        finally:
+            self.delete_tmp_files(tmp_lp, tmp_sol, tmp_log)
+        return status
+
+
+class ArraySolver(pulp.LpSolver):
+    ''' Base class for pulp solvers that pass the problem to a solver
+        library in the same process as NumPy arrays. The problem is
+        converted in every solve, since pulp problems do not record
+        which coefficients were changed.
+
+        Attributes:
+            threads (int): maximum number of threads or None.
+            tolerance (double): primal and dual feasibility tolerance
+                or None.
+            time_limit (double): time limit of one solve in seconds
+                or None.
+
+        Args:
+            threads (int, optional): maximum number of threads.
+                Defaults to None.
+            tolerance (double, optional): primal and dual feasibility
+                tolerance. Defaults to None.
+            time_limit (double, optional): time limit of one solve in
+                seconds. Defaults to None.
+    '''
+    def __init__(self, threads=None, tolerance=None, time_limit=None):
+        super(ArraySolver, self).__init__(mip=False, msg=False,
+                                          timeLimit=time_limit)
+        self.threads = threads
+        self.tolerance = tolerance
+        self.time_limit = time_limit
+
+    def actualSolve(self, lp, **kwargs):
+        ''' Solves a given problem and stores solution in it. Dual values
+            of constraints are set to zero if the solution is not optimal.
+
+            Args:
+                lp (pulp.LpProblem): problem to solve.
+
+            Returns:
+                int: pulp status of the solution.
+        '''
+        variables = lp.variables()
+        constraints = list(lp.constraints.values())
+        column_index = dict((variable, index) for index, variable
+                            in enumerate(variables))
+        matrix = numpy.zeros((len(constraints), len(variables)))
+        for row, constraint in enumerate(constraints):
+            for variable, coefficient in constraint.items():
+                matrix[row, column_index[variable]] = coefficient
+        senses = numpy.array([constraint.sense for constraint in constraints],
+                             dtype=int)
+        rhs = numpy.array([-constraint.constant for constraint
+                           in constraints], dtype=float)
+        costs = numpy.zeros(len(variables))
+        for variable, coefficient in lp.objective.items():
+            costs[column_index[variable]] = coefficient
+        lower_bounds = numpy.array(
+            [-numpy.inf if variable.lowBound is None else variable.lowBound
+             for variable in variables], dtype=float)
+        upper_bounds = numpy.array(
+            [numpy.inf if variable.upBound is None else variable.upBound
+             for variable in variables], dtype=float)
+        status, values, duals, lp.iterations = self._solve_arrays(
+            costs, matrix, senses, rhs, lower_bounds, upper_bounds, lp.sense)
+        if status == pulp.LpStatusOptimal:
+            for variable, value in zip(variables, values):
+                variable.varValue = float(value)
+            for constraint, dual in zip(constraints, duals):
+                constraint.pi = float(dual)
+        else:
+            for constraint in constraints:
+                constraint.pi = 0.0
+        if status == LP_STATUS_TIME_LIMIT:
+            # pulp does not accept statuses it does not define
+            lp.assignStatus(pulp.LpStatusNotSolved)
+            lp.status = status
+        else:
+            lp.assignStatus(status)
+        return status
+
+    def _solve_arrays(self, costs, matrix, senses, rhs, lower_bounds,
+                      upper_bounds, sense):
+        ''' Solves a linear program given by arrays. Must be implemented
+            in derived classes.
+
+            Args:
+                costs (numpy.ndarray): objective function coefficients.
+                matrix (numpy.ndarray): constraint matrix.
+                senses (numpy.ndarray): pulp senses of constraints.
+                rhs (numpy.ndarray): right hand sides of constraints.
+                lower_bounds (numpy.ndarray): lower bounds of variables.
+                upper_bounds (numpy.ndarray): upper bounds of variables.
+                sense (int): pulp.LpMinimize or pulp.LpMaximize.
+
+            Returns:
+                tuple of int, numpy.ndarray, numpy.ndarray, int: pulp
+                    status, values of variables, dual values of constraints
+                    and number of simplex iterations.
+        '''
+        raise NotImplementedError()
+
+
+class HighsSolver(ArraySolver):
+    ''' Pulp solver that solves problems with HiGHS through highspy.
+    '''
+    def available(self):
+        ''' Checks if highspy is installed.
+
+            Returns:
+                bool: True if highspy is installed, False otherwise.
+        '''
+        return highspy is not None
+
+    def _solve_arrays(self, costs, matrix, senses, rhs, lower_bounds,
+                      upper_bounds, sense):
+        ''' See base class.
+        '''
+        highs = create_highs(costs, matrix, senses, rhs, lower_bounds,
+                             upper_bounds, sense)
+        set_highs_options(highs, self.threads, self.tolerance)
+        set_highs_time_limit(highs, self.time_limit)
+        highs.run()
+        status = get_highs_status(highs)
+        iterations = highs.getInfo().simplex_iteration_count
+        if status != pulp.LpStatusOptimal:
+            return status, None, None, iterations
+        solution = highs.getSolution()
+        # solver tolerances might move values slightly outside of bounds
+        values = numpy.clip(numpy.array(solution.col_value), lower_bounds,
+                            upper_bounds)
+        return status, values, numpy.array(solution.row_dual), iterations
+
+
+class ScipySolver(ArraySolver):
+    ''' Pulp solver that solves problems with HiGHS available through
+        scipy.optimize.linprog. Option threads is ignored.
+    '''
+    def available(self):
+        ''' Checks if scipy is installed.
+
+            Returns:
+                bool: True if scipy is installed, False otherwise.
+        '''
+        try:
+            import scipy.optimize
+        except ImportError:
+            return False
+        return True
+
+    def _solve_arrays(self, costs, matrix, senses, rhs, lower_bounds,
+                      upper_bounds, sense):
+        ''' See base class.
+        '''
+        return solve_with_scipy(costs, matrix, senses, rhs, lower_bounds,
+                                upper_bounds, sense, self.tolerance,
+                                self.time_limit)
+
+
+SOLVERS = {'cbc': (CbcSolver, None),
+           'glpk': (GlpkSolver, None),
+           'highs': (HighsSolver, HighsBackend),
+           'scipy': (ScipySolver, ScipyBackend)}
@@ -11,6 +11,12 @@ from pyDEA.core.data_processing.solution import SolutionWithVRS
 class SupperEfficiencyModel(ModelBase):
     ''' This class implements super efficiency model.
 
+        Linear program is created once with all DMUs. Before linear
+        program of a DMU is solved, this DMU is excluded from the
+        reference set (upper bound of its lambda variable is fixed to
+        zero in the envelopment model, its constraint is removed in
+        the multiplier model) and it is restored afterwards.
+
         Attributes:
             model (ModelBase): model that should be decorated
                 with super efficiency model.
@@ -48,10 +54,11 @@ class SupperEfficiencyModel(ModelBase):
         if len(self.model.input_data.DMU_codes) == 1:  # special case
             self._fill_solution_one_dmu(dmu_code, model_solution)
             return
-        self.model.input_data.DMU_codes.remove(dmu_code)
-        self.model._create_lp()
-        self.model.run_for_one_DMU(dmu_code, model_solution)
-        self.model.input_data.DMU_codes.add(dmu_code)
+        self.model._exclude_dmu(dmu_code)
+        try:
+            self.model.run_for_one_DMU(dmu_code, model_solution)
+        finally:
+            self.model._restore_dmu(dmu_code)
 
     def _fill_solution(self, dmu_code, model_solution):
         ''' Fills given solution with data calculated for one DMU.
@@ -4,6 +4,8 @@
 
         FILE_TYPES (list of tuple of str, str): list of supported
             input file parameters.
+        SAVE_DATA_FILE_TYPES (list of tuple of str, str): list of file
+            formats offered when input data is saved.
         SOLUTION_XLSX_FILE (list of tuple of str, str): list of
             supported solution file formats (xlsx).
         TEXT_FOR_PANEL (str): text displayed in the label on the data tab before
@@ -44,7 +46,12 @@ LOG_FILE = 'logging_config.ini'
 PACKAGE = 'pyDEA'
 
 FILE_TYPES = [('Excel (xlsx)', '*.xlsx'),
-              ('Text CSV', '*.csv')]
+              ('Text CSV', '*.csv'),
+              ('Parquet', '*.parquet'),
+              ('Feather', '*.feather'),
+              ('NumPy (npz)', '*.npz'),
+              ('SQLite', '*.db *.sqlite *.sqlite3')]
+SAVE_DATA_FILE_TYPES = FILE_TYPES[:2]
 SOLUTION_XLSX_FILE = [('Excel (xlsx)', '*.xlsx')]
 TEXT_FOR_PANEL = 'File: '
 TEXT_FOR_FILE_LBL = 'Data from file: '
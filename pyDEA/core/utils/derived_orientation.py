@@ -0,0 +1,304 @@
+''' This module contains functions that derive solution of the
+    output-oriented CRS model from solution of the input-oriented CRS model
+    instead of solving linear programs.
+
+    If theta is the optimal value of the input-oriented CRS envelopment
+    model of a DMU with lambda variables lambda, then
+    lambda / theta is an optimal solution of the output-oriented model with
+    optimal value 1 / theta. Duals (weights of the multiplier model)
+    are also divided by theta. Efficiency score of the output-oriented model
+    is 1 / (1 / theta) = theta, so it does not change.
+
+    Attributes:
+        VERIFICATION_TOLERANCE (double): tolerance used by
+            verify_derived_solution, it is relative for values
+            larger than one.
+'''
+import numpy
+import pulp
+
+from pyDEA.core.utils.dea_utils import get_logger, ZERO_TOLERANCE
+
+VERIFICATION_TOLERANCE = 1e-6
+
+
+def get_derivation_mode(params):
+    ''' Returns value of parameter DERIVE_OUTPUT_ORIENTATION.
+
+        Args:
+            params (Parameters): parameters.
+
+        Returns:
+            str: empty string if output-oriented CRS model must be solved,
+                yes if it must be derived, verify if it must be derived
+                and checked against the solved model.
+
+        Raises:
+            ValueError: if parameter DERIVE_OUTPUT_ORIENTATION has
+                invalid value.
+    '''
+    mode = params.get_parameter_value('DERIVE_OUTPUT_ORIENTATION')
+    if mode not in ['', 'yes', 'verify']:
+        raise ValueError(
+            'Unexpected value of parameter <DERIVE_OUTPUT_ORIENTATION>')
+    return mode
+
+
+def get_derivation_conflict(params):
+    ''' Checks if solution of the output-oriented CRS model can be derived
+        from solution of the input-oriented CRS model with given parameters.
+        This is not the case for super efficiency, two phase model,
+        non-discretionary and weakly disposal categories, weight
+        restrictions and multiplier model with non-zero tolerance.
+
+        Args:
+            params (Parameters): parameters of one of the models.
+
+        Returns:
+            str: description of the parameter that prevents derivation
+                or None if solution can be derived.
+    '''
+    if params.get_parameter_value('USE_SUPER_EFFICIENCY'):
+        return 'super efficiency'
+    if params.get_parameter_value('MAXIMIZE_SLACKS'):
+        return 'two phase model'
+    if (params.get_parameter_value('DEA_FORM') == 'multi' and
+            float(params.get_parameter_value(
+                'MULTIPLIER_MODEL_TOLERANCE') or 0) != 0):
+        return 'parameter <MULTIPLIER_MODEL_TOLERANCE>'
+    for param_name in ['NON_DISCRETIONARY_CATEGORIES',
+                       'WEAKLY_DISPOSAL_CATEGORIES',
+                       'ABS_WEIGHT_RESTRICTIONS',
+                       'VIRTUAL_WEIGHT_RESTRICTIONS',
+                       'PRICE_RATIO_RESTRICTIONS']:
+        if params.get_set_of_parameters(param_name):
+            return 'parameter <{0}>'.format(param_name)
+    return None
+
+
+def get_derived_models(params, all_params):
+    ''' Finds models whose solutions must be derived instead of solved.
+
+        Args:
+            params (Parameters): parameters given by the user.
+            all_params (list of Parameters): parameters of models created
+                by model_builder.build_models.
+
+        Returns:
+            dict of int to int: dictionary that maps index of the
+                output-oriented CRS model to index of the input-oriented
+                CRS model. It is empty if parameter DERIVE_OUTPUT_ORIENTATION
+                is not set or if solution cannot be derived.
+    '''
+    if not get_derivation_mode(params):
+        return dict()
+    input_model = None
+    output_model = None
+    for count, model_params in enumerate(all_params):
+        if model_params.get_parameter_value('RETURN_TO_SCALE') != 'CRS':
+            continue
+        if model_params.get_parameter_value('ORIENTATION') == 'input':
+            input_model = count
+        else:
+            output_model = count
+    if (input_model is None or output_model is None or
+            get_derivation_conflict(all_params[output_model]) is not None):
+        return dict()
+    return {output_model: input_model}
+
+
+def get_unsolved_dmus(input_solution):
+    ''' Returns DMUs whose results cannot be derived from solution of
+        the input-oriented CRS model: DMUs whose linear programs are not
+        optimal or have zero efficiency score, i.e. output-oriented
+        linear program is unbounded.
+
+        Args:
+            input_solution (Solution): solution of the input-oriented
+                CRS model.
+
+        Returns:
+            list of str: DMU codes.
+    '''
+    dmu_codes = list(input_solution.lp_status)
+    is_solved = ((input_solution.lp_status.get_values(dmu_codes) ==
+                  pulp.LpStatusOptimal) &
+                 (input_solution.efficiency_scores.get_values(dmu_codes) >
+                  ZERO_TOLERANCE))
+    return [dmu_code for dmu_code, solved in zip(dmu_codes, is_solved.tolist())
+            if not solved]
+
+
+def derive_output_oriented_solution(input_solution, output_model):
+    ''' Derives solution of the output-oriented CRS model from solution
+        of the input-oriented CRS model. Linear programs of DMUs returned
+        by get_unsolved_dmus are solved with the output-oriented model.
+        Linear programs of all other DMUs are recorded as skipped.
+
+        Args:
+            input_solution (Solution): solution of the input-oriented
+                CRS model.
+            output_model (ModelBase): output-oriented CRS model created
+                from the same input data.
+
+        Returns:
+            Solution: solution of the output-oriented model.
+    '''
+    model_solution = output_model._create_solution()
+    model_solution.orientation = 'output'
+    unsolved_dmus = get_unsolved_dmus(input_solution)
+    skipped_dmus = list(set(input_solution.lp_status).difference(
+        unsolved_dmus))
+    scores = input_solution.efficiency_scores.get_values(skipped_dmus)
+    for dmu_code, score in zip(skipped_dmus, scores.tolist()):
+        model_solution.add_lp_status(dmu_code, pulp.LpStatusOptimal)
+        model_solution.add_efficiency_score(dmu_code, score)
+        model_solution.add_lambda_variables(dmu_code, dict(
+            (dmu, float(value) / score) for dmu, value in
+            input_solution.get_lambda_variables(dmu_code).items()))
+        model_solution.add_skipped_lp(dmu_code)
+    # missing duals are NaN and stay missing after division
+    for duals, derived_duals in [
+            (input_solution.input_duals, model_solution.input_duals),
+            (input_solution.output_duals, model_solution.output_duals)]:
+        categories = list(duals.category_index)
+        derived_duals.set_values(
+            skipped_dmus, categories,
+            duals.get_values(skipped_dmus, categories) /
+            scores[:, numpy.newaxis])
+    if unsolved_dmus:
+        solved_solution = output_model.run(unsolved_dmus)
+        for dmu_code in unsolved_dmus:
+            model_solution.import_results(
+                dmu_code, solved_solution.export_results(dmu_code))
+    return model_solution
+
+
+def derive_solutions(models, results, derived_models, solve_model,
+                     verify=False):
+    ''' Derives solutions of output-oriented CRS models.
+
+        Peel the onion ranks and status are taken from the input-oriented
+        model, since efficient DMUs of both models are the same. It is not
+        true if some linear programs are not optimal, then the
+        output-oriented model is solved.
+
+        Args:
+            models (list of ModelBase): models created by
+                model_builder.build_models.
+            results (dict of int to tuple of Solution, dict of str to int,
+                bool): dictionary that maps index of the solved model to
+                its solution, peel the onion ranks (or None) and
+                status of peel the onion. Results of derived models are
+                added to it.
+            derived_models (dict of int to int): dictionary returned by
+                get_derived_models.
+            solve_model (func): function that takes a model, solves it and
+                returns its results in the same format as results.
+            verify (bool, optional): if True, derived solutions are checked
+                against solutions of output-oriented models that must be
+                in results. Defaults to False.
+
+        Raises:
+            ValueError: if derived results of some DMUs are not the same
+                as solved ones.
+    '''
+    for count, input_count in derived_models.items():
+        input_solution, ranks, state = results[input_count]
+        if ranks is not None and get_unsolved_dmus(input_solution):
+            if not verify:
+                results[count] = solve_model(models[count])
+            continue
+        model_solution = derive_output_oriented_solution(input_solution,
+                                                         models[count])
+        if verify:
+            input_data = models[count].input_data
+            different_dmus = verify_derived_solution(
+                model_solution, results[count][0], input_data)
+            if different_dmus:
+                raise ValueError(
+                    'Derived output-oriented solution differs from the '
+                    'solved one for DMUs: {0}'.format(', '.join(
+                        input_data.get_dmu_user_name(dmu_code)
+                        for dmu_code in different_dmus)))
+            get_logger().info('Derived output-oriented solution is verified.')
+        results[count] = (model_solution, ranks, state)
+
+
+def verify_derived_solution(derived_solution, solution, input_data,
+                            tolerance=VERIFICATION_TOLERANCE):
+    ''' Checks derived solution of the output-oriented CRS model against
+        solution obtained by solving linear programs. Linear programs might
+        have several optimal solutions, so lambda variables and duals
+        are not compared directly. Instead, lambda variables must be
+        feasible and duals must give the same objective value as the
+        solved model.
+
+        Args:
+            derived_solution (Solution): solution returned by
+                derive_output_oriented_solution.
+            solution (Solution): solution of the output-oriented model.
+            input_data (InputData): input data.
+            tolerance (double, optional): tolerance, it is relative for
+                values larger than one. Defaults to VERIFICATION_TOLERANCE.
+
+        Returns:
+            list of str: DMU codes whose derived results are not
+                the same as solved ones.
+    '''
+    different_dmus = []
+    for dmu_code, status in solution.lp_status.items():
+        if derived_solution.lp_status.get(dmu_code) != status:
+            different_dmus.append(dmu_code)
+        elif (status == pulp.LpStatusOptimal and
+              dmu_code in derived_solution.skipped_lps and
+              not _is_same_optimum(derived_solution, solution, input_data,
+                                   dmu_code, tolerance)):
+            different_dmus.append(dmu_code)
+    return different_dmus
+
+
+def _is_same_optimum(derived_solution, solution, input_data, dmu_code,
+                     tolerance):
+    ''' Checks if derived results of a given DMU are optimal for the
+        output-oriented model.
+
+        Args:
+            derived_solution (Solution): derived solution.
+            solution (Solution): solved solution.
+            input_data (InputData): input data.
+            dmu_code (str): DMU code.
+            tolerance (double): tolerance.
+
+        Returns:
+            bool: True if derived results are optimal, False otherwise.
+    '''
+    score = solution.get_efficiency_score(dmu_code)
+    if abs(derived_solution.get_efficiency_score(dmu_code) -
+           score) > tolerance:
+        return False
+    coefficients = input_data.coefficients
+    lambdas = derived_solution.get_lambda_variables(dmu_code)
+    for category in input_data.input_categories:
+        total = sum(coefficients[dmu, category] * value
+                    for dmu, value in lambdas.items())
+        value = coefficients[dmu_code, category]
+        if total > value + tolerance * max(1, abs(value)):
+            return False
+    for category in input_data.output_categories:
+        total = sum(coefficients[dmu, category] * value
+                    for dmu, value in lambdas.items())
+        value = coefficients[dmu_code, category] / score
+        if total < value - tolerance * max(1, abs(value)):
+            return False
+    # weights of outputs are normalised, weighted inputs are equal
+    # to the optimal value
+    weighted_outputs = sum(
+        coefficients[dmu_code, category] * dual for category, dual in
+        derived_solution.output_duals[dmu_code].items())
+    weighted_inputs = sum(
+        coefficients[dmu_code, category] * dual for category, dual in
+        derived_solution.input_duals[dmu_code].items())
+    return (abs(weighted_outputs - 1) <= tolerance and
+            abs(weighted_inputs - 1 / score) <= tolerance * max(
+                1, 1 / score))
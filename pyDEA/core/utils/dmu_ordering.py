@@ -0,0 +1,66 @@
+''' This module contains functions that define the order in which
+    linear programs of DMUs are solved.
+
+    The order does not change the solution, but solvers that keep the
+    linear program loaded between DMUs (see
+    :mod:`pyDEA.core.models.solver_backends`) start every solve from the
+    optimal basis of the previous DMU. If consecutive DMUs have similar
+    data, this basis is often close to optimal and only a few simplex
+    iterations are needed.
+'''
+import numpy
+
+
+def get_dmu_profiles(input_data, dmu_codes):
+    ''' Returns data of given DMUs scaled so that every category has
+        maximum absolute value 1 and every DMU vector has length 1.
+
+        Args:
+            input_data (InputData): object that stores input data.
+            dmu_codes (list of str): DMU codes.
+
+        Returns:
+            numpy.ndarray: array with one row per DMU.
+    '''
+    categories = (sorted(input_data.input_categories) +
+                  sorted(input_data.output_categories))
+    profiles = input_data.get_values(categories, dmu_codes)
+    scale = numpy.abs(profiles).max(axis=0)
+    scale[scale == 0] = 1
+    profiles /= scale
+    norms = numpy.linalg.norm(profiles, axis=1)
+    norms[norms == 0] = 1
+    profiles /= norms[:, None]
+    return profiles
+
+
+def order_by_similarity(input_data, dmu_codes):
+    ''' Orders DMUs so that consecutive DMUs have similar data.
+        Starting from the smallest DMU code, the next DMU is always
+        the nearest (in terms of profiles returned by get_dmu_profiles)
+        DMU that was not visited yet.
+
+        Args:
+            input_data (InputData): object that stores input data.
+            dmu_codes (iterable of str): DMU codes.
+
+        Returns:
+            list of str: ordered DMU codes.
+    '''
+    dmu_codes = sorted(dmu_codes)
+    if len(dmu_codes) < 3:
+        return dmu_codes
+    profiles = get_dmu_profiles(input_data, dmu_codes)
+    visited = numpy.zeros(len(dmu_codes), dtype=bool)
+    current = 0
+    order = [current]
+    visited[current] = True
+    for count in range(len(dmu_codes) - 1):
+        # profiles have unit length, so the nearest profile is the one
+        # with the largest dot product
+        similarity = profiles.dot(profiles[current])
+        similarity[visited] = -numpy.inf
+        current = int(numpy.argmax(similarity))
+        order.append(current)
+        visited[current] = True
+    return [dmu_codes[index] for index in order]
@@ -0,0 +1,381 @@
+''' This module contains functions that find DMUs dominated by other DMUs.
+
+    DMU A dominates DMU B if A has smaller or equal inputs and larger or
+    equal outputs than B in every category, and the two differ in at least
+    one category. A strictly dominates B if all inputs are smaller and all
+    outputs are larger. Dominated DMUs are never efficient in the
+    Pareto sense, strictly dominated DMUs also have efficiency score
+    smaller than 1.
+
+    Comparisons are done with NumPy on blocks of DMUs, so memory used
+    at once is bounded by constants of this module and by bitmaps of size
+    NB_LEVELS times the number of DMUs times the number of categories bits.
+
+    The same comparisons give DMUs that are certainly not efficient
+    in a given model (see find_inefficient).
+'''
+import numpy
+
+DEFAULT_BLOCK_SIZE = 256
+# blocks are compared directly to at most this number of DMUs,
+# otherwise bitmaps are used to select candidates
+DIRECT_COMPARISON_LIMIT = 2048
+NB_LEVELS = 64
+# maximum number of bitmap bytes whose pairs are compared at once
+PAIR_CHUNK_SIZE = 16384
+# bound on efficiency score must be below 1 by more than this value
+# to be sure that DMU is not efficient
+SCORE_TOLERANCE = 1e-6
+
+
+def get_category_values(input_data, dmu_codes):
+    ''' Returns inputs and outputs of given DMUs as arrays.
+
+        Args:
+            input_data (InputData): object that stores input data.
+            dmu_codes (list of str): DMU codes.
+
+        Returns:
+            tuple of numpy.ndarray, numpy.ndarray: inputs and outputs
+                with one row per DMU and one column per category.
+    '''
+    return (input_data.get_input_matrix(dmu_codes),
+            input_data.get_output_matrix(dmu_codes))
+
+
+def find_dominated(inputs, outputs, strict=False,
+                   block_size=DEFAULT_BLOCK_SIZE):
+    ''' Finds DMUs that are dominated by other DMUs.
+
+        DMUs are sorted by the sum of scaled outputs minus the sum of
+        scaled inputs. A DMU can be dominated only by DMUs with larger sum,
+        so every block of sorted DMUs is compared only to itself and to
+        DMUs of previous blocks that were not dominated.
+        If there are many such DMUs, candidates are first selected with
+        bitmaps: values of every category are split into NB_LEVELS
+        quantiles and DMUs that are below the quantile of
+        the compared DMU in any category are skipped.
+
+        Args:
+            inputs (numpy.ndarray): inputs with one row per DMU.
+            outputs (numpy.ndarray): outputs with one row per DMU.
+            strict (bool, optional): if True, only strictly dominated DMUs
+                are found. Defaults to False.
+            block_size (int, optional): number of DMUs compared at once.
+                Defaults to DEFAULT_BLOCK_SIZE.
+
+        Returns:
+            numpy.ndarray: boolean array that is True for dominated DMUs.
+    '''
+    # all columns are transformed so that larger values are better
+    values = numpy.hstack((-numpy.asarray(inputs, dtype=float),
+                           numpy.asarray(outputs, dtype=float)))
+    nb_dmus = values.shape[0]
+    dominated = numpy.zeros(nb_dmus, dtype=bool)
+    if nb_dmus < 2:
+        return dominated
+    scale = numpy.abs(values).max(axis=0)
+    scale[scale == 0] = 1
+    order = numpy.argsort(-(values / scale).sum(axis=1), kind='stable')
+    values = values[order]
+    levels, level_bitmaps = _create_level_bitmaps(values)
+    is_dominated = numpy.zeros(nb_dmus, dtype=bool)
+    for start in range(0, nb_dmus, block_size):
+        stop = min(nb_dmus, start + block_size)
+        # DMUs of the block itself are also candidates
+        candidates = numpy.flatnonzero(~is_dominated[:stop])
+        if len(candidates) <= DIRECT_COMPARISON_LIMIT:
+            # candidates with larger sums are compared first, they are
+            # more likely to dominate DMUs of the block
+            block = is_dominated[start:stop]
+            for chunk_start in range(0, len(candidates), block_size):
+                remaining = numpy.flatnonzero(~block)
+                if len(remaining) == 0:
+                    break
+                block[remaining] = _is_dominated(
+                    values[start + remaining],
+                    values[candidates[chunk_start:chunk_start + block_size]],
+                    strict)
+        else:
+            _find_dominated_with_bitmaps(
+                values, start, stop, ~is_dominated[:stop], levels,
+                level_bitmaps, strict, is_dominated)
+    dominated[order] = is_dominated
+    return dominated
+
+
+def _create_level_bitmaps(values):
+    ''' Splits values of every column into quantiles and creates bitmaps
+        of rows whose values are not below every quantile.
+
+        Args:
+            values (numpy.ndarray): values with one row per DMU.
+
+        Returns:
+            tuple of numpy.ndarray, list of numpy.ndarray: index of the
+                quantile of every value and, for every column, packed
+                bitmaps with one row per quantile.
+    '''
+    nb_dmus, nb_columns = values.shape
+    nb_levels = min(NB_LEVELS, nb_dmus)
+    levels = numpy.empty((nb_dmus, nb_columns), dtype=numpy.intp)
+    level_bitmaps = []
+    for column in range(nb_columns):
+        edges = numpy.quantile(values[:, column],
+                               numpy.arange(nb_levels) / float(nb_levels))
+        column_levels = numpy.searchsorted(edges, values[:, column],
+                                           side='right') - 1
+        column_levels[column_levels < 0] = 0
+        levels[:, column] = column_levels
+        level_bitmaps.append(numpy.packbits(
+            column_levels[None, :] >= numpy.arange(nb_levels)[:, None],
+            axis=1))
+    return levels, level_bitmaps
+
+
+def _find_dominated_with_bitmaps(values, start, stop, is_candidate, levels,
+                                 level_bitmaps, strict, is_dominated):
+    ''' Finds dominated rows of a given block. Only rows that are not
+        below the compared row in terms of quantiles are compared.
+
+        Args:
+            values (numpy.ndarray): values with one row per DMU.
+            start (int): index of the first row of the block.
+            stop (int): index of the row after the last row of the block.
+            is_candidate (numpy.ndarray): boolean array that is True
+                for rows with index smaller than stop that might dominate
+                rows of the block.
+            levels (numpy.ndarray): index of the quantile of every value.
+            level_bitmaps (list of numpy.ndarray): bitmaps created by
+                _create_level_bitmaps.
+            strict (bool): if True, only strict dominance is checked.
+            is_dominated (numpy.ndarray): boolean array where dominated
+                rows are marked.
+    '''
+    nb_bytes = (stop + 7) // 8
+    block_levels = levels[start:stop]
+    bitmap = numpy.repeat(numpy.packbits(is_candidate)[None, :],
+                          stop - start, axis=0)
+    for column, column_bitmaps in enumerate(level_bitmaps):
+        bitmap &= column_bitmaps[block_levels[:, column], :nb_bytes]
+    rows, byte_indices = numpy.nonzero(bitmap)
+    for chunk_start in range(0, len(rows), PAIR_CHUNK_SIZE):
+        chunk = slice(chunk_start, chunk_start + PAIR_CHUNK_SIZE)
+        bits = numpy.unpackbits(
+            bitmap[rows[chunk], byte_indices[chunk]][:, None], axis=1)
+        pair_indices, bit_indices = numpy.nonzero(bits)
+        points = rows[chunk][pair_indices] + start
+        other_points = byte_indices[chunk][pair_indices] * 8 + bit_indices
+        not_same = points != other_points
+        points = points[not_same]
+        other_points = other_points[not_same]
+        is_dominated[points[_dominates(values[other_points],
+                                       values[points], strict)]] = True
+
+
+def _is_dominated(points, other_points, strict):
+    ''' Checks which points are dominated by at least one of other points.
+        Larger values are better in all columns.
+
+        Args:
+            points (numpy.ndarray): points with one row per DMU.
+            other_points (numpy.ndarray): points that might dominate points.
+            strict (bool): if True, only strict dominance is checked.
+
+        Returns:
+            numpy.ndarray: boolean array that is True for dominated points.
+    '''
+    better = other_points[None, :, :] > points[:, None, :]
+    if strict:
+        return better.all(axis=2).any(axis=1)
+    not_worse = other_points[None, :, :] >= points[:, None, :]
+    return (not_worse.all(axis=2) & better.any(axis=2)).any(axis=1)
+
+
+def _dominates(points, other_points, strict):
+    ''' Checks if points dominate other points row by row.
+        Larger values are better in all columns.
+
+        Args:
+            points (numpy.ndarray): points with one row per DMU.
+            other_points (numpy.ndarray): points with the same shape.
+            strict (bool): if True, only strict dominance is checked.
+
+        Returns:
+            numpy.ndarray: boolean array that is True for rows where
+                point dominates other point.
+    '''
+    better = points > other_points
+    if strict:
+        return better.all(axis=1)
+    return (points >= other_points).all(axis=1) & better.any(axis=1)
+
+
+def get_dominated_dmus(input_data, dmu_codes, strict=False):
+    ''' Returns DMUs that are dominated by other DMUs from given DMUs.
+
+        Args:
+            input_data (InputData): object that stores input data.
+            dmu_codes (iterable of str): DMU codes.
+            strict (bool, optional): if True, only strictly dominated DMUs
+                are returned. Defaults to False.
+
+        Returns:
+            set of str: dominated DMUs.
+    '''
+    dmu_codes = list(dmu_codes)
+    inputs, outputs = get_category_values(input_data, dmu_codes)
+    dominated = find_dominated(inputs, outputs, strict)
+    return set(dmu_codes[index] for index in numpy.flatnonzero(dominated))
+
+
+def find_inefficient(inputs, outputs, reference_inputs, reference_outputs,
+                     orientation, vrs=False, non_discretionary=None,
+                     block_size=DEFAULT_BLOCK_SIZE):
+    ''' Finds DMUs whose efficiency score is certainly smaller than 1
+        if they are compared to given reference DMUs.
+
+        Efficiency score of a DMU is bounded from above by the score
+        computed with only one reference DMU (scaled in CRS model), and
+        this score is computed without solving linear programs.
+        DMUs with zero bound are not returned, since their linear programs
+        might be unbounded. Weight restrictions can only decrease efficiency scores and the
+        DMU itself gives score 1, so the bound is also valid with weight
+        restrictions and super efficiency. It is not valid with weakly
+        disposal categories.
+
+        Args:
+            inputs (numpy.ndarray): inputs with one row per DMU.
+            outputs (numpy.ndarray): outputs with one row per DMU.
+            reference_inputs (numpy.ndarray): inputs of reference DMUs.
+            reference_outputs (numpy.ndarray): outputs of reference DMUs.
+            orientation (str): input or output.
+            vrs (bool, optional): if True, bound of VRS model is computed,
+                otherwise of CRS model. Defaults to False.
+            non_discretionary (numpy.ndarray, optional): boolean array that
+                is True for non-discretionary input categories if
+                orientation is input, or output categories if orientation
+                is output. Defaults to all categories being discretionary.
+            block_size (int, optional): number of DMUs compared at once.
+                Defaults to DEFAULT_BLOCK_SIZE.
+
+        Returns:
+            numpy.ndarray: boolean array that is True for DMUs that are
+                certainly not efficient.
+
+        Raises:
+            ValueError: if orientation is not input or output.
+    '''
+    values = [numpy.asarray(array, dtype=float) for array in
+              (inputs, outputs, reference_inputs, reference_outputs)]
+    inputs, outputs, reference_inputs, reference_outputs = values
+    inefficient = numpy.zeros(inputs.shape[0], dtype=bool)
+    if orientation == 'input':
+        oriented, reference_oriented = inputs, reference_inputs
+    elif orientation == 'output':
+        oriented, reference_oriented = outputs, reference_outputs
+    else:
+        raise ValueError('Unexpected orientation <{0}>'.format(orientation))
+    if non_discretionary is None:
+        non_discretionary = numpy.zeros(oriented.shape[1], dtype=bool)
+    # ratios are not meaningful for negative values
+    if (not (~non_discretionary).any() or
+            any((array < 0).any() for array in values)):
+        return inefficient
+    is_input = orientation == 'input'
+    for start in range(0, inputs.shape[0], block_size):
+        block = slice(start, start + block_size)
+        # other side of the DMU determines how reference DMU is scaled
+        if is_input:
+            scaling = _get_max_ratios(outputs[block], reference_outputs,
+                                      False)
+        else:
+            scaling = _get_max_ratios(inputs[block], reference_inputs, True)
+        score = _get_max_ratios(oriented[block, ~non_discretionary],
+                                reference_oriented[:, ~non_discretionary],
+                                is_input)
+        fixed = _get_max_ratios(oriented[block, non_discretionary],
+                                reference_oriented[:, non_discretionary],
+                                is_input)
+        with numpy.errstate(invalid='ignore'):
+            if vrs:
+                # reference DMU cannot be scaled
+                feasible = (scaling <= 1) & (fixed <= 1)
+            else:
+                # reference DMU is scaled as little as possible, infinite
+                # times zero is not a number and it is never feasible
+                feasible = scaling * fixed <= 1
+                score = scaling * score
+            # zero score might mean that linear program is unbounded
+            inefficient[block] = (feasible & (score > 0) &
+                                  (score < 1 - SCORE_TOLERANCE)).any(axis=1)
+    return inefficient
+
+
+def _get_max_ratios(values, reference_values, is_input):
+    ''' Computes for every pair of DMU and reference DMU the maximum over
+        categories of ratios that show how many times reference DMU is
+        worse than DMU: reference input divided by input or output divided
+        by reference output. Zero divided by anything is zero.
+
+        Args:
+            values (numpy.ndarray): values with one row per DMU.
+            reference_values (numpy.ndarray): values with one row per
+                reference DMU.
+            is_input (bool): True if values are inputs, False if outputs.
+
+        Returns:
+            numpy.ndarray: maximum ratios with one row per DMU and one
+                column per reference DMU, zero if there are no categories.
+    '''
+    max_ratios = numpy.zeros((values.shape[0], reference_values.shape[0]))
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        for column in range(values.shape[1]):
+            numerator = values[:, column, None]
+            denominator = reference_values[None, :, column]
+            if is_input:
+                numerator, denominator = denominator, numerator
+            ratios = numerator / denominator
+            numpy.maximum(max_ratios, numpy.where(numerator == 0, 0, ratios),
+                          out=max_ratios)
+    return max_ratios
+
+
+def get_inefficient_dmus(input_data, dmu_codes, reference_dmu_codes,
+                         orientation, vrs=False,
+                         non_discretionary_categories=None):
+    ''' Returns DMUs that are certainly not efficient if they are compared
+        to given reference DMUs, see find_inefficient.
+
+        Args:
+            input_data (InputData): object that stores input data.
+            dmu_codes (iterable of str): DMU codes.
+            reference_dmu_codes (iterable of str): codes of reference DMUs.
+            orientation (str): input or output.
+            vrs (bool, optional): if True, VRS model is considered,
+                otherwise CRS model. Defaults to False.
+            non_discretionary_categories (set of str, optional):
+                non-discretionary categories. Defaults to None.
+
+        Returns:
+            set of str: DMUs that are not efficient.
+    '''
+    dmu_codes = list(dmu_codes)
+    if not dmu_codes:
+        return set()
+    inputs, outputs = get_category_values(input_data, dmu_codes)
+    reference_inputs, reference_outputs = get_category_values(
+        input_data, list(reference_dmu_codes))
+    if orientation == 'input':
+        categories = sorted(input_data.input_categories)
+    else:
+        categories = sorted(input_data.output_categories)
+    if non_discretionary_categories is None:
+        non_discretionary_categories = set()
+    non_discretionary = numpy.array(
+        [category in non_discretionary_categories
+         for category in categories], dtype=bool)
+    inefficient = find_inefficient(inputs, outputs, reference_inputs,
+                                   reference_outputs, orientation, vrs,
+                                   non_discretionary)
+    return set(dmu_codes[index] for index in numpy.flatnonzero(inefficient))
@@ -1,9 +1,18 @@
 ''' This module contains function responsible for creating several models and
     parameters in the case when RETURN_TO_SCALE or ORIENTATION is set to both.
+
+    All models share one LP template (see
+    :mod:`pyDEA.core.models.lp_template`), so the data part of
+    the constraint matrix is built once, and models only add rows and
+    columns that distinguish them, e.g. VRS constraint or coefficients of
+    the variable in the objective function. Models also share one
+    deadline of the run given by parameter RUN_TIME_LIMIT.
 '''
+from concurrent.futures import ThreadPoolExecutor
 
 import pyDEA.core.utils.model_factory as model_factory
 from pyDEA.core.data_processing.parameters import Parameters
+from pyDEA.core.models.lp_template import LpTemplate
 
 
 def build_models(params, model_input):
@@ -49,7 +58,55 @@ def build_models(params, model_input):
                                            possible_orientation[1 - count])
             list_of_param_objects.append(new_param_obj)
 
+    lp_template = LpTemplate()
+    time_budget = model_factory.get_time_budget(params)
+    use_views = (solve_concurrently(params) and
+                 len(list_of_param_objects) > 1)
     models = []
     for param_object in list_of_param_objects:
-        models.append(model_factory.create_model(param_object, model_input))
+        data = model_input
+        if use_views:
+            data = model_input.create_view()
+        models.append(model_factory.create_model(param_object, data,
+                                                 lp_template, time_budget))
     return models, list_of_param_objects
+
+
+def solve_concurrently(params):
+    ''' Checks if models created by build_models must be solved
+        concurrently.
+
+        Args:
+            params (Parameters): parameters.
+
+        Returns:
+            bool: True if parameter CONCURRENT_MODELS is set,
+                False otherwise.
+    '''
+    return bool(params.get_parameter_value('CONCURRENT_MODELS'))
+
+
+def solve_models(models, solve_model, concurrent=False):
+    ''' Solves given models one after another or concurrently.
+
+        Models are solved concurrently in threads: CBC and other solvers
+        called by pulp run in separate processes, and HiGHS releases
+        the global interpreter lock while it solves, so linear programs
+        of different models are solved in parallel. Models must be created
+        by build_models with parameter CONCURRENT_MODELS, so that every
+        model has its own view of input data.
+
+        Args:
+            models (list of ModelBase): models.
+            solve_model (func): function that takes a model, solves it and
+                returns its results.
+            concurrent (bool, optional): if True, models are solved
+                concurrently. Defaults to False.
+
+        Returns:
+            list: results of solve_model in the same order as models.
+    '''
+    if not concurrent or len(models) < 2:
+        return [solve_model(model) for model in models]
+    with ThreadPoolExecutor(max_workers=len(models)) as executor:
+        return list(executor.map(solve_model, models))
@@ -1,9 +1,10 @@
 ''' This module contains classes responsible for creating a
     proper DEA model.
 '''
-
+import functools
 
 from pyDEA.core.models.envelopment_model_base import EnvelopmentModelBase
+from pyDEA.core.models.envelopment_model_matrix import EnvelopmentModelMatrixBase
 from pyDEA.core.models.envelopment_model import EnvelopmentModelInputOriented
 from pyDEA.core.models.envelopment_model import EnvelopmentModelOutputOriented
 from pyDEA.core.models.envelopment_model import EnvelopmentModelInputOrientedWithNonDiscVars
@@ -31,6 +32,15 @@ from pyDEA.core.models.bound_generators import generate_lower_bound_for_efficien
 from pyDEA.core.models.super_efficiency_model import SupperEfficiencyModel
 from pyDEA.core.models.maximize_slacks import MaximizeSlacksModel
 from pyDEA.core.models.categorical_dmus import ModelWithCategoricalDMUs
+from pyDEA.core.models.frontier_first_model import FrontierFirstModel
+from pyDEA.core.models.dominance_filter_model import DominanceFilterModel
+from pyDEA.core.models.restricted_basis_model import RestrictedBasisModel
+from pyDEA.core.models.parallel_model import ParallelModel
+from pyDEA.core.models.solver_registry import create_solver
+from pyDEA.core.models.solver_registry import get_default_solver_name
+from pyDEA.core.utils.dmu_ordering import order_by_similarity
+from pyDEA.core.utils.dominance import get_inefficient_dmus
+from pyDEA.core.utils.time_budget import TimeBudget
 import pyDEA.core.utils.dea_utils as dea_utils
 
 
@@ -57,17 +67,311 @@ def add_input_and_output_categories(params, model_input):
         raise ValueError('Both input and output categories must be specified')
 
 
+def use_matrix_engine(params):
+    ''' Checks which LP engine must be used for building linear programs.
+
+        Args:
+            params (Parameters): model parameters.
+
+        Returns:
+            bool: True if linear programs must be assembled from NumPy
+                arrays, False if pulp expressions must be used.
+
+        Raises:
+            ValueError: if parameter LP_ENGINE has invalid value.
+                Allowed values are pulp (or empty string) and matrix.
+    '''
+    lp_engine = params.get_parameter_value('LP_ENGINE')
+    if lp_engine == 'matrix':
+        return True
+    if lp_engine == '' or lp_engine == 'pulp':
+        return False
+    raise ValueError('Unexpected value of parameter <LP_ENGINE>')
+
+
+def use_lambda_file(params):
+    ''' Checks where lambda variables of solutions must be stored.
+
+        Args:
+            params (Parameters): model parameters.
+
+        Returns:
+            bool: True if lambda variables must be stored in
+                a memory-mapped file, False if they must be stored
+                in memory.
+
+        Raises:
+            ValueError: if parameter LAMBDA_STORAGE has invalid value.
+                Allowed values are memory (or empty string) and file.
+    '''
+    lambda_storage = params.get_parameter_value('LAMBDA_STORAGE')
+    if lambda_storage == 'file':
+        return True
+    if lambda_storage == '' or lambda_storage == 'memory':
+        return False
+    raise ValueError('Unexpected value of parameter <LAMBDA_STORAGE>')
+
+
+def get_dmu_ordering(params):
+    ''' Returns function that defines the order in which linear programs
+        of DMUs are solved.
+
+        Args:
+            params (Parameters): model parameters.
+
+        Returns:
+            func: function that orders DMU codes or None if DMUs must be
+                solved in the default order.
+
+        Raises:
+            ValueError: if parameter DMU_ORDER has invalid value.
+                Allowed values are similarity and empty string.
+    '''
+    dmu_order = params.get_parameter_value('DMU_ORDER')
+    if dmu_order == 'similarity':
+        return order_by_similarity
+    if dmu_order == '':
+        return None
+    raise ValueError('Unexpected value of parameter <DMU_ORDER>')
+
+
+def get_inefficiency_screen(params):
+    ''' Returns function that finds DMUs that are certainly not efficient
+        without solving linear programs, see
+        :func:`pyDEA.core.utils.dominance.find_inefficient`.
+
+        Args:
+            params (Parameters): model parameters.
+
+        Returns:
+            func: function that returns DMUs that are not efficient
+                compared to reference DMUs or None if there are weakly
+                disposal categories.
+    '''
+    if params.get_set_of_parameters('WEAKLY_DISPOSAL_CATEGORIES'):
+        return None
+    return functools.partial(
+        get_inefficient_dmus,
+        orientation=params.get_parameter_value('ORIENTATION'),
+        vrs=params.get_parameter_value('RETURN_TO_SCALE') == 'VRS',
+        non_discretionary_categories=params.get_set_of_parameters(
+            'NON_DISCRETIONARY_CATEGORIES'))
+
+
+def get_num_workers(params):
+    ''' Returns number of processes that solve linear programs.
+
+        Args:
+            params (Parameters): model parameters.
+
+        Returns:
+            int: number of processes, 1 if parameter NUM_WORKERS is empty.
+
+        Raises:
+            ValueError: if parameter NUM_WORKERS is not a positive integer.
+    '''
+    num_workers = params.get_parameter_value('NUM_WORKERS')
+    if num_workers == '':
+        return 1
+    try:
+        num_workers = int(num_workers)
+    except ValueError:
+        raise ValueError('Unexpected value of parameter <NUM_WORKERS>')
+    if num_workers < 1:
+        raise ValueError('Unexpected value of parameter <NUM_WORKERS>')
+    return num_workers
+
+
+def _get_positive_number(params, param_name, number_type):
+    ''' Returns value of a given parameter converted to a positive number.
+
+        Args:
+            params (Parameters): model parameters.
+            param_name (str): parameter name.
+            number_type (type): int or float.
+
+        Returns:
+            int or float: value of the parameter or None if it is empty.
+
+        Raises:
+            ValueError: if parameter is not a positive number.
+    '''
+    value = params.get_parameter_value(param_name)
+    if value == '':
+        return None
+    try:
+        value = number_type(value)
+    except ValueError:
+        raise ValueError('Unexpected value of parameter <{0}>'.format(
+            param_name))
+    if value <= 0:
+        raise ValueError('Unexpected value of parameter <{0}>'.format(
+            param_name))
+    return value
+
+
+def get_solver(params, matrix_engine):
+    ''' Returns solver selected with parameter SOLVER, see
+        :mod:`pyDEA.core.models.solver_registry`. Options of the solver are
+        given by parameters SOLVER_THREADS, SOLVER_TOLERANCE and
+        SOLVER_TIME_LIMIT.
+
+        Args:
+            params (Parameters): model parameters.
+            matrix_engine (bool): True if linear programs are built by
+                the matrix LP engine.
+
+        Returns:
+            pulp.LpSolver or solver backend: solver or None if SOLVER,
+                all options and time limits (see get_time_budget) are
+                empty, then the default solver of linear programs is used.
+
+        Raises:
+            ValueError: if some of the parameters have invalid values or
+                if the solver is not available.
+    '''
+    name = params.get_parameter_value('SOLVER')
+    threads = _get_positive_number(params, 'SOLVER_THREADS', int)
+    tolerance = _get_positive_number(params, 'SOLVER_TOLERANCE', float)
+    time_limit = _get_positive_number(params, 'SOLVER_TIME_LIMIT', float)
+    if name == '':
+        if (threads is None and tolerance is None and time_limit is None and
+                get_time_budget(params) is None):
+            return None
+        name = get_default_solver_name(matrix_engine)
+    return create_solver(name, matrix_engine, threads, tolerance,
+                         time_limit)
+
+
+def get_time_budget(params):
+    ''' Returns time limits of DMUs and of the run given by parameters
+        DMU_TIME_LIMIT and RUN_TIME_LIMIT. The deadline of the run
+        starts now.
+
+        Args:
+            params (Parameters): model parameters.
+
+        Returns:
+            TimeBudget: time limits or None if both parameters are empty.
+
+        Raises:
+            ValueError: if some of the parameters is not a positive number.
+    '''
+    dmu_time_limit = _get_positive_number(params, 'DMU_TIME_LIMIT', float)
+    run_time_limit = _get_positive_number(params, 'RUN_TIME_LIMIT', float)
+    if dmu_time_limit is None and run_time_limit is None:
+        return None
+    return TimeBudget(dmu_time_limit, run_time_limit)
+
+
+def get_peer_restriction_conflict(params):
+    ''' Checks if lambda variables of inefficient and dominated DMUs
+        can be removed from linear programs without changing the results.
+        This is not the case for multiplier model, super efficiency,
+        weakly disposal categories and weight restrictions.
+
+        Args:
+            params (Parameters): model parameters.
+
+        Returns:
+            str: description of the parameter that prevents removal of
+                lambda variables or None if they can be removed.
+    '''
+    if params.get_parameter_value('DEA_FORM') == 'multi':
+        return 'multiplier model'
+    if params.get_parameter_value('USE_SUPER_EFFICIENCY'):
+        return 'super efficiency'
+    for param_name in ['WEAKLY_DISPOSAL_CATEGORIES',
+                       'ABS_WEIGHT_RESTRICTIONS',
+                       'VIRTUAL_WEIGHT_RESTRICTIONS',
+                       'PRICE_RATIO_RESTRICTIONS']:
+        if params.get_set_of_parameters(param_name):
+            return 'parameter <{0}>'.format(param_name)
+    return None
+
+
+def check_frontier_first(params):
+    ''' Checks if frontier-first algorithm can be used with given
+        parameters.
+
+        Args:
+            params (Parameters): model parameters.
+
+        Raises:
+            ValueError: if frontier-first algorithm is used with multiplier
+                model, super efficiency, weakly disposal categories or
+                weight restrictions.
+    '''
+    conflict = get_peer_restriction_conflict(params)
+    if conflict is not None:
+        raise ValueError(
+            "Frontier-first algorithm doesn't work with " + conflict)
+
+
+def check_restricted_basis(params):
+    ''' Checks if restricted basis entry can be used with given
+        parameters.
+
+        Args:
+            params (Parameters): model parameters.
+
+        Raises:
+            ValueError: if restricted basis entry is used with multiplier
+                model, super efficiency, two phase model or
+                weight restrictions.
+    '''
+    if params.get_parameter_value('DEA_FORM') == 'multi':
+        raise ValueError(
+            "Restricted basis entry doesn't work with multiplier model")
+    if params.get_parameter_value('USE_SUPER_EFFICIENCY'):
+        raise ValueError(
+            "Restricted basis entry doesn't work with super efficiency")
+    if params.get_parameter_value('MAXIMIZE_SLACKS'):
+        raise ValueError(
+            "Restricted basis entry doesn't work with two phase model")
+    for param_name in ['ABS_WEIGHT_RESTRICTIONS',
+                       'VIRTUAL_WEIGHT_RESTRICTIONS',
+                       'PRICE_RATIO_RESTRICTIONS']:
+        if params.get_set_of_parameters(param_name):
+            raise ValueError("Restricted basis entry doesn't work with "
+                             "parameter <{0}>".format(param_name))
+
+
+def use_dominance_filter(params):
+    ''' Checks if DMUs dominated by other DMUs must be excluded from
+        linear programs. The filter is silently ignored if it
+        cannot be applied with given parameters.
+
+        Args:
+            params (Parameters): model parameters.
+
+        Returns:
+            bool: True if parameter DOMINANCE_FILTER is set and lambda
+                variables of dominated DMUs can be removed,
+                False otherwise.
+    '''
+    return bool(params.get_parameter_value('DOMINANCE_FILTER') and
+                get_peer_restriction_conflict(params) is None)
+
+
 class ModelFactoryBase(object):
     ''' Abstract base class for factory classes responsible for creating
         a DEA model.
     '''
     @classmethod
-    def create_model(cls, params, model_input):
+    def create_model(cls, params, model_input, lp_template=None,
+                     time_budget=None):
         ''' Allocated a proper DEA model given parameters and input data.
 
             Args:
                 params (Parameters): model parameters.
                 model_input (InputData): object that stores input data.
+                lp_template (LpTemplate, optional): data part of the
+                    constraint matrix shared with other models. If None,
+                    the model builds its own template.
+                time_budget (TimeBudget, optional): time limits shared
+                    with other models of the run. If None, time limits
+                    are created from parameters (see get_time_budget).
 
             Returns:
                 ModelBase: allocated DEA model.
@@ -106,6 +410,15 @@ class ModelFactoryBase(object):
 
         model = cls.get_basic_model(model_input, concrete_model,
                                     weakly_disposal_categories, params)
+        model.dmu_ordering = get_dmu_ordering(params)
+        model.inefficiency_screen = get_inefficiency_screen(params)
+        model.solver = get_solver(params, use_matrix_engine(params))
+        if time_budget is None:
+            time_budget = get_time_budget(params)
+        model.time_budget = time_budget
+        model.use_lambda_file = use_lambda_file(params)
+        if lp_template is not None:
+            model.lp_template = lp_template
         model = cls.add_extra(model, weakly_disposal_categories,
                               non_discr_categories, orientation)
 
@@ -135,6 +448,10 @@ class ModelFactoryBase(object):
                                              model_input.categories)
             model = cls.get_price_ratio_model(model, bounds)
 
+        if params.get_parameter_value('RESTRICTED_BASIS'):
+            check_restricted_basis(params)
+            model = RestrictedBasisModel(model)
+
         if use_super_efficiency:
             model = SupperEfficiencyModel(model)
 
@@ -147,11 +464,21 @@ class ModelFactoryBase(object):
                     "Two phase model doesn't work with multiplier model")
             model = MaximizeSlacksModel(model, weakly_disposal_categories)
 
+        if params.get_parameter_value('FRONTIER_FIRST'):
+            check_frontier_first(params)
+            model = FrontierFirstModel(
+                model, dominance_filter=use_dominance_filter(params))
+        elif use_dominance_filter(params):
+            model = DominanceFilterModel(model)
         categorical_category = params.get_parameter_value(
             'CATEGORICAL_CATEGORY')
         if categorical_category:
             model = ModelWithCategoricalDMUs(model, categorical_category)
 
+        num_workers = get_num_workers(params)
+        if num_workers > 1:
+            model = ParallelModel(model, num_workers)
+
         return model
 
     @classmethod
@@ -358,6 +685,9 @@ class EnvelopmentModelFactory(ModelFactoryBase):
                 weakly_disposal_categories)
         else:
             constraint_creator = DefaultConstraintCreator()
+        if use_matrix_engine(params):
+            return EnvelopmentModelMatrixBase(model_input, concrete_model,
+                                              constraint_creator)
         return EnvelopmentModelBase(model_input, concrete_model,
                                     constraint_creator)
 
@@ -415,6 +745,9 @@ class MultiplierModelFactory(ModelFactoryBase):
                         weakly_disposal_categories, params):
         ''' See base class.
         '''
+        if use_matrix_engine(params):
+            raise ValueError(
+                'Matrix LP engine works only with envelopment model')
         tolerance = float(params.get_parameter_value(
             'MULTIPLIER_MODEL_TOLERANCE'))
         return MultiplierModelBase(model_input, tolerance, concrete_model)
@@ -463,7 +796,7 @@ class MultiplierModelFactory(ModelFactoryBase):
         return new_model
 
 
-def create_model(params, model_input):
+def create_model(params, model_input, lp_template=None, time_budget=None):
         ''' Allocates a proper DEA model based on given parameters and
             input data. This function must be used for creating DEA model.
             It calls appropriate factory class.
@@ -471,6 +804,12 @@ def create_model(params, model_input):
             Args:
                 params (Parameters): model parameters.
                 model_input (InputData): object that stores input data.
+                lp_template (LpTemplate, optional): data part of the
+                    constraint matrix shared with other models. If None,
+                    the model builds its own template.
+                time_budget (TimeBudget, optional): time limits shared
+                    with other models of the run. If None, time limits
+                    are created from parameters (see get_time_budget).
 
             Raises:
                 ValueError: if DEA form parameter has invalid value.
@@ -481,8 +820,12 @@ def create_model(params, model_input):
         '''
         dea_form = params.get_parameter_value('DEA_FORM')
         if dea_form == 'env':
-            return EnvelopmentModelFactory.create_model(params, model_input)
+            return EnvelopmentModelFactory.create_model(params, model_input,
+                                                        lp_template,
+                                                        time_budget)
         elif dea_form == 'multi':
-            return MultiplierModelFactory.create_model(params, model_input)
+            return MultiplierModelFactory.create_model(params, model_input,
+                                                       lp_template,
+                                                       time_budget)
         else:
             raise ValueError('Invalid value of parameter <DEA_FORM>')
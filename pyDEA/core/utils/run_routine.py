@@ -7,14 +7,19 @@ import os
 from tkinter.messagebox import showerror
 from tkinter import StringVar
 
+from pulp import LpStatusOptimal
+
 from pyDEA.core.data_processing.read_data import validate_data
 from pyDEA.core.data_processing.read_data import construct_input_data_instance, read_data
 from pyDEA.core.data_processing.read_data import convert_to_dictionary
+import pyDEA.core.data_processing.data_cache as data_cache
 from pyDEA.core.utils.dea_utils import create_params_str, auto_name_if_needed
 from pyDEA.core.utils.dea_utils import get_logger
 from pyDEA.core.data_processing.write_data import FileWriter
 from pyDEA.core.data_processing.xlsx_workbook import XlsxWorkbook
+import pyDEA.core.utils.derived_orientation as derived_orientation
 import pyDEA.core.utils.model_builder as model_builder
+import pyDEA.core.utils.model_factory as model_factory
 from pyDEA.core.models.model_progress_bar_decorator import ProgressBarDecorator
 from pyDEA.core.models.peel_the_onion import peel_the_onion_method
 from pyDEA.core.data_processing.solution_text_writer import TxtWriter
@@ -47,8 +52,8 @@ class RunMethodBase(object):
                     self.validate_weights_if_needed()  # MUST be called
                     # before model_builder, because it might
                     # update parameters
-                    model_input = construct_input_data_instance(categories,
-                                                                coefficients)
+                    model_input = self.construct_input_data(categories,
+                                                            coefficients)
 
                     models, all_params = model_builder.build_models(params,
                                                                     model_input)
@@ -62,18 +67,40 @@ class RunMethodBase(object):
                     all_ranks = []
                     run_date = datetime.datetime.today()
                     start_time = datetime.datetime.now()
-                    for count, model_obj in enumerate(models):
-                        model = self.decorate_model(model_obj)
-
-                        call_peel_the_onion = params.get_parameter_value(
-                            'PEEL_THE_ONION')
-
+                    models = [self.decorate_model(model_obj)
+                              for model_obj in models]
+                    call_peel_the_onion = params.get_parameter_value(
+                        'PEEL_THE_ONION')
+                    skip_dominated = (
+                        model_factory.use_dominance_filter(params) and
+                        not params.get_parameter_value(
+                            'CATEGORICAL_CATEGORY'))
+
+                    def solve_model(model):
+                        if call_peel_the_onion:
+                            return peel_the_onion_method(model,
+                                                         skip_dominated)
+                        return model.run(), None, True
+
+                    derived_models = derived_orientation.get_derived_models(
+                        params, all_params)
+                    verify = derived_orientation.get_derivation_mode(
+                        params) == 'verify'
+                    solved_models = [count for count in range(len(models))
+                                     if verify or count not in derived_models]
+                    model_results = model_builder.solve_models(
+                        [models[count] for count in solved_models],
+                        solve_model,
+                        model_builder.solve_concurrently(params) and
+                        self.can_solve_concurrently())
+                    results = dict(zip(solved_models, model_results))
+                    derived_orientation.derive_solutions(
+                        models, results, derived_models, solve_model, verify)
+                    for count, model in enumerate(models):
+                        model_solution, ranks, model_state = results[count]
                         if call_peel_the_onion:
-                            model_solution, ranks, state = (
-                                peel_the_onion_method(model))
                             all_ranks.append(ranks)
-                        else:
-                            model_solution = model.run()
+                            state = state and model_state
 
                         str_to_write = create_params_str(all_params[count])
                         param_strs.append(str_to_write)
@@ -113,6 +140,20 @@ class RunMethodBase(object):
         '''
         raise NotImplementedError()
 
+    def construct_input_data(self, categories, coefficients):
+        ''' Constructs instance of InputData from validated categories
+            and coefficients.
+
+            Args:
+                categories (list of str): list of categories.
+                coefficients (dict of str to list of double): dictionary that
+                    maps DMU name to a list with coefficients.
+
+            Returns:
+                InputData: constructed instance.
+        '''
+        return construct_input_data_instance(categories, coefficients)
+
     def get_coefficients(self):
         ''' Returns problem data coefficients.
 
@@ -187,6 +228,17 @@ class RunMethodBase(object):
         '''
         pass
 
+    def can_solve_concurrently(self):
+        ''' Checks if models decorated by decorate_model can be solved
+            in several threads. By default returns True, but can be
+            redefined by child classes.
+
+            Returns:
+                bool: True if models can be solved concurrently,
+                    False otherwise.
+        '''
+        return True
+
 
 class RunMethodTerminal(RunMethodBase):
     ''' This class implements running routing from terminal.
@@ -198,6 +250,11 @@ class RunMethodTerminal(RunMethodBase):
             output_format (str): file extension for solution files.
             data (list of str): list where the first element is DMU name, all
                 other elements are coefficients.
+            cache_directory (str): directory where parsed input data is
+                cached, None if input data is not cached.
+            cache_key (CacheKey): key of the data file in the cache.
+            cached_data (CachedData): input data loaded from the cache,
+                None if input data was read from the data file.
 
         Args:
             params (Parameters): parameters.
@@ -213,20 +270,53 @@ class RunMethodTerminal(RunMethodBase):
         self.output_dir = output_dir
         self.output_format = output_format
         self.data = []
+        self.cache_directory = None
+        self.cache_key = None
+        self.cached_data = None
 
     def get_categories(self):
-        ''' See base class.
+        ''' See base class. If input data is cached, the data file is
+            read only if it is not in the cache.
         '''
+        file_name = self.params.get_parameter_value('DATA_FILE')
+        query = self.params.get_parameter_value('DATA_QUERY')
+        self.cache_directory = data_cache.get_cache_directory(self.params)
+        if self.cache_directory is not None:
+            self.cache_key = data_cache.CacheKey(file_name,
+                                                 self.sheet_name_usr, query)
+            self.cached_data = data_cache.load_data(self.cache_directory,
+                                                    self.cache_key)
+            if self.cached_data is not None:
+                get_logger().info('Input data loaded from cache %s.',
+                                  self.cache_directory)
+                return self.cached_data.categories
         categories, self.data, dmu_name, sheet_name = read_data(
-            self.params.get_parameter_value('DATA_FILE'),
-            self.sheet_name_usr)
+            file_name, self.sheet_name_usr, query)
         return categories
 
     def get_coefficients(self):
         ''' See base class.
         '''
+        if self.cached_data is not None:
+            return self.cached_data.get_coefficients(), False
         return convert_to_dictionary(self.data)
 
+    def construct_input_data(self, categories, coefficients):
+        ''' See base class. Input data read from the data file is stored
+            in the cache if it is enabled.
+        '''
+        if self.cached_data is not None:
+            return self.cached_data.create_input_data()
+        input_data = super().construct_input_data(categories, coefficients)
+        if self.cache_directory is not None:
+            try:
+                data_cache.store_data(self.cache_directory, self.cache_key,
+                                      categories, coefficients)
+            except OSError as excinfo:
+                get_logger().warning('Input data was not cached: %s',
+                                     excinfo)
+        return input_data
+
     def show_error(self, message):
         ''' See base class.
         '''
@@ -344,6 +434,15 @@ class RunMethodGUI(RunMethodBase):
         self.frame.increment = self.increment
         return model
 
+    def can_solve_concurrently(self):
+        ''' Progress bar must be updated from the main thread,
+            so models are always solved one after another.
+
+            Returns:
+                bool: False.
+        '''
+        return False
+
     def post_process_solutions(self, solutions, params, param_strs, all_ranks,
                                run_date, total_seconds):
         ''' See base class.
@@ -385,6 +484,9 @@ def derive_returns_to_scale_classification(param_strs, solutions):
                     each model.
             solutions (list of Solution): list of obtained solutions.            
 
+        DMUs whose linear programs are not optimal in both models
+        are not classified.
+
         Returns:
             RTS_classification (dict of dmu_code (str) to classification (str)): indicate frontier 
                 for the DMUs.
@@ -410,12 +512,21 @@ def derive_returns_to_scale_classification(param_strs, solutions):
             continue
             
         ordered_dmu_codes = solution_crs._input_data.DMU_codes_in_added_order
-        for dmu_code in ordered_dmu_codes:
+        same_scores = (
+            solution_crs.efficiency_scores.get_values(ordered_dmu_codes) ==
+            solution_vrs.efficiency_scores.get_values(ordered_dmu_codes))
+        for dmu_code, same_score in zip(ordered_dmu_codes,
+                                        same_scores.tolist()):
             # check dmu_code exist in both solutions        
             if solution_crs._input_data.DMU_code_to_user_name[dmu_code] != solution_vrs._input_data.DMU_code_to_user_name[dmu_code]:
                 raise Exception("Cannot find DMU" + solution_vrs._input_data.DMU_code_to_user_name[dmu_code] + "in the VRS model")
         
-            if solution_crs.efficiency_scores[dmu_code] == solution_vrs.efficiency_scores[dmu_code]:
+            # DMUs without optimal solution of both models, e.g. stopped
+            # by time limit, are not classified
+            if (solution_crs.lp_status[dmu_code] != LpStatusOptimal or
+                    solution_vrs.lp_status[dmu_code] != LpStatusOptimal):
+                continue
+            if same_score:
                 RTS_classification[dmu_code] = 'CRS'
             else: 
                 all_lambda_vars = solution_crs.get_lambda_variables(dmu_code)
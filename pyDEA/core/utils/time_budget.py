@@ -0,0 +1,55 @@
+''' This module contains TimeBudget class that limits time spent on
+    linear programs of one DMU and on the whole run.
+'''
+import time
+
+
+class TimeBudget(object):
+    ''' Time limits set by parameters DMU_TIME_LIMIT and RUN_TIME_LIMIT.
+        The limit of a DMU covers all linear programs solved for it in
+        one solution, e.g. all iterations of the restricted basis model.
+        The limit of the run is a wall clock deadline, so it is the same
+        in all processes that solve linear programs in parallel and
+        in all models created by one run (see
+        :func:`pyDEA.core.utils.model_builder.build_models`).
+
+        Attributes:
+            dmu_time_limit (double): time in seconds that the solver
+                might spend on one DMU or None if there is no limit.
+            deadline (double): time (as returned by time.time()) after
+                which linear programs are not solved or None if there
+                is no limit.
+
+        Args:
+            dmu_time_limit (double, optional): time in seconds that the
+                solver might spend on one DMU. Defaults to None.
+            run_time_limit (double, optional): time in seconds from now
+                until the deadline. Defaults to None.
+    '''
+    def __init__(self, dmu_time_limit=None, run_time_limit=None):
+        self.dmu_time_limit = dmu_time_limit
+        self.deadline = None
+        if run_time_limit is not None:
+            self.deadline = time.time() + run_time_limit
+
+    def get_time_limit(self, spent_time=0):
+        ''' Returns time that the solver might spend on the next linear
+            program of a DMU.
+
+            Args:
+                spent_time (double, optional): time in seconds already
+                    spent on linear programs of the DMU. Defaults to 0.
+
+            Returns:
+                double: time in seconds, it is zero or negative if the
+                    linear program must not be solved, or None if there
+                    is no limit.
+        '''
+        time_limit = None
+        if self.dmu_time_limit is not None:
+            time_limit = self.dmu_time_limit - spent_time
+        if self.deadline is not None:
+            time_left = self.deadline - time.time()
+            if time_limit is None or time_left < time_limit:
+                time_limit = time_left
+        return time_limit
@@ -3,11 +3,59 @@
 import sys
 
 from pyDEA.core.data_processing.parameters import parse_parameters_from_file
+import pyDEA.core.data_processing.data_cache as data_cache
 from pyDEA.core.utils.run_routine import RunMethodTerminal
 from pyDEA.core.utils.dea_utils import clean_up_pickled_files, get_logger
 
 
-def main(filename, output_format='xlsx', output_dir='', sheet_name_usr=''):
+def extract_num_workers(args):
+    ''' Removes option --num-workers from command line arguments.
+        Option can be given as --num-workers N or --num-workers=N.
+
+        Args:
+            args (list of str): command line arguments.
+
+        Returns:
+            tuple of list of str, str: remaining arguments and value of
+                the option (None if option is not given).
+
+        Raises:
+            ValueError: if option is given without value.
+    '''
+    remaining_args = []
+    num_workers = None
+    index = 0
+    while index < len(args):
+        arg = args[index]
+        if arg == '--num-workers':
+            if index + 1 >= len(args):
+                raise ValueError('Option --num-workers requires a value')
+            num_workers = args[index + 1]
+            index += 1
+        elif arg.startswith('--num-workers='):
+            num_workers = arg[len('--num-workers='):]
+        else:
+            remaining_args.append(arg)
+        index += 1
+    return remaining_args, num_workers
+
+
+def extract_clear_cache(args):
+    ''' Removes option --clear-cache from command line arguments.
+
+        Args:
+            args (list of str): command line arguments.
+
+        Returns:
+            tuple of list of str, bool: remaining arguments and True if
+                the option is given, False otherwise.
+    '''
+    remaining_args = [arg for arg in args if arg != '--clear-cache']
+    return remaining_args, len(remaining_args) != len(args)
+
+
+def main(filename, output_format='xlsx', output_dir='', sheet_name_usr='',
+         num_workers=None, clear_cache=False):
     ''' Main function to run DEA models from terminal.
 
         Args:
@@ -25,6 +73,12 @@ def main(filename, output_format='xlsx', output_dir='', sheet_name_usr=''):
                 input data from which data will be read. If input data file is
                 in csv format,
                 this value is ignored.
+            num_workers (str, optional): number of processes that solve
+                linear programs. If it is given, it overrides parameter
+                NUM_WORKERS.
+            clear_cache (bool, optional): if True, all cached input data
+                is removed from the directory given by parameter
+                DATA_CACHE before the data file is read.
 
     '''
     print('Params file', filename, 'output_format', output_format,
@@ -35,6 +89,14 @@ def main(filename, output_format='xlsx', output_dir='', sheet_name_usr=''):
                 filename, output_format, output_dir, sheet_name_usr)
 
     params = parse_parameters_from_file(filename)
+    if num_workers is not None:
+        params.update_parameter('NUM_WORKERS', num_workers)
+    if clear_cache:
+        cache_directory = data_cache.get_cache_directory(params)
+        if cache_directory is not None:
+            nb_removed = data_cache.clear_cache(cache_directory)
+            logger.info('Removed %d cached input data file(s) from %s.',
+                        nb_removed, cache_directory)
     params.print_all_parameters()
     run_method = RunMethodTerminal(params, sheet_name_usr, output_format,
                                    output_dir)
@@ -43,10 +105,16 @@ def main(filename, output_format='xlsx', output_dir='', sheet_name_usr=''):
     logger.info('pyDEA exited.')
 
 if __name__ == '__main__':
-    args = sys.argv[1:]
+    args, num_workers = extract_num_workers(sys.argv[1:])
+    args, clear_cache = extract_clear_cache(args)
     logger = get_logger()
     logger.info('pyDEA started as a console application.')
     print('args = {0}'.format(args))
+    if clear_cache and not args:
+        print('Removed {0} cached input data file(s) from {1}'.format(
+            data_cache.clear_cache(data_cache.DEFAULT_CACHE_DIRECTORY),
+            data_cache.DEFAULT_CACHE_DIRECTORY))
+        sys.exit()
     if len(args) < 1 or len(args) > 4:
         logger.error('Invalid number of input arguments. At least one '
                      'argument must be given, no more than 4 arguments, but %d were given.',
@@ -63,9 +131,14 @@ if __name__ == '__main__':
                          ' output is written to current directory)\n'
                          '(4) sheet name from which data should be read '
                          '(optional, if not specified, data is read from'
-                         ' the first sheet)')
+                         ' the first sheet)\n'
+                         'Option --num-workers N (optional) sets the number'
+                         ' of processes that solve linear programs\n'
+                         'Option --clear-cache (optional) removes cached'
+                         ' input data, without other arguments it clears'
+                         ' the default cache directory and exits')
     try:
-        main(*args)
+        main(*args, num_workers=num_workers, clear_cache=clear_cache)
     except Exception as excinfo:
         logger.error(excinfo)
         raise    
@@ -49,7 +49,12 @@ setup(
         "Operating System :: Microsoft :: Windows",
         "Operating System :: POSIX :: Linux"
     ],
-    install_requires=['pulp>=1.6.1', 'openpyxl'],
+    install_requires=['pulp>=2', 'openpyxl', 'numpy'],
+    extras_require={
+        'matrix': ['scipy'],
+        'highs': ['highspy'],
+        'arrow': ['pyarrow'],
+    },
     entry_points={
         'gui_scripts': [
             'pyDEA=pyDEA.main_gui:main',
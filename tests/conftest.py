@@ -0,0 +1,8 @@
+import pytest
+
+from pyDEA.core.utils.dea_utils import clean_up_pickled_files
+
+
+@pytest.fixture
+def clean_up(request):
+    request.addfinalizer(clean_up_pickled_files)
@@ -0,0 +1,84 @@
+import functools
+
+import pytest
+
+import pyDEA.core.models.categorical_dmus as categorical_dmus
+from pyDEA.core.models.categorical_dmus import can_grow_lp
+import pyDEA.core.utils.model_factory as factory
+
+from tests.utils_for_tests import create_params
+from tests.utils_for_tests import create_random_data
+
+
+@pytest.fixture
+def data(clean_up):
+    return create_random_data(11, 30, 'level', 4, ['x1', 'x2'], ['q1', 'q2'])
+
+
+_create_params = functools.partial(
+    create_params, RETURN_TO_SCALE='CRS', CATEGORICAL_CATEGORY='level')
+
+
+def _run_with_rebuilt_lp(monkeypatch, model, dmu_codes=None):
+    with monkeypatch.context() as patch:
+        patch.setattr(categorical_dmus, 'can_grow_lp', lambda model: False)
+        return model.run(dmu_codes)
+
+
+@pytest.mark.parametrize('extra_params', [
+    {}, {'RETURN_TO_SCALE': 'VRS', 'ORIENTATION': 'output'},
+    {'LP_ENGINE': 'matrix'},
+    {'LP_ENGINE': 'matrix', 'RETURN_TO_SCALE': 'VRS'},
+    {'MAXIMIZE_SLACKS': 'yes', 'RETURN_TO_SCALE': 'VRS'},
+    {'USE_SUPER_EFFICIENCY': 'yes'},
+    {'RESTRICTED_BASIS': 'yes', 'RETURN_TO_SCALE': 'VRS'},
+    {'ABS_WEIGHT_RESTRICTIONS': 'x1 >= 0.01', 'RETURN_TO_SCALE': 'VRS'},
+    {'PRICE_RATIO_RESTRICTIONS': 'x1/x2 <= 5'},
+    {'NON_DISCRETIONARY_CATEGORIES': 'x2'}])
+def test_categorical_model_grows_lp(data, monkeypatch, extra_params):
+    model = factory.create_model(_create_params(**extra_params), data)
+    assert can_grow_lp(model.model)
+    solution = model.run()
+    assert data.DMU_codes == set(data.DMU_codes_in_added_order)
+    expected_solution = _run_with_rebuilt_lp(monkeypatch, model)
+    for dmu_code in data.DMU_codes:
+        assert solution.lp_status[dmu_code] == (
+            expected_solution.lp_status[dmu_code])
+        assert solution.get_efficiency_score(dmu_code) == pytest.approx(
+            expected_solution.get_efficiency_score(dmu_code))
+        assert solution.get_lambda_variables(dmu_code) == pytest.approx(
+            expected_solution.get_lambda_variables(dmu_code))
+
+
+def test_categorical_model_grows_lp_for_some_dmus(data, monkeypatch):
+    model = factory.create_model(_create_params(), data)
+    dmu_codes = [data._DMU_user_name_to_code[dmu] for dmu in ['D3', 'D14']]
+    solution = model.run(dmu_codes)
+    expected_solution = _run_with_rebuilt_lp(monkeypatch, model, dmu_codes)
+    assert set(solution.lp_status.keys()) == set(dmu_codes)
+    for dmu_code in dmu_codes:
+        assert solution.get_efficiency_score(dmu_code) == pytest.approx(
+            expected_solution.get_efficiency_score(dmu_code))
+
+
+@pytest.mark.parametrize('extra_params', [
+    {'DEA_FORM': 'multi'}, {'FRONTIER_FIRST': 'yes'},
+    {'DOMINANCE_FILTER': 'yes'}])
+def test_categorical_model_rebuilds_lp(data, extra_params):
+    model = factory.create_model(_create_params(**extra_params), data)
+    assert not can_grow_lp(model.model)
+    solution = model.run()
+    expected_solution = factory.create_model(_create_params(), data).run()
+    for dmu_code in data.DMU_codes:
+        assert solution.get_efficiency_score(dmu_code) == pytest.approx(
+            expected_solution.get_efficiency_score(dmu_code))
+
+
+def test_categorical_model_solves_levels_in_parallel(data):
+    solution = factory.create_model(_create_params(), data).run()
+    parallel_solution = factory.create_model(
+        _create_params(NUM_WORKERS='2'), data).run()
+    for dmu_code in data.DMU_codes:
+        assert parallel_solution.get_efficiency_score(
+            dmu_code) == pytest.approx(solution.get_efficiency_score(
+                dmu_code))
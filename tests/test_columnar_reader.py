@@ -0,0 +1,89 @@
+import json
+
+import numpy
+import pytest
+
+from pyDEA.core.data_processing.columnar_reader import NPZReader
+from pyDEA.core.data_processing.read_data import read_data, validate_data
+from pyDEA.core.data_processing.read_data import convert_to_dictionary
+
+
+def _write_npz(tmpdir, **columns):
+    file_name = str(tmpdir.join('data.npz'))
+    with open(file_name, 'wb') as f:
+        numpy.savez(f, **columns)
+    return file_name
+
+
+def test_read_npz(tmpdir):
+    file_name = _write_npz(tmpdir, DMU=numpy.array(['A', 'B', 'C']),
+                           x1=numpy.array([1, 2, 3]),
+                           q1=numpy.array([0.5, 1.5, 2.5]))
+    reader = NPZReader()
+    reader.open_file(file_name, '')
+    assert reader.values.dtype == numpy.float64
+    assert reader.values.tolist() == [[1, 0.5], [2, 1.5], [3, 2.5]]
+    assert reader.get_cell_value(0, 2) == 'q1'
+    assert reader.get_cell_value(2, 0) == 'B'
+    assert reader.get_cell_value(2, 2) == 1.5
+    assert list(reader.get_rows())[:2] == [['DMU', 'x1', 'q1'],
+                                           ['A', 1, 0.5]]
+    reader.close_file()
+    categories, coefficients, dmu_name, sheet_name = read_data(file_name)
+    assert categories == ['x1', 'q1']
+    assert coefficients == [['A', 1, 0.5], ['B', 2, 1.5], ['C', 3, 2.5]]
+    assert dmu_name == 'DMU' and sheet_name == ''
+    coefficients, has_same_dmus = convert_to_dictionary(coefficients)
+    assert validate_data(categories, coefficients)
+
+
+def test_read_npz_that_is_not_numeric(tmpdir):
+    file_name = _write_npz(tmpdir, DMU=numpy.array([10, 20]),
+                           x1=numpy.array([1.0, numpy.nan]),
+                           q1=numpy.array(['5', 'abc']))
+    reader = NPZReader()
+    reader.open_file(file_name, '')
+    assert reader.values is None
+    assert reader.columns == [[1.0, ''], ['5', 'abc']]
+    categories, coefficients, dmu_name, sheet_name = read_data(file_name)
+    assert coefficients == [[10, 1.0, '5'], [20, '', 'abc']]
+
+
+def test_read_invalid_npz(tmpdir):
+    file_name = _write_npz(tmpdir, DMU=numpy.array(['A']),
+                           x1=numpy.ones((1, 2)))
+    with pytest.raises(ValueError):
+        read_data(file_name)
+    file_name = _write_npz(tmpdir, DMU=numpy.array(['A']),
+                           x1=numpy.ones(2))
+    with pytest.raises(ValueError):
+        read_data(file_name)
+
+
+@pytest.mark.parametrize('extension', ['.parquet', '.feather'])
+def test_read_arrow_table(tmpdir, extension):
+    pyarrow = pytest.importorskip('pyarrow')
+    import pyarrow.feather
+    import pyarrow.parquet
+    table = pyarrow.table({'x1': pyarrow.array([1, 2], pyarrow.int32()),
+                           'q1': [0.5, 1.5],
+                           'name': ['A', 'B']})
+    # DMU names are stored in pandas index
+    pandas_metadata = {'index_columns': ['name'], 'columns': []}
+    table = table.replace_schema_metadata(
+        {b'pandas': json.dumps(pandas_metadata).encode('utf-8')})
+    file_name = str(tmpdir.join('data' + extension))
+    if extension == '.parquet':
+        pyarrow.parquet.write_table(table, file_name)
+    else:
+        pyarrow.feather.write_feather(table, file_name)
+    assert read_data(file_name) == (
+        ['x1', 'q1'], [['A', 1, 0.5], ['B', 2, 1.5]], 'name', '')
+    table = pyarrow.table({'DMU': ['A', 'B'], 'x1': [1.0, None],
+                           'q1': ['1', 'x']})
+    if extension == '.parquet':
+        pyarrow.parquet.write_table(table, file_name)
+    else:
+        pyarrow.feather.write_feather(table, file_name)
+    assert read_data(file_name) == (
+        ['x1', 'q1'], [['A', 1, '1'], ['B', '', 'x']], 'DMU', '')
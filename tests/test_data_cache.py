@@ -0,0 +1,111 @@
+import os
+
+import numpy
+import pytest
+
+import pyDEA.core.data_processing.data_cache as data_cache
+from pyDEA.core.data_processing.read_data import validate_data
+from pyDEA.core.utils.run_routine import RunMethodTerminal
+import pyDEA.core.utils.run_routine as run_routine
+
+from tests.utils_for_tests import create_params
+
+
+@pytest.fixture
+def file_name(tmpdir):
+    random_state = numpy.random.RandomState(5)
+    file_name = str(tmpdir.join('data.csv'))
+    with open(file_name, 'w') as f:
+        f.write('DMU,x1,x2,q1\n')
+        for count in range(20):
+            f.write('D{0},{1}\n'.format(count, ','.join(
+                str(value) for value in random_state.uniform(1, 10, 3))))
+    return file_name
+
+
+def _load_input_data(params):
+    runner = RunMethodTerminal(params, '', 'csv')
+    categories = runner.get_categories()
+    coefficients, has_same_dmus = runner.get_coefficients()
+    assert not has_same_dmus
+    assert validate_data(categories, coefficients)
+    return runner, runner.construct_input_data(categories, coefficients)
+
+
+def test_get_cache_directory(file_name, tmpdir):
+    assert data_cache.get_cache_directory(create_params(
+        DATA_FILE=file_name)) is None
+    assert data_cache.get_cache_directory(create_params(
+        DATA_FILE=file_name, DATA_CACHE='no')) is None
+    assert data_cache.get_cache_directory(create_params(
+        DATA_FILE=file_name,
+        DATA_CACHE='yes')) == data_cache.DEFAULT_CACHE_DIRECTORY
+    assert data_cache.get_cache_directory(create_params(
+        DATA_FILE=file_name, DATA_CACHE=str(tmpdir))) == str(tmpdir)
+    with pytest.raises(ValueError):
+        data_cache.get_cache_directory(create_params(
+            DATA_FILE=file_name, DATA_CACHE=file_name))
+
+
+def test_store_and_load_data(file_name, tmpdir):
+    directory = str(tmpdir.join('cache'))
+    key = data_cache.CacheKey(file_name, '')
+    assert data_cache.load_data(directory, key) is None
+    coefficients = {'A': [1, 2.5], 7: [3, 4], 'C': [0, 1e-12]}
+    data_cache.store_data(directory, key, ['x1', 2], coefficients)
+    cached_data = data_cache.load_data(directory, key)
+    assert cached_data.categories == ['x1', 2]
+    assert cached_data.get_coefficients() == coefficients
+    assert list(cached_data.get_coefficients().keys()) == ['A', 7, 'C']
+    input_data = cached_data.create_input_data()
+    assert input_data.coefficients[
+        input_data._DMU_user_name_to_code[7], 2] == 4
+    # entries of other sheets are not the same
+    other_key = data_cache.CacheKey(file_name, 'Sheet1')
+    assert data_cache.load_data(directory, other_key) is None
+    data_cache.store_data(directory, other_key, ['x1'], {'A': [1]})
+    # new version of the file replaces the previous entry
+    with open(file_name, 'a') as f:
+        f.write('D20,1,2,3\n')
+    new_key = data_cache.CacheKey(file_name, '')
+    assert new_key.prefix == key.prefix and new_key.digest != key.digest
+    assert data_cache.load_data(directory, new_key) is None
+    data_cache.store_data(directory, new_key, ['x1'], {'A': [1]})
+    assert not os.path.exists(key.get_entry_name(directory))
+    assert len(os.listdir(directory)) == 2
+    open(os.path.join(directory, 'notes.txt'), 'w').close()
+    assert data_cache.clear_cache(directory) == 2
+    assert os.listdir(directory) == ['notes.txt']
+    assert data_cache.clear_cache(str(tmpdir.join('missing'))) == 0
+
+
+def test_corrupted_entry_is_removed(file_name, tmpdir):
+    directory = str(tmpdir)
+    key = data_cache.CacheKey(file_name, '')
+    with open(key.get_entry_name(directory), 'w') as f:
+        f.write('not an npz-file')
+    assert data_cache.load_data(directory, key) is None
+    assert not os.path.exists(key.get_entry_name(directory))
+
+
+def test_runner_uses_cache(file_name, tmpdir, monkeypatch):
+    directory = str(tmpdir.join('cache'))
+    params = create_params(DATA_FILE=file_name, DATA_CACHE=directory)
+    runner, expected_data = _load_input_data(params)
+    assert runner.cached_data is None
+    assert len(os.listdir(directory)) == 1
+
+    def read_data(*args):
+        raise AssertionError('data file must not be read')
+    monkeypatch.setattr(run_routine, 'read_data', read_data)
+    runner, input_data = _load_input_data(params)
+    assert runner.cached_data is not None
+    assert input_data.DMU_codes_in_added_order == (
+        expected_data.DMU_codes_in_added_order)
+    assert input_data.DMU_code_to_user_name == (
+        expected_data.DMU_code_to_user_name)
+    assert input_data.categories == expected_data.categories
+    for dmu_code in expected_data.DMU_codes:
+        for category in expected_data.categories:
+            assert input_data.coefficients[dmu_code, category] == (
+                expected_data.coefficients[dmu_code, category])
@@ -0,0 +1,154 @@
+import functools
+
+import pulp
+import pytest
+
+from pyDEA.core.models.peel_the_onion import peel_the_onion_method
+import pyDEA.core.utils.derived_orientation as derived_orientation
+import pyDEA.core.utils.model_builder as model_builder
+
+from tests.utils_for_tests import create_params
+from tests.utils_for_tests import create_random_data
+
+
+def _create_data(with_unbounded_dmu=True):
+    data = create_random_data(17, 25, 'level')
+    if with_unbounded_dmu:
+        # DMU without outputs, its output-oriented linear program
+        # is unbounded
+        for category, value in zip(['x1', 'x2', 'q1', 'q2'], [5, 5, 0, 0]):
+            data.add_coefficient('Z', category, value)
+        data.add_coefficient('Z', 'level', 2)
+    return data
+
+
+@pytest.fixture
+def data(clean_up):
+    return _create_data()
+
+
+_create_params = functools.partial(
+    create_params, RETURN_TO_SCALE='both', ORIENTATION='both',
+    DERIVE_OUTPUT_ORIENTATION='yes')
+
+
+def _solve_model(model):
+    return model.run(), None, True
+
+
+def _peel_the_onion(model):
+    return peel_the_onion_method(model)
+
+
+def _solve(models, solve_model=_solve_model):
+    return dict((count, solve_model(model))
+                for count, model in enumerate(models))
+
+
+def test_get_derived_models():
+    params = _create_params()
+    all_params = [_create_params(RETURN_TO_SCALE=rts, ORIENTATION=orientation)
+                  for rts, orientation in [('VRS', 'input'), ('CRS', 'input'),
+                                           ('VRS', 'output'),
+                                           ('CRS', 'output')]]
+    assert derived_orientation.get_derived_models(params, all_params) == {
+        3: 1}
+    assert derived_orientation.get_derived_models(
+        params, all_params[:2]) == dict()
+    params.update_parameter('DERIVE_OUTPUT_ORIENTATION', '')
+    assert derived_orientation.get_derived_models(
+        params, all_params) == dict()
+    params.update_parameter('DERIVE_OUTPUT_ORIENTATION', 'no')
+    with pytest.raises(ValueError):
+        derived_orientation.get_derived_models(params, all_params)
+
+
+@pytest.mark.parametrize('extra_params, conflict', [
+    ({'USE_SUPER_EFFICIENCY': 'yes'}, 'super efficiency'),
+    ({'MAXIMIZE_SLACKS': 'yes'}, 'two phase model'),
+    ({'DEA_FORM': 'multi', 'MULTIPLIER_MODEL_TOLERANCE': '1e-6'},
+     'parameter <MULTIPLIER_MODEL_TOLERANCE>'),
+    ({'NON_DISCRETIONARY_CATEGORIES': 'x1'},
+     'parameter <NON_DISCRETIONARY_CATEGORIES>'),
+    ({'PRICE_RATIO_RESTRICTIONS': 'x1/x2 <= 5'},
+     'parameter <PRICE_RATIO_RESTRICTIONS>'),
+    ({'DEA_FORM': 'multi'}, None), ({'CATEGORICAL_CATEGORY': 'level'}, None)])
+def test_get_derivation_conflict(extra_params, conflict):
+    assert derived_orientation.get_derivation_conflict(
+        _create_params(**extra_params)) == conflict
+
+
+@pytest.mark.parametrize('extra_params', [
+    {}, {'LP_ENGINE': 'matrix'}, {'DEA_FORM': 'multi'},
+    {'CATEGORICAL_CATEGORY': 'level'},
+    {'RETURN_TO_SCALE': 'CRS', 'RESTRICTED_BASIS': 'yes'}])
+def test_derive_solutions(data, extra_params):
+    params = _create_params(**extra_params)
+    models, all_params = model_builder.build_models(params, data)
+    derived_models = derived_orientation.get_derived_models(
+        params, all_params)
+    assert len(derived_models) == 1
+    results = _solve(models)
+    count = list(derived_models.keys())[0]
+    solution = results[count][0]
+    derived_orientation.derive_solutions(models, results, derived_models,
+                                         _solve_model, verify=True)
+    derived_solution, ranks, state = results[count]
+    assert state
+    assert ranks is None
+    assert derived_solution.orientation == 'output'
+    dmu_code = data._DMU_user_name_to_code['Z']
+    assert dmu_code not in derived_solution.skipped_lps
+    assert derived_solution.lp_status[dmu_code] == (
+        solution.lp_status[dmu_code])
+    assert derived_solution.skipped_lps == data.DMU_codes - set([dmu_code])
+    for dmu_code in derived_solution.skipped_lps:
+        assert derived_solution.get_efficiency_score(
+            dmu_code) == pytest.approx(solution.get_efficiency_score(
+                dmu_code))
+
+
+@pytest.mark.parametrize('with_unbounded_dmu', [False, True])
+def test_derive_solutions_with_peel_the_onion(clean_up, with_unbounded_dmu):
+    data = _create_data(with_unbounded_dmu)
+    params = _create_params(RETURN_TO_SCALE='CRS', PEEL_THE_ONION='yes')
+    models, all_params = model_builder.build_models(params, data)
+    derived_models = derived_orientation.get_derived_models(
+        params, all_params)
+    count, input_count = list(derived_models.items())[0]
+    expected_solution, expected_ranks, expected_state = _peel_the_onion(
+        models[count])
+    results = {input_count: _peel_the_onion(models[input_count])}
+    derived_orientation.derive_solutions(models, results, derived_models,
+                                         _peel_the_onion)
+    solution, ranks, state = results[count]
+    assert ranks == expected_ranks
+    assert state == expected_state
+    assert bool(solution.skipped_lps) != with_unbounded_dmu
+    for dmu_code in data.DMU_codes:
+        assert solution.lp_status[dmu_code] == (
+            expected_solution.lp_status[dmu_code])
+
+
+def test_verify_derived_solution(data):
+    params = _create_params(RETURN_TO_SCALE='CRS',
+                            DERIVE_OUTPUT_ORIENTATION='verify')
+    models, all_params = model_builder.build_models(params, data)
+    results = _solve(models)
+    derived_models = derived_orientation.get_derived_models(
+        params, all_params)
+    output_count = list(derived_models.keys())[0]
+    solution = results[output_count][0]
+    dmu_code = data._DMU_user_name_to_code['D3']
+    solution.efficiency_scores[dmu_code] *= 0.5
+    with pytest.raises(ValueError) as excinfo:
+        derived_orientation.derive_solutions(models, results, derived_models,
+                                             _solve_model, verify=True)
+    assert 'D3' in str(excinfo.value)
+    derived_solution = derived_orientation.derive_output_oriented_solution(
+        results[derived_models[output_count]][0], models[output_count])
+    assert derived_orientation.verify_derived_solution(
+        derived_solution, solution, data) == [dmu_code]
+    solution.lp_status[dmu_code] = pulp.LpStatusInfeasible
+    assert derived_orientation.verify_derived_solution(
+        derived_solution, solution, data) == [dmu_code]
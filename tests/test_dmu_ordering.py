@@ -0,0 +1,68 @@
+import numpy
+import pytest
+
+from pyDEA.core.utils.dmu_ordering import get_dmu_profiles
+from pyDEA.core.utils.dmu_ordering import order_by_similarity
+import pyDEA.core.utils.model_factory as factory
+
+from tests.utils_for_tests import create_data
+from tests.utils_for_tests import create_params
+
+
+@pytest.fixture
+def data(clean_up):
+    values = {'A': (2, 5, 1), 'B': (2, 4, 2), 'C': (6, 6, 3), 'D': (3, 2, 1),
+              'E': (6, 2, 2), 'F': (4, 10, 2)}
+    return create_data(sorted(values.items()), ['x1', 'x2', 'q'],
+                       ['x1', 'x2'], ['q'])
+
+
+def _get_code(data, dmu):
+    return data._DMU_user_name_to_code[dmu]
+
+
+def test_get_dmu_profiles(data):
+    codes = [_get_code(data, 'A'), _get_code(data, 'F')]
+    profiles = get_dmu_profiles(data, codes)
+    assert profiles.shape == (2, 3)
+    assert numpy.linalg.norm(profiles, axis=1) == pytest.approx([1, 1])
+    # F has the same profile as A up to scaling
+    assert profiles[0] == pytest.approx(profiles[1])
+
+
+def test_order_by_similarity(data):
+    order = order_by_similarity(data, data.DMU_codes)
+    assert sorted(order) == sorted(data.DMU_codes)
+    assert order[0] == min(data.DMU_codes)
+    assert order[0] == _get_code(data, 'A')
+    assert order[1] == _get_code(data, 'F')
+    assert order_by_similarity(data, [_get_code(data, 'B')]) == [
+        _get_code(data, 'B')]
+
+
+def _create_params(dmu_order):
+    return create_params(OUTPUT_CATEGORIES='q', LP_ENGINE='matrix',
+                         DMU_ORDER=dmu_order)
+
+
+def test_get_dmu_ordering():
+    assert factory.get_dmu_ordering(_create_params('')) is None
+    assert (factory.get_dmu_ordering(_create_params('similarity')) is
+            order_by_similarity)
+    with pytest.raises(ValueError) as excinfo:
+        factory.get_dmu_ordering(_create_params('random'))
+    assert str(excinfo.value) == 'Unexpected value of parameter <DMU_ORDER>'
+
+
+def test_model_with_dmu_ordering(data):
+    solutions = []
+    for dmu_order in ['', 'similarity']:
+        model = factory.create_model(_create_params(dmu_order), data)
+        solutions.append(model.run())
+    for dmu_code in data.DMU_codes:
+        assert solutions[0].get_efficiency_score(
+            dmu_code) == pytest.approx(
+                solutions[1].get_efficiency_score(dmu_code))
+        assert solutions[1].lp_iterations[dmu_code] >= 0
+    assert solutions[1].get_total_lp_iterations() == sum(
+        solutions[1].lp_iterations.values())
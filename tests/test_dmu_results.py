@@ -0,0 +1,135 @@
+import pickle
+
+import numpy
+import pulp
+import pytest
+
+from pyDEA.core.data_processing.dmu_results import DmuResults
+from pyDEA.core.data_processing.dmu_results import MISSING_STATUS
+from pyDEA.core.data_processing.dmu_results import ResultMatrix
+from pyDEA.core.data_processing.dmu_results import ResultVector
+from pyDEA.core.data_processing.write_data import SheetWithCategoricalVar
+import pyDEA.core.utils.model_factory as factory
+
+from tests.utils_for_tests import create_params
+from tests.utils_for_tests import create_random_data
+
+
+class _WorkSheet(object):
+
+    def __init__(self):
+        self.name = ''
+        self.cells = dict()
+
+    def write(self, row_index, column_index, value):
+        self.cells[row_index, column_index] = value
+
+
+@pytest.fixture
+def data(clean_up):
+    return create_random_data(11, 25)
+
+
+def test_result_vector():
+    dmu_index = {'a': 0, 'b': 1}
+    scores = ResultVector(dmu_index)
+    scores['b'] = 0.5
+    scores['c'] = 1
+    assert dmu_index == {'a': 0, 'b': 1, 'c': 2}
+    assert scores['b'] == 0.5 and scores['c'] == 1
+    assert 'a' not in scores and 'b' in scores
+    assert list(scores.items()) == [('b', 0.5), ('c', 1)]
+    with pytest.raises(KeyError):
+        scores['a']
+    with pytest.raises(KeyError):
+        scores['unknown']
+    scores['b'] *= 0.5
+    assert scores['b'] == 0.25
+    del scores['c']
+    assert len(scores) == 1
+    values = scores.get_values(['c', 'b'])
+    assert numpy.isnan(values[0]) and values[1] == 0.25
+    with pytest.raises(KeyError):
+        scores.get_values(['unknown'])
+
+
+def test_result_vector_of_statuses():
+    dmu_index = dict()
+    statuses = ResultVector(dmu_index, numpy.int8, MISSING_STATUS)
+    for count in range(20):
+        statuses['dmu_{0}'.format(count)] = pulp.LpStatusOptimal
+    statuses['dmu_3'] = pulp.LpStatusInfeasible
+    statuses['dmu_5'] = 'Something'
+    assert statuses['dmu_5'] == 'Something'
+    assert isinstance(statuses['dmu_3'], int)
+    assert len(statuses) == 20
+    assert statuses.find(pulp.LpStatusInfeasible) == ['dmu_3']
+    assert statuses.find('Something') == ['dmu_5']
+    assert len(statuses.find(pulp.LpStatusOptimal)) == 18
+    assert statuses.get_values(['dmu_5', 'dmu_0']).tolist() == [
+        MISSING_STATUS, pulp.LpStatusOptimal]
+    statuses['dmu_5'] = pulp.LpStatusOptimal
+    assert statuses['dmu_5'] == pulp.LpStatusOptimal
+    assert 'dmu_5' not in statuses._other_values
+
+
+def test_result_matrix():
+    dmu_index = {'a': 0}
+    duals = ResultMatrix(dmu_index, ['x1'])
+    assert len(duals['a']) == 0
+    duals.set_value('a', 'x1', 2)
+    duals.set_value('b', 'x2', -1)
+    assert duals['a'] == {'x1': 2}
+    assert duals['b'] == {'x2': -1}
+    assert duals.get_value('b', 'x2') == -1
+    with pytest.raises(KeyError) as excinfo:
+        duals.get_value('unknown', 'x1')
+    assert str(excinfo.value) == "'unknown'"
+    with pytest.raises(KeyError) as excinfo:
+        duals.get_value('a', 'x2')
+    assert str(excinfo.value) == "'x2'"
+    duals['a'] = {'x2': 3}
+    assert dict(duals['a']) == {'x2': 3}
+    duals['a']['x1'] = 4
+    assert duals['a'] == {'x1': 4, 'x2': 3}
+    values = duals.get_values(['b', 'a'], ['x2', 'x1', 'x3'])
+    assert values[0, 0] == -1 and values[1, :2].tolist() == [3, 4]
+    assert numpy.isnan(values[0, 1]) and numpy.isnan(values[:, 2]).all()
+    duals.set_values(['a', 'b'], ['x1'], numpy.array([[5.0], [6.0]]))
+    assert duals['b'] == {'x1': 6, 'x2': -1}
+
+
+def test_dmu_results_are_pickled():
+    results = DmuResults(['a', 'b'], ['x1'], ['q1'])
+    results.lp_status['c'] = pulp.LpStatusOptimal
+    results.input_duals['c'] = {'x1': 0.5}
+    results.vrs_duals['a'] = -1
+    copy_of_results = pickle.loads(pickle.dumps(results))
+    assert copy_of_results.lp_status['c'] == pulp.LpStatusOptimal
+    assert copy_of_results.input_duals['c'] == {'x1': 0.5}
+    assert copy_of_results.vrs_duals['a'] == -1
+    copy_of_results.efficiency_scores['d'] = 1
+    # all containers share one index of DMUs
+    assert copy_of_results.input_duals.dmu_index['d'] == 3
+
+
+@pytest.mark.parametrize('extra_params', [
+    {}, {'DEA_FORM': 'multi', 'ORIENTATION': 'output'}])
+def test_weighted_data_sheet(data, extra_params):
+    params = create_params(**extra_params)
+    factory.add_input_and_output_categories(params, data)
+    solution = factory.create_model(params, data).run()
+    work_sheet = _WorkSheet()
+    SheetWithCategoricalVar().create_sheet_weighted_data(
+        work_sheet, solution, 0, '')
+    categories = (list(data.input_categories) +
+                  list(data.output_categories))
+    for count, dmu_code in enumerate(data.DMU_codes_in_added_order):
+        assert work_sheet.cells[count + 2, 1] == (
+            solution.get_efficiency_score(dmu_code))
+        for column, category in enumerate(categories[:2]):
+            assert work_sheet.cells[count + 2, column + 2] == pytest.approx(
+                solution.get_input_dual(dmu_code, category) *
+                data.coefficients[dmu_code, category])
+        assert work_sheet.cells[count + 2, 6] == (
+            solution.get_VRS_dual(dmu_code))
@@ -0,0 +1,153 @@
+import numpy
+import pytest
+
+from pyDEA.core.data_processing.input_data import InputData
+from pyDEA.core.data_processing.parameters import Parameters
+from pyDEA.core.utils.dea_utils import clean_up_pickled_files
+import pyDEA.core.utils.dominance as dominance
+import pyDEA.core.utils.model_factory as factory
+
+
+def _find_dominated_brute_force(inputs, outputs, strict):
+    values = numpy.hstack((-inputs, outputs))
+    dominated = numpy.zeros(len(values), dtype=bool)
+    for index, point in enumerate(values):
+        for other_index, other_point in enumerate(values):
+            if index == other_index:
+                continue
+            if strict:
+                is_dominated = (other_point > point).all()
+            else:
+                is_dominated = ((other_point >= point).all() and
+                                (other_point > point).any())
+            if is_dominated:
+                dominated[index] = True
+                break
+    return dominated
+
+
+@pytest.mark.parametrize('strict', [False, True])
+@pytest.mark.parametrize('nb_dmus, nb_inputs, nb_outputs, rounded', [
+    (1, 1, 1, False), (50, 1, 1, True), (300, 2, 2, False),
+    (300, 3, 2, True), (200, 10, 10, False)])
+def test_find_dominated(strict, nb_dmus, nb_inputs, nb_outputs, rounded):
+    random_state = numpy.random.RandomState(7)
+    inputs = random_state.uniform(1, 10, (nb_dmus, nb_inputs))
+    outputs = random_state.uniform(1, 10, (nb_dmus, nb_outputs))
+    if rounded:
+        # ties and duplicates
+        inputs = numpy.round(inputs / 3)
+        outputs = numpy.round(outputs / 3)
+    expected = _find_dominated_brute_force(inputs, outputs, strict)
+    assert (dominance.find_dominated(inputs, outputs, strict, 16) ==
+            expected).all()
+
+
+@pytest.mark.parametrize('strict', [False, True])
+@pytest.mark.parametrize('rounded', [False, True])
+def test_find_dominated_with_bitmaps(monkeypatch, strict, rounded):
+    monkeypatch.setattr(dominance, 'DIRECT_COMPARISON_LIMIT', 8)
+    monkeypatch.setattr(dominance, 'PAIR_CHUNK_SIZE', 50)
+    random_state = numpy.random.RandomState(3)
+    inputs = random_state.uniform(1, 10, (400, 2))
+    outputs = random_state.uniform(1, 10, (400, 3))
+    if rounded:
+        inputs = numpy.round(inputs / 2)
+        outputs = numpy.round(outputs / 2)
+    expected = _find_dominated_brute_force(inputs, outputs, strict)
+    assert (dominance.find_dominated(inputs, outputs, strict, 32) ==
+            expected).all()
+
+
+def test_get_dominated_dmus():
+    data = InputData()
+    values = {'A': (1, 1, 4), 'B': (2, 2, 3), 'C': (1, 2, 4),
+              'D': (3, 1, 5), 'E': (1, 1, 4)}
+    for dmu, (x1, x2, q) in values.items():
+        data.add_coefficient(dmu, 'x1', x1)
+        data.add_coefficient(dmu, 'x2', x2)
+        data.add_coefficient(dmu, 'q', q)
+    data.add_input_category('x1')
+    data.add_input_category('x2')
+    data.add_output_category('q')
+    codes = dict((data.get_dmu_user_name(dmu_code), dmu_code)
+                 for dmu_code in data.DMU_codes)
+    assert dominance.get_dominated_dmus(data, data.DMU_codes) == set(
+        [codes['B'], codes['C']])
+    assert dominance.get_dominated_dmus(
+        data, data.DMU_codes, strict=True) == set([codes['B']])
+    assert dominance.get_dominated_dmus(
+        data, [codes['B'], codes['C'], codes['D']]) == set([codes['B']])
+    assert dominance.get_dominated_dmus(
+        data, [codes['C'], codes['D']]) == set()
+
+
+def test_find_inefficient():
+    inputs = numpy.array([[2, 4], [1, 1], [4, 4], [1, 0], [2, 4], [3, 1],
+                          [3, 3]])
+    outputs = numpy.array([[1], [1], [4], [0], [2], [1], [2]])
+    # CRS: DMU 1 is scaled, zero outputs of DMU 3 give zero bound
+    expected = [True, False, False, False, False, False, True]
+    assert (dominance.find_inefficient(
+        inputs, outputs, inputs, outputs, 'input') == expected).all()
+    assert (dominance.find_inefficient(
+        inputs, outputs, inputs, outputs, 'output') == expected).all()
+    # VRS: DMUs cannot be scaled
+    expected = [True, False, False, False, False, False, False]
+    assert (dominance.find_inefficient(
+        inputs, outputs, inputs, outputs, 'input', vrs=True) ==
+        expected).all()
+    assert (dominance.find_inefficient(
+        inputs, outputs, inputs, outputs, 'output', vrs=True) ==
+        expected).all()
+    # second input is not decreased, so DMU 1 is better than DMU 5
+    assert (dominance.find_inefficient(
+        inputs, outputs, inputs, outputs, 'input',
+        non_discretionary=numpy.array([False, True])) ==
+        [True, False, False, False, False, True, True]).all()
+    assert not dominance.find_inefficient(
+        inputs, outputs, inputs, outputs, 'input',
+        non_discretionary=numpy.array([True, True])).any()
+    assert not dominance.find_inefficient(
+        -inputs, outputs, -inputs, outputs, 'input').any()
+    assert (dominance.find_inefficient(
+        inputs, outputs, inputs[1:3], outputs[1:3], 'input') ==
+        [True, False, False, False, False, False, True]).all()
+    with pytest.raises(ValueError):
+        dominance.find_inefficient(inputs, outputs, inputs, outputs, 'both')
+
+
+@pytest.mark.parametrize('extra_params', [
+    {}, {'ORIENTATION': 'output'}, {'RETURN_TO_SCALE': 'VRS'},
+    {'RETURN_TO_SCALE': 'VRS', 'ORIENTATION': 'output'},
+    {'NON_DISCRETIONARY_CATEGORIES': 'x2'},
+    {'NON_DISCRETIONARY_CATEGORIES': 'q1', 'ORIENTATION': 'output',
+     'RETURN_TO_SCALE': 'VRS'}])
+def test_get_inefficient_dmus(request, extra_params):
+    request.addfinalizer(clean_up_pickled_files)
+    random_state = numpy.random.RandomState(11)
+    data = InputData()
+    for count in range(40):
+        values = numpy.round(random_state.uniform(0, 6, 4))
+        for category, value in zip(['x1', 'x2', 'q1', 'q2'], values):
+            data.add_coefficient('D{0}'.format(count), category, value + 1)
+    data.add_input_category('x1')
+    data.add_input_category('x2')
+    data.add_output_category('q1')
+    data.add_output_category('q2')
+    params = Parameters()
+    params.update_parameter('INPUT_CATEGORIES', 'x1; x2')
+    params.update_parameter('OUTPUT_CATEGORIES', 'q1; q2')
+    params.update_parameter('DEA_FORM', 'env')
+    params.update_parameter('RETURN_TO_SCALE', 'CRS')
+    params.update_parameter('ORIENTATION', 'input')
+    for name, value in extra_params.items():
+        params.update_parameter(name, value)
+    model = factory.create_model(params, data)
+    solution = model.run()
+    inefficient = model.inefficiency_screen(data, data.DMU_codes,
+                                            data.DMU_codes)
+    assert len(inefficient) > 0
+    for dmu_code in inefficient:
+        assert (solution.get_efficiency_score(dmu_code) <
+                1 - dominance.SCORE_TOLERANCE)
@@ -0,0 +1,91 @@
+import functools
+
+import numpy
+import pytest
+
+from pyDEA.core.models.dominance_filter_model import DominanceFilterModel
+from pyDEA.core.models.frontier_first_model import FrontierFirstModel
+from pyDEA.core.models.peel_the_onion import peel_the_onion_method
+from pyDEA.core.utils.dominance import get_dominated_dmus
+import pyDEA.core.utils.model_factory as factory
+
+from tests.utils_for_tests import create_data
+from tests.utils_for_tests import create_params
+
+
+@pytest.fixture
+def data(clean_up):
+    random_state = numpy.random.RandomState(11)
+    rows = [('dmu_{0}'.format(count),
+             list(numpy.round(random_state.uniform(1, 10, 3))) +
+             [1 + count % 2]) for count in range(60)]
+    return create_data(rows, ['x1', 'x2', 'q', 'level'], ['x1', 'x2'], ['q'])
+
+
+_create_params = functools.partial(
+    create_params, OUTPUT_CATEGORIES='q', RETURN_TO_SCALE='CRS')
+
+
+def _find_decorator(model, decorator_class):
+    while not isinstance(model, decorator_class):
+        model = model.__dict__['model']
+    return model
+
+
+@pytest.mark.parametrize('extra_params', [
+    {}, {'RETURN_TO_SCALE': 'VRS'}, {'ORIENTATION': 'output'},
+    {'RETURN_TO_SCALE': 'VRS', 'ORIENTATION': 'output',
+     'LP_ENGINE': 'matrix'},
+    {'CATEGORICAL_CATEGORY': 'level'}, {'MAXIMIZE_SLACKS': 'yes'},
+    {'FRONTIER_FIRST': 'yes'}])
+def test_dominance_filter_model(data, extra_params):
+    solution = factory.create_model(_create_params(**extra_params),
+                                    data).run()
+    model = factory.create_model(_create_params(
+        DOMINANCE_FILTER='yes', **extra_params), data)
+    filtered_solution = model.run()
+    dominated_dmus = get_dominated_dmus(data, data.DMU_codes)
+    assert dominated_dmus
+    for dmu_code in data.DMU_codes:
+        assert (filtered_solution.lp_status[dmu_code] ==
+                solution.lp_status[dmu_code])
+        assert filtered_solution.get_efficiency_score(
+            dmu_code) == pytest.approx(solution.get_efficiency_score(
+                dmu_code))
+        if 'CATEGORICAL_CATEGORY' not in extra_params:
+            assert not dominated_dmus.intersection(
+                filtered_solution.get_lambda_variables(dmu_code))
+    if 'FRONTIER_FIRST' in extra_params:
+        assert _find_decorator(model, FrontierFirstModel).dominance_filter
+    elif 'CATEGORICAL_CATEGORY' not in extra_params:
+        assert (_find_decorator(model, DominanceFilterModel).peers ==
+                data.DMU_codes.difference(dominated_dmus))
+
+
+@pytest.mark.parametrize('extra_params', [
+    {'DEA_FORM': 'multi'}, {'USE_SUPER_EFFICIENCY': 'yes'},
+    {'WEAKLY_DISPOSAL_CATEGORIES': 'x1'}])
+def test_dominance_filter_ignored(data, extra_params):
+    params = _create_params(DOMINANCE_FILTER='yes', **extra_params)
+    assert not factory.use_dominance_filter(params)
+    model = factory.create_model(params, data)
+    with pytest.raises(KeyError):
+        _find_decorator(model, DominanceFilterModel)
+
+
+@pytest.mark.parametrize('extra_params', [
+    {}, {'RETURN_TO_SCALE': 'VRS', 'ORIENTATION': 'output'}])
+def test_peel_the_onion_skip_dominated(data, extra_params):
+    model = factory.create_model(_create_params(**extra_params), data)
+    solution, ranks, state = peel_the_onion_method(model)
+    model = factory.create_model(_create_params(**extra_params), data)
+    skip_solution, skip_ranks, skip_state = peel_the_onion_method(
+        model, skip_dominated=True)
+    assert state and skip_state
+    assert max(ranks.values()) > 2
+    assert skip_ranks == ranks
+    assert model.input_data.DMU_codes == data.DMU_codes
+    for dmu_code in data.DMU_codes:
+        assert skip_solution.get_efficiency_score(
+            dmu_code) == pytest.approx(solution.get_efficiency_score(
+                dmu_code))
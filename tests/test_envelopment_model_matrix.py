@@ -0,0 +1,151 @@
+import pytest
+
+from pyDEA.core.models.envelopment_model_base import EnvelopmentModelBase
+from pyDEA.core.models.envelopment_model_matrix import EnvelopmentModelMatrixBase
+from pyDEA.core.models.envelopment_model import EnvelopmentModelInputOriented
+from pyDEA.core.models.envelopment_model import EnvelopmentModelOutputOriented
+from pyDEA.core.models.envelopment_model import EnvelopmentModelInputOrientedWithNonDiscVars
+from pyDEA.core.models.envelopment_model_decorators import DefaultConstraintCreator
+from pyDEA.core.models.envelopment_model_decorators import DisposableVarsConstraintCreator
+from pyDEA.core.models.envelopment_model_decorators import EnvelopmentModelVRSDecorator
+from pyDEA.core.models.envelopment_model_decorators import EnvelopmentModelWithAbsoluteWeightRestrictions
+from pyDEA.core.models.envelopment_model_decorators import EnvelopmentModelWithPriceRatioConstraints
+from pyDEA.core.models.super_efficiency_model import SupperEfficiencyModel
+from pyDEA.core.models.bound_generators import generate_upper_bound_for_efficiency_score
+from pyDEA.core.models.bound_generators import generate_lower_bound_for_efficiency_score
+from pyDEA.core.models.bound_generators import generate_supper_efficiency_upper_bound
+from pyDEA.core.data_processing.input_data import InputData
+from pyDEA.core.data_processing.parameters import Parameters
+from pyDEA.core.utils.dea_utils import clean_up_pickled_files
+import pyDEA.core.utils.model_factory as factory
+
+
+@pytest.fixture
+def data(request):
+    data = InputData()
+    data.add_coefficient('A', 'x1', 2)
+    data.add_coefficient('A', 'x2', 5)
+    data.add_coefficient('A', 'q', 1)
+    data.add_coefficient('B', 'x1', 2)
+    data.add_coefficient('B', 'x2', 4)
+    data.add_coefficient('B', 'q', 2)
+    data.add_coefficient('C', 'x1', 6)
+    data.add_coefficient('C', 'x2', 6)
+    data.add_coefficient('C', 'q', 3)
+    data.add_coefficient('D', 'x1', 3)
+    data.add_coefficient('D', 'x2', 2)
+    data.add_coefficient('D', 'q', 1)
+    data.add_coefficient('E', 'x1', 6)
+    data.add_coefficient('E', 'x2', 2)
+    data.add_coefficient('E', 'q', 2)
+    data.add_input_category('x1')
+    data.add_input_category('x2')
+    data.add_output_category('q')
+    request.addfinalizer(clean_up_pickled_files)
+    return data
+
+
+def _check_same_scores(data, first_solution, second_solution):
+    for dmu_code in data.DMU_codes:
+        assert (first_solution.lp_status[dmu_code] ==
+                second_solution.lp_status[dmu_code])
+        if dmu_code in first_solution.efficiency_scores:
+            assert second_solution.get_efficiency_score(
+                dmu_code) == pytest.approx(
+                first_solution.get_efficiency_score(dmu_code))
+
+
+def test_CRS_env_input_oriented_matrix(data):
+    model = EnvelopmentModelMatrixBase(
+        data, EnvelopmentModelInputOriented(
+            generate_upper_bound_for_efficiency_score),
+        DefaultConstraintCreator())
+    model_solution = model.run()
+    expected_scores = {'A': 0.5, 'B': 1, 'C': 0.83333333, 'D': 0.71428571,
+                       'E': 1}
+    for dmu, score in expected_scores.items():
+        dmu_code = data._DMU_user_name_to_code[dmu]
+        assert model_solution.get_efficiency_score(dmu_code) == pytest.approx(
+            score)
+
+    dmu_code_D = data._DMU_user_name_to_code['D']
+    lambdas = model_solution.get_lambda_variables(dmu_code_D)
+    assert lambdas[data._DMU_user_name_to_code['B']] == pytest.approx(
+        0.21428571)
+    assert lambdas[data._DMU_user_name_to_code['E']] == pytest.approx(
+        0.28571429)
+    assert len(lambdas) == 2
+    assert model_solution.get_input_dual(dmu_code_D, 'x1') == pytest.approx(
+        0.14285714)
+    assert model_solution.get_input_dual(dmu_code_D, 'x2') == pytest.approx(
+        0.28571429)
+    assert model_solution.get_output_dual(dmu_code_D, 'q') == pytest.approx(
+        0.71428571)
+
+
+@pytest.mark.parametrize('concrete_model', [
+    EnvelopmentModelInputOriented(generate_upper_bound_for_efficiency_score),
+    EnvelopmentModelOutputOriented(generate_lower_bound_for_efficiency_score),
+    EnvelopmentModelInputOrientedWithNonDiscVars(
+        ['x2'], generate_upper_bound_for_efficiency_score)])
+def test_matrix_model_with_decorators(data, concrete_model):
+    def create(model_class, constraint_creator):
+        model = model_class(data, concrete_model, constraint_creator)
+        model = EnvelopmentModelVRSDecorator(model)
+        model = EnvelopmentModelWithAbsoluteWeightRestrictions(
+            model, {'x1': (0.1, None)})
+        return EnvelopmentModelWithPriceRatioConstraints(
+            model, {('x1', 'x2'): (None, 5)})
+
+    for constraint_creator in [DefaultConstraintCreator(),
+                               DisposableVarsConstraintCreator(['q'])]:
+        pulp_solution = create(EnvelopmentModelBase,
+                               constraint_creator).run()
+        matrix_solution = create(EnvelopmentModelMatrixBase,
+                                 constraint_creator).run()
+        _check_same_scores(data, pulp_solution, matrix_solution)
+        for dmu_code in data.DMU_codes:
+            assert matrix_solution.vrs_duals[dmu_code] == pytest.approx(
+                pulp_solution.vrs_duals[dmu_code], abs=1e-6) or (
+                pulp_solution.get_efficiency_score(dmu_code) ==
+                pytest.approx(1))
+
+
+def test_matrix_model_super_efficiency(data):
+    def create(model_class):
+        return SupperEfficiencyModel(model_class(
+            data, EnvelopmentModelInputOriented(
+                generate_supper_efficiency_upper_bound),
+            DefaultConstraintCreator()))
+
+    _check_same_scores(data, create(EnvelopmentModelBase).run(),
+                       create(EnvelopmentModelMatrixBase).run())
+
+
+def test_create_matrix_model(data):
+    params = Parameters()
+    params.update_parameter('INPUT_CATEGORIES', 'x1; x2')
+    params.update_parameter('OUTPUT_CATEGORIES', 'q')
+    params.update_parameter('DEA_FORM', 'env')
+    params.update_parameter('RETURN_TO_SCALE', 'CRS')
+    params.update_parameter('ORIENTATION', 'input')
+    params.update_parameter('MULTIPLIER_MODEL_TOLERANCE', '0')
+    params.update_parameter('LP_ENGINE', 'matrix')
+    model = factory.create_model(params, data)
+    assert isinstance(model, EnvelopmentModelMatrixBase)
+
+    params.update_parameter('LP_ENGINE', 'pulp')
+    model = factory.create_model(params, data)
+    assert model.__class__.__name__ == 'EnvelopmentModelBase'
+
+    params.update_parameter('LP_ENGINE', 'unknown')
+    with pytest.raises(ValueError) as excinfo:
+        factory.create_model(params, data)
+    assert str(excinfo.value) == 'Unexpected value of parameter <LP_ENGINE>'
+
+    params.update_parameter('LP_ENGINE', 'matrix')
+    params.update_parameter('DEA_FORM', 'multi')
+    with pytest.raises(ValueError) as excinfo:
+        factory.create_model(params, data)
+    assert (str(excinfo.value) ==
+            'Matrix LP engine works only with envelopment model')
@@ -0,0 +1,82 @@
+import functools
+
+import pytest
+
+from pyDEA.core.models.frontier_first_model import FrontierFirstModel
+import pyDEA.core.utils.model_factory as factory
+
+from tests.utils_for_tests import create_data
+from tests.utils_for_tests import create_params
+
+
+@pytest.fixture
+def data(clean_up):
+    values = {'A': (2, 5, 1, 1), 'B': (2, 4, 2, 1), 'C': (6, 6, 3, 2),
+              'D': (3, 2, 1, 2), 'E': (6, 2, 2, 1), 'F': (4, 9, 2, 2),
+              'G': (5, 3, 2, 1), 'H': (8, 8, 2, 2), 'I': (3, 3, 2, 1)}
+    return create_data(sorted(values.items()), ['x1', 'x2', 'q', 'level'],
+                       ['x1', 'x2'], ['q'])
+
+
+_create_params = functools.partial(
+    create_params, OUTPUT_CATEGORIES='q', RETURN_TO_SCALE='CRS')
+
+
+def _get_frontier_first_model(model):
+    while not isinstance(model, FrontierFirstModel):
+        model = model.__dict__['model']
+    return model
+
+
+@pytest.mark.parametrize('extra_params', [
+    {}, {'RETURN_TO_SCALE': 'VRS'}, {'ORIENTATION': 'output'},
+    {'RETURN_TO_SCALE': 'VRS', 'ORIENTATION': 'output',
+     'LP_ENGINE': 'matrix'},
+    {'NON_DISCRETIONARY_CATEGORIES': 'x2'},
+    {'CATEGORICAL_CATEGORY': 'level'}, {'MAXIMIZE_SLACKS': 'yes'}])
+@pytest.mark.parametrize('block_size', [2, 3, 200])
+def test_frontier_first_model(data, extra_params, block_size):
+    model = factory.create_model(_create_params(**extra_params), data)
+    solution = model.run()
+    frontier_first_model = factory.create_model(_create_params(
+        FRONTIER_FIRST='yes', **extra_params), data)
+    _get_frontier_first_model(
+        frontier_first_model).block_size = block_size
+    frontier_first_solution = frontier_first_model.run()
+    assert frontier_first_solution.orientation == solution.orientation
+    frontier = _get_frontier_first_model(frontier_first_model).frontier
+    for dmu_code in data.DMU_codes:
+        assert (frontier_first_solution.lp_status[dmu_code] ==
+                solution.lp_status[dmu_code])
+        assert frontier_first_solution.get_efficiency_score(
+            dmu_code) == pytest.approx(solution.get_efficiency_score(
+                dmu_code))
+        if 'CATEGORICAL_CATEGORY' not in extra_params:
+            # lambda variables of DMUs outside the frontier are zero
+            assert set(frontier_first_solution.get_lambda_variables(
+                dmu_code)).issubset(frontier)
+    if 'MAXIMIZE_SLACKS' in extra_params:
+        for dmu_code in data.DMU_codes:
+            assert (frontier_first_model.second_solution.lp_status[dmu_code]
+                    == model.second_solution.lp_status[dmu_code])
+
+
+def test_frontier(data):
+    model = factory.create_model(_create_params(FRONTIER_FIRST='yes'), data)
+    model.block_size = 2
+    solution = model.run()
+    assert sorted(model.frontier) == sorted(
+        dmu_code for dmu_code in data.DMU_codes
+        if solution.get_efficiency_score(dmu_code) == pytest.approx(1))
+    with pytest.raises(ValueError):
+        FrontierFirstModel(model, 1)
+
+
+@pytest.mark.parametrize('extra_params', [
+    {'DEA_FORM': 'multi'}, {'USE_SUPER_EFFICIENCY': 'yes'},
+    {'WEAKLY_DISPOSAL_CATEGORIES': 'x1'},
+    {'ABS_WEIGHT_RESTRICTIONS': 'x1 >= 0.1'}])
+def test_frontier_first_not_supported(data, extra_params):
+    with pytest.raises(ValueError):
+        factory.create_model(_create_params(FRONTIER_FIRST='yes',
+                                            **extra_params), data)
@@ -1,3 +1,6 @@
+import pickle
+
+import numpy
 import pytest
 
 from pyDEA.core.data_processing.input_data import InputData
@@ -123,3 +126,81 @@ def test_input_data_list_of_dmu_codes_order():
                                                  'dmu3'],
                                              data._DMU_user_name_to_code[
                                              'dmu4']]
+
+
+def test_input_data_matrices(data):
+    data.add_coefficient('dmu2', 'x2', 7)
+    data.add_coefficient('dmu2', 'q', 1.5)
+    data.add_input_category('x2')
+    data.add_input_category('x1')
+    data.add_output_category('q')
+    dmu1 = data._DMU_user_name_to_code['dmu1']
+    dmu2 = data._DMU_user_name_to_code['dmu2']
+    assert data.get_input_matrix().tolist() == [[2.4, 5], [3, 7]]
+    assert data.get_output_matrix([dmu2, dmu1]).tolist() == [[1.5], [-12]]
+    assert data.get_values(['q', 'x1'], [dmu2]).tolist() == [[1.5, 3]]
+    assert data.get_dmu_row(dmu1, ['x2', 'q']).tolist() == [5, -12]
+    # returned arrays are copies
+    data.get_input_matrix()[0, 0] = 100
+    assert data.coefficients[dmu1, 'x1'] == 2.4
+
+
+def test_input_data_missing_values(data):
+    dmu2 = data._DMU_user_name_to_code['dmu2']
+    assert (dmu2, 'x2') not in data.coefficients
+    assert (dmu2, 'z') not in data.coefficients
+    with pytest.raises(KeyError) as excinfo:
+        data.coefficients[dmu2, 'x2']
+    assert excinfo.value.args[0] == (dmu2, 'x2')
+    with pytest.raises(KeyError) as excinfo:
+        data.get_values(['x1', 'x2'])
+    assert excinfo.value.args[0] == (dmu2, 'x2')
+    with pytest.raises(KeyError):
+        data.get_dmu_row('dmu_100', ['x1'])
+
+
+def test_input_data_many_coefficients():
+    data = InputData()
+    values = numpy.arange(3000, dtype=float).reshape(1000, 3)
+    for count, row in enumerate(values):
+        for category, value in zip(['x1', 'x2', 'q'], row):
+            data.add_coefficient('dmu{0}'.format(count), category, value)
+    assert len(data.coefficients) == 3000
+    assert data.coefficients.values.shape == (1000, 3)
+    assert numpy.array_equal(data.get_values(['x1', 'x2', 'q']), values)
+    assert sorted(data.coefficients.items())[0] == (
+        (data._DMU_user_name_to_code['dmu0'], 'q'), 2)
+    copy_of_data = pickle.loads(pickle.dumps(data))
+    assert copy_of_data.coefficients == data.coefficients
+    assert copy_of_data.coefficients._buffer.shape == (1000, 3)
+    copy_of_data.add_coefficient('dmu1000', 'x1', -1)
+    assert copy_of_data.get_dmu_row(
+        copy_of_data._DMU_user_name_to_code['dmu1000'], ['x1']) == [-1]
+    assert len(data.coefficients) == 3000
+
+
+def test_input_data_add_coefficients():
+    categories = ['x1', 'x2', 'q1']
+    values = numpy.arange(9.0).reshape(3, 3)
+    expected = InputData()
+    expected.add_coefficient('first', 'x1', 100)
+    data = InputData()
+    data.add_coefficient('first', 'x1', 100)
+    for dmu, row in zip(['A', 'B', 'C'], values):
+        for category, value in zip(categories, row):
+            expected.add_coefficient(dmu, category, value)
+    data.add_coefficients(['A', 'B', 'C'], categories, values)
+    assert data.DMU_codes_in_added_order == expected.DMU_codes_in_added_order
+    assert data.DMU_code_to_user_name == expected.DMU_code_to_user_name
+    assert data._count == expected._count
+    assert data.categories == expected.categories
+    assert dict(data.coefficients) == dict(expected.coefficients)
+    data.add_coefficients(['first'], ['x2'], [[7]])
+    assert data.coefficients['dmu_1', 'x2'] == 7
+    for dmu_names, new_categories in [(['D', 'D'], ['x1']),
+                                      (['D'], ['q2', 'q2']),
+                                      (['D', 'B'], ['q2', 'x1'])]:
+        with pytest.raises(KeyError):
+            data.add_coefficients(dmu_names, new_categories,
+                                  numpy.ones((len(dmu_names),
+                                              len(new_categories))))
@@ -0,0 +1,105 @@
+import gc
+import os
+import pickle
+
+import pytest
+
+from pyDEA.core.data_processing.lambda_matrix import INITIAL_CAPACITY
+from pyDEA.core.data_processing.lambda_matrix import LambdaMatrix
+import pyDEA.core.utils.model_factory as factory
+
+from tests.utils_for_tests import create_params
+from tests.utils_for_tests import create_random_data
+
+
+@pytest.fixture
+def data(clean_up):
+    return create_random_data(3, 30)
+
+
+@pytest.mark.parametrize('use_file', [False, True])
+def test_lambda_matrix(use_file, tmpdir):
+    matrix = LambdaMatrix(use_file, str(tmpdir))
+    matrix.set_row('a', {'b': 0.5, 'a': 0, 'c': 1.5})
+    matrix.set_row('b', {'b': 1})
+    matrix.set_row('c', dict())
+    assert list(matrix.get_row('a').items()) == [
+        ('b', 0.5), ('a', 0), ('c', 1.5)]
+    assert matrix.get_row('b') == {'b': 1}
+    assert matrix.get_row('c') == dict()
+    assert matrix.get_value('a', 'c') == 1.5
+    assert matrix.get_value('b', 'a') == 0
+    assert matrix.get_value('b', 'unknown') == 0
+    assert 'a' in matrix and 'd' not in matrix
+    with pytest.raises(KeyError):
+        matrix.get_row('d')
+    with pytest.raises(KeyError):
+        matrix.get_value('d', 'a')
+    # new row replaces the previous one
+    matrix.set_row('a', {'a': 1})
+    assert matrix.get_row('a') == {'a': 1}
+    assert matrix.get_row('b') == {'b': 1}
+    assert matrix.nb_entries == 5
+    if use_file:
+        assert os.path.dirname(matrix.file_name) == str(tmpdir)
+        assert os.path.exists(matrix.file_name)
+
+
+@pytest.mark.parametrize('use_file', [False, True])
+def test_lambda_matrix_growth(use_file):
+    matrix = LambdaMatrix(use_file)
+    nb_dmus = 2 * INITIAL_CAPACITY + 1
+    dmu_codes = ['dmu_{0}'.format(count) for count in range(nb_dmus)]
+    for count, dmu_code in enumerate(dmu_codes):
+        matrix.set_row(dmu_code, dict((other, float(count))
+                                      for other in dmu_codes[:count % 7]))
+    for count, dmu_code in enumerate(dmu_codes):
+        assert matrix.get_row(dmu_code) == dict(
+            (other, count) for other in dmu_codes[:count % 7])
+    copy_of_matrix = pickle.loads(pickle.dumps(matrix))
+    assert copy_of_matrix.file_name is None
+    assert len(copy_of_matrix._entries) == matrix.nb_entries
+    assert copy_of_matrix.get_row(dmu_codes[-1]) == matrix.get_row(
+        dmu_codes[-1])
+    copy_of_matrix.set_row('new', {'new': 1})
+    assert copy_of_matrix.get_row('new') == {'new': 1}
+    matrix.close()
+    if use_file:
+        assert not os.path.exists(matrix.file_name)
+
+
+def test_lambda_matrix_file_is_removed():
+    matrix = LambdaMatrix(use_file=True)
+    matrix.set_row('a', {'a': 1})
+    file_name = matrix.file_name
+    assert os.path.exists(file_name)
+    del matrix
+    gc.collect()
+    assert not os.path.exists(file_name)
+
+
+def test_use_lambda_file():
+    assert factory.use_lambda_file(create_params()) is False
+    assert factory.use_lambda_file(create_params(
+        LAMBDA_STORAGE='memory')) is False
+    assert factory.use_lambda_file(create_params(
+        LAMBDA_STORAGE='file')) is True
+    with pytest.raises(ValueError):
+        factory.use_lambda_file(create_params(LAMBDA_STORAGE='disk'))
+
+
+@pytest.mark.parametrize('extra_params', [
+    {}, {'DEA_FORM': 'multi'}, {'MAXIMIZE_SLACKS': 'yes'},
+    {'NUM_WORKERS': '2'}])
+def test_models_with_lambda_file(data, extra_params):
+    params = create_params(**extra_params)
+    factory.add_input_and_output_categories(params, data)
+    expected_solution = factory.create_model(params, data).run()
+    params.update_parameter('LAMBDA_STORAGE', 'file')
+    solution = factory.create_model(params, data).run()
+    assert solution.lambda_matrix.file_name is not None
+    for dmu_code in data.DMU_codes:
+        assert solution.get_lambda_variables(dmu_code) == (
+            expected_solution.get_lambda_variables(dmu_code))
+        assert solution.is_efficient(dmu_code) == (
+            expected_solution.is_efficient(dmu_code))
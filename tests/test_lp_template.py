@@ -0,0 +1,94 @@
+import functools
+import pickle
+
+import pytest
+
+from pyDEA.core.models.lp_template import LpTemplate
+from pyDEA.core.models.peel_the_onion import peel_the_onion_method
+import pyDEA.core.utils.model_builder as model_builder
+import pyDEA.core.utils.model_factory as factory
+
+from tests.utils_for_tests import create_params
+from tests.utils_for_tests import create_random_data
+
+
+@pytest.fixture
+def data(clean_up):
+    return create_random_data(5, 30, 'level', 3)
+
+
+_create_params = functools.partial(
+    create_params, RETURN_TO_SCALE='both', ORIENTATION='both')
+
+
+def _get_base_model(model):
+    while 'model' in vars(model) or '_model_to_decorate' in vars(model):
+        model = vars(model).get('model', None) or vars(model).get(
+            '_model_to_decorate')
+    return model
+
+
+def test_lp_template(data):
+    template = LpTemplate()
+    dmu_codes = [data._DMU_user_name_to_code[dmu] for dmu in ['D7', 'D2']]
+    columns = template.get_columns(data, dmu_codes)
+    assert list(columns) == [7, 2]
+    assert list(template.get_row(data, 'x1', columns)) == [
+        data.coefficients[dmu_code, 'x1'] for dmu_code in dmu_codes]
+    rows = template.get_rows(data, ['q1', 'x2'], columns)
+    assert rows.shape == (2, 2)
+    assert rows[1, 0] == data.coefficients[dmu_codes[0], 'x2']
+    ordered_dmu_codes, ordered_columns = template.get_ordered_columns(
+        data, set(dmu_codes))
+    assert ordered_dmu_codes == dmu_codes[::-1]
+    assert list(ordered_columns) == [2, 7]
+    restored_template = pickle.loads(pickle.dumps(template))
+    assert restored_template._rows == dict()
+    assert list(restored_template.get_row(data, 'x1', columns)) == list(
+        template.get_row(data, 'x1', columns))
+    data.add_coefficient('D30', 'x1', 1)
+    columns = template.get_columns(
+        data, [data._DMU_user_name_to_code['D30']])
+    assert list(template.get_row(data, 'x1', columns)) == [1]
+
+
+@pytest.mark.parametrize('extra_params', [
+    {}, {'LP_ENGINE': 'matrix'}, {'DEA_FORM': 'multi'},
+    {'MAXIMIZE_SLACKS': 'yes'}, {'RESTRICTED_BASIS': 'yes'}])
+def test_models_share_lp_template(data, extra_params):
+    params = _create_params(**extra_params)
+    models, all_params = model_builder.build_models(params, data)
+    assert len(models) == 4
+    templates = set(id(_get_base_model(model).lp_template)
+                    for model in models)
+    assert len(templates) == 1
+    for model, model_params in zip(models, all_params):
+        assert model.input_data is data
+        solution = model.run()
+        expected_solution = factory.create_model(model_params, data).run()
+        for dmu_code in data.DMU_codes:
+            assert solution.lp_status[dmu_code] == (
+                expected_solution.lp_status[dmu_code])
+            assert solution.get_efficiency_score(dmu_code) == pytest.approx(
+                expected_solution.get_efficiency_score(dmu_code))
+
+
+@pytest.mark.parametrize('extra_params', [
+    {}, {'LP_ENGINE': 'matrix'}, {'CATEGORICAL_CATEGORY': 'level'}])
+def test_solve_models_concurrently(data, extra_params):
+    params = _create_params(CONCURRENT_MODELS='yes', **extra_params)
+    models, all_params = model_builder.build_models(params, data)
+    assert len(set(id(model.input_data) for model in models)) == 4
+    assert all(model.input_data.coefficients is data.coefficients
+               for model in models)
+    results = model_builder.solve_models(
+        models, lambda model: peel_the_onion_method(model), concurrent=True)
+    for (solution, ranks, state), model_params in zip(results, all_params):
+        assert state
+        expected_solution, expected_ranks, _ = peel_the_onion_method(
+            factory.create_model(model_params, data))
+        assert ranks == expected_ranks
+        for dmu_code in data.DMU_codes:
+            assert solution.get_efficiency_score(dmu_code) == pytest.approx(
+                expected_solution.get_efficiency_score(dmu_code))
+    assert data.DMU_codes == set(data.DMU_codes_in_added_order)
@@ -1,7 +1,8 @@
 import os
 import shutil
+import pytest
 
-from pyDEA.main import main
+from pyDEA.main import main, extract_num_workers, extract_clear_cache
 from pyDEA.core.data_processing.parameters import parse_parameters_from_file
 from pyDEA.core.utils.dea_utils import auto_name_if_needed
 
@@ -49,3 +50,22 @@ def test_main_csv():
     main(filename, sheet_name_usr='haha')
     assert os.path.exists(auto_name) is True
     os.remove(auto_name)
+
+
+def test_extract_num_workers():
+    assert extract_num_workers(['params.txt', 'csv']) == (
+        ['params.txt', 'csv'], None)
+    assert extract_num_workers(['params.txt', '--num-workers', '4',
+                                'csv']) == (['params.txt', 'csv'], '4')
+    assert extract_num_workers(['--num-workers=2', 'params.txt']) == (
+        ['params.txt'], '2')
+    with pytest.raises(ValueError) as excinfo:
+        extract_num_workers(['params.txt', '--num-workers'])
+    assert str(excinfo.value) == 'Option --num-workers requires a value'
+
+
+def test_extract_clear_cache():
+    assert extract_clear_cache(['params.txt', 'csv']) == (
+        ['params.txt', 'csv'], False)
+    assert extract_clear_cache(['--clear-cache', 'params.txt']) == (
+        ['params.txt'], True)
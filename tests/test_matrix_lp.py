@@ -0,0 +1,80 @@
+import numpy
+import pulp
+import pytest
+
+from pyDEA.core.models.matrix_lp import MatrixLpProblem
+
+
+@pytest.fixture
+def problem():
+    ''' min x + y + 2z s.t. x + 2y + z >= 4 (block), 3x + y >= 3 (block),
+        x + y + z == z_total (pulp constraint), x, y >= 0, 0 <= z <= 10.
+    '''
+    x = pulp.LpVariable('x', 0)
+    y = pulp.LpVariable('y', 0)
+    z = pulp.LpVariable('z', 0, 10)
+    problem = MatrixLpProblem('test', pulp.LpMinimize)
+    problem.set_block_variables([x, y])
+    first = problem.add_block_constraint('first', numpy.array([1, 2]),
+                                         pulp.LpConstraintGE)
+    first.addterm(z, 1)
+    first.changeRHS(4)
+    second = problem.add_block_constraint('second', numpy.array([3, 1]),
+                                          pulp.LpConstraintGE)
+    second.changeRHS(3)
+    problem += x + y + 2 * z, 'objective'
+    return problem, x, y, z
+
+
+def test_solve(problem):
+    lp_problem, x, y, z = problem
+    assert lp_problem.solve() == pulp.LpStatusOptimal
+    assert lp_problem.status == pulp.LpStatusOptimal
+    assert pulp.value(lp_problem.objective) == pytest.approx(2.2)
+    assert lp_problem.block_values[0] == pytest.approx(0.4)
+    assert lp_problem.block_values[1] == pytest.approx(1.8)
+    assert z.varValue == pytest.approx(0)
+    assert lp_problem.constraints['first'].pi == pytest.approx(0.4)
+    assert lp_problem.constraints['second'].pi == pytest.approx(0.2)
+
+
+def test_change_coefficients_and_rhs(problem):
+    lp_problem, x, y, z = problem
+    lp_problem.constraints['second'][x] = 1
+    lp_problem.constraints['second'].changeRHS(4)
+    assert lp_problem.constraints['second'][x] == 1
+    assert lp_problem.constraints['first'][z] == 1
+    lp_problem.solve()
+    assert pulp.value(lp_problem.objective) == pytest.approx(4)
+
+
+def test_maximize_and_equality(problem):
+    lp_problem, x, y, z = problem
+    lp_problem += (x + y + z == 5, 'total')
+    lp_problem.sense = pulp.LpMaximize
+    lp_problem.objective = pulp.LpAffineExpression(z)
+    lp_problem.solve()
+    assert z.varValue == pytest.approx(4)
+    # increasing total by one increases objective by one
+    assert lp_problem.constraints['total'].pi == pytest.approx(1)
+
+
+def test_infeasible(problem):
+    lp_problem, x, y, z = problem
+    lp_problem += (x + y + z <= 1, 'small')
+    lp_problem += (z >= 2, 'big')
+    assert lp_problem.solve() == pulp.LpStatusInfeasible
+    assert lp_problem.block_values is None
+
+
+def test_deepcopy(problem):
+    lp_problem, x, y, z = problem
+    copy = lp_problem.deepcopy()
+    copy.constraints['first'].changeRHS(40)
+    copy.constraints['second'][y] = 10
+    assert lp_problem.constraints['first'].rhs == 4
+    assert lp_problem.constraints['second'][y] == 1
+    copy.solve()
+    assert pulp.value(copy.objective) == pytest.approx(20)
+    lp_problem.solve()
+    assert pulp.value(lp_problem.objective) == pytest.approx(2.2)
@@ -0,0 +1,164 @@
+import functools
+
+import numpy
+import pulp
+import pytest
+from scipy.optimize import linprog
+
+from pyDEA.core.models.maximize_slacks import OBJECTIVE_TOLERANCE
+import pyDEA.core.utils.model_factory as factory
+
+from tests.utils_for_tests import create_data
+from tests.utils_for_tests import create_params
+
+INPUTS = ['x1', 'x2']
+OUTPUTS = ['q1', 'q2']
+
+
+@pytest.fixture
+def data(clean_up):
+    values = numpy.random.RandomState(3).uniform(1, 10, (25, 4))
+    rows = [('D{0}'.format(count), row) for count, row in enumerate(values)]
+    # DMU with the smallest x2 and outputs, but with too much x1,
+    # has an input slack in any optimal solution
+    row = values.min(axis=0)
+    row[0] = 200
+    rows.append(('S', row))
+    return create_data(rows, INPUTS + OUTPUTS, INPUTS, OUTPUTS)
+
+
+_create_params = functools.partial(
+    create_params, RETURN_TO_SCALE='CRS', MAXIMIZE_SLACKS='yes')
+
+
+def _get_values(data, dmu_codes, categories):
+    return numpy.array([[data.coefficients[dmu_code, category]
+                         for category in categories]
+                        for dmu_code in dmu_codes])
+
+
+def _get_max_slacks(data, dmu_code, score, orientation, vrs,
+                    super_efficiency, weakly_disposable):
+    ''' Solves the second phase with scipy.
+    '''
+    dmu_codes = data.DMU_codes_in_added_order
+    inputs = _get_values(data, dmu_codes, INPUTS)
+    outputs = _get_values(data, dmu_codes, OUTPUTS)
+    index = dmu_codes.index(dmu_code)
+    input_rhs = inputs[index].copy()
+    output_rhs = outputs[index].copy()
+    # objective function of the first phase is fixed with a tolerance,
+    # its value is relaxed in the same way
+    if orientation == 'input':
+        input_rhs *= score + OBJECTIVE_TOLERANCE * max(1, score)
+    else:
+        output_rhs *= 1 / score - OBJECTIVE_TOLERANCE * max(1, 1 / score)
+    nb_dmus = len(dmu_codes)
+    categories = INPUTS + OUTPUTS
+    slack_columns = [count for count, category in enumerate(categories)
+                     if category not in weakly_disposable]
+    # sum(lambda * x) + s = rhs, sum(lambda * y) - s = rhs
+    matrix = numpy.zeros((len(categories), nb_dmus + len(slack_columns)))
+    matrix[:len(INPUTS), :nb_dmus] = inputs.T
+    matrix[len(INPUTS):, :nb_dmus] = outputs.T
+    for column, row in enumerate(slack_columns):
+        matrix[row, nb_dmus + column] = 1 if row < len(INPUTS) else -1
+    rhs = numpy.concatenate((input_rhs, output_rhs))
+    if vrs:
+        vrs_row = numpy.zeros(matrix.shape[1])
+        vrs_row[:nb_dmus] = 1
+        matrix = numpy.vstack((matrix, vrs_row))
+        rhs = numpy.append(rhs, 1)
+    bounds = [(0, None)] * matrix.shape[1]
+    if super_efficiency:
+        bounds[index] = (0, 0)
+    costs = numpy.zeros(matrix.shape[1])
+    costs[nb_dmus:] = -1
+    result = linprog(costs, A_eq=matrix, b_eq=rhs, bounds=bounds,
+                     method='highs')
+    assert result.status == 0
+    return -result.fun
+
+
+def _get_slacks_of_solution(data, solution, dmu_code, score, orientation):
+    lambdas = solution.get_lambda_variables(dmu_code)
+    total = 0
+    for category in INPUTS:
+        value = data.coefficients[dmu_code, category]
+        if orientation == 'input':
+            value *= score
+        total += value - sum(data.coefficients[other, category] * weight
+                             for other, weight in lambdas.items())
+    for category in OUTPUTS:
+        value = data.coefficients[dmu_code, category]
+        if orientation == 'output':
+            value /= score
+        total += sum(data.coefficients[other, category] * weight
+                     for other, weight in lambdas.items()) - value
+    return total
+
+
+@pytest.mark.parametrize('extra_params', [
+    {}, {'RETURN_TO_SCALE': 'VRS'}, {'ORIENTATION': 'output'},
+    {'RETURN_TO_SCALE': 'VRS', 'ORIENTATION': 'output'},
+    {'LP_ENGINE': 'matrix'},
+    {'LP_ENGINE': 'matrix', 'RETURN_TO_SCALE': 'VRS',
+     'ORIENTATION': 'output'},
+    {'USE_SUPER_EFFICIENCY': 'yes'},
+    {'USE_SUPER_EFFICIENCY': 'yes', 'LP_ENGINE': 'matrix'},
+    {'WEAKLY_DISPOSAL_CATEGORIES': 'x2'}])
+def test_maximize_slacks(data, extra_params):
+    params = _create_params(**extra_params)
+    model = factory.create_model(params, data)
+    solution = model.run()
+    second_solution = model.second_solution
+    orientation = params.get_parameter_value('ORIENTATION')
+    weakly_disposable = params.get_set_of_parameters(
+        'WEAKLY_DISPOSAL_CATEGORIES')
+    assert second_solution.skipped_lps
+    assert len(second_solution.skipped_lps) < len(data.DMU_codes)
+    for dmu_code in data.DMU_codes:
+        assert second_solution.lp_status[dmu_code] == pulp.LpStatusOptimal
+        score = solution.get_efficiency_score(dmu_code)
+        assert second_solution.get_efficiency_score(
+            dmu_code) == pytest.approx(score)
+        expected_slacks = _get_max_slacks(
+            data, dmu_code, score, orientation,
+            params.get_parameter_value('RETURN_TO_SCALE') == 'VRS',
+            bool(params.get_parameter_value('USE_SUPER_EFFICIENCY')),
+            weakly_disposable)
+        if dmu_code in second_solution.skipped_lps:
+            assert expected_slacks == pytest.approx(0, abs=1e-5)
+        if not weakly_disposable:
+            assert _get_slacks_of_solution(
+                data, second_solution, dmu_code, score,
+                orientation) == pytest.approx(expected_slacks, rel=1e-6,
+                                              abs=1e-5)
+    dmu_code = data._DMU_user_name_to_code['S']
+    assert dmu_code not in second_solution.skipped_lps
+
+
+def test_maximize_slacks_restores_lp(data):
+    model = factory.create_model(_create_params(), data)
+    first_solution = model.run()
+    objective = model.lp_model.objective
+    variables = sorted(objective.keys(), key=str)
+    assert [str(variable) for variable in variables] == [
+        'Variable_in_objective_function']
+    assert variables[0].lowBound == 0
+    assert model.lp_model.sense == pulp.LpMinimize
+    for variable in model._slack_variables.values():
+        assert variable.upBound == 0
+    solution = model.model.run()
+    for dmu_code in data.DMU_codes:
+        assert solution.get_efficiency_score(dmu_code) == pytest.approx(
+            first_solution.get_efficiency_score(dmu_code))
+
+
+def test_maximize_slacks_in_parallel(data):
+    model = factory.create_model(_create_params(NUM_WORKERS='2'), data)
+    model.run()
+    expected_model = factory.create_model(_create_params(), data)
+    expected_model.run()
+    assert model.second_solution.skipped_lps == (
+        expected_model.second_solution.skipped_lps)
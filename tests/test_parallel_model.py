@@ -0,0 +1,131 @@
+import functools
+import pickle
+
+import pytest
+
+from pyDEA.core.models.parallel_model import ParallelModel
+from pyDEA.core.models.parallel_model import split_into_chunks
+from pyDEA.core.models.parallel_model import dump_model
+from pyDEA.core.models.parallel_model import load_model
+import pyDEA.core.utils.model_factory as factory
+
+from tests.utils_for_tests import create_data
+from tests.utils_for_tests import create_params
+
+
+@pytest.fixture
+def data(clean_up):
+    values = {'A': (2, 5, 1, 1), 'B': (2, 4, 2, 1), 'C': (6, 6, 3, 2),
+              'D': (3, 2, 1, 2), 'E': (6, 2, 2, 1), 'F': (4, 9, 2, 2),
+              'G': (5, 3, 2, 1)}
+    return create_data(sorted(values.items()), ['x1', 'x2', 'q', 'level'],
+                       ['x1', 'x2'], ['q'])
+
+
+_create_params = functools.partial(create_params, OUTPUT_CATEGORIES='q')
+
+
+def _check_same_solutions(data, first_solution, second_solution,
+                          check_lambdas_and_duals=True):
+    assert first_solution.orientation == second_solution.orientation
+    for dmu_code in data.DMU_codes:
+        assert (first_solution.lp_status[dmu_code] ==
+                second_solution.lp_status[dmu_code])
+        if dmu_code not in first_solution.efficiency_scores:
+            continue
+        assert first_solution.get_efficiency_score(
+            dmu_code) == pytest.approx(
+                second_solution.get_efficiency_score(dmu_code))
+        if check_lambdas_and_duals:
+            assert first_solution.get_lambda_variables(
+                dmu_code) == pytest.approx(
+                    second_solution.get_lambda_variables(dmu_code))
+            assert first_solution.input_duals[dmu_code] == pytest.approx(
+                second_solution.input_duals[dmu_code])
+            assert first_solution.vrs_duals[dmu_code] == pytest.approx(
+                second_solution.vrs_duals[dmu_code])
+
+
+def test_split_into_chunks():
+    assert split_into_chunks([1, 2, 3, 4, 5], 2) == [[1, 2], [3, 4, 5]]
+    assert split_into_chunks([1, 2], 3) == [[1], [2]]
+    assert split_into_chunks([], 3) == []
+
+
+def test_get_num_workers():
+    assert factory.get_num_workers(_create_params()) == 1
+    assert factory.get_num_workers(_create_params(NUM_WORKERS='4')) == 4
+    for value in ['0', 'many']:
+        with pytest.raises(ValueError) as excinfo:
+            factory.get_num_workers(_create_params(NUM_WORKERS=value))
+        assert (str(excinfo.value) ==
+                'Unexpected value of parameter <NUM_WORKERS>')
+    with pytest.raises(ValueError):
+        ParallelModel(None, 0)
+
+
+@pytest.mark.parametrize('extra_params', [
+    {}, {'USE_SUPER_EFFICIENCY': 'yes'},
+    {'CATEGORICAL_CATEGORY': 'level', 'ABS_WEIGHT_RESTRICTIONS': 'x1 >= 0.1'}])
+def test_parallel_model(data, extra_params):
+    serial_model = factory.create_model(_create_params(**extra_params), data)
+    parallel_model = factory.create_model(
+        _create_params(NUM_WORKERS='3', **extra_params), data)
+    assert isinstance(parallel_model, ParallelModel)
+    _check_same_solutions(data, serial_model.run(), parallel_model.run())
+
+
+def test_parallel_model_with_warm_start(data):
+    # solver is warm-started from a different basis in every worker,
+    # so lambda variables and duals of degenerate problems might differ
+    extra_params = {'DMU_ORDER': 'similarity', 'LP_ENGINE': 'matrix',
+                    'USE_SUPER_EFFICIENCY': 'yes'}
+    serial_model = factory.create_model(_create_params(**extra_params), data)
+    parallel_model = factory.create_model(
+        _create_params(NUM_WORKERS='2', **extra_params), data)
+    _check_same_solutions(data, serial_model.run(), parallel_model.run(),
+                          check_lambdas_and_duals=False)
+
+
+def test_parallel_model_with_max_slacks(data):
+    serial_model = factory.create_model(_create_params(
+        MAXIMIZE_SLACKS='yes'), data)
+    parallel_model = factory.create_model(_create_params(
+        MAXIMIZE_SLACKS='yes', NUM_WORKERS='2'), data)
+    _check_same_solutions(data, serial_model.run(), parallel_model.run())
+    _check_same_solutions(data, serial_model.second_solution,
+                          parallel_model.second_solution)
+
+
+def test_pickled_model(data):
+    # workers started with spawn method receive pickled model
+    model = factory.create_model(_create_params(
+        USE_SUPER_EFFICIENCY='yes', MAXIMIZE_SLACKS='yes',
+        LP_ENGINE='matrix'), data)
+    solution = model.run()
+    pickled_model = pickle.loads(pickle.dumps(model))
+    _check_same_solutions(data, solution, pickled_model.run())
+
+
+def test_worker_statistics(data):
+    model = factory.create_model(_create_params(NUM_WORKERS='2'), data)
+    solution = model.run()
+    assert model.shared_data_size == 7 * 4 * 8
+    assert len(solution.worker_statistics) == 2
+    assert sum(statistics['nb_dmus'] for statistics
+               in solution.worker_statistics) == 7
+    for statistics in solution.worker_statistics:
+        assert statistics['startup_time'] >= 0
+        assert statistics['peak_memory'] is None or statistics[
+            'peak_memory'] > 0
+
+
+def test_dump_model(data):
+    model = factory.create_model(_create_params(
+        CATEGORICAL_CATEGORY='level'), data)
+    model_data = dump_model(model)
+    assert pickle.loads(pickle.dumps(data)) is not data
+    loaded_model = load_model(model_data, data)
+    assert loaded_model.input_data is data
+    with pytest.raises(pickle.UnpicklingError):
+        pickle.loads(model_data)
@@ -0,0 +1,124 @@
+import functools
+
+import pytest
+
+from pyDEA.core.data_processing.input_data import InputData
+from pyDEA.core.models.peel_the_onion import can_peel_incrementally
+from pyDEA.core.models.peel_the_onion import peel_the_onion_by_rerunning
+from pyDEA.core.models.peel_the_onion import peel_the_onion_incrementally
+from pyDEA.core.models.peel_the_onion import peel_the_onion_method
+import pyDEA.core.utils.model_factory as factory
+
+from tests.utils_for_tests import create_params
+from tests.utils_for_tests import create_random_data
+
+
+@pytest.fixture
+def data(clean_up):
+    return create_random_data(5, 40, 'group', 2, ['x1', 'x2'], ['q1', 'q2'])
+
+
+_create_params = functools.partial(create_params, RETURN_TO_SCALE='CRS')
+
+
+@pytest.mark.parametrize('extra_params', [
+    {}, {'RETURN_TO_SCALE': 'VRS', 'ORIENTATION': 'output'},
+    {'DEA_FORM': 'multi'},
+    {'DEA_FORM': 'multi', 'RETURN_TO_SCALE': 'VRS'},
+    {'USE_SUPER_EFFICIENCY': 'yes'},
+    {'MAXIMIZE_SLACKS': 'yes', 'RETURN_TO_SCALE': 'VRS'},
+    {'LP_ENGINE': 'matrix'},
+    {'LP_ENGINE': 'matrix', 'RETURN_TO_SCALE': 'VRS',
+     'MAXIMIZE_SLACKS': 'yes'},
+    {'RESTRICTED_BASIS': 'yes', 'RETURN_TO_SCALE': 'VRS'},
+    {'WEAKLY_DISPOSAL_CATEGORIES': 'x2'},
+    {'NON_DISCRETIONARY_CATEGORIES': 'x2'},
+    {'NON_DISCRETIONARY_CATEGORIES': 'q1', 'ORIENTATION': 'output',
+     'RETURN_TO_SCALE': 'VRS'},
+    {'USE_SUPER_EFFICIENCY': 'yes', 'ORIENTATION': 'output'},
+    {'ABS_WEIGHT_RESTRICTIONS': 'x1 >= 0.01'},
+    {'ABS_WEIGHT_RESTRICTIONS': 'x1 >= 0.01', 'DEA_FORM': 'multi'}])
+def test_peel_the_onion_incrementally(data, extra_params):
+    model = factory.create_model(_create_params(**extra_params), data)
+    assert can_peel_incrementally(model)
+    solution, ranks, state = peel_the_onion_incrementally(model)
+    assert data.DMU_codes == set(data.DMU_codes_in_added_order)
+    expected_solution, expected_ranks, expected_state = (
+        peel_the_onion_by_rerunning(model))
+    assert state and expected_state
+    assert max(ranks.values()) > 3
+    assert ranks == expected_ranks
+    for dmu_code in data.DMU_codes:
+        assert solution.get_efficiency_score(dmu_code) == pytest.approx(
+            expected_solution.get_efficiency_score(dmu_code))
+    if 'MAXIMIZE_SLACKS' in extra_params:
+        assert model.second_solution is not None
+        assert len(model.second_solution.lp_status) == len(data.DMU_codes)
+
+
+def test_peel_the_onion_incrementally_restores_lp(data):
+    model = factory.create_model(_create_params(), data)
+    peel_the_onion_incrementally(model)
+    lambda_variables = [variable for dmu_code, variable
+                        in model._variables.items()
+                        if dmu_code in data.DMU_codes]
+    assert 0 < len(lambda_variables) < len(data.DMU_codes)
+    for variable in lambda_variables:
+        assert variable.upBound is None
+    model = factory.create_model(_create_params(DEA_FORM='multi'), data)
+    peel_the_onion_incrementally(model)
+    assert not model._excluded_constraints
+    assert data.DMU_codes == set(data.DMU_codes_in_added_order)
+
+
+@pytest.mark.parametrize('extra_params', [
+    {'CATEGORICAL_CATEGORY': 'group'}, {'FRONTIER_FIRST': 'yes'},
+    {'DOMINANCE_FILTER': 'yes'}])
+def test_peel_the_onion_with_rerunning(data, extra_params):
+    model = factory.create_model(_create_params(**extra_params), data)
+    assert not can_peel_incrementally(model)
+    solution, ranks, state = peel_the_onion_method(model)
+    expected_model = factory.create_model(_create_params(), data)
+    expected_solution, expected_ranks, expected_state = (
+        peel_the_onion_incrementally(expected_model))
+    assert state
+    if 'CATEGORICAL_CATEGORY' not in extra_params:
+        assert ranks == expected_ranks
+
+
+def test_peel_the_onion_incrementally_with_infeasible_lp(data):
+    # super efficiency model with VRS has infeasible linear programs
+    params = _create_params(USE_SUPER_EFFICIENCY='yes', RETURN_TO_SCALE='VRS')
+    model = factory.create_model(params, data)
+    solution, ranks, state = peel_the_onion_incrementally(model)
+    expected_solution, expected_ranks, expected_state = (
+        peel_the_onion_by_rerunning(factory.create_model(params, data)))
+    assert not state and not expected_state
+    assert set(solution.lp_status.keys()) == data.DMU_codes
+    assert ranks == expected_ranks
+    assert 1 in ranks.values()
+    assert data.DMU_codes == set(data.DMU_codes_in_added_order)
+
+
+@pytest.mark.parametrize('extra_params', [
+    {}, {'USE_SUPER_EFFICIENCY': 'yes'},
+    {'USE_SUPER_EFFICIENCY': 'yes', 'ORIENTATION': 'output'}])
+def test_peel_the_onion_incrementally_last_dmu(extra_params):
+    # every rank has one DMU, the last one is solved alone
+    data = InputData()
+    for count, (x1, q1) in enumerate([(1, 4), (2, 5), (3, 3), (4, 2),
+                                       (5, 1)]):
+        data.add_coefficient('D{0}'.format(count), 'x1', x1)
+        data.add_coefficient('D{0}'.format(count), 'q1', q1)
+    data.add_input_category('x1')
+    data.add_output_category('q1')
+    params = _create_params(INPUT_CATEGORIES='x1', OUTPUT_CATEGORIES='q1',
+                            **extra_params)
+    model = factory.create_model(params, data)
+    solution, ranks, state = peel_the_onion_incrementally(model)
+    expected_solution, expected_ranks, expected_state = (
+        peel_the_onion_by_rerunning(factory.create_model(params, data)))
+    assert state and expected_state
+    assert ranks == expected_ranks
+    assert sorted(ranks.values()) == [1, 2, 3, 4, 5]
+    assert len(data.DMU_codes) == 5
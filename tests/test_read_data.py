@@ -0,0 +1,97 @@
+import openpyxl
+import pytest
+
+from pyDEA.core.data_processing.read_data import read_data, CSVReader
+from pyDEA.core.data_processing.read_data import XLSXReader
+from pyDEA.core.data_processing.read_data import convert_to_dictionary
+from pyDEA.core.data_processing.read_data import validate_data
+
+
+@pytest.fixture
+def file_name(tmpdir):
+    # write-only workbooks do not store dimensions of sheets
+    book = openpyxl.Workbook(write_only=True)
+    sheet = book.create_sheet('first')
+    sheet.append([None])
+    sheet.append([None, 'DMU', 'x1', 'x2', 'q1'])
+    sheet.append([None, 'A', 1, 2.5, 3])
+    sheet.append([None, 'B', 4, ' 5 '])
+    sheet.append([])
+    sheet.append([None, 'C', 7, 8, 9])
+    book.create_sheet('second').append(['x1', 'q1'])
+    file_name = str(tmpdir.join('data.xlsx'))
+    book.save(file_name)
+    return file_name
+
+
+def test_read_data_from_xlsx(file_name):
+    categories, coefficients, dmu_name, sheet_name = read_data(file_name)
+    assert categories == ['x1', 'x2', 'q1']
+    assert coefficients == [['A', 1, 2.5, 3], ['B', 4, 5, ''],
+                            ['C', 7, 8, 9]]
+    assert dmu_name == 'DMU'
+    assert sheet_name == 'first'
+
+
+def test_xlsx_reader_streams_rows(file_name):
+    reader = XLSXReader()
+    reader.open_file(file_name, 'second')
+    rows = reader.get_rows()
+    assert not isinstance(rows, list)
+    assert [reader.get_cell_content(cell) for cell in next(rows)] == [
+        'x1', 'q1']
+    assert reader.get_cell_value(0, 1) == 'q1'
+    assert reader.get_sheet_name() == 'second'
+    reader.close_file()
+    assert reader.book is None
+
+
+def _write_csv(tmpdir, text):
+    file_name = str(tmpdir.join('data.csv'))
+    with open(file_name, 'w') as f:
+        f.write(text)
+    return file_name
+
+
+def test_read_csv_table(tmpdir):
+    file_name = _write_csv(tmpdir, '\n,DMU,x1, q1\n,A,1,2.5\n, B ,3,4\n\n')
+    reader = CSVReader()
+    reader.open_file(file_name, '')
+    assert reader.rows == []
+    assert reader.values.tolist() == [[1, 2.5], [3, 4]]
+    assert reader.get_cell_value(1, 3) == ' q1'
+    assert reader.get_cell_value(3, 1) == ' B '
+    assert reader.get_cell_value(3, 2) == '3.0'
+    assert reader.get_cell_value(3, 0) == ''
+    assert reader.get_cell_value(7, 0) == ''
+    reader.close_file()
+    expected = (['x1', 'q1'], [['A', 1, 2.5], ['B', 3, 4]], 'DMU', '')
+    assert read_data(file_name) == expected
+    # the same file is parsed cell by cell if it is not a table
+    with open(file_name, 'a') as f:
+        f.write(',C,5,6\n')
+    categories, coefficients, dmu_name, sheet_name = read_data(file_name)
+    assert coefficients == expected[1] + [['C', 5, 6]]
+
+
+@pytest.mark.parametrize('text', [
+    'DMU,x1,q1\nA,1,2\nB,3,not a number\n',
+    'DMU,x1,q1\nA,1,2\nB,3\n',
+    'DMU,x1,\nA,1,2\n',
+    'DMU,x1,q1\n'])
+def test_read_csv_that_is_not_table(tmpdir, text):
+    file_name = _write_csv(tmpdir, text)
+    reader = CSVReader()
+    reader.open_file(file_name, '')
+    assert reader.values is None
+    assert reader.get_table() is None
+    assert reader.get_rows()[0][:2] == ['DMU', 'x1']
+    reader.close_file()
+
+
+def test_read_csv_with_short_row(tmpdir):
+    file_name = _write_csv(tmpdir, 'DMU,x1,q1\nA,1,2\nB,3\n')
+    categories, coefficients, dmu_name, sheet_name = read_data(file_name)
+    assert coefficients == [['A', 1, 2], ['B', 3]]
+    coefficients, has_same_dmus = convert_to_dictionary(coefficients)
+    assert not validate_data(categories, coefficients)
@@ -0,0 +1,59 @@
+import functools
+
+import pytest
+
+from pyDEA.core.models.restricted_basis_model import RestrictedBasisModel
+import pyDEA.core.utils.model_factory as factory
+
+from tests.utils_for_tests import create_params
+from tests.utils_for_tests import create_random_data
+
+
+@pytest.fixture
+def data(clean_up):
+    return create_random_data(5, 40, 'level', 2, ['x1', 'x2'], ['q1', 'q2'])
+
+
+_create_params = functools.partial(create_params, RETURN_TO_SCALE='CRS')
+
+
+def _get_restricted_basis_model(model):
+    while not isinstance(model, RestrictedBasisModel):
+        model = model.__dict__['model']
+    return model
+
+
+@pytest.mark.parametrize('extra_params', [
+    {}, {'RETURN_TO_SCALE': 'VRS'}, {'ORIENTATION': 'output'},
+    {'RETURN_TO_SCALE': 'VRS', 'ORIENTATION': 'output'},
+    {'NON_DISCRETIONARY_CATEGORIES': 'x2'},
+    {'WEAKLY_DISPOSAL_CATEGORIES': 'q1'},
+    {'CATEGORICAL_CATEGORY': 'level'}, {'FRONTIER_FIRST': 'yes'}])
+@pytest.mark.parametrize('lp_engine', ['pulp', 'matrix'])
+def test_restricted_basis_model(data, extra_params, lp_engine):
+    solution = factory.create_model(_create_params(
+        LP_ENGINE=lp_engine, **extra_params), data).run()
+    model = factory.create_model(_create_params(
+        RESTRICTED_BASIS='yes', LP_ENGINE=lp_engine, **extra_params), data)
+    _get_restricted_basis_model(model).columns_per_iteration = 2
+    restricted_solution = model.run()
+    for dmu_code in data.DMU_codes:
+        assert (restricted_solution.lp_status[dmu_code] ==
+                solution.lp_status[dmu_code])
+        assert restricted_solution.get_efficiency_score(
+            dmu_code) == pytest.approx(solution.get_efficiency_score(
+                dmu_code))
+    in_lp = _get_restricted_basis_model(model)._in_lp
+    assert in_lp.sum() < len(in_lp)
+
+
+@pytest.mark.parametrize('extra_params', [
+    {'DEA_FORM': 'multi'}, {'USE_SUPER_EFFICIENCY': 'yes'},
+    {'MAXIMIZE_SLACKS': 'yes'},
+    {'ABS_WEIGHT_RESTRICTIONS': 'x1 >= 0.1'}])
+def test_restricted_basis_not_supported(data, extra_params):
+    with pytest.raises(ValueError):
+        factory.create_model(_create_params(RESTRICTED_BASIS='yes',
+                                            **extra_params), data)
+    with pytest.raises(ValueError):
+        RestrictedBasisModel(None, 0)
@@ -0,0 +1,66 @@
+import pickle
+
+import pytest
+
+from pyDEA.core.data_processing.input_data import InputData
+import pyDEA.core.data_processing.shared_input_data as shared_input_data
+from pyDEA.core.data_processing.shared_input_data import SharedInputData
+from pyDEA.core.data_processing.shared_input_data import attach_input_data
+
+
+@pytest.fixture
+def data():
+    data = InputData()
+    data.add_coefficient('A', 'x', 2)
+    data.add_coefficient('A', 'y', 1.5)
+    data.add_coefficient('B', 'x', 3)
+    data.add_coefficient('B', 'y', 0)
+    data.add_coefficient('C', 'x', 4)
+    data.add_input_category('x')
+    data.add_output_category('y')
+    return data
+
+
+def _check_attached_data(data, handle):
+    # handle is sent to worker processes
+    attached_data, block = attach_input_data(pickle.loads(pickle.dumps(
+        handle)))
+    assert attached_data.DMU_codes == data.DMU_codes
+    assert attached_data.input_categories == data.input_categories
+    assert attached_data.output_categories == data.output_categories
+    assert (attached_data.DMU_code_to_user_name ==
+            data.DMU_code_to_user_name)
+    coefficients = attached_data.coefficients
+    assert len(coefficients) == 5
+    assert dict(coefficients.items()) == data.coefficients
+    code_c = data._DMU_user_name_to_code['C']
+    assert (code_c, 'y') not in coefficients
+    with pytest.raises(KeyError):
+        coefficients[code_c, 'y']
+    with pytest.raises(KeyError):
+        coefficients[code_c, 'z']
+    with pytest.raises(ValueError):
+        coefficients.values[0, 0] = 10
+    return block
+
+
+def test_shared_input_data(data):
+    shared_data = SharedInputData(data)
+    assert shared_data.nbytes == 3 * 2 * 8
+    try:
+        block = _check_attached_data(data, shared_data.handle)
+        del block
+    finally:
+        shared_data.close()
+
+
+def test_shared_input_data_in_file(data, monkeypatch):
+    # memory-mapped file is used if shared memory is not available
+    monkeypatch.setattr(shared_input_data, 'shared_memory', None)
+    shared_data = SharedInputData(data)
+    file_name = shared_data.handle['file_name']
+    block = _check_attached_data(data, shared_data.handle)
+    del block
+    shared_data.close()
+    with pytest.raises(OSError):
+        open(file_name)
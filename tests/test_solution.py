@@ -3,6 +3,7 @@ from pulp import LpStatusOptimal
 
 from pyDEA.core.data_processing.solution import Solution, SolutionWithVRS, SolutionWithSuperEfficiency
 from pyDEA.core.data_processing.input_data import InputData
+from pyDEA.core.data_processing.write_data import create_sheet_peer_count
 
 from tests.test_input_data import data
 
@@ -149,3 +150,81 @@ def test_solution_with_super_efficiency(data):
     with pytest.raises(ValueError) as excinfo:
         s.add_efficiency_score('dmu_1', -2)
     assert str(excinfo.value) == 'Efficiency score must be >= 0'
+
+
+def test_solution_add_lp_iterations(data):
+    s = Solution(data)
+    assert s.get_total_lp_iterations() is None
+    s.add_lp_iterations('dmu_1', 3)
+    s.add_lp_iterations('dmu_1', 2)
+    s.add_lp_iterations('dmu_4', 1)
+    assert s.lp_iterations['dmu_1'] == 5
+    assert s.get_total_lp_iterations() == 6
+    with pytest.raises(ValueError) as excinfo:
+        s.add_lp_iterations('dmu_2', 1)
+    assert str(excinfo.value) == 'DMU code dmu_2 does not exist'
+
+
+def test_solution_efficient_dmus_and_peers(data):
+    s = SolutionWithVRS(Solution(data))
+    s.add_lp_status('dmu_1', LpStatusOptimal)
+    s.add_lp_status('dmu_4', LpStatusOptimal)
+    s.add_efficiency_score('dmu_1', 0.5)
+    s.add_efficiency_score('dmu_4', 0.9999999)
+    s.add_lambda_variables('dmu_1', {'dmu_1': 0, 'dmu_4': 1.5})
+    s.add_lambda_variables('dmu_4', {'dmu_4': 1})
+    assert s.get_efficient_dmus() == {'dmu_4'}
+    assert s.get_efficient_dmus() is s.get_efficient_dmus()
+    assert s.get_peers('dmu_1') == ['dmu_4']
+    assert s.get_peers('dmu_4') == ['dmu_4']
+    # cache is cleared when results change
+    s.add_efficiency_score('dmu_1', 1)
+    assert s.get_efficient_dmus() == {'dmu_1', 'dmu_4'}
+    s.add_lp_status('dmu_4', 0)
+    assert s.get_efficient_dmus() == {'dmu_1'}
+    s.add_lambda_variables('dmu_1', {'dmu_1': 1})
+    assert s.get_peers('dmu_1') == ['dmu_1']
+    results = s.export_results('dmu_1')
+    results['lambda_variables'] = {'dmu_4': 2}
+    s.import_results('dmu_1', results)
+    assert s.get_peers('dmu_1') == ['dmu_4']
+    with pytest.raises(KeyError):
+        Solution(data).get_peers('dmu_1')
+
+
+def test_solution_with_super_efficiency_efficient_dmus(data):
+    s = SolutionWithSuperEfficiency(data)
+    s.add_lp_status('dmu_1', LpStatusOptimal)
+    s.add_lp_status('dmu_4', LpStatusOptimal)
+    s.add_efficiency_score('dmu_1', 1.2)
+    s.add_efficiency_score('dmu_4', 0.9999999)
+    assert s.get_efficient_dmus() == {'dmu_1'}
+
+
+def test_create_sheet_peer_count(data):
+    cells = dict()
+
+    class WorkSheet(object):
+        name = ''
+
+        def write(self, row_index, column_index, value):
+            cells[row_index, column_index] = value
+
+    data.add_coefficient('dmu3', 'x1', 1)
+    s = Solution(data)
+    s.add_lp_status('dmu_1', LpStatusOptimal)
+    s.add_lp_status('dmu_4', LpStatusOptimal)
+    s.add_lp_status(data._DMU_user_name_to_code['dmu3'], 0)
+    s.add_efficiency_score('dmu_1', 0.5)
+    s.add_efficiency_score('dmu_4', 1)
+    s.add_lambda_variables('dmu_1', {'dmu_4': 1.5})
+    s.add_lambda_variables('dmu_4', {'dmu_4': 1})
+    row_index = create_sheet_peer_count(WorkSheet(), s, 0, 'params')
+    assert row_index == 6
+    assert cells[1, 0] == 'Efficient Peers'
+    assert cells[1, 1] == 'dmu2'
+    assert (1, 2) not in cells
+    assert [cells[3, 0], cells[3, 1]] == ['dmu1', 1.5]
+    assert [cells[4, 0], cells[4, 1]] == ['dmu2', 1]
+    assert [cells[5, 0], cells[5, 1]] == ['dmu3', 'Not Solved']
+    assert [cells[6, 0], cells[6, 1]] == ['Peer count', 2]
@@ -0,0 +1,173 @@
+import pickle
+
+import numpy
+import pulp
+import pytest
+
+from pyDEA.core.models.matrix_lp import MatrixLpProblem, MatrixLpVariable
+from pyDEA.core.models.solver_backends import ScipyBackend, HighsBackend
+from pyDEA.core.models.solver_backends import get_default_backend
+from pyDEA.core.models.solver_backends import get_row_bounds
+
+highspy = pytest.importorskip('highspy')
+
+
+@pytest.fixture
+def problem():
+    ''' min x + y + 2z s.t. x + 2y + z >= 4 (block), 3x + y >= 3 (block),
+        x, y >= 0, 0 <= z <= 10.
+    '''
+    x = MatrixLpVariable('x', 0)
+    y = MatrixLpVariable('y', 0)
+    z = pulp.LpVariable('z', 0, 10)
+    problem = MatrixLpProblem('test', pulp.LpMinimize)
+    problem.set_block_variables([x, y])
+    first = problem.add_block_constraint('first', numpy.array([1, 2]),
+                                         pulp.LpConstraintGE)
+    first.addterm(z, 1)
+    first.changeRHS(4)
+    second = problem.add_block_constraint('second', numpy.array([3, 1]),
+                                          pulp.LpConstraintGE)
+    second.changeRHS(3)
+    problem += x + y + 2 * z, 'objective'
+    return problem, x, y, z
+
+
+def _solve_with_both(lp_problem):
+    copy = lp_problem.deepcopy()
+    assert lp_problem.solve(HighsBackend()) == pulp.LpStatusOptimal
+    assert copy.solve(ScipyBackend()) == pulp.LpStatusOptimal
+    assert pulp.value(lp_problem.objective) == pytest.approx(
+        pulp.value(copy.objective))
+    for name, constraint in lp_problem.constraints.items():
+        assert constraint.pi == pytest.approx(copy.constraints[name].pi)
+    return pulp.value(lp_problem.objective)
+
+
+def test_get_default_backend():
+    assert isinstance(get_default_backend(), HighsBackend)
+
+
+def test_get_row_bounds():
+    assert get_row_bounds(pulp.LpConstraintGE, 2) == (2, numpy.inf)
+    assert get_row_bounds(pulp.LpConstraintLE, 2) == (-numpy.inf, 2)
+    assert get_row_bounds(pulp.LpConstraintEQ, 2) == (2, 2)
+
+
+def test_highs_model_is_reused(problem):
+    lp_problem, x, y, z = problem
+    assert _solve_with_both(lp_problem) == pytest.approx(2.2)
+    model = lp_problem.solver_model
+    assert not lp_problem.changed_rows
+
+    lp_problem.constraints['second'][x] = 1
+    lp_problem.constraints['second'].changeRHS(4)
+    assert _solve_with_both(lp_problem) == pytest.approx(4)
+    assert lp_problem.solver_model is model
+
+    lp_problem.constraints['first'].sense = pulp.LpConstraintEQ
+    lp_problem.constraints['first'][z] = 0.5
+    lp_problem.constraints['first'].changeRHS(8)
+    lp_problem.sense = pulp.LpMaximize
+    lp_problem.objective = pulp.LpAffineExpression(z)
+    assert _solve_with_both(lp_problem) == pytest.approx(8)
+    assert lp_problem.solver_model is model
+
+
+def test_highs_model_bounds(problem):
+    lp_problem, x, y, z = problem
+    lp_problem.solve(HighsBackend())
+    model = lp_problem.solver_model
+    x.upBound = 0
+    assert list(lp_problem.changed_bounds) == [x]
+    assert _solve_with_both(lp_problem) == pytest.approx(3)
+    assert lp_problem.block_values[0] == pytest.approx(0)
+    z.lowBound = 1
+    assert _solve_with_both(lp_problem) == pytest.approx(5)
+    assert lp_problem.solver_model is model
+
+
+def test_highs_model_is_reloaded(problem):
+    lp_problem, x, y, z = problem
+    lp_problem.solve(HighsBackend())
+    model = lp_problem.solver_model
+    lp_problem += (x + y + z >= 10, 'total')
+    assert _solve_with_both(lp_problem) == pytest.approx(10)
+    assert lp_problem.solver_model is not model
+
+    model = lp_problem.solver_model
+    w = pulp.LpVariable('w', 0)
+    lp_problem.constraints['total'][w] = 1
+    lp_problem.objective = x + y + 2 * z + 0.5 * w
+    assert _solve_with_both(lp_problem) == pytest.approx(6.1)
+    assert lp_problem.solver_model is not model
+
+
+def test_highs_model_block_variables_added(problem):
+    lp_problem, x, y, z = problem
+    lp_problem.solve(HighsBackend())
+    model = lp_problem.solver_model
+    w = MatrixLpVariable('w', 0)
+    lp_problem.add_block_variables([w], numpy.array([[4], [6]]))
+    assert lp_problem.added_block_variables == [w]
+    assert lp_problem.get_block_variables() == [x, y, w]
+    lp_problem.objective = x + y + 2 * z + w
+    assert _solve_with_both(lp_problem) == pytest.approx(1)
+    assert lp_problem.solver_model is model
+    assert lp_problem.block_values == pytest.approx([0, 0, 1])
+    assert z.varValue == pytest.approx(0)
+
+    lp_problem += (x + y + w >= 2, 'total')
+    v = MatrixLpVariable('v', 0)
+    lp_problem.solve(HighsBackend())
+    model = lp_problem.solver_model
+    lp_problem.add_block_variables([v], numpy.array([[3], [3]]))
+    lp_problem.constraints['total'][v] = 1
+    lp_problem.objective = x + y + 2 * z + w + 0.5 * v
+    assert _solve_with_both(lp_problem) == pytest.approx(1)
+    assert lp_problem.solver_model is model
+    assert lp_problem.block_values == pytest.approx([0, 0, 0, 2])
+
+
+def test_highs_infeasible(problem):
+    lp_problem, x, y, z = problem
+    lp_problem.solve(HighsBackend())
+    lp_problem += (x + y + z <= 1, 'small')
+    lp_problem += (z >= 2, 'big')
+    assert lp_problem.solve(HighsBackend()) == pulp.LpStatusInfeasible
+    assert lp_problem.block_values is None
+    assert lp_problem.constraints['first'].pi == 0
+
+
+def test_highs_warm_start(problem):
+    lp_problem, x, y, z = problem
+    lp_problem.solve(HighsBackend())
+    assert lp_problem.iterations > 0
+    lp_problem.solve(HighsBackend())
+    assert lp_problem.iterations == 0
+    lp_problem.solve(HighsBackend(warm_start=False))
+    assert lp_problem.iterations > 0
+
+    # optimal basis is kept if redundant constraint is added
+    lp_problem.solve(HighsBackend())
+    lp_problem += (x + y + z >= 0, 'redundant')
+    assert lp_problem.solve(HighsBackend()) == pulp.LpStatusOptimal
+    assert lp_problem.iterations == 0
+    assert pulp.value(lp_problem.objective) == pytest.approx(2.2)
+
+
+def test_scipy_iterations(problem):
+    lp_problem, x, y, z = problem
+    lp_problem.solve(ScipyBackend())
+    assert lp_problem.iterations > 0
+
+
+def test_pickled_problem(problem):
+    lp_problem, x, y, z = problem
+    lp_problem.solve(HighsBackend())
+    lp_problem = pickle.loads(pickle.dumps(lp_problem))
+    assert lp_problem.solver_model is None
+    x = lp_problem.get_block_variables()[0]
+    x.upBound = 0
+    assert _solve_with_both(lp_problem) == pytest.approx(3)
+    assert lp_problem.block_values[0] == pytest.approx(0)
@@ -0,0 +1,155 @@
+import functools
+
+import pulp
+import pytest
+
+from pyDEA.core.models.solver_backends import HighsBackend, ScipyBackend
+from pyDEA.core.models.solver_registry import CBC_ITERATIONS, GLPK_ITERATIONS
+from pyDEA.core.models.solver_registry import CbcSolver, GlpkSolver
+from pyDEA.core.models.solver_registry import HighsSolver, ScipySolver
+from pyDEA.core.models.solver_registry import create_solver, read_iterations
+from pyDEA.core.models.solver_registry import read_glpk_duals
+import pyDEA.core.utils.model_factory as factory
+
+from tests.utils_for_tests import create_params
+from tests.utils_for_tests import create_random_data
+
+
+@pytest.fixture
+def data(clean_up):
+    return create_random_data(11, 25)
+
+
+_create_params = functools.partial(create_params, ORIENTATION='output')
+
+
+def _create_lp():
+    lp_model = pulp.LpProblem('test', pulp.LpMaximize)
+    x = pulp.LpVariable('x', 0)
+    y = pulp.LpVariable('y', 0)
+    lp_model += 3 * x + 2 * y
+    lp_model += x + y <= 4, 'c1'
+    lp_model += x + 3 * y <= 6, 'c2'
+    lp_model += x <= 3, 'c3'
+    return lp_model
+
+
+def test_create_solver():
+    assert isinstance(create_solver('cbc'), CbcSolver)
+    assert isinstance(create_solver('highs'), HighsSolver)
+    assert isinstance(create_solver('scipy', threads=2), ScipySolver)
+    backend = create_solver('highs', True, threads=1, tolerance=1e-8,
+                            time_limit=10)
+    assert isinstance(backend, HighsBackend)
+    assert backend.threads == 1
+    assert backend.tolerance == 1e-8
+    assert backend.time_limit == 10
+    assert isinstance(create_solver('scipy', True), ScipyBackend)
+    with pytest.raises(ValueError):
+        create_solver('cbc', True)
+    with pytest.raises(ValueError):
+        create_solver('glpk', True)
+    with pytest.raises(ValueError):
+        create_solver('cplex')
+
+
+@pytest.mark.parametrize('name', ['cbc', 'highs', 'scipy'])
+def test_pulp_solvers(name):
+    lp_model = _create_lp()
+    solver = create_solver(name, tolerance=1e-7, time_limit=5)
+    assert lp_model.solve(solver) == pulp.LpStatusOptimal
+    assert pulp.value(lp_model.objective) == pytest.approx(11)
+    assert lp_model.constraints['c2'].pi == pytest.approx(2 / 3.0)
+    assert lp_model.constraints['c3'].pi == pytest.approx(7 / 3.0)
+    assert lp_model.constraints['c1'].pi == pytest.approx(0)
+    assert lp_model.iterations >= 0
+    lp_model += pulp.lpSum(lp_model.variables()) >= 10, 'c4'
+    assert lp_model.solve(solver) == pulp.LpStatusInfeasible
+
+
+@pytest.mark.skipif(not GlpkSolver().available(),
+                    reason='glpsol is not installed')
+def test_glpk_solver():
+    lp_model = _create_lp()
+    assert lp_model.solve(create_solver('glpk')) == pulp.LpStatusOptimal
+    assert pulp.value(lp_model.objective) == pytest.approx(11)
+    assert lp_model.constraints['c2'].pi == pytest.approx(2 / 3.0, 1e-5)
+    assert lp_model.iterations is not None
+
+
+def test_read_iterations(tmpdir):
+    log_file = tmpdir.join('cbc.log')
+    log_file.write('Optimal - objective value 11\n'
+                   'Optimal objective 11 - 3 iterations time 0.002\n')
+    assert read_iterations(str(log_file), CBC_ITERATIONS) == 3
+    log_file.write('      0: obj =   0.000000000e+00 inf =   0.000e+00 (2)\n'
+                   '*     2: obj =   1.100000000e+01 inf =   0.000e+00 (0)\n'
+                   'OPTIMAL LP SOLUTION FOUND\n')
+    assert read_iterations(str(log_file), GLPK_ITERATIONS) == 2
+    assert read_iterations(str(tmpdir.join('missing.log')),
+                           CBC_ITERATIONS) is None
+
+
+def test_read_glpk_duals(tmpdir):
+    # rows are printed in the same format as glp_print_sol does
+    rows = ['%6d %-12s %s %13.6g %13s %13.6g %13s' % (
+                1, 'c1', 'B ', 3, '', 4, ''),
+            '%6d %-12s %s %13.6g %13s %13.6g %13.6g ' % (
+                2, 'c2', 'NU', 6, '', 6, 0.666667),
+            '%6d %s\n%20s%s %13.6g %13s %13.6g %13s' % (
+                3, 'long_constraint_name', '', 'NU', 3, '', 3, '< eps')]
+    solution_file = tmpdir.join('glpk.sol')
+    solution_file.write('\n'.join([
+        'Problem:    test', 'Rows:       3', 'Columns:    2',
+        'Non-zeros:  5', 'Status:     OPTIMAL',
+        'Objective:  OBJ = 11 (MAXimum)', '',
+        '   No.   Row name   St   Activity     Lower bound   Upper bound'
+        '    Marginal',
+        '------ ------------ -- ------------- ------------- -------------'
+        ' -------------'] + rows + ['',
+        '   No. Column name  St   Activity     Lower bound   Upper bound'
+        '    Marginal']))
+    assert read_glpk_duals(str(solution_file)) == {
+        'c1': 0, 'c2': 0.666667, 'long_constraint_name': 0}
+
+
+def test_get_solver():
+    assert factory.get_solver(_create_params(), False) is None
+    assert isinstance(factory.get_solver(_create_params(
+        SOLVER_THREADS='2'), False), CbcSolver)
+    assert isinstance(factory.get_solver(_create_params(
+        SOLVER_TIME_LIMIT='1.5'), True), HighsBackend)
+    for name, value in [('SOLVER_THREADS', '0'), ('SOLVER_THREADS', 'a'),
+                        ('SOLVER_TOLERANCE', '-1e-6'),
+                        ('SOLVER_TIME_LIMIT', 'never'), ('SOLVER', 'cplex')]:
+        with pytest.raises(ValueError):
+            factory.get_solver(_create_params(**{name: value}), False)
+
+
+@pytest.mark.parametrize('extra_params', [
+    {'SOLVER': 'cbc'}, {'SOLVER': 'highs', 'SOLVER_THREADS': '1'},
+    {'SOLVER': 'scipy', 'SOLVER_TOLERANCE': '1e-8'},
+    {'SOLVER': 'highs', 'DEA_FORM': 'multi'},
+    {'SOLVER': 'highs', 'MAXIMIZE_SLACKS': 'yes'},
+    {'SOLVER': 'highs', 'RESTRICTED_BASIS': 'yes'},
+    {'SOLVER': 'scipy', 'LP_ENGINE': 'matrix'},
+    {'SOLVER': 'highs', 'LP_ENGINE': 'matrix', 'SOLVER_TIME_LIMIT': '10'}])
+def test_models_with_solvers(data, extra_params):
+    params = _create_params(**extra_params)
+    factory.add_input_and_output_categories(params, data)
+    expected_solution = factory.create_model(_create_params(), data).run()
+    solution = factory.create_model(params, data).run()
+    for dmu_code in data.DMU_codes:
+        assert solution.lp_status[dmu_code] == pulp.LpStatusOptimal
+        assert solution.get_efficiency_score(dmu_code) == pytest.approx(
+            expected_solution.get_efficiency_score(dmu_code), abs=1e-6)
+        assert solution.lp_times[dmu_code] > 0
+        assert solution.lp_iterations[dmu_code] >= 0
+    assert solution.get_total_lp_time() == pytest.approx(
+        sum(solution.lp_times.values()))
+    dmu_code = data._DMU_user_name_to_code['D3']
+    results = solution.export_results(dmu_code)
+    assert results['lp_time'] == solution.lp_times[dmu_code]
+    new_solution = factory.create_model(params, data)._create_solution()
+    new_solution.import_results(dmu_code, results)
+    assert new_solution.lp_times == {dmu_code: results['lp_time']}
@@ -0,0 +1,102 @@
+import os
+import sqlite3
+
+import numpy
+import pytest
+
+from pyDEA.core.data_processing.parameters import Parameters
+from pyDEA.core.data_processing.read_data import read_data
+from pyDEA.core.data_processing.sqlite_reader import SQLiteReader
+from pyDEA.core.data_processing.sqlite_reader import get_table_names
+from pyDEA.core.utils.run_routine import RunMethodTerminal
+
+
+@pytest.fixture
+def file_name(tmpdir):
+    random_state = numpy.random.RandomState(9)
+    file_name = str(tmpdir.join('data.db'))
+    connection = sqlite3.connect(file_name)
+    connection.execute('CREATE TABLE dmus (name TEXT, x1 REAL, q1 INTEGER,'
+                       ' region TEXT)')
+    connection.executemany('INSERT INTO dmus VALUES (?, ?, ?, ?)', [
+        ('D{0}'.format(count), value, count + 1, 'north' if count % 2
+         else 'south') for count, value in
+        enumerate(random_state.uniform(1, 10, 25))])
+    connection.execute('CREATE TABLE "other ""table""" (name, x1)')
+    connection.execute('INSERT INTO "other ""table""" VALUES (1, NULL)')
+    connection.execute("INSERT INTO \"other \"\"table\"\"\" VALUES (2, 'a')")
+    connection.commit()
+    connection.close()
+    return file_name
+
+
+def test_get_table_names(file_name, tmpdir):
+    assert get_table_names(file_name) == ['dmus', 'other "table"']
+    with pytest.raises(ValueError):
+        get_table_names(str(tmpdir.join('missing.db')))
+    # database is opened in read-only mode and is never created
+    assert not os.path.exists(str(tmpdir.join('missing.db')))
+
+
+def test_read_table_in_batches(file_name):
+    reader = SQLiteReader('SELECT name, x1, q1 FROM dmus ORDER BY q1')
+    reader.CHUNK_SIZE = 4
+    reader.open_file(file_name, '')
+    assert reader.header == ['name', 'x1', 'q1']
+    assert reader.values.shape == (25, 2)
+    assert reader.values[:, 1].tolist() == list(range(1, 26))
+    assert reader.dmu_names[-1] == 'D24'
+    assert reader.get_sheet_name() == ''
+    reader.close_file()
+    categories, coefficients, dmu_name, sheet_name = read_data(
+        file_name, query='SELECT name, x1, q1 FROM dmus')
+    assert categories == ['x1', 'q1']
+    assert coefficients[0] == ['D0', reader.values.item(0, 0), 1]
+    assert dmu_name == 'name'
+
+
+def test_read_table_that_is_not_numeric(file_name):
+    reader = SQLiteReader()
+    reader.CHUNK_SIZE = 4
+    reader.open_file(file_name, '')
+    assert reader.get_sheet_name() == 'dmus'
+    assert reader.values is None
+    assert reader.columns[2][:2] == ['south', 'north']
+    assert reader.columns[1] == list(range(1, 26))
+    assert read_data(file_name, 'other "table"') == (
+        ['x1'], [[1, ''], [2, 'a']], 'name', 'other "table"')
+    # missing values of the first batch are empty cells too
+    reader = SQLiteReader('other "table"')
+    reader.CHUNK_SIZE = 1
+    reader.open_file(file_name, 'dmus')
+    assert reader.columns == [['', 'a']]
+
+
+def test_read_invalid_query(file_name):
+    with pytest.raises(ValueError):
+        read_data(file_name, query='SELECT * FROM missing')
+    with pytest.raises(ValueError):
+        read_data(file_name, query='DELETE FROM dmus')
+    with pytest.raises(ValueError):
+        read_data(file_name, query='PRAGMA user_version = 1')
+    assert len(read_data(file_name)[1]) == 25
+
+
+def test_runner_reads_query(file_name, tmpdir):
+    params = Parameters()
+    params.update_parameter('DATA_FILE', file_name)
+    params.update_parameter('DATA_QUERY', 'SELECT name, x1, q1 FROM dmus '
+                                          'WHERE region = "north"')
+    params.update_parameter('DATA_CACHE', str(tmpdir.join('cache')))
+    for count in range(2):
+        runner = RunMethodTerminal(params, '', 'csv')
+        categories = runner.get_categories()
+        coefficients, has_same_dmus = runner.get_coefficients()
+        assert categories == ['x1', 'q1']
+        assert len(coefficients) == 12
+        assert (runner.cached_data is not None) == (count == 1)
+        runner.construct_input_data(categories, coefficients)
+    params.update_parameter('DATA_QUERY', 'dmus')
+    runner = RunMethodTerminal(params, '', 'csv')
+    assert runner.get_categories() == ['x1', 'q1', 'region']
+    assert runner.cached_data is None
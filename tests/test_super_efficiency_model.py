@@ -0,0 +1,71 @@
+import functools
+
+import pytest
+
+from pyDEA.core.models.super_efficiency_model import SupperEfficiencyModel
+import pyDEA.core.utils.model_factory as factory
+
+from tests.utils_for_tests import create_data
+from tests.utils_for_tests import create_params
+
+
+@pytest.fixture
+def data(clean_up):
+    values = {'A': (2, 5, 1), 'B': (2, 4, 2), 'C': (6, 6, 3),
+              'D': (3, 2, 1), 'E': (6, 2, 2), 'F': (4, 9, 2),
+              'G': (5, 3, 2), 'H': (8, 8, 2), 'I': (3, 3, 2)}
+    return create_data(sorted(values.items()), ['x1', 'x2', 'q'],
+                       ['x1', 'x2'], ['q'])
+
+
+_create_params = functools.partial(
+    create_params, OUTPUT_CATEGORIES='q', RETURN_TO_SCALE='CRS',
+    USE_SUPER_EFFICIENCY='yes')
+
+
+def _solve_without_dmu(model, data):
+    ''' Solves linear program of every DMU with a linear program created
+        without this DMU.
+    '''
+    solution = model._create_solution()
+    for dmu_code in sorted(data.DMU_codes):
+        data.DMU_codes.remove(dmu_code)
+        model.model._create_lp()
+        data.DMU_codes.add(dmu_code)
+        model.model.run_for_one_DMU(dmu_code, solution)
+    return solution
+
+
+@pytest.mark.parametrize('extra_params', [
+    {}, {'RETURN_TO_SCALE': 'VRS'}, {'ORIENTATION': 'output'},
+    {'RETURN_TO_SCALE': 'VRS', 'ORIENTATION': 'output'},
+    {'LP_ENGINE': 'matrix'},
+    {'LP_ENGINE': 'matrix', 'RETURN_TO_SCALE': 'VRS'},
+    {'DEA_FORM': 'multi'},
+    {'DEA_FORM': 'multi', 'RETURN_TO_SCALE': 'VRS', 'ORIENTATION': 'output'},
+    {'NON_DISCRETIONARY_CATEGORIES': 'x2'}])
+def test_super_efficiency_model(data, extra_params):
+    model = factory.create_model(_create_params(**extra_params), data)
+    assert isinstance(model, SupperEfficiencyModel)
+    solution = model.run()
+    expected_solution = _solve_without_dmu(model, data)
+    assert len(data.DMU_codes) == 9
+    for dmu_code in data.DMU_codes:
+        assert (solution.lp_status[dmu_code] ==
+                expected_solution.lp_status[dmu_code])
+        if dmu_code in expected_solution.efficiency_scores:
+            assert solution.get_efficiency_score(
+                dmu_code) == pytest.approx(
+                    expected_solution.get_efficiency_score(dmu_code))
+            assert dmu_code not in solution.get_lambda_variables(dmu_code)
+
+
+def test_excluded_dmu_is_restored(data):
+    model = factory.create_model(_create_params(), data)
+    model.run()
+    for dmu_code in data.DMU_codes:
+        assert model._variables[dmu_code].upBound is None
+    model = factory.create_model(_create_params(DEA_FORM='multi'), data)
+    model.run()
+    assert len(model.lp_model.constraints) == len(data.DMU_codes) + 1
+    assert not model._excluded_constraints
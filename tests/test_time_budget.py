@@ -0,0 +1,179 @@
+import datetime
+import os
+import time
+
+import numpy
+import pulp
+import pytest
+
+from pyDEA.core.data_processing.solution import LP_STATUS_TIME_LIMIT
+from pyDEA.core.data_processing.solution import get_lp_status_name
+from pyDEA.core.data_processing.write_data import SheetWithParameters
+from pyDEA.core.models.solver_backends import create_highs
+from pyDEA.core.models.solver_backends import set_highs_time_limit
+from pyDEA.core.utils.model_builder import build_models
+from pyDEA.core.utils.run_routine import RunMethodTerminal
+from pyDEA.core.utils.time_budget import TimeBudget
+import pyDEA.core.utils.model_factory as factory
+
+from tests.utils_for_tests import create_params
+from tests.utils_for_tests import create_random_data
+
+
+class _WorkSheet(object):
+
+    def __init__(self):
+        self.name = ''
+        self.cells = dict()
+
+    def write(self, row_index, column_index, value):
+        self.cells[row_index, column_index] = value
+
+
+@pytest.fixture
+def data(clean_up):
+    return create_random_data(7, 20)
+
+
+def _create_model(data, **extra_params):
+    params = create_params(**extra_params)
+    factory.add_input_and_output_categories(params, data)
+    return factory.create_model(params, data)
+
+
+def test_time_budget():
+    assert TimeBudget().get_time_limit(5) is None
+    budget = TimeBudget(dmu_time_limit=2)
+    assert budget.deadline is None
+    assert budget.get_time_limit() == 2
+    assert budget.get_time_limit(0.5) == 1.5
+    budget = TimeBudget(dmu_time_limit=2, run_time_limit=1)
+    assert budget.deadline == pytest.approx(time.time() + 1, abs=0.5)
+    assert 0 < budget.get_time_limit() <= 1
+    assert budget.get_time_limit(1.5) == 0.5
+    budget.deadline = time.time() - 1
+    assert budget.get_time_limit() < 0
+
+
+def test_get_time_budget():
+    assert factory.get_time_budget(create_params()) is None
+    budget = factory.get_time_budget(create_params(DMU_TIME_LIMIT='0.5'))
+    assert budget.dmu_time_limit == 0.5
+    assert budget.deadline is None
+    budget = factory.get_time_budget(create_params(RUN_TIME_LIMIT='60'))
+    assert budget.dmu_time_limit is None
+    assert budget.deadline > time.time()
+    for name in ['DMU_TIME_LIMIT', 'RUN_TIME_LIMIT']:
+        for value in ['0', 'soon']:
+            with pytest.raises(ValueError):
+                factory.get_time_budget(create_params(**{name: value}))
+    assert factory.get_solver(create_params(DMU_TIME_LIMIT='1'),
+                              False) is not None
+
+
+def test_models_of_run_share_deadline(data):
+    models, all_params = build_models(
+        create_params(RUN_TIME_LIMIT='60', RETURN_TO_SCALE='both'), data)
+    assert len(models) == 2
+    assert models[0].time_budget is models[1].time_budget
+    models[0].time_budget.deadline = time.time() - 1
+    solution = models[1].run()
+    for dmu_code in data.DMU_codes:
+        assert solution.lp_status[dmu_code] == LP_STATUS_TIME_LIMIT
+    models, all_params = build_models(
+        create_params(RETURN_TO_SCALE='both'), data)
+    assert models[0].time_budget is None
+
+
+def test_run_both_returns_to_scale_after_deadline(clean_up, tmpdir):
+    params = create_params(DATA_FILE='tests/DEA_example2_data.xlsx',
+                           INPUT_CATEGORIES='I1; I2; I3',
+                           OUTPUT_CATEGORIES='O1; O2',
+                           RETURN_TO_SCALE='both', RUN_TIME_LIMIT='0.000001')
+    RunMethodTerminal(params, '', 'csv', str(tmpdir)).run(params)
+    assert os.listdir(str(tmpdir)) == ['DEA_example2_data_result']
+
+
+def test_get_lp_status_name():
+    assert get_lp_status_name(LP_STATUS_TIME_LIMIT) == 'Time limit'
+    assert get_lp_status_name(pulp.LpStatusOptimal) == 'Optimal'
+
+
+def _get_time_limit_option(highs):
+    value = highs.getOptionValue('time_limit')
+    # older highspy returns a pair of status and value
+    if isinstance(value, tuple):
+        value = value[1]
+    return value
+
+
+def test_set_highs_time_limit():
+    highs = create_highs(numpy.ones(2), numpy.ones((1, 2)),
+                         numpy.array([pulp.LpConstraintGE]),
+                         numpy.ones(1), numpy.zeros(2),
+                         numpy.full(2, numpy.inf), pulp.LpMinimize)
+    highs.run()
+    set_highs_time_limit(highs, 2)
+    assert _get_time_limit_option(highs) == pytest.approx(
+        highs.getRunTime() + 2)
+    set_highs_time_limit(highs, None)
+    assert _get_time_limit_option(highs) == numpy.inf
+
+
+@pytest.mark.parametrize('extra_params', [
+    {}, {'SOLVER': 'highs'}, {'LP_ENGINE': 'matrix'},
+    {'SOLVER': 'highs', 'MAXIMIZE_SLACKS': 'yes'},
+    {'SOLVER': 'highs', 'RESTRICTED_BASIS': 'yes'},
+    {'SOLVER': 'scipy', 'DEA_FORM': 'multi'}])
+def test_run_deadline(data, extra_params):
+    model = _create_model(data, RUN_TIME_LIMIT='60', **extra_params)
+    solution = model.run()
+    assert all(lp_status == pulp.LpStatusOptimal
+               for lp_status in solution.lp_status.values())
+    model = _create_model(data, RUN_TIME_LIMIT='60', **extra_params)
+    model.time_budget.deadline = time.time() - 1
+    solution = model.run()
+    assert solution.lp_times == dict()
+    for dmu_code in data.DMU_codes:
+        assert solution.lp_status[dmu_code] == LP_STATUS_TIME_LIMIT
+    work_sheet = _WorkSheet()
+    sheet = SheetWithParameters(create_params(), datetime.datetime.now(), 1)
+    row_index = sheet.create_sheet_parameters(work_sheet, solution, 0, '')
+    assert work_sheet.cells[row_index - 1, 0] == (
+        'Linear programs stopped by time limit:')
+    assert work_sheet.cells[row_index - 1, 1] == len(data.DMU_codes)
+
+
+@pytest.mark.parametrize('extra_params', [
+    {'SOLVER': 'highs'}, {'SOLVER': 'scipy'}, {'LP_ENGINE': 'matrix'},
+    {'SOLVER': 'highs', 'RESTRICTED_BASIS': 'yes'}])
+def test_dmu_time_limit(data, extra_params):
+    model = _create_model(data, DMU_TIME_LIMIT='1e-9', **extra_params)
+    solution = model.run()
+    for dmu_code in data.DMU_codes:
+        assert solution.lp_status[dmu_code] == LP_STATUS_TIME_LIMIT
+        assert solution.lp_times[dmu_code] > 0
+    # time limit of the solver is restored after every solve
+    assert model.solver.time_limit is None
+
+
+def test_dmu_time_limit_of_both_phases(data, monkeypatch):
+    model = _create_model(data, MAXIMIZE_SLACKS='yes', DMU_TIME_LIMIT='60')
+    first_phase = model.model.run_for_one_DMU
+
+    def slow_first_phase(dmu_code, model_solution):
+        first_phase(dmu_code, model_solution)
+        model_solution.add_lp_time(dmu_code, 60)
+
+    monkeypatch.setattr(model.model, 'run_for_one_DMU', slow_first_phase)
+    solution = model.run()
+    second_solution = model.second_solution
+    assert len(second_solution.skipped_lps) < len(data.DMU_codes)
+    for dmu_code in data.DMU_codes:
+        assert solution.lp_status[dmu_code] == pulp.LpStatusOptimal
+        if dmu_code in second_solution.skipped_lps:
+            assert second_solution.lp_status[dmu_code] == (
+                pulp.LpStatusOptimal)
+        else:
+            assert second_solution.lp_status[dmu_code] == (
+                LP_STATUS_TIME_LIMIT)
@@ -1,10 +1,13 @@
+import numpy
 from pulp import LpStatusOptimal
 import pytest
 
-from pyDEA.core.data_processing.read_data_from_xls import read_data
-from pyDEA.core.data_processing.read_data_from_xls import construct_input_data_instance
-from pyDEA.core.data_processing.read_data_from_xls import validate_data
-from pyDEA.core.data_processing.read_data_from_xls import convert_to_dictionary
+from pyDEA.core.data_processing.input_data import InputData
+from pyDEA.core.data_processing.parameters import Parameters
+from pyDEA.core.data_processing.read_data import read_data
+from pyDEA.core.data_processing.read_data import construct_input_data_instance
+from pyDEA.core.data_processing.read_data import validate_data
+from pyDEA.core.data_processing.read_data import convert_to_dictionary
 from pyDEA.core.utils.dea_utils import clean_up_pickled_files
 
 
@@ -211,3 +214,59 @@ def check_if_category_is_within_price_ratio_constraints(model_solution, bounds):
                     dual_value_denom = _get_proper_dual(
                         category_in_denom, model_solution, dmu_code)
                     assert dual_value - WEIGHT_RESTRICTION_TOLERANCE <= upper_bound * dual_value_denom
+
+
+def create_params(**extra_params):
+    ''' (**str) -> Parameters
+
+        Parameters of input-oriented VRS envelopment model with inputs
+        x1, x2 and outputs q1, q2, given parameters override them.
+    '''
+    params = Parameters()
+    params.update_parameter('INPUT_CATEGORIES', 'x1; x2')
+    params.update_parameter('OUTPUT_CATEGORIES', 'q1; q2')
+    params.update_parameter('DEA_FORM', 'env')
+    params.update_parameter('RETURN_TO_SCALE', 'VRS')
+    params.update_parameter('ORIENTATION', 'input')
+    params.update_parameter('MULTIPLIER_MODEL_TOLERANCE', '0')
+    for name, value in extra_params.items():
+        params.update_parameter(name, value)
+    return params
+
+
+def create_data(rows, categories, input_categories=(),
+                output_categories=()):
+    ''' (list of (str, list), list of str, list of str, list of str)
+        -> InputData
+
+        Every row contains DMU name and values of categories.
+    '''
+    data = InputData()
+    for dmu, values in rows:
+        for category, value in zip(categories, values):
+            data.add_coefficient(dmu, category, value)
+    for category in input_categories:
+        data.add_input_category(category)
+    for category in output_categories:
+        data.add_output_category(category)
+    return data
+
+
+def create_random_data(seed, nb_dmus, level_category=None, nb_levels=2,
+                       input_categories=(), output_categories=()):
+    ''' (int, int, str, int, list of str, list of str) -> InputData
+
+        DMUs D0, D1, ... with random x1, x2, q1, q2 between 1 and 10 and,
+        if level_category is given, levels 1, 2, ..., nb_levels.
+    '''
+    random_state = numpy.random.RandomState(seed)
+    categories = ['x1', 'x2', 'q1', 'q2']
+    if level_category is not None:
+        categories.append(level_category)
+    rows = []
+    for count in range(nb_dmus):
+        values = list(random_state.uniform(1, 10, 4))
+        if level_category is not None:
+            values.append(count % nb_levels + 1)
+        rows.append(('D{0}'.format(count), values))
+    return create_data(rows, categories, input_categories, output_categories)